@@ -9,12 +9,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from lingc_cli.commands import (
+    blocklist,
     db,
     doctor,
     env,
     init,
     lifecycle,
     run as run_cmd,
+    scheduler,
     self as self_cmd,
 )
 
@@ -30,6 +32,8 @@ def add_all(app: typer.Typer) -> None:
     run_cmd.register(app)
     lifecycle.register(app)
     db.register(app)
+    blocklist.register(app)
+    scheduler.register(app)
     self_cmd.register(app)
 
 
@@ -0,0 +1,113 @@
+"""lc blocklist — import and export the bot blocklist as CSV or JSON Lines."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import typer
+
+from lingc_cli.exceptions import LingcCliError
+from lingc_cli.handlers.blocklist import blocklist_index_ttl_seconds, run_blocklist
+from lingc_cli.i18n import _
+
+if TYPE_CHECKING:
+    from lingc_cli.handlers.blocklist import BlocklistAction
+
+
+def _run(
+    action: BlocklistAction,
+    file: str,
+    *,
+    platform_id: str | None,
+    adapter_id: str | None,
+    bot_id: str | None,
+) -> int:
+    """Run a transfer and translate failures to a Typer exit code."""
+    try:
+        return run_blocklist(
+            action,
+            Path(file),
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            bot_id=bot_id,
+        )
+    except LingcCliError as exc:
+        typer.echo(_("error: {message}").format(message=exc), err=True)
+        raise typer.Exit(1) from exc
+
+
+def register(app: typer.Typer) -> None:
+    """Register the blocklist sub-application onto the root application."""
+    blocklist_app = typer.Typer(help=_("Import or export the blocklist."))
+
+    @blocklist_app.command(
+        "import", help=_("Import blocklist entries from a .csv or .jsonl file.")
+    )
+    def import_(
+        file: str = typer.Argument(..., help=_("Source .csv or .jsonl file.")),
+        platform_id: str | None = typer.Option(
+            None, "--platform-id", help=_("Import every entry for this platform.")
+        ),
+        adapter_id: str | None = typer.Option(
+            None, "--adapter-id", help=_("Import every entry for this adapter.")
+        ),
+        bot_id: str | None = typer.Option(
+            None, "--bot-id", help=_("Import every entry for this bot account.")
+        ),
+    ) -> None:
+        """Upsert every record of FILE in one transaction."""
+        count = _run(
+            "import",
+            file,
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            bot_id=bot_id,
+        )
+        typer.echo(_("Imported {count} blocklist entries.").format(count=count))
+        ttl = blocklist_index_ttl_seconds()
+        if ttl > 0:
+            typer.echo(
+                _(
+                    "A running bot enforces them within {seconds} seconds, "
+                    "when it reloads its blocklist index."
+                ).format(seconds=ttl)
+            )
+        else:
+            typer.echo(
+                _(
+                    "LINGCHU_BLOCKLIST_INDEX_TTL_SECONDS is 0: restart a running "
+                    "bot to enforce them."
+                ),
+                err=True,
+            )
+
+    @blocklist_app.command(
+        "export", help=_("Export blocklist entries to a .csv or .jsonl file.")
+    )
+    def export(
+        file: str = typer.Argument(..., help=_("Destination .csv or .jsonl file.")),
+        platform_id: str | None = typer.Option(
+            None, "--platform-id", help=_("Only export entries for this platform.")
+        ),
+        adapter_id: str | None = typer.Option(
+            None, "--adapter-id", help=_("Only export entries for this adapter.")
+        ),
+        bot_id: str | None = typer.Option(
+            None, "--bot-id", help=_("Only export entries for this bot account.")
+        ),
+    ) -> None:
+        """Write the stored entries to FILE."""
+        count = _run(
+            "export",
+            file,
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            bot_id=bot_id,
+        )
+        typer.echo(_("Exported {count} blocklist entries.").format(count=count))
+
+    app.add_typer(blocklist_app, name="blocklist")
+
+
+__all__ = ["register"]
@@ -0,0 +1,56 @@
+"""lc scheduler — inspect the run history of persistent scheduler jobs."""
+
+from __future__ import annotations
+
+import typer
+
+from lingc_cli.exceptions import LingcCliError
+from lingc_cli.handlers.scheduler import run_scheduler_stats
+from lingc_cli.i18n import _
+
+
+def _duration(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f} ms"
+
+
+def register(app: typer.Typer) -> None:
+    """Register the scheduler sub-application onto the root application."""
+    scheduler_app = typer.Typer(help=_("Inspect scheduler job runs."))
+
+    @scheduler_app.command(
+        "stats", help=_("Show p50/p95 run durations per scheduler handler.")
+    )
+    def stats(
+        limit: int = typer.Option(
+            512, "--limit", min=1, help=_("Aggregate at most this many latest runs.")
+        ),
+    ) -> None:
+        """Aggregate the persisted run history per handler key."""
+        try:
+            rows = run_scheduler_stats(limit)
+        except LingcCliError as exc:
+            typer.echo(_("error: {message}").format(message=exc), err=True)
+            raise typer.Exit(1) from exc
+        if not rows:
+            typer.echo(_("No scheduler job runs recorded yet."))
+            return
+        for row in rows:
+            typer.echo(
+                _(
+                    "{handler_key}: {runs} runs, p50 {p50}, p95 {p95}, "
+                    "{failures} failed, {misfires} missed, {skips} skipped"
+                ).format(
+                    handler_key=row.handler_key,
+                    runs=row.runs,
+                    p50=_duration(row.p50_ms),
+                    p95=_duration(row.p95_ms),
+                    failures=row.failures,
+                    misfires=row.misfires,
+                    skips=row.skips,
+                )
+            )
+
+    app.add_typer(scheduler_app, name="scheduler")
+
+
+__all__ = ["register"]
@@ -0,0 +1,86 @@
+"""Blocklist import/export for Lingc CLI (lc blocklist).
+
+Runs the plugin's blocklist transfer service against the configured
+database. NoneBot is initialized the same way as ``lc db`` so the orm session
+factory is available; the plugin module is imported lazily so an unprepared
+environment is reported as EnvironmentNotReadyError.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from typing import TYPE_CHECKING, Literal
+
+from lingc_cli.exceptions import EnvironmentNotReadyError, LingcCliError
+from lingc_cli.handlers.db import _ensure_nonebot
+from lingc_cli.i18n import _
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# nonebot and the lingchu plugin are optional runtime deps of this command.
+# pyright: reportMissingImports=false
+
+_TRANSFER_MODULE = "src.plugins.nonebot_plugin_lingchu_bot.services.blocklist_transfer"
+_CONFIG_MODULE = "src.plugins.nonebot_plugin_lingchu_bot.core.config"
+
+BlocklistAction = Literal["import", "export"]
+
+
+def run_blocklist(
+    action: BlocklistAction,
+    path: Path,
+    *,
+    platform_id: str | None = None,
+    adapter_id: str | None = None,
+    bot_id: str | None = None,
+) -> int:
+    """Import or export the blocklist and return the number of rows moved.
+
+    On import the identity options replace the matching columns of every
+    record; on export they restrict the rows written.
+
+    Raises:
+        EnvironmentNotReadyError: If NoneBot or the plugin cannot be loaded.
+        LingcCliError: If the file is invalid or the database rejects it.
+    """
+    try:
+        _ensure_nonebot()
+        transfer = importlib.import_module(_TRANSFER_MODULE)
+    except ImportError as exc:
+        raise EnvironmentNotReadyError(
+            _("The lingchu plugin is not installed; cannot transfer the blocklist.")
+        ) from exc
+
+    identity = {
+        "platform_id": platform_id,
+        "adapter_id": adapter_id,
+        "bot_id": bot_id,
+    }
+    try:
+        if action == "import":
+            overrides = {key: value for key, value in identity.items() if value}
+            return asyncio.run(transfer.import_blocklist(path, overrides))
+        return asyncio.run(transfer.export_blocklist(path, **identity))
+    except transfer.BlocklistTransferError as exc:
+        raise LingcCliError(str(exc)) from exc
+    except Exception as exc:
+        # DatabaseError and driver failures are not LingcCliErrors; surface
+        # them with their type so the CLI does not exit silently.
+        message = f"{type(exc).__name__}: {exc}"
+        raise LingcCliError(message) from exc
+
+
+def blocklist_index_ttl_seconds() -> int:
+    """Return how often a running bot reloads its active blocklist index.
+
+    Imported rows bypass the bot's in-process index and are enforced once it
+    reloads; ``0`` means the bot loads the index only at startup.  Call after
+    :func:`run_blocklist`, which has loaded the plugin.
+    """
+    config = importlib.import_module(_CONFIG_MODULE)
+    return config.plugin_config.blocklist_index_ttl_seconds
+
+
+__all__ = ["BlocklistAction", "blocklist_index_ttl_seconds", "run_blocklist"]
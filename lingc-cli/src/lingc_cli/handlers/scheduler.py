@@ -0,0 +1,48 @@
+"""Scheduler run statistics for Lingc CLI (lc scheduler).
+
+Aggregates the persisted run history of the plugin's scheduler jobs.  The
+running bot keeps its own in-memory history; this command reads the
+``lingchu_scheduled_job_runs`` table so it works from a separate process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from typing import Any
+
+from lingc_cli.exceptions import EnvironmentNotReadyError, LingcCliError
+from lingc_cli.handlers.db import _ensure_nonebot
+from lingc_cli.i18n import _
+
+# nonebot and the lingchu plugin are optional runtime deps of this command.
+# pyright: reportMissingImports=false
+
+_HISTORY_MODULE = "src.plugins.nonebot_plugin_lingchu_bot.services.scheduler_history"
+
+
+def run_scheduler_stats(limit: int) -> list[Any]:
+    """Return per-handler ``JobRunStats`` over the latest ``limit`` runs.
+
+    Raises:
+        EnvironmentNotReadyError: If NoneBot or the plugin cannot be loaded.
+        LingcCliError: If the run history cannot be read.
+    """
+    try:
+        _ensure_nonebot()
+        history = importlib.import_module(_HISTORY_MODULE)
+    except ImportError as exc:
+        raise EnvironmentNotReadyError(
+            _("The lingchu plugin is not installed; cannot read scheduler runs.")
+        ) from exc
+
+    try:
+        return asyncio.run(history.load_job_run_stats(limit))
+    except Exception as exc:
+        # DatabaseError and driver failures are not LingcCliErrors; surface
+        # them with their type so the CLI does not exit silently.
+        message = f"{type(exc).__name__}: {exc}"
+        raise LingcCliError(message) from exc
+
+
+__all__ = ["run_scheduler_stats"]
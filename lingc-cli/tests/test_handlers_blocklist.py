@@ -0,0 +1,102 @@
+"""Tests for lingc_cli.handlers.blocklist.run_blocklist."""
+
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+from lingc_cli.exceptions import EnvironmentNotReadyError, LingcCliError
+from lingc_cli.handlers import blocklist
+from lingc_cli.handlers.blocklist import blocklist_index_ttl_seconds, run_blocklist
+
+IMPORTED = 2
+EXPORTED = 3
+INDEX_TTL_SECONDS = 60
+
+
+class _TransferError(ValueError):
+    """Fake BlocklistTransferError."""
+
+
+def _install_fake_transfer(
+    monkeypatch: pytest.MonkeyPatch, calls: list[tuple[str, tuple, dict]]
+) -> types.ModuleType:
+    """Register a fake blocklist transfer module in sys.modules."""
+    module = types.ModuleType(blocklist._TRANSFER_MODULE)
+
+    async def import_blocklist(*args: object, **kwargs: object) -> int:
+        calls.append(("import", args, kwargs))
+        return IMPORTED
+
+    async def export_blocklist(*args: object, **kwargs: object) -> int:
+        calls.append(("export", args, kwargs))
+        return EXPORTED
+
+    module.BlocklistTransferError = _TransferError
+    module.import_blocklist = import_blocklist
+    module.export_blocklist = export_blocklist
+    monkeypatch.setattr(blocklist, "_ensure_nonebot", lambda: None)
+    monkeypatch.setitem(sys.modules, blocklist._TRANSFER_MODULE, module)
+    return module
+
+
+def test_blocklist_not_installed_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """When the plugin is absent, run_blocklist reports an unready environment."""
+    monkeypatch.setattr(blocklist, "_ensure_nonebot", lambda: None)
+    monkeypatch.setattr(
+        importlib,
+        "import_module",
+        lambda name: (_ for _ in ()).throw(ImportError(f"no {name}")),
+    )
+    with pytest.raises(EnvironmentNotReadyError):
+        run_blocklist("import", Path("blocklist.csv"))
+
+
+def test_import_passes_only_given_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, tuple, dict]] = []
+    _install_fake_transfer(monkeypatch, calls)
+
+    assert run_blocklist("import", Path("in.csv"), bot_id="42") == IMPORTED
+    assert calls == [("import", (Path("in.csv"), {"bot_id": "42"}), {})]
+
+
+def test_export_filters_by_identity(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, tuple, dict]] = []
+    _install_fake_transfer(monkeypatch, calls)
+
+    assert run_blocklist("export", Path("out.jsonl"), platform_id="qq") == EXPORTED
+    assert calls == [
+        (
+            "export",
+            (Path("out.jsonl"),),
+            {"platform_id": "qq", "adapter_id": None, "bot_id": None},
+        )
+    ]
+
+
+def test_transfer_errors_become_cli_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    module = _install_fake_transfer(monkeypatch, [])
+
+    async def import_blocklist(*_args: object) -> int:
+        message = "line 3: user_id is required"
+        raise _TransferError(message)
+
+    module.import_blocklist = import_blocklist
+    with pytest.raises(LingcCliError, match="line 3"):
+        run_blocklist("import", Path("in.csv"))
+
+
+def test_index_ttl_comes_from_the_plugin_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    module = types.ModuleType(blocklist._CONFIG_MODULE)
+    module.plugin_config = types.SimpleNamespace(
+        blocklist_index_ttl_seconds=INDEX_TTL_SECONDS
+    )
+    monkeypatch.setitem(sys.modules, blocklist._CONFIG_MODULE, module)
+
+    assert blocklist_index_ttl_seconds() == INDEX_TTL_SECONDS
@@ -0,0 +1,62 @@
+"""Tests for lingc_cli.handlers.scheduler.run_scheduler_stats."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+
+import pytest
+
+from lingc_cli.exceptions import EnvironmentNotReadyError, LingcCliError
+from lingc_cli.handlers import scheduler
+from lingc_cli.handlers.scheduler import run_scheduler_stats
+
+LIMIT = 64
+
+
+def _install_fake_history(
+    monkeypatch: pytest.MonkeyPatch, calls: list[int]
+) -> types.ModuleType:
+    """Register a fake scheduler history module in sys.modules."""
+    module = types.ModuleType(scheduler._HISTORY_MODULE)
+
+    async def load_job_run_stats(limit: int) -> list[str]:
+        calls.append(limit)
+        return ["cleanup"]
+
+    module.load_job_run_stats = load_job_run_stats
+    monkeypatch.setattr(scheduler, "_ensure_nonebot", lambda: None)
+    monkeypatch.setitem(sys.modules, scheduler._HISTORY_MODULE, module)
+    return module
+
+
+def test_scheduler_not_installed_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(scheduler, "_ensure_nonebot", lambda: None)
+    monkeypatch.setattr(
+        importlib,
+        "import_module",
+        lambda name: (_ for _ in ()).throw(ImportError(f"no {name}")),
+    )
+    with pytest.raises(EnvironmentNotReadyError):
+        run_scheduler_stats(LIMIT)
+
+
+def test_stats_load_the_requested_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+    _install_fake_history(monkeypatch, calls)
+
+    assert run_scheduler_stats(LIMIT) == ["cleanup"]
+    assert calls == [LIMIT]
+
+
+def test_database_errors_become_cli_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    module = _install_fake_history(monkeypatch, [])
+
+    async def load_job_run_stats(_limit: int) -> list[str]:
+        message = "no such table"
+        raise RuntimeError(message)
+
+    module.load_job_run_stats = load_job_run_stats
+    with pytest.raises(LingcCliError, match="RuntimeError: no such table"):
+        run_scheduler_stats(LIMIT)
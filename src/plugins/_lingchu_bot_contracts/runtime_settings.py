@@ -11,6 +11,8 @@ if TYPE_CHECKING:
     from collections.abc import Mapping
 
 MAX_RECALL_MESSAGE_DEFAULT_COUNT = 100
+MAX_SAMPLE_PERCENT = 100
+MESSAGE_STORE_PARTITION_PERIODS = ("none", "week", "month")
 
 
 class SettingsValidationError(ValueError):
@@ -36,6 +38,25 @@ def _non_negative_int(name: str, value: Any) -> int:
     return value
 
 
+def _positive_int(name: str, value: Any) -> int:
+    if type(value) is not int or value < 1:
+        raise SettingsValidationError(f"{name} must be a positive integer")
+    return value
+
+
+def _percent(name: str, value: Any) -> int:
+    if type(value) is not int or not 0 <= value <= MAX_SAMPLE_PERCENT:
+        raise SettingsValidationError(f"{name} must be between 0 and 100")
+    return value
+
+
+def _choice(name: str, value: Any, choices: tuple[str, ...]) -> str:
+    text = str(value).strip().lower()
+    if text not in choices:
+        raise SettingsValidationError(f"{name} must be one of {', '.join(choices)}")
+    return text
+
+
 def _coerce_bool(name: str, value: Any) -> bool:
     """Parse boolean settings, including case-insensitive env strings."""
     if isinstance(value, str):
@@ -68,7 +89,21 @@ class DeploymentSettings:
     message_store_summary_limit: int = 500
     message_store_record_api_calls: bool = True
     message_store_cleanup_enabled: bool = True
+    message_store_cleanup_batch_size: int = 1000
+    message_store_cleanup_pause_ms: int = 100
+    message_store_cleanup_incremental_vacuum: bool = False
+    message_store_write_batch_size: int = 200
+    message_store_write_interval_ms: int = 500
+    message_store_write_queue_limit: int = 10000
+    message_store_raw_payload_sample_percent: int = 100
+    message_store_partition_period: str = "none"
     recall_message_default_count: int = 10
+    permission_index_ttl_seconds: int = 0
+    blocklist_index_ttl_seconds: int = 60
+    onebot_member_cache_ttl_seconds: int = 30
+    onebot_group_list_ttl_seconds: int = 300
+    scheduler_verify_job_version: bool = False
+    media_cache_max_bytes: int = 256 * 1024 * 1024
     protected_subject_feature_keys: frozenset[str] = field(
         default_factory=lambda: frozenset({
             "kick_member",
@@ -83,6 +118,7 @@ class DeploymentSettings:
             "remote_kick",
             "remote_block",
             "remote_mute",
+            "mass_block",
         })
     )
     lingchu_superusers: dict[str, dict[str, str | int]] | None = None
@@ -159,6 +195,84 @@ class DeploymentSettings:
                 ),
             ),
         )
+        cleanup_batch_size = _positive_int(
+            "message_store_cleanup_batch_size",
+            _coerce_int(
+                "message_store_cleanup_batch_size",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_CLEANUP_BATCH_SIZE",
+                    "lingchu_message_store_cleanup_batch_size",
+                    "message_store_cleanup_batch_size",
+                    default=1000,
+                ),
+            ),
+        )
+        cleanup_pause_ms = _non_negative_int(
+            "message_store_cleanup_pause_ms",
+            _coerce_int(
+                "message_store_cleanup_pause_ms",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_CLEANUP_PAUSE_MS",
+                    "lingchu_message_store_cleanup_pause_ms",
+                    "message_store_cleanup_pause_ms",
+                    default=100,
+                ),
+            ),
+        )
+        write_batch_size = _positive_int(
+            "message_store_write_batch_size",
+            _coerce_int(
+                "message_store_write_batch_size",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_WRITE_BATCH_SIZE",
+                    "lingchu_message_store_write_batch_size",
+                    "message_store_write_batch_size",
+                    default=200,
+                ),
+            ),
+        )
+        write_interval_ms = _positive_int(
+            "message_store_write_interval_ms",
+            _coerce_int(
+                "message_store_write_interval_ms",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_WRITE_INTERVAL_MS",
+                    "lingchu_message_store_write_interval_ms",
+                    "message_store_write_interval_ms",
+                    default=500,
+                ),
+            ),
+        )
+        write_queue_limit = _positive_int(
+            "message_store_write_queue_limit",
+            _coerce_int(
+                "message_store_write_queue_limit",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_WRITE_QUEUE_LIMIT",
+                    "lingchu_message_store_write_queue_limit",
+                    "message_store_write_queue_limit",
+                    default=10000,
+                ),
+            ),
+        )
+        raw_payload_sample_percent = _percent(
+            "message_store_raw_payload_sample_percent",
+            _coerce_int(
+                "message_store_raw_payload_sample_percent",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_RAW_PAYLOAD_SAMPLE_PERCENT",
+                    "lingchu_message_store_raw_payload_sample_percent",
+                    "message_store_raw_payload_sample_percent",
+                    default=100,
+                ),
+            ),
+        )
         count = _coerce_int(
             "recall_message_default_count",
             _value(
@@ -215,7 +329,109 @@ class DeploymentSettings:
                     default=True,
                 ),
             ),
+            message_store_cleanup_batch_size=cleanup_batch_size,
+            message_store_cleanup_pause_ms=cleanup_pause_ms,
+            message_store_cleanup_incremental_vacuum=_coerce_bool(
+                "message_store_cleanup_incremental_vacuum",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_CLEANUP_INCREMENTAL_VACUUM",
+                    "lingchu_message_store_cleanup_incremental_vacuum",
+                    "message_store_cleanup_incremental_vacuum",
+                    default=False,
+                ),
+            ),
+            message_store_write_batch_size=write_batch_size,
+            message_store_write_interval_ms=write_interval_ms,
+            message_store_write_queue_limit=write_queue_limit,
+            message_store_raw_payload_sample_percent=raw_payload_sample_percent,
+            message_store_partition_period=_choice(
+                "message_store_partition_period",
+                _value(
+                    source,
+                    "LINGCHU_MESSAGE_STORE_PARTITION_PERIOD",
+                    "lingchu_message_store_partition_period",
+                    "message_store_partition_period",
+                    default="none",
+                ),
+                MESSAGE_STORE_PARTITION_PERIODS,
+            ),
             recall_message_default_count=count,
+            permission_index_ttl_seconds=_non_negative_int(
+                "permission_index_ttl_seconds",
+                _coerce_int(
+                    "permission_index_ttl_seconds",
+                    _value(
+                        source,
+                        "LINGCHU_PERMISSION_INDEX_TTL_SECONDS",
+                        "lingchu_permission_index_ttl_seconds",
+                        "permission_index_ttl_seconds",
+                        default=0,
+                    ),
+                ),
+            ),
+            blocklist_index_ttl_seconds=_non_negative_int(
+                "blocklist_index_ttl_seconds",
+                _coerce_int(
+                    "blocklist_index_ttl_seconds",
+                    _value(
+                        source,
+                        "LINGCHU_BLOCKLIST_INDEX_TTL_SECONDS",
+                        "lingchu_blocklist_index_ttl_seconds",
+                        "blocklist_index_ttl_seconds",
+                        default=60,
+                    ),
+                ),
+            ),
+            onebot_member_cache_ttl_seconds=_non_negative_int(
+                "onebot_member_cache_ttl_seconds",
+                _coerce_int(
+                    "onebot_member_cache_ttl_seconds",
+                    _value(
+                        source,
+                        "LINGCHU_ONEBOT_MEMBER_CACHE_TTL_SECONDS",
+                        "lingchu_onebot_member_cache_ttl_seconds",
+                        "onebot_member_cache_ttl_seconds",
+                        default=30,
+                    ),
+                ),
+            ),
+            onebot_group_list_ttl_seconds=_non_negative_int(
+                "onebot_group_list_ttl_seconds",
+                _coerce_int(
+                    "onebot_group_list_ttl_seconds",
+                    _value(
+                        source,
+                        "LINGCHU_ONEBOT_GROUP_LIST_TTL_SECONDS",
+                        "lingchu_onebot_group_list_ttl_seconds",
+                        "onebot_group_list_ttl_seconds",
+                        default=300,
+                    ),
+                ),
+            ),
+            scheduler_verify_job_version=_coerce_bool(
+                "scheduler_verify_job_version",
+                _value(
+                    source,
+                    "LINGCHU_SCHEDULER_VERIFY_JOB_VERSION",
+                    "lingchu_scheduler_verify_job_version",
+                    "scheduler_verify_job_version",
+                    default=False,
+                ),
+            ),
+            media_cache_max_bytes=_non_negative_int(
+                "media_cache_max_bytes",
+                _coerce_int(
+                    "media_cache_max_bytes",
+                    _value(
+                        source,
+                        "LINGCHU_MEDIA_CACHE_MAX_BYTES",
+                        "lingchu_media_cache_max_bytes",
+                        "media_cache_max_bytes",
+                        default=256 * 1024 * 1024,
+                    ),
+                ),
+            ),
             protected_subject_feature_keys=frozenset(
                 str(item).strip() for item in protected if str(item).strip()
             ),
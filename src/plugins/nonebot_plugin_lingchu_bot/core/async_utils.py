@@ -1,14 +1,91 @@
-"""Async utilities for fire-and-forget background tasks."""
+"""Async utilities for fire-and-forget and lane-bounded background tasks."""
 
 import asyncio
+from collections import deque
 from collections.abc import Coroutine
-from typing import Any
+from dataclasses import dataclass, field
+from functools import partial
+import time
+from typing import Any, Literal
 
 from nonebot import logger
 
 _background_tasks: set[asyncio.Task[Any]] = set()
 _BACKGROUND_TASK_DRAIN_TIMEOUT_SECONDS = 10.0
 
+AUDIT_LANE = "audit"
+MESSAGE_STORE_LANE = "message-store"
+NOTICE_LANE = "notices"
+
+type LanePolicy = Literal["drop", "coalesce"]
+
+
+@dataclass(frozen=True, slots=True)
+class LaneConfig:
+    """Capacity limits for one background lane.
+
+    ``policy="drop"`` rejects new jobs once ``max_queue`` jobs are waiting.
+    ``policy="coalesce"`` additionally replaces a waiting job that was
+    submitted with the same ``key``, so bursts collapse into the latest job.
+    """
+
+    concurrency: int
+    max_queue: int
+    policy: LanePolicy = "drop"
+
+
+@dataclass(frozen=True, slots=True)
+class LaneStats:
+    """Point-in-time counters for one background lane."""
+
+    name: str
+    queued: int
+    running: int
+    submitted: int
+    completed: int
+    failed: int
+    dropped: int
+    coalesced: int
+    last_latency_seconds: float
+    max_latency_seconds: float
+    total_latency_seconds: float
+
+
+@dataclass(slots=True)
+class _LaneJob:
+    coro: Coroutine[Any, Any, Any]
+    name: str
+    key: str | None
+    submitted_at: float
+
+
+@dataclass(slots=True)
+class _Lane:
+    name: str
+    config: LaneConfig
+    queue: deque[_LaneJob] = field(default_factory=deque)
+    running: set[asyncio.Task[Any]] = field(default_factory=set)
+    overflowing: bool = False
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    last_latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    total_latency_seconds: float = 0.0
+
+
+DEFAULT_LANES: dict[str, LaneConfig] = {
+    AUDIT_LANE: LaneConfig(concurrency=4, max_queue=1000),
+    MESSAGE_STORE_LANE: LaneConfig(concurrency=2, max_queue=1000),
+    NOTICE_LANE: LaneConfig(concurrency=4, max_queue=200, policy="coalesce"),
+}
+
+_lanes: dict[str, _Lane] = {
+    name: _Lane(name=name, config=config) for name, config in DEFAULT_LANES.items()
+}
+
 
 def get_background_tasks() -> tuple[asyncio.Task[Any], ...]:
     """Return a stable snapshot of currently registered background tasks."""
@@ -52,15 +129,132 @@ def _on_background_task_done(task: asyncio.Task[Any]) -> None:
     logger.exception("Background task %s failed", task.get_name(), exc_info=exc)
 
 
+def submit_background(
+    lane: str,
+    coro: Coroutine[Any, Any, Any],
+    *,
+    name: str,
+    key: str | None = None,
+) -> bool:
+    """Run ``coro`` on a bounded background lane.
+
+    The job starts immediately while the lane is below its concurrency cap and
+    otherwise waits in the lane queue.  A full queue drops the new job, and a
+    coalescing lane replaces a waiting job submitted with the same ``key``.
+    Dropped or replaced coroutines are closed without running.
+
+    Args:
+        lane: Lane name, e.g. :data:`AUDIT_LANE`.
+        coro: The coroutine to schedule.
+        name: Human-readable name for the background task.
+        key: Coalescing key; ignored by ``policy="drop"`` lanes.
+
+    Returns:
+        ``True`` when the job was started, queued, or coalesced; ``False``
+        when it was dropped.
+
+    Raises:
+        KeyError: If ``lane`` is not a registered lane.
+    """
+    state = _lanes[lane]
+    job = _LaneJob(coro=coro, name=name, key=key, submitted_at=time.perf_counter())
+    if key is not None and state.config.policy == "coalesce":
+        for index, waiting in enumerate(state.queue):
+            if waiting.key == key:
+                waiting.coro.close()
+                state.queue[index] = job
+                state.coalesced += 1
+                return True
+    if (
+        len(state.running) >= state.config.concurrency
+        and len(state.queue) >= state.config.max_queue
+    ):
+        coro.close()
+        state.dropped += 1
+        if not state.overflowing:
+            state.overflowing = True
+            logger.warning(
+                "Background lane {} is full ({} queued); dropping new jobs",
+                lane,
+                len(state.queue),
+            )
+        return False
+    state.submitted += 1
+    state.queue.append(job)
+    _pump_lane(state)
+    return True
+
+
+def _pump_lane(state: _Lane) -> None:
+    """Start queued jobs until the lane reaches its concurrency cap."""
+    while state.queue and len(state.running) < state.config.concurrency:
+        job = state.queue.popleft()
+        task = asyncio.create_task(job.coro, name=job.name)
+        state.running.add(task)
+        _background_tasks.add(task)
+        task.add_done_callback(_on_background_task_done)
+        task.add_done_callback(partial(_on_lane_task_done, state, job))
+    if not state.queue:
+        state.overflowing = False
+
+
+def _on_lane_task_done(state: _Lane, job: _LaneJob, task: asyncio.Task[Any]) -> None:
+    state.running.discard(task)
+    latency = time.perf_counter() - job.submitted_at
+    state.last_latency_seconds = latency
+    state.max_latency_seconds = max(state.max_latency_seconds, latency)
+    state.total_latency_seconds += latency
+    if not task.cancelled() and task.exception() is not None:
+        state.failed += 1
+    else:
+        state.completed += 1
+    _pump_lane(state)
+
+
+def get_lane_stats() -> dict[str, LaneStats]:
+    """Return queue depth, drop counts and latency counters for every lane."""
+    return {
+        name: LaneStats(
+            name=name,
+            queued=len(state.queue),
+            running=len(state.running),
+            submitted=state.submitted,
+            completed=state.completed,
+            failed=state.failed,
+            dropped=state.dropped,
+            coalesced=state.coalesced,
+            last_latency_seconds=state.last_latency_seconds,
+            max_latency_seconds=state.max_latency_seconds,
+            total_latency_seconds=state.total_latency_seconds,
+        )
+        for name, state in _lanes.items()
+    }
+
+
+def _discard_queued_lane_jobs() -> dict[str, int]:
+    """Close every job still waiting in a lane queue and count them per lane."""
+    discarded: dict[str, int] = {}
+    for name, state in _lanes.items():
+        if not state.queue:
+            continue
+        discarded[name] = len(state.queue)
+        state.dropped += len(state.queue)
+        while state.queue:
+            state.queue.popleft().coro.close()
+    return discarded
+
+
 async def drain_background_tasks(
     *,
     drain_timeout: float = _BACKGROUND_TASK_DRAIN_TIMEOUT_SECONDS,
 ) -> None:
-    """Wait for background tasks with a bounded shutdown timeout.
+    """Wait for background tasks and queued lane jobs with a bounded timeout.
 
-    Tasks that do not finish before ``drain_timeout`` are cancelled and left to
-    complete asynchronously; shutdown must not hang on an uncooperative
-    discardable task.
+    Lane jobs keep starting as running ones finish, so queued work is drained
+    within the same deadline.  Tasks that do not finish before
+    ``drain_timeout`` are cancelled, queued lane jobs are discarded, and both
+    are left to complete asynchronously; shutdown must not hang on an
+    uncooperative discardable task.
     """
     if drain_timeout <= 0:
         raise ValueError
@@ -77,11 +271,14 @@ async def drain_background_tasks(
         else:
             _, unfinished = await asyncio.wait(pending, timeout=remaining)
         if unfinished:
+            discarded = _discard_queued_lane_jobs()
             for task in unfinished:
                 task.cancel()
             logger.warning(
-                "Timed out draining background tasks; cancelled {} task(s)",
+                "Timed out draining background tasks; cancelled {} task(s), "
+                "discarded queued lane jobs {}",
                 len(unfinished),
+                discarded,
             )
             await asyncio.sleep(0)
             return
@@ -93,6 +93,8 @@ HANDLE_DEFAULT_DEFINITIONS: Final[tuple[HandleDefaultDefinition, ...]] = (
     HandleDefaultDefinition("block_member", "default_reason", _parse_text),
     HandleDefaultDefinition("remote_block", "block_duration", _parse_optional_duration),
     HandleDefaultDefinition("remote_block", "default_reason", _parse_text),
+    HandleDefaultDefinition("mass_block", "block_duration", _parse_optional_duration),
+    HandleDefaultDefinition("mass_block", "default_reason", _parse_text),
     HandleDefaultDefinition("recall_message", "default_count", _parse_positive_count),
     HandleDefaultDefinition("protect_member", "whitelist_scope", _parse_scope),
     HandleDefaultDefinition("protect_member", "default_reason", _parse_text),
@@ -1,25 +1,41 @@
-"""HTTP helpers for user-supplied media downloads."""
+"""HTTP helpers for user-supplied media downloads.
+
+Downloads go through one long-lived :class:`PublicHTTPDownloader`, which keeps
+a single driver session (and its connection pool) open until shutdown and
+caches DNS answers for a short TTL.  Every hop is still validated against the
+private-network block list and the connected peer must be one of the
+validated addresses, so the DNS cache never widens what may be reached.
+Concurrent downloads share one byte budget: each reserves its ``max_bytes``
+before the first request and releases it once the body is received.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 from dataclasses import dataclass
 from ipaddress import ip_address
 import socket
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import ParseResult, urljoin, urlparse
 
 from nonebot import get_driver
 from nonebot.drivers import Request
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterable
+    from collections.abc import AsyncIterable, AsyncIterator
 
 _HTTP_SCHEMES = frozenset({"http", "https"})
 _HTTP_ERROR_STATUS = 400
 _HTTP_SUCCESS_RANGE = (200, 300)
 _REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
 _MAX_REDIRECTS = 3
+_DNS_CACHE_TTL_SECONDS = 60.0
+_DNS_CACHE_MAX_ENTRIES = 1024
+_DOWNLOAD_BYTE_BUDGET = 64 * 1024 * 1024
+
+type _Chunk = bytes | bytearray | memoryview
 
 
 class UnsafeDownloadURLError(ValueError):
@@ -70,14 +86,18 @@ def _parse_http_url(url: str) -> tuple[ParseResult, int]:
     return parsed, port
 
 
+def _validate_public_addresses(addresses: tuple[str, ...]) -> None:
+    if not addresses or any(_is_forbidden_address(address) for address in addresses):
+        msg = "image URL resolves to a blocked network"
+        raise UnsafeDownloadURLError(msg)
+
+
 async def _validate_and_resolve_http_url(
     url: str,
 ) -> tuple[ParseResult, tuple[str, ...]]:
     parsed, port = _parse_http_url(url)
     addresses = await resolve_host_addresses(parsed.hostname or "", port)
-    if not addresses or any(_is_forbidden_address(address) for address in addresses):
-        msg = "image URL resolves to a blocked network"
-        raise UnsafeDownloadURLError(msg)
+    _validate_public_addresses(addresses)
     return parsed, addresses
 
 
@@ -86,20 +106,26 @@ async def validate_public_http_url(url: str) -> None:
     await _validate_and_resolve_http_url(url)
 
 
-def _response_content_bytes(content: Any) -> bytes:
+def _response_chunk(content: Any) -> _Chunk:
     if isinstance(content, (bytes, bytearray, memoryview)):
-        return bytes(content)
+        return content
     if isinstance(content, str):
         return content.encode()
     msg = "downloaded image response is not binary"
     raise UnsafeDownloadURLError(msg)
 
 
+class BodySink(Protocol):
+    """Receiver of a download body, such as an ``aiofiles`` file."""
+
+    async def write(self, chunk: _Chunk, /) -> Any: ...
+
+
 @dataclass(frozen=True, slots=True)
 class _SingleHopResponse:
     status_code: int
     headers: Any
-    content: bytes
+    size: int = 0
 
 
 def _header_value(headers: Any, name: str) -> str | None:
@@ -152,25 +178,28 @@ def _validate_declared_response_size(headers: Any, max_bytes: int) -> None:
 async def _read_limited_chunks(
     chunks: AsyncIterable[Any],
     max_bytes: int,
-) -> bytes:
-    data = bytearray()
+    sink: BodySink,
+) -> int:
+    size = 0
     async for chunk in chunks:
-        chunk_bytes = _response_content_bytes(chunk)
-        if len(data) + len(chunk_bytes) > max_bytes:
+        data = _response_chunk(chunk)
+        size += len(data)
+        if size > max_bytes:
             msg = "downloaded image is too large"
             raise UnsafeDownloadURLError(msg)
-        data.extend(chunk_bytes)
-    return bytes(data)
+        await sink.write(data)
+    return size
 
 
-async def _read_response_content(content: Any, max_bytes: int) -> bytes:
+async def _read_response_content(content: Any, max_bytes: int, sink: BodySink) -> int:
     if hasattr(content, "__aiter__"):
-        return await _read_limited_chunks(content, max_bytes)
-    data = _response_content_bytes(content)
+        return await _read_limited_chunks(content, max_bytes, sink)
+    data = _response_chunk(content)
     if len(data) > max_bytes:
         msg = "downloaded image is too large"
         raise UnsafeDownloadURLError(msg)
-    return data
+    await sink.write(data)
+    return len(data)
 
 
 def _peer_host(value: Any) -> str | None:
@@ -256,6 +285,7 @@ async def _request_one_hop_httpx(
     *,
     max_bytes: int,
     allowed_addresses: tuple[str, ...],
+    sink: BodySink,
 ) -> _SingleHopResponse:
     cookies = getattr(getattr(request, "cookies", None), "jar", None)
     async with client.stream(
@@ -279,9 +309,9 @@ async def _request_one_hop_httpx(
         )
         status_code = response.status_code
         if not _HTTP_SUCCESS_RANGE[0] <= status_code < _HTTP_SUCCESS_RANGE[1]:
-            return _SingleHopResponse(status_code, headers, b"")
-        content = await _read_limited_chunks(response.aiter_bytes(), max_bytes)
-    return _SingleHopResponse(status_code, headers, content)
+            return _SingleHopResponse(status_code, headers)
+        size = await _read_limited_chunks(response.aiter_bytes(), max_bytes, sink)
+    return _SingleHopResponse(status_code, headers, size)
 
 
 async def _request_one_hop_aiohttp(
@@ -291,6 +321,7 @@ async def _request_one_hop_aiohttp(
     *,
     max_bytes: int,
     allowed_addresses: tuple[str, ...],
+    sink: BodySink,
 ) -> _SingleHopResponse:
     async with client.request(
         _request_method(request),
@@ -310,12 +341,13 @@ async def _request_one_hop_aiohttp(
         )
         status_code = response.status
         if not _HTTP_SUCCESS_RANGE[0] <= status_code < _HTTP_SUCCESS_RANGE[1]:
-            return _SingleHopResponse(status_code, headers, b"")
-        content = await _read_limited_chunks(
+            return _SingleHopResponse(status_code, headers)
+        size = await _read_limited_chunks(
             response.content.iter_chunked(8192),
             max_bytes,
+            sink,
         )
-    return _SingleHopResponse(status_code, headers, content)
+    return _SingleHopResponse(status_code, headers, size)
 
 
 async def _request_one_hop_generic(
@@ -324,6 +356,7 @@ async def _request_one_hop_generic(
     *,
     max_bytes: int,
     allowed_addresses: tuple[str, ...],
+    sink: BodySink,
 ) -> _SingleHopResponse:
     response = await session.request(request)
     headers = getattr(response, "headers", None)
@@ -344,12 +377,13 @@ async def _request_one_hop_generic(
         if status_code is None:
             msg = "download response is missing a status code"
             raise UnsafeDownloadURLError(msg)
-        return _SingleHopResponse(status_code, headers, b"")
-    content = await _read_response_content(
+        return _SingleHopResponse(status_code, headers)
+    size = await _read_response_content(
         getattr(response, "content", b""),
         max_bytes,
+        sink,
     )
-    return _SingleHopResponse(status_code, headers, content)
+    return _SingleHopResponse(status_code, headers, size)
 
 
 async def _request_one_hop(
@@ -358,6 +392,7 @@ async def _request_one_hop(
     *,
     max_bytes: int,
     allowed_addresses: tuple[str, ...],
+    sink: BodySink,
 ) -> _SingleHopResponse:
     client = _session_client(session)
     if client is not None and callable(getattr(client, "stream", None)):
@@ -367,6 +402,7 @@ async def _request_one_hop(
             request,
             max_bytes=max_bytes,
             allowed_addresses=allowed_addresses,
+            sink=sink,
         )
     if client is not None and callable(getattr(client, "request", None)):
         return await _request_one_hop_aiohttp(
@@ -375,12 +411,14 @@ async def _request_one_hop(
             request,
             max_bytes=max_bytes,
             allowed_addresses=allowed_addresses,
+            sink=sink,
         )
     return await _request_one_hop_generic(
         session,
         request,
         max_bytes=max_bytes,
         allowed_addresses=allowed_addresses,
+        sink=sink,
     )
 
 
@@ -398,34 +436,151 @@ def _redirect_url(current_url: str, headers: Any) -> str:
     return next_url
 
 
-async def download_public_http_bytes(
-    url: str,
-    *,
-    max_bytes: int,
-    request_timeout: float | None = None,
-) -> bytes | None:
-    """Download bytes from a public HTTP(S) URL with size and status checks."""
+class _ByteBudget:
+    """Bytes that running downloads may receive at the same time."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.available = capacity
+        self._condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        # A single download larger than the budget waits for the whole budget.
+        size = min(size, self.capacity)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.available >= size)
+            self.available -= size
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.available += size
+                self._condition.notify_all()
+
+
+def _validate_size_limit(max_bytes: int) -> None:
     if max_bytes < 0:
         msg = "download size limit must not be negative"
         raise UnsafeDownloadURLError(msg)
-    get_session = getattr(get_driver(), "get_session", None)
-    if get_session is None:
-        return None
-    async with get_session() as session:
+
+
+class PublicHTTPDownloader:
+    """Shared downloader for user-supplied public HTTP(S) URLs.
+
+    The driver session is opened on first use and reused by every download
+    until :meth:`close`.  DNS answers are cached for ``dns_ttl_seconds``.
+    Every download reserves its ``max_bytes`` from ``byte_budget`` while it
+    receives the body, so concurrent downloads queue once the budget is
+    spent.
+    """
+
+    def __init__(
+        self,
+        *,
+        dns_ttl_seconds: float = _DNS_CACHE_TTL_SECONDS,
+        byte_budget: int = _DOWNLOAD_BYTE_BUDGET,
+    ) -> None:
+        self._dns_ttl_seconds = dns_ttl_seconds
+        self._dns_cache: dict[tuple[str, int], tuple[float, tuple[str, ...]]] = {}
+        self._budget = _ByteBudget(byte_budget)
+        self._session_lock = asyncio.Lock()
+        self._session_context: Any = None
+        self._session: Any = None
+
+    async def download_into(
+        self,
+        url: str,
+        sink: BodySink,
+        *,
+        max_bytes: int,
+        request_timeout: float | None = None,
+    ) -> int | None:
+        """Stream a body chunk by chunk into ``sink`` and return its size.
+
+        The caller owns ``sink``.  ``max_bytes`` is reserved from the byte
+        budget until the body is received.  Returns ``None`` when the driver
+        has no HTTP client.
+        """
+        _validate_size_limit(max_bytes)
+        session = await self._get_session()
+        if session is None:
+            return None
+        async with self._budget.reserve(max_bytes):
+            return await self._fetch(
+                session,
+                url,
+                sink,
+                max_bytes=max_bytes,
+                request_timeout=request_timeout,
+            )
+
+    async def close(self) -> None:
+        """Close the shared session and forget cached DNS answers."""
+        context = self._session_context
+        self._session_context = None
+        self._session = None
+        self._dns_cache.clear()
+        if context is not None:
+            await context.__aexit__(None, None, None)
+
+    async def _get_session(self) -> Any | None:
+        if self._session is not None:
+            return self._session
+        async with self._session_lock:
+            if self._session is None:
+                get_session = getattr(get_driver(), "get_session", None)
+                if get_session is None:
+                    return None
+                context = get_session()
+                self._session = await context.__aenter__()
+                self._session_context = context
+        return self._session
+
+    async def _resolve(self, hostname: str, port: int) -> tuple[str, ...]:
+        key = (hostname.lower(), port)
+        now = time.monotonic()
+        cached = self._dns_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        addresses = await resolve_host_addresses(hostname, port)
+        if addresses and self._dns_ttl_seconds > 0:
+            if len(self._dns_cache) >= _DNS_CACHE_MAX_ENTRIES:
+                self._dns_cache = {
+                    cached_key: entry
+                    for cached_key, entry in self._dns_cache.items()
+                    if entry[0] > now
+                }
+                if len(self._dns_cache) >= _DNS_CACHE_MAX_ENTRIES:
+                    del self._dns_cache[next(iter(self._dns_cache))]
+            self._dns_cache[key] = (now + self._dns_ttl_seconds, addresses)
+        return addresses
+
+    async def _fetch(
+        self,
+        session: Any,
+        url: str,
+        sink: BodySink,
+        *,
+        max_bytes: int,
+        request_timeout: float | None,
+    ) -> int:
         current_url = url
         for redirect_count in range(_MAX_REDIRECTS + 1):
-            _, allowed_addresses = await _validate_and_resolve_http_url(current_url)
+            parsed, port = _parse_http_url(current_url)
+            allowed_addresses = await self._resolve(parsed.hostname or "", port)
+            _validate_public_addresses(allowed_addresses)
             request = Request("GET", current_url, timeout=request_timeout)
             response = await _request_one_hop(
                 session,
                 request,
                 max_bytes=max_bytes,
                 allowed_addresses=allowed_addresses,
+                sink=sink,
             )
             if response.status_code in _REDIRECT_STATUSES:
                 if redirect_count >= _MAX_REDIRECTS:
-                    msg = "too many redirects while downloading image"
-                    raise UnsafeDownloadURLError(msg)
+                    break
                 current_url = _redirect_url(current_url, response.headers)
                 continue
             if (
@@ -435,5 +590,19 @@ async def download_public_http_bytes(
             ):
                 msg = "image download failed"
                 raise UnsafeDownloadURLError(msg)
-            return response.content
-    return None
+            return response.size
+        msg = "too many redirects while downloading image"
+        raise UnsafeDownloadURLError(msg)
+
+
+_downloader = PublicHTTPDownloader()
+
+
+def get_public_http_downloader() -> PublicHTTPDownloader:
+    """Return the process-wide downloader."""
+    return _downloader
+
+
+async def close_public_http_downloader() -> None:
+    """Close the process-wide downloader's session at shutdown."""
+    await _downloader.close()
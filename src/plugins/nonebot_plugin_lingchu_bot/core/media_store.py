@@ -0,0 +1,243 @@
+"""Content-addressed on-disk cache for media handed to protocol implementations.
+
+Files live under ``cache_dir/media`` and are named by the SHA-256 of their
+content, so the same image sent twice is stored once.  URL downloads are
+hashed while they stream to disk, and each URL is remembered for
+``_URL_INDEX_TTL_SECONDS`` so a repeated URL is served without a request.
+Once the directory holds more than ``media_cache_max_bytes`` the least
+recently used files are removed.  A hit refreshes the file's modification
+time, which keeps the LRU order across restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import contextlib
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import Any
+from uuid import uuid4
+
+import aiofiles
+import aiofiles.os
+
+from .config import plugin_config
+from .http_security import get_public_http_downloader
+
+_MEDIA_DIR_NAME = "media"
+_PARTIAL_SUFFIX = ".part"
+_URL_INDEX_TTL_SECONDS = 3600.0
+_URL_INDEX_MAX_ENTRIES = 1024
+
+
+class _HashingFileSink:
+    """Write download chunks to a file while hashing them."""
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    async def write(self, chunk: bytes | bytearray | memoryview, /) -> None:
+        self.digest.update(chunk)
+        await self._handle.write(chunk)
+
+
+def _scan(root: Path) -> list[tuple[float, str, int]]:
+    """Return ``(mtime, name, size)`` of stored files, dropping stale partials."""
+    files: list[tuple[float, str, int]] = []
+    with contextlib.suppress(FileNotFoundError), os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(_PARTIAL_SUFFIX):
+                # Left behind by a download interrupted in an earlier run.
+                Path(entry.path).unlink(missing_ok=True)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+    files.sort()
+    return files
+
+
+class MediaStore:
+    """LRU-bounded, content-addressed media files in one directory.
+
+    ``max_bytes`` of ``0`` disables eviction.  The newest file is never
+    evicted, even when it alone exceeds the cap.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._urls: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently stored, as far as this process knows."""
+        return self._total_bytes
+
+    async def put_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        *,
+        suffix: str = ".png",
+    ) -> Path:
+        """Store ``data`` and return its path; existing content is not rewritten."""
+        name = f"{hashlib.sha256(data).hexdigest()}{suffix}"
+        async with self._lock:
+            path = await self._hit(name)
+        if path is not None:
+            return path
+        partial = await self._partial_path()
+        try:
+            async with aiofiles.open(partial, "wb") as handle:
+                await handle.write(data)
+            return await self._commit(partial, name, len(data))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(partial)
+            raise
+
+    async def put_url(
+        self,
+        url: str,
+        *,
+        max_bytes: int,
+        suffix: str = ".png",
+        request_timeout: float | None = None,
+    ) -> Path | None:
+        """Return the stored copy of ``url``, downloading it when unknown.
+
+        The download goes through the shared public HTTP downloader, keeps
+        its checks and reserves ``max_bytes`` from its byte budget while it
+        streams.  Returns ``None`` when the driver has no HTTP client.
+        """
+        async with self._lock:
+            path = await self._url_hit(url)
+        if path is not None:
+            return path
+        partial = await self._partial_path()
+        try:
+            async with aiofiles.open(partial, "wb") as handle:
+                sink = _HashingFileSink(handle)
+                size = await get_public_http_downloader().download_into(
+                    url,
+                    sink,
+                    max_bytes=max_bytes,
+                    request_timeout=request_timeout,
+                )
+            if size is None:
+                await aiofiles.os.remove(partial)
+                return None
+            name = f"{sink.digest.hexdigest()}{suffix}"
+            path = await self._commit(partial, name, size)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(partial)
+            raise
+        self._remember_url(url, name)
+        return path
+
+    async def _partial_path(self) -> Path:
+        async with self._lock:
+            # Scan first: the scan removes partial files it finds.
+            await self._load()
+        await aiofiles.os.makedirs(self.root, exist_ok=True)
+        return self.root / f"{uuid4().hex}{_PARTIAL_SUFFIX}"
+
+    async def _load(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            files = await asyncio.to_thread(_scan, self.root)
+            self._entries = OrderedDict((name, size) for _, name, size in files)
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    async def _hit(self, name: str) -> Path | None:
+        entries = await self._load()
+        if name not in entries:
+            return None
+        path = self.root / name
+        try:
+            await asyncio.to_thread(os.utime, path)
+        except FileNotFoundError:
+            self._forget(name)
+            return None
+        entries.move_to_end(name)
+        return path
+
+    async def _url_hit(self, url: str) -> Path | None:
+        remembered = self._urls.get(url)
+        if remembered is None:
+            return None
+        expires_at, name = remembered
+        if expires_at <= time.monotonic():
+            del self._urls[url]
+            return None
+        path = await self._hit(name)
+        if path is not None:
+            self._urls.move_to_end(url)
+        return path
+
+    async def _commit(self, partial: Path, name: str, size: int) -> Path:
+        async with self._lock:
+            path = await self._hit(name)
+            if path is not None:
+                await aiofiles.os.remove(partial)
+                return path
+            path = self.root / name
+            await aiofiles.os.replace(partial, path)
+            entries = await self._load()
+            entries[name] = size
+            self._total_bytes += size
+            await self._evict()
+        return path
+
+    async def _evict(self) -> None:
+        entries = await self._load()
+        while (
+            self.max_bytes > 0
+            and self._total_bytes > self.max_bytes
+            and len(entries) > 1
+        ):
+            name = next(iter(entries))
+            self._forget(name)
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(self.root / name)
+
+    def _forget(self, name: str) -> None:
+        if self._entries is not None and name in self._entries:
+            self._total_bytes -= self._entries.pop(name)
+        for url in [url for url, (_, stored) in self._urls.items() if stored == name]:
+            del self._urls[url]
+
+    def _remember_url(self, url: str, name: str) -> None:
+        self._urls[url] = (time.monotonic() + _URL_INDEX_TTL_SECONDS, name)
+        self._urls.move_to_end(url)
+        while len(self._urls) > _URL_INDEX_MAX_ENTRIES:
+            self._urls.popitem(last=False)
+
+
+@dataclass(slots=True)
+class _StoreState:
+    store: MediaStore | None = None
+
+
+_state = _StoreState()
+
+
+def get_media_store() -> MediaStore:
+    """Return the media store for the configured cache directory and cap."""
+    root = plugin_config.cache_dir / _MEDIA_DIR_NAME
+    max_bytes = plugin_config.media_cache_max_bytes
+    store = _state.store
+    if store is None or store.root != root or store.max_bytes != max_bytes:
+        store = MediaStore(root, max_bytes=max_bytes)
+        _state.store = store
+    return store
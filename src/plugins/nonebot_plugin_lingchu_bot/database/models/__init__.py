@@ -18,7 +18,8 @@ from .message import (
     utc_now,
 )
 from .registry import Adapter, Platform, ProtocolImplementation
-from .scheduler import ScheduledJob
+from .retention import RetentionWatermark
+from .scheduler import ScheduledJob, ScheduledJobRun
 from .subject_policy import SubjectPolicyEntry
 
 __all__ = (
@@ -35,7 +36,9 @@ __all__ = (
     "ProtocolImplementation",
     "QQOneBotV11NoneBotAuditRecord",
     "QQOneBotV11NoneBotEventRecord",
+    "RetentionWatermark",
     "ScheduledJob",
+    "ScheduledJobRun",
     "SubjectPolicyEntry",
     "utc_now",
 )
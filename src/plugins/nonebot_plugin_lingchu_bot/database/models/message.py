@@ -8,7 +8,7 @@ from nonebot import require
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import Model
-from sqlalchemy import Identity, Integer, UniqueConstraint
+from sqlalchemy import Identity, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .._dialect_compat import CompatDateTimeTZ, CompatText, compat_string
@@ -33,44 +33,46 @@ class MessageRecord(Model):
             "message_id",
             name="uq_lingchu_message_record_identity",
         ),
+        # Composite indexes follow the read paths: exact conversation pages and
+        # recall by user or by bot, each ordered by recency.  ``_expiry`` lets
+        # retention find the last expired id without reading retained rows.
+        Index(
+            "ix_lingchu_message_records_conversation_recent",
+            "bot_id",
+            "conversation_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_lingchu_message_records_user_recent", "bot_id", "user_id", "created_at"
+        ),
+        Index("ix_lingchu_message_records_bot_recent", "bot_id", "created_at"),
+        Index("ix_lingchu_message_records_expiry", "created_at", "id"),
         {"extend_existing": True},
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
-    platform_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    adapter_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    protocol_id: Mapped[str] = mapped_column(
-        compat_string(64), default="unknown", index=True
-    )
-    framework_id: Mapped[str] = mapped_column(
-        compat_string(64), default="nonebot", index=True
-    )
-    bot_id: Mapped[str] = mapped_column(compat_string(128), index=True)
-    conversation_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    user_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    message_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    event_type: Mapped[str] = mapped_column(compat_string(128), index=True)
-    event_category: Mapped[str | None] = mapped_column(compat_string(64), index=True)
-    message_type: Mapped[str | None] = mapped_column(compat_string(64), index=True)
+    platform_id: Mapped[str] = mapped_column(compat_string(64))
+    adapter_id: Mapped[str] = mapped_column(compat_string(64))
+    protocol_id: Mapped[str] = mapped_column(compat_string(64), default="unknown")
+    framework_id: Mapped[str] = mapped_column(compat_string(64), default="nonebot")
+    bot_id: Mapped[str] = mapped_column(compat_string(128))
+    conversation_id: Mapped[str | None] = mapped_column(compat_string(128))
+    user_id: Mapped[str | None] = mapped_column(compat_string(128))
+    message_id: Mapped[str | None] = mapped_column(compat_string(128))
+    event_type: Mapped[str] = mapped_column(compat_string(128))
+    event_category: Mapped[str | None] = mapped_column(compat_string(64))
+    message_type: Mapped[str | None] = mapped_column(compat_string(64))
     text_summary: Mapped[str | None] = mapped_column(CompatText)
     raw_message: Mapped[str | None] = mapped_column(CompatText)
     raw_event: Mapped[str | None] = mapped_column(CompatText)
-    process_status: Mapped[str] = mapped_column(
-        compat_string(32),
-        default="received",
-        index=True,
-    )
+    process_status: Mapped[str] = mapped_column(compat_string(32), default="received")
     exception_summary: Mapped[str | None] = mapped_column(CompatText)
-    created_at: Mapped[datetime] = mapped_column(
-        CompatDateTimeTZ,
-        default=utc_now,
-        index=True,
-    )
+    created_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ, default=utc_now)
     updated_at: Mapped[datetime] = mapped_column(
         CompatDateTimeTZ,
         default=utc_now,
         onupdate=utc_now,
-        index=True,
     )
 
 
@@ -78,26 +80,23 @@ class AuditRecord(Model):
     """Audit event for API calls and bot lifecycle events."""
 
     __tablename__ = "lingchu_audit_records"
-    __table_args__ = ({"extend_existing": True},)
+    __table_args__ = (
+        Index("ix_lingchu_audit_records_expiry", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
-    platform_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    adapter_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    protocol_id: Mapped[str | None] = mapped_column(compat_string(64), index=True)
-    framework_id: Mapped[str] = mapped_column(
-        compat_string(64), default="nonebot", index=True
-    )
-    bot_id: Mapped[str] = mapped_column(compat_string(128), index=True)
-    audit_type: Mapped[str] = mapped_column(compat_string(64), index=True)
-    event_type: Mapped[str] = mapped_column(compat_string(128), index=True)
+    platform_id: Mapped[str] = mapped_column(compat_string(64))
+    adapter_id: Mapped[str] = mapped_column(compat_string(64))
+    protocol_id: Mapped[str | None] = mapped_column(compat_string(64))
+    framework_id: Mapped[str] = mapped_column(compat_string(64), default="nonebot")
+    bot_id: Mapped[str] = mapped_column(compat_string(128))
+    audit_type: Mapped[str] = mapped_column(compat_string(64))
+    event_type: Mapped[str] = mapped_column(compat_string(128))
     data_summary: Mapped[str | None] = mapped_column(CompatText)
     result_summary: Mapped[str | None] = mapped_column(CompatText)
     exception_summary: Mapped[str | None] = mapped_column(CompatText)
-    created_at: Mapped[datetime] = mapped_column(
-        CompatDateTimeTZ,
-        default=utc_now,
-        index=True,
-    )
+    created_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ, default=utc_now)
 
 
 class QQOneBotV11NoneBotEventRecord(Model):
@@ -114,42 +113,44 @@ class QQOneBotV11NoneBotEventRecord(Model):
             "message_id",
             name="uq_lingchu_qq_ob11_nb_event_identity",
         ),
+        # Same read-path and expiry indexes as ``MessageRecord``.
+        Index(
+            "ix_lingchu_qq_ob11_nb_event_conversation_recent",
+            "bot_id",
+            "conversation_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_lingchu_qq_ob11_nb_event_user_recent", "bot_id", "user_id", "created_at"
+        ),
+        Index("ix_lingchu_qq_ob11_nb_event_bot_recent", "bot_id", "created_at"),
+        Index("ix_lingchu_qq_ob11_nb_event_expiry", "created_at", "id"),
         {"extend_existing": True},
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
-    platform_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    adapter_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    protocol_id: Mapped[str | None] = mapped_column(compat_string(64), index=True)
-    framework_id: Mapped[str] = mapped_column(
-        compat_string(64), default="nonebot", index=True
-    )
-    bot_id: Mapped[str] = mapped_column(compat_string(128), index=True)
-    conversation_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    user_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    message_id: Mapped[str | None] = mapped_column(compat_string(128), index=True)
-    event_type: Mapped[str] = mapped_column(compat_string(128), index=True)
-    event_category: Mapped[str | None] = mapped_column(compat_string(64), index=True)
-    message_type: Mapped[str | None] = mapped_column(compat_string(64), index=True)
+    platform_id: Mapped[str] = mapped_column(compat_string(64))
+    adapter_id: Mapped[str] = mapped_column(compat_string(64))
+    protocol_id: Mapped[str | None] = mapped_column(compat_string(64))
+    framework_id: Mapped[str] = mapped_column(compat_string(64), default="nonebot")
+    bot_id: Mapped[str] = mapped_column(compat_string(128))
+    conversation_id: Mapped[str | None] = mapped_column(compat_string(128))
+    user_id: Mapped[str | None] = mapped_column(compat_string(128))
+    message_id: Mapped[str | None] = mapped_column(compat_string(128))
+    event_type: Mapped[str] = mapped_column(compat_string(128))
+    event_category: Mapped[str | None] = mapped_column(compat_string(64))
+    message_type: Mapped[str | None] = mapped_column(compat_string(64))
     text_summary: Mapped[str | None] = mapped_column(CompatText)
     raw_message: Mapped[str | None] = mapped_column(CompatText)
     raw_event: Mapped[str | None] = mapped_column(CompatText)
-    process_status: Mapped[str] = mapped_column(
-        compat_string(32),
-        default="received",
-        index=True,
-    )
+    process_status: Mapped[str] = mapped_column(compat_string(32), default="received")
     exception_summary: Mapped[str | None] = mapped_column(CompatText)
-    created_at: Mapped[datetime] = mapped_column(
-        CompatDateTimeTZ,
-        default=utc_now,
-        index=True,
-    )
+    created_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ, default=utc_now)
     updated_at: Mapped[datetime] = mapped_column(
         CompatDateTimeTZ,
         default=utc_now,
         onupdate=utc_now,
-        index=True,
     )
 
 
@@ -157,23 +158,20 @@ class QQOneBotV11NoneBotAuditRecord(Model):
     """QQ OneBot V11 API and lifecycle audit event in the NoneBot partition."""
 
     __tablename__ = "lingchu_qq_onebot_v11_nonebot_audit_records"
-    __table_args__ = ({"extend_existing": True},)
+    __table_args__ = (
+        Index("ix_lingchu_qq_ob11_nb_audit_expiry", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
-    platform_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    adapter_id: Mapped[str] = mapped_column(compat_string(64), index=True)
-    protocol_id: Mapped[str | None] = mapped_column(compat_string(64), index=True)
-    framework_id: Mapped[str] = mapped_column(
-        compat_string(64), default="nonebot", index=True
-    )
-    bot_id: Mapped[str] = mapped_column(compat_string(128), index=True)
-    audit_type: Mapped[str] = mapped_column(compat_string(64), index=True)
-    event_type: Mapped[str] = mapped_column(compat_string(128), index=True)
+    platform_id: Mapped[str] = mapped_column(compat_string(64))
+    adapter_id: Mapped[str] = mapped_column(compat_string(64))
+    protocol_id: Mapped[str | None] = mapped_column(compat_string(64))
+    framework_id: Mapped[str] = mapped_column(compat_string(64), default="nonebot")
+    bot_id: Mapped[str] = mapped_column(compat_string(128))
+    audit_type: Mapped[str] = mapped_column(compat_string(64))
+    event_type: Mapped[str] = mapped_column(compat_string(128))
     data_summary: Mapped[str | None] = mapped_column(CompatText)
     result_summary: Mapped[str | None] = mapped_column(CompatText)
     exception_summary: Mapped[str | None] = mapped_column(CompatText)
-    created_at: Mapped[datetime] = mapped_column(
-        CompatDateTimeTZ,
-        default=utc_now,
-        index=True,
-    )
+    created_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ, default=utc_now)
@@ -0,0 +1,37 @@
+"""Retention sweeper progress ORM model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from nonebot import require
+
+require("nonebot_plugin_orm")
+from nonebot_plugin_orm import Model
+from sqlalchemy import Identity, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._dialect_compat import CompatDateTimeTZ, compat_string
+from .message import utc_now
+
+
+class RetentionWatermark(Model):
+    """Last primary key deleted by an unfinished retention sweep of a table."""
+
+    __tablename__ = "lingchu_retention_watermarks"
+    __table_args__ = (
+        UniqueConstraint(
+            "table_name",
+            name="uq_lingchu_retention_watermarks_table_name",
+        ),
+        {"extend_existing": True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    table_name: Mapped[str] = mapped_column(compat_string(128))
+    last_id: Mapped[int] = mapped_column(Integer)
+    updated_at: Mapped[datetime] = mapped_column(
+        CompatDateTimeTZ,
+        default=utc_now,
+        onupdate=utc_now,
+    )
@@ -1,4 +1,4 @@
-"""Persistent scheduler job ORM model."""
+"""Persistent scheduler job and run history ORM models."""
 
 from __future__ import annotations
 
@@ -8,7 +8,7 @@ from nonebot import require
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import Model
-from sqlalchemy import Identity, Integer, UniqueConstraint
+from sqlalchemy import Float, Identity, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .._dialect_compat import CompatBoolean, CompatDateTimeTZ, CompatText, compat_string
@@ -51,3 +51,22 @@ class ScheduledJob(Model):
         onupdate=utc_now,
         index=True,
     )
+
+
+class ScheduledJobRun(Model):
+    """One execution, misfire or overlap skip of a persistent scheduled job."""
+
+    __tablename__ = "lingchu_scheduled_job_runs"
+    __table_args__ = ({"extend_existing": True},)
+
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    job_id: Mapped[str] = mapped_column(compat_string(128), index=True)
+    handler_key: Mapped[str] = mapped_column(compat_string(128), index=True)
+    started_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ, index=True)
+    finished_at: Mapped[datetime] = mapped_column(CompatDateTimeTZ)
+    # 错过或因 ``max_instances`` 跳过的执行没有耗时。
+    duration_ms: Mapped[float | None] = mapped_column(Float)
+    result: Mapped[str | None] = mapped_column(CompatText)
+    exception: Mapped[str | None] = mapped_column(CompatText)
+    misfired: Mapped[bool] = mapped_column(CompatBoolean, default=False)
+    skipped: Mapped[bool] = mapped_column(CompatBoolean, default=False)
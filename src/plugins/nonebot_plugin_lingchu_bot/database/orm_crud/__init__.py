@@ -14,6 +14,8 @@ from ._base import (
 from ._bulk import (
     async_iterate_safe,
     bulk_create,
+    bulk_upsert,
+    list_ids,
     list_items,
     upsert,
 )
@@ -38,12 +40,14 @@ __all__ = (
     "_orders",
     "async_iterate_safe",
     "bulk_create",
+    "bulk_upsert",
     "count",
     "create",
     "delete",
     "exists",
     "get_one",
     "get_or_create",
+    "list_ids",
     "list_items",
     "update",
     "update_or_create",
@@ -1,9 +1,10 @@
-"""批量与 upsert 操作：bulk_create、upsert、list_items、async_iterate_safe。"""
+"""批量与 upsert 操作：bulk_create、(bulk_)upsert、list_items、async_iterate_safe。"""
 
 from __future__ import annotations
 
 from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
+from itertools import batched
 from typing import TYPE_CHECKING, Any
 
 from nonebot import require
@@ -30,6 +31,10 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
     from sqlalchemy.sql.elements import ColumnElement
 
+# 单条多行语句的绑定参数上限：低于 SQLite (>= 3.32) 的 32766 与 PostgreSQL
+# 驱动的 32767，并为显式 update_values 预留余量。
+_BULK_UPSERT_MAX_PARAMS = 32_000
+
 
 @dataclass(frozen=True)
 class UpsertSpec[T: Model]:
@@ -356,6 +361,109 @@ async def _mysql_upsert[T: Model](
     return obj
 
 
+def _dedupe_bulk_upsert_rows(
+    rows: Sequence[dict[str, Any]],
+    conflict_keys: Sequence[str],
+) -> list[dict[str, Any]]:
+    """按冲突键去重批量 upsert 行，同键保留最后一行。
+
+    PostgreSQL 不允许同一条 ``ON CONFLICT DO UPDATE`` 语句两次命中同一行，
+    因此同一批次内冲突键相同的行只保留最后写入的版本。冲突键含 ``NULL``
+    的行不会触发唯一约束冲突，原样保留。
+    """
+    keyed: dict[tuple[Any, ...], dict[str, Any]] = {}
+    unkeyed: list[dict[str, Any]] = []
+    for row in rows:
+        key = tuple(row.get(name) for name in conflict_keys)
+        if None in key:
+            unkeyed.append(row)
+        else:
+            keyed[key] = row
+    return [*keyed.values(), *unkeyed]
+
+
+async def bulk_upsert[T: Model](
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[T],
+    rows: Sequence[dict[str, Any]],
+    *,
+    conflict_fields: Sequence[str],
+    update_values: dict[str, Any] | None = None,
+) -> int:
+    """执行多行方言级 upsert（INSERT ... ON CONFLICT / ON DUPLICATE KEY）。
+
+    与 ``upsert`` 不同，本函数不使用 ``RETURNING`` 取回 ORM 对象，适用于
+    只关心写入结果的高频批量写入路径。行数超过绑定参数上限时按
+    ``_BULK_UPSERT_MAX_PARAMS`` 拆分为多条语句，仍在调用方的事务内执行。
+
+    Args:
+        session: 异步会话 / Async session.
+        model: ORM 模型类 / ORM model class.
+        rows: 插入字段字典列表，所有行字段必须一致 / Rows sharing one column set.
+        conflict_fields: 唯一冲突字段 / Conflict-target columns.
+        update_values: 冲突时更新字段；默认使用 excluded insert values。
+
+    Returns:
+        去重后提交的行数 / Number of rows submitted after in-batch dedupe.
+
+    Raises:
+        ValueError: 参数或字段非法时 / On invalid arguments or columns.
+        DatabaseError: 数据库执行失败或方言不支持时 / On DB failure.
+    """
+    if not rows:
+        return 0
+    validated_rows = [_validate_column_values(model, row) for row in rows]
+    column_names = set(validated_rows[0])
+    if any(set(row) != column_names for row in validated_rows[1:]):
+        raise ValueError("All bulk upsert rows must share the same columns")
+
+    columns = _get_column_map(model)
+    conflict_keys = _validate_upsert_conflict_target(
+        model,
+        columns,
+        conflict_fields,
+        None,
+    )
+    update_keys, explicit_update_values = _prepare_upsert_update_values(
+        model,
+        validated_rows[0],
+        conflict_keys,
+        update_values,
+    )
+    unique_rows = _dedupe_bulk_upsert_rows(validated_rows, conflict_keys)
+
+    dialect_name = _get_session_dialect_name(session)
+    chunk_size = max(1, _BULK_UPSERT_MAX_PARAMS // len(column_names))
+    for chunk in batched(unique_rows, chunk_size, strict=False):
+        if dialect_name in {"mysql", "mariadb"}:
+            insert_stmt = mysql_insert(model).values(list(chunk))
+            stmt = insert_stmt.on_duplicate_key_update(
+                **_mysql_upsert_set_values(
+                    insert_stmt, update_keys, explicit_update_values
+                )
+            )
+        else:
+            insert_stmt = _dialect_insert_statement(model, dialect_name, None).values(
+                list(chunk)
+            )
+            stmt = insert_stmt.on_conflict_do_update(
+                **_upsert_conflict_kwargs(columns, conflict_keys, None),
+                set_=_upsert_set_values(
+                    insert_stmt, update_keys, explicit_update_values
+                ),
+            )
+        try:
+            await session.execute(stmt)
+        except SQLAlchemyError as e:
+            raise DatabaseError("Bulk upsert failed") from e
+
+    try:
+        await session.flush()
+    except SQLAlchemyError as e:
+        raise DatabaseError("Bulk upsert failed") from e
+    return len(unique_rows)
+
+
 async def list_items[T: Model](
     session: AsyncSession | async_scoped_session[AsyncSession],
     model: type[T],
@@ -406,6 +514,49 @@ async def list_items[T: Model](
         raise DatabaseError("Failed to list records") from e
 
 
+async def list_ids[T: Model](
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[T],
+    filters: dict[str, Any] | None = None,
+    *,
+    conditions: Sequence[ColumnElement[bool]] | None = None,
+    limit: int = 100,
+) -> list[Any]:
+    """按主键 ``id`` 升序列出符合条件的记录 ID，不加载整行。
+
+    Args:
+        session: 异步会话 / Async session.
+        model: 带 ``id`` 主键的 ORM 模型类 / ORM model class with an ``id`` key.
+        filters: 筛选条件 / Filter conditions.
+        conditions: 额外的 SQLAlchemy 列条件 / Extra SQLAlchemy column conditions.
+        limit: 限制数量，0 表示不限 / Maximum number of ids, 0 for no limit.
+
+    Returns:
+        升序排列的 ID 列表 / Ids in ascending order.
+
+    Raises:
+        DatabaseError: 查询失败时 / On query failure.
+    """
+    cs = _combined_conditions(
+        model,
+        filters,
+        conditions,
+        require_non_empty=False,
+    )
+    id_column = _get_column_map(model)["id"]
+    try:
+        stmt = select(id_column)
+        if cs:
+            stmt = stmt.where(*cs)
+        stmt = stmt.order_by(id_column.asc())
+        if limit:
+            stmt = stmt.limit(limit)
+        res = await session.execute(stmt)
+        return list(res.scalars().all())
+    except SQLAlchemyError as e:
+        raise DatabaseError("Failed to list record ids") from e
+
+
 async def async_iterate_safe[T: Model](
     session: AsyncSession | async_scoped_session[AsyncSession],
     model: type[T],
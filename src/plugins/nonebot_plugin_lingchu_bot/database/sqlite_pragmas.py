@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Any
+import sqlite3
+from typing import TYPE_CHECKING, Any
 
 from nonebot import logger
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from .orm_crud import DatabaseError
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
 
 def _is_sqlite_connection(dbapi_connection: Any) -> bool:
@@ -35,3 +42,36 @@ def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
                 cursor.close()
             except Exception as exc:
                 logger.warning("Failed to close SQLite PRAGMA cursor: {}", exc)
+
+
+async def incremental_vacuum(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+) -> bool:
+    """Return free pages to the file system after large deletes on SQLite.
+
+    ``PRAGMA incremental_vacuum`` only shrinks databases created with
+    ``auto_vacuum=INCREMENTAL``; elsewhere it is a no-op.  Other dialects are
+    skipped.  SQLite frees one page per step of the pragma, and SQLAlchemy
+    does not read a statement without result columns, so the pragma runs on
+    the driver cursor and every row is read there.  The caller commits.
+
+    Returns:
+        Whether the pragma was executed.
+
+    Raises:
+        DatabaseError: If the pragma fails.
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        return False
+    try:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver: Any = raw_connection.driver_connection
+        cursor = await driver.execute("PRAGMA incremental_vacuum")
+        try:
+            await cursor.fetchall()
+        finally:
+            await cursor.close()
+    except (SQLAlchemyError, sqlite3.Error) as exc:
+        raise DatabaseError("Failed to run incremental vacuum") from exc
+    return True
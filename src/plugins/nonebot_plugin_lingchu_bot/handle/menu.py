@@ -8,7 +8,7 @@ from nonebot import logger, require
 
 require("nonebot_plugin_alconna")
 from nonebot_plugin_alconna import AlconnaMatcher, on_alconna
-from packaging.version import InvalidVersion, Version, parse
+from packaging.version import InvalidVersion, Version
 
 from ..core.mutable_settings import get_mutable_settings
 from ..i18n import get_configured_locale, gettext, normalize_locale
@@ -154,13 +154,8 @@ def _page_commands_from_pages(pages: tuple[MenuPage, ...]) -> tuple[MenuPage, ..
     return tuple(page for page in pages if page.command is not None)
 
 
-def _page_lookup_from_pages(pages: tuple[MenuPage, ...]) -> dict[str, MenuPage]:
-    return {page.id: page for page in _flatten_pages(pages)}
-
-
 MENU_SECTIONS: tuple[MenuSection, ...] = _sections_from_pages(MENU_PAGES)
 MENU_PAGE_COMMANDS: tuple[MenuPage, ...] = _page_commands_from_pages(MENU_PAGES)
-_MENU_PAGE_BY_ID: dict[str, MenuPage] = _page_lookup_from_pages(MENU_PAGES)
 
 
 def _menu_page_command(page: MenuPage) -> str:
@@ -265,6 +260,24 @@ _BASE_MENU_FEATURES: Final[tuple[MenuFeature, ...]] = (
         PlatformCapability.MEMBER_MODERATION,
         (MenuAvailability(QQ_PLATFORM_ID, ONEBOT_V11_ADAPTER_ID),),
     ),
+    MenuFeature(
+        "import-blocklist",
+        "import_blocklist",
+        "member-management",
+        LocalizedText("导入黑名单", "Import blocklist"),
+        LocalizedText("<文件名.csv|.jsonl>", "<file.csv|.jsonl>"),
+        PlatformCapability.MEMBER_MODERATION,
+        (MenuAvailability(QQ_PLATFORM_ID, ONEBOT_V11_ADAPTER_ID),),
+    ),
+    MenuFeature(
+        "export-blocklist",
+        "export_blocklist",
+        "member-management",
+        LocalizedText("导出黑名单", "Export blocklist"),
+        LocalizedText("[文件名.csv|.jsonl]", "[file.csv|.jsonl]"),
+        PlatformCapability.MEMBER_MODERATION,
+        (MenuAvailability(QQ_PLATFORM_ID, ONEBOT_V11_ADAPTER_ID),),
+    ),
     MenuFeature(
         "protect-member",
         "protect_member",
@@ -505,6 +518,18 @@ _BASE_MENU_FEATURES: Final[tuple[MenuFeature, ...]] = (
         PlatformCapability.MEMBER_MODERATION,
         (MenuAvailability(QQ_PLATFORM_ID, ONEBOT_V11_ADAPTER_ID),),
     ),
+    MenuFeature(
+        "mass-block",
+        "mass_block",
+        "remote-management",
+        LocalizedText("批量拉黑", "Mass block"),
+        LocalizedText(
+            "<群号|群名称列表|全部群> @用户 [时长秒数] [原因]",
+            "<group_ids|group_names|all> @user [duration seconds] [reason]",
+        ),
+        PlatformCapability.MEMBER_MODERATION,
+        (MenuAvailability(QQ_PLATFORM_ID, ONEBOT_V11_ADAPTER_ID),),
+    ),
     MenuFeature(
         "remote-announcement",
         "remote_announcement",
@@ -592,6 +617,15 @@ _BASE_MENU_FEATURES: Final[tuple[MenuFeature, ...]] = (
         PlatformCapability.APPLICATION_OPERATION,
         _QQ_BOTH,
     ),
+    MenuFeature(
+        "scheduler-stats",
+        "scheduler_stats",
+        "application-operation",
+        LocalizedText("调度统计", "Scheduler stats"),
+        LocalizedText("", ""),
+        PlatformCapability.APPLICATION_OPERATION,
+        _QQ_BOTH,
+    ),
 )
 
 _TELEGRAM_COMMAND_KEYS: Final = frozenset({
@@ -626,6 +660,202 @@ _DEFAULT_MENU_FEATURES: Final = tuple(
     for feature in _BASE_MENU_FEATURES
 )
 MENU_FEATURES: tuple[MenuFeature, ...] = _DEFAULT_MENU_FEATURES
+_MENU_COMMAND_KEYS: frozenset[str] = frozenset(
+    feature.command_key for feature in MENU_FEATURES
+)
+
+# Every text variant the renderer distinguishes: English locales and the rest.
+_MENU_LANGUAGES: Final = ("zh_CN", "en_US")
+_EMPTY_PAGE_TEXT: Final = LocalizedText("暂无可用功能", "No available features")
+_RENDER_CACHE_MAX_ENTRIES: Final = 512
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledAvailability:
+    """A :class:`MenuAvailability` with its minimum version parsed once."""
+
+    platform_id: str
+    adapter_id: str
+    implementation_name: str | None
+    protocol_version: str | None
+    requires_version: bool
+    minimum_version: Version | None
+
+    def matches(self, context: MenuRuntimeContext, version: Version | None) -> bool:
+        if (
+            self.platform_id != context.platform_id
+            or self.adapter_id != context.adapter_id
+        ):
+            return False
+        if (
+            self.protocol_version is not None
+            and self.protocol_version != context.protocol_version
+        ):
+            return False
+        if (
+            self.implementation_name is not None
+            and self.implementation_name != context.implementation_name
+        ):
+            return False
+        if not self.requires_version:
+            return True
+        return (
+            self.minimum_version is not None
+            and version is not None
+            and version >= self.minimum_version
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _MenuQuery:
+    """One render request, with the context version parsed once."""
+
+    context: MenuRuntimeContext
+    version: Version | None
+    language: str
+    allowed_command_keys: frozenset[str] | None
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledFeature:
+    """A feature's predicates plus its line per language and availability."""
+
+    command_key: str
+    platform_capability: PlatformCapability
+    availability: tuple[_CompiledAvailability, ...]
+    lines: dict[str, tuple[str, ...]]
+
+    def line(self, query: _MenuQuery) -> str | None:
+        allowed = query.allowed_command_keys
+        if allowed is not None and self.command_key not in allowed:
+            return None
+        if self.platform_capability not in query.context.platform_capabilities:
+            return None
+        for index, availability in enumerate(self.availability):
+            if availability.matches(query.context, query.version):
+                return self.lines[query.language][index]
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledPage:
+    titles: dict[str, str]
+    features: tuple[_CompiledFeature, ...]
+    children: tuple[_CompiledPage, ...]
+    subtree_features: tuple[_CompiledFeature, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledMenu:
+    pages: dict[str, _CompiledPage]
+    index: tuple[tuple[_CompiledPage, dict[str, str]], ...]
+
+
+def _compile_availability(availability: MenuAvailability) -> _CompiledAvailability:
+    minimum_version = None
+    if availability.minimum_version is not None:
+        minimum_version = _parse_version(availability.minimum_version)
+    return _CompiledAvailability(
+        platform_id=availability.platform_id,
+        adapter_id=availability.adapter_id,
+        implementation_name=availability.implementation_name,
+        protocol_version=availability.protocol_version,
+        requires_version=availability.minimum_version is not None,
+        minimum_version=minimum_version,
+    )
+
+
+def _compile_feature(feature: MenuFeature) -> _CompiledFeature | None:
+    trigger = COMMAND_TRIGGERS.get(feature.command_key)
+    if trigger is None:
+        logger.debug(f"Lingchu 菜单跳过未知命令: {feature.command_key!r}")
+        return None
+    lines: dict[str, tuple[str, ...]] = {}
+    for language in _MENU_LANGUAGES:
+        summary = _localized(feature.summary, language)
+        command = trigger.primary_for(language)
+        lines[language] = tuple(
+            _render_feature_line(
+                summary,
+                command,
+                _localized(availability.usage_override or feature.usage, language),
+            )
+            for availability in feature.availability
+        )
+    return _CompiledFeature(
+        command_key=feature.command_key,
+        platform_capability=feature.platform_capability,
+        availability=tuple(
+            _compile_availability(availability) for availability in feature.availability
+        ),
+        lines=lines,
+    )
+
+
+def _render_feature_line(summary: str, command: str, usage: str) -> str:
+    return f"- {summary}: {f'{command} {usage}'.strip()}"
+
+
+def _compile_page(
+    page: MenuPage,
+    features_by_section: dict[str, list[_CompiledFeature]],
+) -> _CompiledPage:
+    features = tuple(features_by_section.get(page.id, ()))
+    children = tuple(
+        _compile_page(child, features_by_section) for child in page.children
+    )
+    return _CompiledPage(
+        titles={
+            language: _localized(page.title, language) for language in _MENU_LANGUAGES
+        },
+        features=features,
+        children=children,
+        subtree_features=(
+            *features,
+            *(feature for child in children for feature in child.subtree_features),
+        ),
+    )
+
+
+def _compile_menu(
+    pages: tuple[MenuPage, ...],
+    features: tuple[MenuFeature, ...],
+) -> _CompiledMenu:
+    features_by_section: dict[str, list[_CompiledFeature]] = {}
+    for feature in features:
+        compiled = _compile_feature(feature)
+        if compiled is not None:
+            features_by_section.setdefault(feature.section_id, []).append(compiled)
+    compiled_pages: dict[str, _CompiledPage] = {}
+
+    def register(page: MenuPage) -> _CompiledPage:
+        compiled = _compile_page(page, features_by_section)
+        compiled_pages[page.id] = compiled
+        for child in page.children:
+            register(child)
+        return compiled
+
+    roots = {page.id: register(page) for page in pages}
+    index = tuple(
+        (
+            roots[page.id],
+            {
+                language: _render_menu_index_entry(
+                    _localized(page.title, language),
+                    _localized(page.command, language),
+                )
+                for language in _MENU_LANGUAGES
+            },
+        )
+        for page in _page_commands_from_pages(pages)
+    )
+    return _CompiledMenu(pages=compiled_pages, index=index)
+
+
+_COMPILED_MENU: _CompiledMenu | None = None
+_RENDERED_MENUS: dict[
+    tuple[str | None, MenuRuntimeContext, str, frozenset[str] | None], str
+] = {}
 
 
 def default_menu_features() -> tuple[MenuFeature, ...]:
@@ -635,17 +865,37 @@ def default_menu_features() -> tuple[MenuFeature, ...]:
 
 def set_menu_pages(pages: tuple[MenuPage, ...]) -> None:
     """Replace runtime menu pages and refresh derived lookup data."""
-    global MENU_PAGES, MENU_PAGE_COMMANDS, MENU_SECTIONS, _MENU_PAGE_BY_ID
+    global MENU_PAGES, MENU_PAGE_COMMANDS, MENU_SECTIONS
     MENU_PAGES = pages
     MENU_SECTIONS = _sections_from_pages(pages)
     MENU_PAGE_COMMANDS = _page_commands_from_pages(pages)
-    _MENU_PAGE_BY_ID = _page_lookup_from_pages(pages)
+    _recompile_menu()
 
 
 def set_menu_features(features: tuple[MenuFeature, ...]) -> None:
     """Replace runtime menu features used by renderers and permissions."""
-    global MENU_FEATURES
+    global MENU_FEATURES, _MENU_COMMAND_KEYS
     MENU_FEATURES = features
+    _MENU_COMMAND_KEYS = frozenset(feature.command_key for feature in features)
+    _recompile_menu()
+
+
+def _recompile_menu() -> None:
+    global _COMPILED_MENU
+    _COMPILED_MENU = _compile_menu(MENU_PAGES, MENU_FEATURES)
+    _RENDERED_MENUS.clear()
+
+
+def _compiled_menu() -> _CompiledMenu:
+    if _COMPILED_MENU is None:
+        _recompile_menu()
+    assert _COMPILED_MENU is not None
+    return _COMPILED_MENU
+
+
+def menu_command_keys() -> frozenset[str]:
+    """Return the command keys of the current runtime menu features."""
+    return _MENU_COMMAND_KEYS
 
 
 def render_menu(
@@ -666,15 +916,24 @@ def render_menu_index(
     allowed_command_keys: frozenset[str] | None = None,
 ) -> str:
     selected_locale = normalize_locale(locale or get_configured_locale())
-    lines = [gettext("灵初功能菜单", selected_locale)]
+    key = (None, context, selected_locale, allowed_command_keys)
+    rendered = _RENDERED_MENUS.get(key)
+    if rendered is None:
+        rendered = _render_index(context, selected_locale, allowed_command_keys)
+        _remember_rendered(key, rendered)
+    return rendered
 
-    for page in MENU_PAGE_COMMANDS:
-        if not _page_has_visible_content(page, context, allowed_command_keys):
-            continue
-        title = _localized(page.title, selected_locale)
-        command = _localized(page.command, selected_locale)
-        lines.append(_render_menu_index_entry(title, command))
 
+def _render_index(
+    context: MenuRuntimeContext,
+    locale: str,
+    allowed_command_keys: frozenset[str] | None,
+) -> str:
+    query = _menu_query(context, locale, allowed_command_keys)
+    lines = [gettext("灵初功能菜单", locale)]
+    for page, entries in _compiled_menu().index:
+        if any(feature.line(query) for feature in page.subtree_features):
+            lines.append(entries[query.language])
     return "\n".join(lines)
 
 
@@ -699,29 +958,40 @@ def render_menu_page(
     allowed_command_keys: frozenset[str] | None = None,
 ) -> str:
     selected_locale = normalize_locale(locale or get_configured_locale())
-    page = _MENU_PAGE_BY_ID[page_id]
-    lines = [_localized(page.title, selected_locale)]
-    lines.extend(
-        _render_page_body(
-            page,
-            context,
-            selected_locale,
-            allowed_command_keys=allowed_command_keys,
-            include_self_title=False,
-        )
-    )
+    key = (page_id, context, selected_locale, allowed_command_keys)
+    rendered = _RENDERED_MENUS.get(key)
+    if rendered is None:
+        page = _compiled_menu().pages[page_id]
+        rendered = _render_page(page, context, selected_locale, allowed_command_keys)
+        _remember_rendered(key, rendered)
+    return rendered
+
+
+def _render_page(
+    page: _CompiledPage,
+    context: MenuRuntimeContext,
+    locale: str,
+    allowed_command_keys: frozenset[str] | None,
+) -> str:
+    query = _menu_query(context, locale, allowed_command_keys)
+    lines = [page.titles[query.language]]
+    lines.extend(_render_page_body(page, query, include_self_title=False))
 
     if len(lines) == 1:
-        lines.append(
-            _localized(
-                LocalizedText("暂无可用功能", "No available features"),
-                selected_locale,
-            )
-        )
+        lines.append(_localized(_EMPTY_PAGE_TEXT, query.language))
 
     return "\n".join(lines)
 
 
+def _remember_rendered(
+    key: tuple[str | None, MenuRuntimeContext, str, frozenset[str] | None],
+    rendered: str,
+) -> None:
+    if len(_RENDERED_MENUS) >= _RENDER_CACHE_MAX_ENTRIES:
+        del _RENDERED_MENUS[next(iter(_RENDERED_MENUS))]
+    _RENDERED_MENUS[key] = rendered
+
+
 def default_menu_context() -> MenuRuntimeContext:
     return MenuRuntimeContext(
         platform_id=QQ_PLATFORM_ID,
@@ -755,98 +1025,43 @@ def telegram_menu_context() -> MenuRuntimeContext:
     )
 
 
-def _render_section(
-    section: MenuSection,
-    context: MenuRuntimeContext,
-    locale: str,
-    allowed_command_keys: frozenset[str] | None = None,
-) -> list[str]:
-    title = _localized(section.title, locale)
-    lines = [f"【{title}】"]
-
-    for feature in _features_for_section(section.id):
-        rendered = _render_feature(feature, context, locale, allowed_command_keys)
-        if rendered:
-            lines.append(rendered)
-
-    if len(lines) == 1:
-        return []
-    return lines
-
-
 def _render_page_body(
-    page: MenuPage,
-    context: MenuRuntimeContext,
-    locale: str,
+    page: _CompiledPage,
+    query: _MenuQuery,
     *,
-    allowed_command_keys: frozenset[str] | None,
     include_self_title: bool,
 ) -> list[str]:
     lines: list[str] = []
-    section = _render_section(
-        MenuSection(page.id, page.title),
-        context,
-        locale,
-        allowed_command_keys,
-    )
-    if section:
+    feature_lines = [line for feature in page.features if (line := feature.line(query))]
+    if feature_lines:
         if include_self_title:
-            lines.extend(("", *section))
-        else:
-            lines.extend(section[1:])
+            lines.extend(("", f"【{page.titles[query.language]}】"))
+        lines.extend(feature_lines)
 
     for child in page.children:
-        child_lines = _render_page_body(
-            child,
-            context,
-            locale,
-            allowed_command_keys=allowed_command_keys,
-            include_self_title=True,
-        )
-        if child_lines:
-            lines.extend(child_lines)
+        lines.extend(_render_page_body(child, query, include_self_title=True))
 
     return lines
 
 
-def _page_has_visible_content(
-    page: MenuPage,
+def _menu_query(
     context: MenuRuntimeContext,
-    allowed_command_keys: frozenset[str] | None = None,
-) -> bool:
-    return any(
-        _matched_availability(feature, context, allowed_command_keys)
-        for feature in _page_features(page)
+    locale: str,
+    allowed_command_keys: frozenset[str] | None,
+) -> _MenuQuery:
+    version = None
+    if context.implementation_version is not None:
+        version = _parse_version(context.implementation_version)
+    return _MenuQuery(
+        context=context,
+        version=version,
+        language=_menu_language(locale),
+        allowed_command_keys=allowed_command_keys,
     )
 
 
-def _page_features(page: MenuPage) -> Iterable[MenuFeature]:
-    yield from _features_for_section(page.id)
-    for child in page.children:
-        yield from _page_features(child)
-
-
-def _features_for_section(section_id: str) -> Iterable[MenuFeature]:
-    return (feature for feature in MENU_FEATURES if feature.section_id == section_id)
-
-
-def _render_feature(
-    feature: MenuFeature,
-    context: MenuRuntimeContext,
-    locale: str,
-    allowed_command_keys: frozenset[str] | None = None,
-) -> str:
-    availability = _matched_availability(feature, context, allowed_command_keys)
-    if availability is None:
-        return ""
-
-    command_key = feature.command_key
-    trigger = COMMAND_TRIGGERS[command_key]
-    command = trigger.primary_for(locale)
-    usage = _localized(availability.usage_override or feature.usage, locale)
-    summary = _localized(feature.summary, locale)
-    command_text = f"{command} {usage}".strip()
-    return f"- {summary}: {command_text}"
+def _menu_language(locale: str) -> str:
+    return "en_US" if locale.lower().startswith("en") else "zh_CN"
 
 
 def _localized(value: Any, locale: str) -> str:
@@ -863,56 +1078,8 @@ def _localized(value: Any, locale: str) -> str:
     return str(value)
 
 
-def _matched_availability(
-    feature: MenuFeature,
-    context: MenuRuntimeContext,
-    allowed_command_keys: frozenset[str] | None = None,
-) -> MenuAvailability | None:
-    if feature.command_key not in COMMAND_TRIGGERS:
-        logger.debug(f"Lingchu 菜单跳过未知命令: {feature.command_key!r}")
-        return None
-    if (
-        allowed_command_keys is not None
-        and feature.command_key not in allowed_command_keys
-    ):
-        return None
-    if feature.platform_capability not in context.platform_capabilities:
-        return None
-    for availability in feature.availability:
-        if _availability_matches(availability, context):
-            return availability
-    return None
-
-
-def _availability_matches(
-    availability: MenuAvailability,
-    context: MenuRuntimeContext,
-) -> bool:
-    if (
-        availability.platform_id != context.platform_id
-        or availability.adapter_id != context.adapter_id
-    ):
-        return False
-    context_values = (
-        (availability.protocol_version, context.protocol_version),
-        (availability.implementation_name, context.implementation_name),
-    )
-    if any(
-        expected is not None and expected != actual
-        for expected, actual in context_values
-    ):
-        return False
-    if availability.minimum_version is None:
-        return True
-    return context.implementation_version is not None and _version_gte(
-        context.implementation_version, availability.minimum_version
-    )
-
-
-def _version_gte(current: str, minimum: str) -> bool:
+def _parse_version(value: str) -> Version | None:
     try:
-        current_version: Version = parse(current)
-        minimum_version: Version = parse(minimum)
+        return Version(value)
     except InvalidVersion:
-        return False
-    return current_version >= minimum_version
+        return None
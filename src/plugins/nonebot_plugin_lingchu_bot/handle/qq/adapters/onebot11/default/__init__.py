@@ -4,10 +4,13 @@ from . import (
     announcement as announcement,
     block as block,
     bot_state as bot_state,
+    capabilities as capabilities,
+    group_directory as group_directory,
     handle_defaults as handle_defaults,
     kick as kick,
     lifecycle as lifecycle,
     member as member,
+    member_cache as member_cache,
     menu as menu,
     mute as mute,
     profile as profile,
@@ -12,10 +12,14 @@ from nonebot_plugin_alconna.uniseg import Image as UniImage
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session
-from packaging.version import InvalidVersion, parse
 
 from ......core.config import get_handle_config_manager
 from ......i18n import _async as _
+from ......platforms.qq.capabilities import (
+    GROUP_NOTICE,
+    NAPCAT,
+    get_onebot_capabilities,
+)
 from ....commands.announcement import (
     AnnouncementImagePath,
     _resolve_image_path,
@@ -25,27 +29,21 @@ from ....commands.common import selected_adapter_handle
 from ..napcat.announcement import send_group_notice_napcat
 from .common import check_bot_privilege
 
+_ANNOUNCEMENT_SENDERS: dict[str, Any] = {NAPCAT: send_group_notice_napcat}
 
-async def _resolve_announcement_action(bot: OneBot11) -> tuple[Any | None, str | None]:
-    version_info = await bot.get_version_info()
-    # OneBot V11 适配器解包响应，get_version_info() 直接返回 data 字段
-    data = version_info.get("data", version_info)
 
-    if data.get("protocol_version") != "v11":
+async def resolve_onebot11_announcement_action(
+    bot: OneBot11,
+) -> tuple[Any | None, str | None]:
+    """按缓存的实现能力选择群公告发送函数，返回 ``(发送函数, 错误信息)``。"""
+    capabilities = await get_onebot_capabilities(bot)
+    if capabilities.protocol_version != "v11":
         return None, await _("不支持的 OneBot 协议版本")
 
-    raw_version = data.get("app_version", "0")
-    try:
-        current_version = parse(raw_version)
-    except InvalidVersion:
-        current_version = parse("0")
-
-    app_name = data.get("app_name")
-    match app_name:
-        case "NapCat.Onebot" if current_version >= parse("4.18.0"):
-            return send_group_notice_napcat, None
-        case _:
-            return None, await _("不支持的 OneBot 版本")
+    action = _ANNOUNCEMENT_SENDERS.get(capabilities.implementation(GROUP_NOTICE) or "")
+    if action is None:
+        return None, await _("不支持的 OneBot 版本")
+    return action, None
 
 
 async def send_onebot11_group_announcement_notice(
@@ -55,12 +53,15 @@ async def send_onebot11_group_announcement_notice(
     group_id: int,
     content: str,
     image_path: AnnouncementImagePath | None,
+    action: Any | None = None,
 ) -> str | None:
-    action, error_msg = await _resolve_announcement_action(bot)
-    if error_msg is not None:
-        return error_msg
+    """发送群公告；批量发送时可传入预先解析的 ``action``。"""
     if action is None:
-        return await _("不支持的 OneBot 版本")
+        action, error_msg = await resolve_onebot11_announcement_action(bot)
+        if error_msg is not None:
+            return error_msg
+        if action is None:
+            return await _("不支持的 OneBot 版本")
 
     await action(
         content=content,
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Any
 
 from nonebot import logger, on_message, on_request, require
@@ -14,7 +15,7 @@ from nonebot_plugin_alconna.uniseg import At
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session
 
-from ......core.config import get_handle_config_manager
+from ......core.config import get_handle_config_manager, plugin_config
 from ......database.orm_crud import DatabaseError
 from ......i18n import _async as _
 from ......repositories.blocklist import (
@@ -23,12 +24,19 @@ from ......repositories.blocklist import (
     find_active_block,
     remove_block,
 )
+from ......services.blocklist_transfer import (
+    BlocklistTransferError,
+    export_blocklist,
+    import_blocklist,
+)
 from ....commands.block import (
     block_member_cmd,
     clear_blocklist_cmd,
+    export_blocklist_cmd,
     global_block_member_cmd,
     global_clear_blocklist_cmd,
     global_unblock_member_cmd,
+    import_blocklist_cmd,
     unblock_member_cmd,
 )
 from ....commands.common import selected_adapter_handle
@@ -391,6 +399,102 @@ async def onebot11_global_clear_blocklist(
     )
 
 
+_DEFAULT_EXPORT_FILE = "blocklist.csv"
+
+
+def _blocklist_transfer_path(file: str) -> Path | None:
+    """Resolve a chat-supplied file name inside ``<data_dir>/blocklist``."""
+    name = file.strip()
+    if not name or name.startswith(".") or Path(name).name != name:
+        return None
+    return plugin_config.data_dir / "blocklist" / name
+
+
+@selected_adapter_handle(import_blocklist_cmd, "~onebot.v11", "import_blocklist")
+async def onebot11_import_blocklist(
+    file: str,
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+) -> Any:
+    path = _blocklist_transfer_path(file)
+    if path is None:
+        return await import_blocklist_cmd.finish(
+            message=(await _("无效的黑名单文件名: {file}")).format(file=file)
+        )
+    if not path.is_file():
+        return await import_blocklist_cmd.finish(
+            message=(await _("未找到黑名单文件: {file}")).format(file=path.name)
+        )
+    try:
+        # 导入到当前 Bot，忽略文件中的平台与 Bot 标识
+        imported = await import_blocklist(
+            path,
+            {
+                "platform_id": QQ_PLATFORM_ID,
+                "adapter_id": ONEBOT_V11_ADAPTER_ID,
+                "bot_id": bot_id(bot),
+            },
+        )
+    except BlocklistTransferError as error:
+        return await import_blocklist_cmd.finish(
+            message=(await _("导入黑名单失败: {error}")).format(error=error)
+        )
+    except DatabaseError as error:
+        return await _finish_database_error(
+            import_blocklist_cmd, await _("导入黑名单"), error
+        )
+
+    # 记录审计
+    await record_audit_fire_and_forget(
+        bot, event, CommandAudit(action="import_blocklist", reason=path.name)
+    )
+
+    message = (await _("已导入黑名单: \n文件: {file}\n写入记录: {count}")).format(
+        file=path.name, count=imported
+    )
+    logger.info(message)
+    return await import_blocklist_cmd.finish(message=message)
+
+
+@selected_adapter_handle(export_blocklist_cmd, "~onebot.v11", "export_blocklist")
+async def onebot11_export_blocklist(
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+    file: str | None = None,
+) -> Any:
+    path = _blocklist_transfer_path(file or _DEFAULT_EXPORT_FILE)
+    if path is None:
+        return await export_blocklist_cmd.finish(
+            message=(await _("无效的黑名单文件名: {file}")).format(file=file)
+        )
+    try:
+        exported = await export_blocklist(
+            path,
+            platform_id=QQ_PLATFORM_ID,
+            adapter_id=ONEBOT_V11_ADAPTER_ID,
+            bot_id=bot_id(bot),
+        )
+    except BlocklistTransferError as error:
+        return await export_blocklist_cmd.finish(
+            message=(await _("导出黑名单失败: {error}")).format(error=error)
+        )
+    except DatabaseError as error:
+        return await _finish_database_error(
+            export_blocklist_cmd, await _("导出黑名单"), error
+        )
+
+    # 记录审计
+    await record_audit_fire_and_forget(
+        bot, event, CommandAudit(action="export_blocklist", reason=path.name)
+    )
+
+    message = (await _("已导出黑名单: \n文件: {file}\n导出记录: {count}")).format(
+        file=path.name, count=exported
+    )
+    logger.info(message)
+    return await export_blocklist_cmd.finish(message=message)
+
+
 @blocklisted_message.handle()
 async def onebot11_kick_blocklisted_message(
     bot: OneBot11Bot,
@@ -0,0 +1,39 @@
+"""OneBot V11 实现能力缓存的填充与失效。
+
+协议端只有在重连时才可能更换实现或版本，因此连接建立时查询一次
+``get_version_info`` 并缓存，连接断开时丢弃。
+"""
+
+from nonebot import get_driver, logger
+from nonebot.adapters import Bot
+from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
+from nonebot.adapters.onebot.v11.exception import (
+    ActionFailed as OneBot11ActionFailed,
+    NetworkError as OneBot11NetworkError,
+)
+
+from ......platforms.qq.capabilities import (
+    invalidate_onebot_capabilities,
+    load_onebot_capabilities,
+)
+
+driver = get_driver()
+
+
+@driver.on_bot_connect
+async def load_capabilities_on_connect(bot: Bot) -> None:
+    """连接建立时预先缓存实现能力；失败时留待首次使用再查询。"""
+    if not isinstance(bot, OneBot11Bot):
+        return
+    # 重连前的旧缓存（或进行中的查询）可能来自另一个实现
+    invalidate_onebot_capabilities(str(bot.self_id))
+    try:
+        await load_onebot_capabilities(bot)
+    except (OneBot11ActionFailed, OneBot11NetworkError, TypeError, ValueError) as e:
+        logger.debug(f"Lingchu 获取 OneBot 实现信息失败: {e!r}")
+
+
+@driver.on_bot_disconnect
+async def clear_capabilities_on_disconnect(bot: Bot) -> None:
+    """断开期间协议端可能升级或更换实现，重连后重新查询。"""
+    invalidate_onebot_capabilities(str(bot.self_id))
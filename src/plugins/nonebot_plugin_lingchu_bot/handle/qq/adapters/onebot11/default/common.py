@@ -23,6 +23,10 @@ from ......core.config import plugin_config
 from ......database.orm_crud import DatabaseError
 from ......i18n import _async as _
 from ......permissions.subject_policy import find_active_subject_policy
+from ......platforms.qq.member_cache import (
+    get_bot_member_info,
+    get_group_member_info,
+)
 from ......repositories import permissions as permission_repo
 from ......repositories.blocklist import (
     BlocklistUpsert,
@@ -52,6 +56,7 @@ class CommandAudit:
     reason: str | None = None
     duration: int | None = None
     group_id: int | None = None
+    result: str | None = None
 
 
 async def target_user_onebot11(
@@ -67,9 +72,7 @@ async def target_user_onebot11(
         return target_user_id, user.display
 
     try:
-        member_info = await bot.get_group_member_info(
-            group_id=event.group_id, user_id=target_user_id
-        )
+        member_info = await get_group_member_info(bot, event.group_id, target_user_id)
         name = member_info.get("card") or member_info.get("nickname") or ""
         if name:
             return target_user_id, str(name)
@@ -99,9 +102,7 @@ async def resolve_user_onebot11(
     if isinstance(user, int):
         # 直接传入 user_id，尝试获取昵称
         try:
-            member_info = await bot.get_group_member_info(
-                group_id=event.group_id, user_id=user
-            )
+            member_info = await get_group_member_info(bot, event.group_id, user)
             name = member_info.get("card") or member_info.get("nickname") or ""
             return user, str(name)
         except Onebot11ActionFailed:
@@ -238,9 +239,7 @@ async def check_target_privilege(
 
     # 获取目标用户角色
     try:
-        member_info = await bot.get_group_member_info(
-            group_id=event.group_id, user_id=target_user_id, no_cache=True
-        )
+        member_info = await get_group_member_info(bot, event.group_id, target_user_id)
     except Onebot11ActionFailed:
         # 无法获取目标用户信息，允许操作（让 API 层处理）
         return True
@@ -251,9 +250,7 @@ async def check_target_privilege(
 
     # 目标是管理员或群主，检查操作者权限
     try:
-        operator_info = await bot.get_group_member_info(
-            group_id=event.group_id, user_id=event.user_id, no_cache=True
-        )
+        operator_info = await get_group_member_info(bot, event.group_id, event.user_id)
     except Onebot11ActionFailed:
         await cmd_matcher.finish(await _("无法验证操作权限"))
         return False
@@ -326,9 +323,7 @@ async def check_bot_privilege(
 ) -> bool:
     """检查机器人是否在目标群中具有管理员/群主权限。返回 True 表示通过检查。"""
     try:
-        bot_info = await bot.get_group_member_info(
-            group_id=group_id, user_id=int(bot.self_id), no_cache=True
-        )
+        bot_info = await get_bot_member_info(bot, group_id)
     except (Onebot11ActionFailed, ValueError, TypeError):
         await cmd_matcher.finish(await _("机器人缺少管理员权限"))
         return False
@@ -370,7 +365,7 @@ async def record_command_audit(
                     bot_id=bot_id(bot),
                     api_name=f"command:{audit.action}",
                     data_summary=data_summary,
-                    result_summary="success",
+                    result_summary=audit.result or "success",
                     exception_summary=None,
                     audit_type="command",
                 ),
@@ -409,11 +404,12 @@ async def record_audit_fire_and_forget(
 ) -> None:
     """异步记录审计日志（fire-and-forget 模式）。
 
-    封装 fire_and_forget + record_command_audit 的常用模式。
+    通过有界的 audit 后台通道提交 record_command_audit；通道满时丢弃。
     """
-    from ......core.async_utils import fire_and_forget
+    from ......core.async_utils import AUDIT_LANE, submit_background
 
-    fire_and_forget(
+    submit_background(
+        AUDIT_LANE,
         record_command_audit(
             bot,
             event,
@@ -0,0 +1,35 @@
+"""OneBot V11 群列表缓存失效。
+
+机器人自身入群或退群（含被踢、解散）会改变 ``get_group_list`` 的结果，
+因此在匹配器运行前丢弃该 bot 的群列表缓存。
+"""
+
+from nonebot import get_driver
+from nonebot.adapters import Bot
+from nonebot.adapters.onebot.v11.event import (
+    GroupDecreaseNoticeEvent as OneBot11GroupDecreaseNoticeEvent,
+    GroupIncreaseNoticeEvent as OneBot11GroupIncreaseNoticeEvent,
+)
+from nonebot.message import event_preprocessor
+
+from ......platforms.qq.group_directory import invalidate_group_directory
+
+# 普通联合类型（而非 ``type`` 语句）：NoneBot 依据注解筛选事件类型。
+GroupMembershipNotice = (
+    OneBot11GroupDecreaseNoticeEvent | OneBot11GroupIncreaseNoticeEvent
+)
+
+driver = get_driver()
+
+
+@event_preprocessor
+async def invalidate_group_directory_on_notice(event: GroupMembershipNotice) -> None:
+    """机器人自身入群或退群时丢弃其群列表缓存。"""
+    if event.user_id == event.self_id:
+        invalidate_group_directory(str(event.self_id))
+
+
+@driver.on_bot_disconnect
+async def clear_group_directory_on_disconnect(bot: Bot) -> None:
+    """连接断开期间的入群/退群不会收到通知，重连后重新拉取。"""
+    invalidate_group_directory(str(bot.self_id))
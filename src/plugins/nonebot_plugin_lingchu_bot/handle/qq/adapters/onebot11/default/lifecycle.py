@@ -16,11 +16,17 @@ from ......services.protocol_restart_feedback import (
     clear_pending_restart_feedback_for,
     register_pending_restart_feedback,
 )
+from ......services.scheduler_history import (
+    JobRunStats,
+    job_run_stats,
+    recent_job_runs,
+)
 from ....commands.common import selected_adapter_handle
 from ....commands.lifecycle import (
     quit_group_cmd,
     reset_runtime_config_cmd,
     restart_protocol_endpoint_cmd,
+    scheduler_stats_cmd,
 )
 
 _CURRENT_PLATFORM_ALIASES = {
@@ -111,3 +117,43 @@ async def onebot11_reset_runtime_config(
     del bot, event, session
     await reload_runtime_configs_from_disk()
     return await reset_runtime_config_cmd.finish(await _("灵初配置已从磁盘重置"))
+
+
+def _format_duration_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f} ms"
+
+
+async def _format_scheduler_stats(stats: list[JobRunStats], total: int) -> str:
+    header = await _("调度任务统计（最近 {total} 条记录）：")
+    line = await _(
+        "{handler_key}：执行 {runs} 次，p50 {p50}，p95 {p95}，"
+        "失败 {failures}，错过 {misfires}，跳过 {skips}"
+    )
+    lines = [header.format(total=total)]
+    lines.extend(
+        line.format(
+            handler_key=item.handler_key,
+            runs=item.runs,
+            p50=_format_duration_ms(item.p50_ms),
+            p95=_format_duration_ms(item.p95_ms),
+            failures=item.failures,
+            misfires=item.misfires,
+            skips=item.skips,
+        )
+        for item in stats
+    )
+    return "\n".join(lines)
+
+
+@selected_adapter_handle(scheduler_stats_cmd, "~onebot.v11", "scheduler_stats")
+async def onebot11_scheduler_stats(
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+    session: async_scoped_session,
+) -> Any:
+    del bot, event, session
+    stats = job_run_stats()
+    if not stats:
+        return await scheduler_stats_cmd.finish(await _("暂无调度任务执行记录"))
+    message = await _format_scheduler_stats(stats, len(recent_job_runs()))
+    return await scheduler_stats_cmd.finish(message)
@@ -0,0 +1,47 @@
+"""OneBot V11 群成员信息缓存失效。
+
+群管理员变动、成员增减与禁言通知会改变 ``get_group_member_info`` 的结果，
+因此在匹配器运行前丢弃对应缓存，保证同一事件中的处理器读到新数据。
+通知对象是 bot 自身或全体（``user_id == 0``）时丢弃整个群的缓存。
+"""
+
+from nonebot import get_driver
+from nonebot.adapters import Bot
+from nonebot.adapters.onebot.v11.event import (
+    GroupAdminNoticeEvent as OneBot11GroupAdminNoticeEvent,
+    GroupBanNoticeEvent as OneBot11GroupBanNoticeEvent,
+    GroupDecreaseNoticeEvent as OneBot11GroupDecreaseNoticeEvent,
+    GroupIncreaseNoticeEvent as OneBot11GroupIncreaseNoticeEvent,
+)
+from nonebot.message import event_preprocessor
+
+from ......platforms.qq.member_cache import (
+    clear_member_cache,
+    invalidate_group_member,
+)
+
+# 普通联合类型（而非 ``type`` 语句）：NoneBot 依据注解筛选事件类型。
+MemberChangeNotice = (
+    OneBot11GroupAdminNoticeEvent
+    | OneBot11GroupBanNoticeEvent
+    | OneBot11GroupDecreaseNoticeEvent
+    | OneBot11GroupIncreaseNoticeEvent
+)
+
+driver = get_driver()
+
+
+@event_preprocessor
+async def invalidate_member_cache_on_notice(event: MemberChangeNotice) -> None:
+    """成员变动通知到达时丢弃对应的群成员缓存。"""
+    bot_id = str(event.self_id)
+    if event.user_id in (0, event.self_id):
+        invalidate_group_member(bot_id, event.group_id)
+    else:
+        invalidate_group_member(bot_id, event.group_id, event.user_id)
+
+
+@driver.on_bot_disconnect
+async def clear_member_cache_on_disconnect(bot: Bot) -> None:
+    """连接断开期间的变动不会收到通知，重连后重新查询。"""
+    clear_member_cache(str(bot.self_id))
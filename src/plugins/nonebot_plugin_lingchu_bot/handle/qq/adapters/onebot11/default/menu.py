@@ -4,15 +4,17 @@ from nonebot import logger, require
 from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
 from nonebot.adapters.onebot.v11.event import Event as OneBot11Event
 from nonebot.adapters.onebot.v11.exception import ActionFailed as OneBot11ActionFailed
+from nonebot.typing import T_State
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session
 
 from ......permissions import allowed_command_keys
+from ......platforms.qq.capabilities import get_onebot_capabilities
 from .....menu import (
-    MENU_FEATURES,
     ONEBOT_V11_ADAPTER_ID,
     menu_cmd,
+    menu_command_keys,
     menu_page_cmds,
     qq_menu_context,
     render_menu_index,
@@ -27,10 +29,11 @@ onebot11_menu_pages: dict[str, Any] = {}
 async def onebot11_menu(
     bot: OneBot11Bot,
     session: async_scoped_session,
+    state: T_State,
     _event: OneBot11Event | None = None,
 ) -> Any:
     context = await _onebot11_menu_context(bot)
-    allowed = await _allowed_menu_keys(session, bot, _event)
+    allowed = await _allowed_menu_keys(session, bot, _event, state)
     return await menu_cmd.finish(
         message=render_menu_index(context, allowed_command_keys=allowed)
     )
@@ -43,10 +46,11 @@ def _register_onebot11_menu_page(page_id: str) -> None:
     async def onebot11_menu_page(
         bot: OneBot11Bot,
         session: async_scoped_session,
+        state: T_State,
         _event: OneBot11Event | None = None,
     ) -> Any:
         context = await _onebot11_menu_context(bot)
-        allowed = await _allowed_menu_keys(session, bot, _event)
+        allowed = await _allowed_menu_keys(session, bot, _event, state)
         return await command.finish(
             message=render_menu_page(page_id, context, allowed_command_keys=allowed)
         )
@@ -60,36 +64,30 @@ for _page_id in menu_page_cmds:
 
 async def _onebot11_menu_context(bot: OneBot11Bot) -> Any:
     try:
-        version_info = await bot.get_version_info()
+        capabilities = await get_onebot_capabilities(bot)
     except (OneBot11ActionFailed, RuntimeError, TypeError, ValueError) as error:
-        data: dict[str, Any] = {}
         logger.debug(f"Lingchu 获取 OneBot 实现信息失败: {error!r}")
-    else:
-        data = version_info.get("data", version_info)
+        return qq_menu_context(adapter_id=ONEBOT_V11_ADAPTER_ID)
 
     return qq_menu_context(
         adapter_id=ONEBOT_V11_ADAPTER_ID,
-        implementation_name=_string_or_none(data.get("app_name")),
-        implementation_version=_string_or_none(data.get("app_version")),
-        protocol_version=_string_or_none(data.get("protocol_version")),
+        implementation_name=capabilities.app_name,
+        implementation_version=capabilities.app_version,
+        protocol_version=capabilities.protocol_version,
     )
 
 
-def _string_or_none(value: Any) -> str | None:
-    if value is None:
-        return None
-    return str(value)
-
-
 async def _allowed_menu_keys(
     session: async_scoped_session,
     bot: OneBot11Bot,
     event: OneBot11Event | None,
+    state: T_State | None = None,
 ) -> frozenset[str] | None:
     if event is None:
         return None
-    command_keys = frozenset(feature.command_key for feature in MENU_FEATURES)
-    return await allowed_command_keys(session, bot, event, command_keys)
+    return await allowed_command_keys(
+        session, bot, event, menu_command_keys(), state=state
+    )
 
 
 async def import_handle() -> Any:
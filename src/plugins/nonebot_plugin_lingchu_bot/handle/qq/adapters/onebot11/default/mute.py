@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-import json
 from typing import Any
 
 from nonebot import logger, require
@@ -19,6 +18,7 @@ from ......core.config import get_handle_config_manager, plugin_config
 from ......core.handle_default_values import update_handle_default
 from ......i18n import _async as _
 from ......permissions.subject_policy import find_active_subject_policy
+from ......platforms.qq.member_cache import get_group_member_info
 from ......repositories import message_store as message_repository
 from ....commands.common import selected_adapter_handle
 from ....commands.mute import (
@@ -126,11 +126,7 @@ async def _can_recall_sender(
     if await _is_recall_protected_target(session, bot, event, sender_id):
         return False
     try:
-        member_info = await bot.get_group_member_info(
-            group_id=event.group_id,
-            user_id=sender_id,
-            no_cache=True,
-        )
+        member_info = await get_group_member_info(bot, event.group_id, sender_id)
     except OneBot11ActionFailed:
         return True
     return member_info.get("role", "member") not in ("admin", "owner")
@@ -140,54 +136,6 @@ def _candidate_fetch_limit(count: int) -> int:
     return min(max(count * 5, count + 20), 500)
 
 
-def _record_conversation_id(record: Any) -> str | None:
-    value = getattr(record, "conversation_id", None)
-    return value if isinstance(value, str) else None
-
-
-def _record_raw_event(record: Any) -> dict[str, Any] | None:
-    raw_event = getattr(record, "raw_event", None)
-    if not isinstance(raw_event, str):
-        return None
-    try:
-        parsed = json.loads(raw_event)
-    except json.JSONDecodeError:
-        return None
-    return parsed if isinstance(parsed, dict) else None
-
-
-def _record_belongs_to_group(record: Any, group_id: int) -> bool:
-    group_id_text = str(group_id)
-    conversation_id = _record_conversation_id(record)
-    if conversation_id == group_id_text:
-        return True
-    if conversation_id is not None and conversation_id.startswith(
-        f"group_{group_id_text}_"
-    ):
-        return True
-    raw_event = _record_raw_event(record)
-    if raw_event is None:
-        return False
-    return _message_id_int(raw_event.get("group_id")) == group_id
-
-
-def _merge_recall_candidates(
-    *record_groups: list[Any],
-    group_id: int,
-) -> list[Any]:
-    records: list[Any] = []
-    seen: set[str] = set()
-    for group in record_groups:
-        for record in group:
-            message_id = getattr(record, "message_id", None)
-            key = str(message_id) if message_id is not None else f"id:{id(record)}"
-            if key in seen or not _record_belongs_to_group(record, group_id):
-                continue
-            seen.add(key)
-            records.append(record)
-    return records
-
-
 async def _list_recall_candidate_records(
     session: async_scoped_session,
     bot: OneBot11Bot,
@@ -196,28 +144,14 @@ async def _list_recall_candidate_records(
     target_user_id: int | None,
     recall_count: int,
 ) -> list[Any]:
-    fetch_limit = _candidate_fetch_limit(recall_count)
-    common_filters: dict[str, Any] = {
-        "platform_id": "qq",
-        "adapter_id": "~onebot.v11",
-        "bot_id": bot_id(bot),
-        "user_id": str(target_user_id) if target_user_id is not None else None,
-    }
-    broad_records = await message_repository.list_recent_messages(
-        session,
-        **common_filters,
-        limit=min(fetch_limit * 2, 500),
-    )
-    group_records = await message_repository.list_recent_messages(
+    return await message_repository.list_recent_messages(
         session,
-        **common_filters,
-        conversation_id=str(event.group_id),
-        limit=fetch_limit,
-    )
-    return _merge_recall_candidates(
-        broad_records,
-        group_records,
-        group_id=event.group_id,
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        bot_id=bot_id(bot),
+        conversation_id=message_repository.group_conversation_id(event.group_id),
+        user_id=str(target_user_id) if target_user_id is not None else None,
+        limit=_candidate_fetch_limit(recall_count),
     )
 
 
@@ -12,10 +12,14 @@ from nonebot_plugin_alconna.uniseg import Image as UniImage
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session
-from packaging.version import InvalidVersion, parse
 
 from ......core.config import get_handle_config_manager
 from ......i18n import _async as _
+from ......platforms.qq.capabilities import (
+    GROUP_PORTRAIT,
+    NAPCAT,
+    get_onebot_capabilities,
+)
 from ....commands.common import selected_adapter_handle
 from ....commands.profile import (
     _resolve_image_path,
@@ -85,38 +89,19 @@ async def onebot11_set_group_avatar(
     if image_path is None:
         return await set_group_avatar_cmd.finish(await _("请上传一张图片"))
 
-    # 2. 获取版本信息
+    # 2. 按缓存的实现能力选择对应的实现
     try:
-        version_info = await bot.get_version_info()
-        # OneBot V11 适配器解包响应，get_version_info() 直接返回 data 字段
-        data = version_info.get("data", version_info)
-        app_name = data.get("app_name")
-        raw_version = data.get("app_version", "0")
-        try:
-            current_version = parse(raw_version)
-        except InvalidVersion:
-            current_version = parse("0")
-
-        # 3. 选择对应的实现
-        match app_name:
-            case "NapCat.Onebot" if current_version >= parse("4.18.0"):
-
-                async def _set_portrait() -> None:
-                    await set_group_portrait_napcat(
-                        image_path=image_path, bot=bot, event=event
-                    )
-
-                action = _set_portrait
-            case _:
-                return await set_group_avatar_cmd.finish(
-                    await _("当前 OneBot 实现不支持设置群头像")
-                )
-
-        # 4. 执行设置头像操作
-        await action()
+        capabilities = await get_onebot_capabilities(bot)
+        if capabilities.implementation(GROUP_PORTRAIT) != NAPCAT:
+            return await set_group_avatar_cmd.finish(
+                await _("当前 OneBot 实现不支持设置群头像")
+            )
+
+        # 3. 执行设置头像操作
+        await set_group_portrait_napcat(image_path=image_path, bot=bot, event=event)
     except OneBot11ActionFailed as e:
         logger.error(f"设置群头像失败，操作被拒绝: {e!r}")
         return await set_group_avatar_cmd.finish(await _("设置群头像失败，操作被拒绝"))
 
-    # 5. 反馈结果
+    # 4. 反馈结果
     return await set_group_avatar_cmd.finish(await _("群头像已更新"))
@@ -27,6 +27,7 @@ require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session, get_session
 
 from ......permissions.subject_policy import find_active_subject_policy
+from ......platforms.qq.member_cache import get_bot_member_info
 from .common import (
     ONEBOT_V11_ADAPTER_ID,
     QQ_PLATFORM_ID,
@@ -98,9 +99,10 @@ def _fire_protect_restore_audit(
     operator_id: int,
     duration: int,
 ) -> None:
-    from ......core.async_utils import fire_and_forget
+    from ......core.async_utils import AUDIT_LANE, submit_background
 
-    fire_and_forget(
+    submit_background(
+        AUDIT_LANE,
         _record_protect_restore_audit(bot, group_id, user_id, operator_id, duration),
         name="audit:protect_auto_unmute",
     )
@@ -114,11 +116,7 @@ async def _is_whole_group_muted(bot: OneBot11Bot, group_id: int) -> bool:
     后续 ``set_group_ban`` 的 API 结果兜底。
     """
     try:
-        bot_info = await bot.get_group_member_info(
-            group_id=group_id,
-            user_id=int(bot.self_id),
-            no_cache=True,
-        )
+        bot_info = await get_bot_member_info(bot, group_id)
     except (OneBot11ActionFailed, ValueError, TypeError):
         return False
     shut_up_timestamp = bot_info.get("shut_up_timestamp", 0)
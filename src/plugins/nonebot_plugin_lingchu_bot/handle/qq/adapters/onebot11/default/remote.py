@@ -9,7 +9,10 @@ from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
 from nonebot.adapters.onebot.v11.event import (
     GroupMessageEvent as OneBot11GroupMessageEvent,
 )
-from nonebot.adapters.onebot.v11.exception import ActionFailed as OneBot11ActionFailed
+from nonebot.adapters.onebot.v11.exception import (
+    ActionFailed as OneBot11ActionFailed,
+    NetworkError as OneBot11NetworkError,
+)
 
 require("nonebot_plugin_alconna")
 from nonebot_plugin_alconna.uniseg import At, Image as UniImage
@@ -21,7 +24,16 @@ from ......core.config import get_handle_config_manager, plugin_config
 from ......database.orm_crud import DatabaseError
 from ......i18n import _async as _
 from ......permissions.subject_policy import find_active_subject_policy
+from ......platforms.qq.fanout import FanoutPolicy, fan_out
+from ......platforms.qq.group_directory import GroupDirectory, get_group_directory
+from ......platforms.qq.member_cache import (
+    get_bot_member_info,
+    get_group_member_info,
+)
 from ......repositories.blocklist import (
+    BlocklistUpsert,
+    bulk_upsert_blocks,
+    expires_at_from_duration,
     find_active_block,
     remove_block,
 )
@@ -29,6 +41,7 @@ from ....commands.announcement import _resolve_image_path
 from ....commands.common import selected_adapter_handle
 from ....commands.remote import (
     mass_announcement_cmd,
+    mass_block_cmd,
     remote_announcement_cmd,
     remote_block_cmd,
     remote_kick_cmd,
@@ -38,7 +51,10 @@ from ....commands.remote import (
     remote_whole_mute_cmd,
     remote_whole_unmute_cmd,
 )
-from .announcement import send_onebot11_group_announcement_notice
+from .announcement import (
+    resolve_onebot11_announcement_action,
+    send_onebot11_group_announcement_notice,
+)
 from .common import (
     MUTE_DURATION_MAX,
     MUTE_DURATION_MIN,
@@ -60,7 +76,11 @@ from .common import (
 _MASS_TARGET_SEPARATOR = re.compile(r"[,，、;；]")
 _MASS_ALL_TARGETS = frozenset({"全部群", "所有群", "all", "*"})
 _MASS_MAX_TARGETS = 20
+_MASS_ANNOUNCEMENT_MAX_TARGETS = 100
 _MASS_CONFIRM_TARGETS = 5
+_MASS_PROGRESS_INTERVAL = 10
+_MASS_ANNOUNCEMENT_POLICY = FanoutPolicy(concurrency=4, rate=2.0, burst=4)
+_MASS_KICK_POLICY = FanoutPolicy(concurrency=4, rate=4.0, burst=4)
 
 
 @dataclass(frozen=True)
@@ -72,6 +92,15 @@ class MassAnnouncementResult:
     error: str | None = None
 
 
+@dataclass(frozen=True)
+class MassBlockResult:
+    """Result for one target group in a mass block."""
+
+    group_id: int
+    ok: bool
+    error: str | None = None
+
+
 async def _resolve_group_id(
     bot: OneBot11Bot,
     group_id: int | str,
@@ -92,26 +121,17 @@ async def _resolve_group_id(
     except (ValueError, TypeError):
         pass
 
-    # 模糊匹配群名称
-    try:
-        group_list = await bot.get_group_list()
-    except OneBot11ActionFailed:
-        await cmd_matcher.finish(await _("获取群列表失败"))
+    # 模糊匹配群名称：精确匹配优先，其次为包含关系
+    directory = await _group_directory_or_finish(bot, cmd_matcher)
+    if directory is None:
         return None
+    candidates = directory.match(group_id)
 
-    # 精确匹配优先
-    for g in group_list:
-        if g.get("group_name") == group_id:
-            return g["group_id"]
-
-    # 模糊匹配（包含关系）
-    candidates = [g for g in group_list if group_id in g.get("group_name", "")]
-
-    if len(candidates) == 1:
-        return candidates[0]["group_id"]
+    if len(candidates) == 1 or (candidates and candidates[0].group_name == group_id):
+        return candidates[0].group_id
 
     if len(candidates) > 1:
-        names = ", ".join(f"{g['group_name']}({g['group_id']})" for g in candidates[:5])
+        names = ", ".join(f"{g.group_name}({g.group_id})" for g in candidates[:5])
         await cmd_matcher.finish(
             (await _("匹配到多个群聊，请提供更精确的名称或群号: {names}")).format(
                 names=names
@@ -125,19 +145,29 @@ async def _resolve_group_id(
     return None
 
 
+async def _group_directory_or_finish(
+    bot: OneBot11Bot,
+    cmd_matcher: Any,
+) -> GroupDirectory | None:
+    try:
+        return await get_group_directory(bot)
+    except (OneBot11ActionFailed, KeyError, TypeError, ValueError):
+        await cmd_matcher.finish(await _("获取群列表失败"))
+        return None
+
+
 async def _check_bot_in_group(bot: OneBot11Bot, group_id: int) -> bool:
     """检查机器人是否在目标群聊中"""
     try:
-        group_list = await bot.get_group_list()
-        return any(g["group_id"] == group_id for g in group_list)
-    except (OneBot11ActionFailed, KeyError, TypeError):
+        return group_id in await get_group_directory(bot)
+    except (OneBot11ActionFailed, KeyError, TypeError, ValueError):
         return False
 
 
 async def _check_user_in_group(bot: OneBot11Bot, group_id: int, user_id: int) -> bool:
     """检查目标用户是否在目标群聊中"""
     try:
-        await bot.get_group_member_info(group_id=group_id, user_id=user_id)
+        await get_group_member_info(bot, group_id, user_id)
     except OneBot11ActionFailed:
         return False
     else:
@@ -235,9 +265,7 @@ async def _check_remote_target_privilege(
         return False
 
     try:
-        target_info = await bot.get_group_member_info(
-            group_id=group_id, user_id=target_user_id, no_cache=True
-        )
+        target_info = await get_group_member_info(bot, group_id, target_user_id)
     except OneBot11ActionFailed:
         return True
 
@@ -245,9 +273,7 @@ async def _check_remote_target_privilege(
         return True
 
     try:
-        operator_info = await bot.get_group_member_info(
-            group_id=group_id, user_id=event.user_id, no_cache=True
-        )
+        operator_info = await get_group_member_info(bot, group_id, event.user_id)
     except OneBot11ActionFailed:
         await cmd_matcher.finish(await _("无法验证操作权限"))
         return False
@@ -894,17 +920,10 @@ async def _resolve_all_group_ids(
     bot: OneBot11Bot,
     cmd_matcher: Any,
 ) -> list[int] | None:
-    try:
-        group_list = await bot.get_group_list()
-    except OneBot11ActionFailed:
-        await cmd_matcher.finish(await _("获取群列表失败"))
-        return None
-
-    try:
-        return _dedupe_group_ids([int(group["group_id"]) for group in group_list])
-    except (KeyError, TypeError, ValueError):
-        await cmd_matcher.finish(await _("获取群列表失败"))
+    directory = await _group_directory_or_finish(bot, cmd_matcher)
+    if directory is None:
         return None
+    return directory.group_ids()
 
 
 async def _resolve_mass_announcement_targets(
@@ -958,11 +977,7 @@ async def _check_mass_announcement_target_context(
         return await _("机器人不在目标群聊中")
 
     try:
-        bot_info = await bot.get_group_member_info(
-            group_id=group_id,
-            user_id=int(bot.self_id),
-            no_cache=True,
-        )
+        bot_info = await get_bot_member_info(bot, group_id)
     except (OneBot11ActionFailed, ValueError, TypeError):
         return await _("机器人缺少管理员权限")
 
@@ -973,6 +988,44 @@ async def _check_mass_announcement_target_context(
     return None
 
 
+async def _mass_announcement_refused(
+    group_id: int,
+    error: OneBot11ActionFailed,
+) -> MassAnnouncementResult:
+    logger.error(f"群发公告失败，目标群 {group_id} 操作被拒绝: {error!r}")
+    return MassAnnouncementResult(
+        group_id=group_id, ok=False, error=await _("操作被拒绝")
+    )
+
+
+def _format_mass_audit(
+    results: list[MassAnnouncementResult] | list[MassBlockResult],
+) -> str:
+    """将逐群结果压缩为一条审计记录的结果摘要。"""
+    return "; ".join(
+        f"{result.group_id}=ok" if result.ok else f"{result.group_id}={result.error}"
+        for result in results
+    )
+
+
+class _MassProgress:
+    """每完成 ``_MASS_PROGRESS_INTERVAL`` 个目标群回复一次进度。"""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.done = 0
+
+    async def report(self, _group_id: int, _result: MassAnnouncementResult) -> None:
+        self.done += 1
+        if self.done % _MASS_PROGRESS_INTERVAL or self.done == self.total:
+            return
+        await mass_announcement_cmd.send(
+            (await _("群发公告进度：{done}/{total}")).format(
+                done=self.done, total=self.total
+            )
+        )
+
+
 @selected_adapter_handle(
     mass_announcement_cmd,
     "~onebot.v11",
@@ -1002,63 +1055,275 @@ async def onebot11_mass_announcement(
     )
     if group_ids is None:
         return None
-    if len(group_ids) > _MASS_MAX_TARGETS:
+    if len(group_ids) > _MASS_ANNOUNCEMENT_MAX_TARGETS:
         return await mass_announcement_cmd.finish(
             (await _("群发目标超过 {limit} 个，已拒绝执行")).format(
-                limit=_MASS_MAX_TARGETS
+                limit=_MASS_ANNOUNCEMENT_MAX_TARGETS
             )
         )
     if len(group_ids) > _MASS_CONFIRM_TARGETS and targets is None:
         return await mass_announcement_cmd.finish(await _("请明确指定群发目标后重试"))
 
+    # 协议端版本对所有目标群相同，只解析一次
+    try:
+        action, action_error = await resolve_onebot11_announcement_action(bot)
+    except (OneBot11ActionFailed, OneBot11NetworkError) as error:
+        logger.error(f"群发公告失败，无法获取协议端版本: {error!r}")
+        return await mass_announcement_cmd.finish(await _("操作被拒绝"))
+    if action is None:
+        return await mass_announcement_cmd.finish(
+            action_error or await _("不支持的 OneBot 版本")
+        )
+
     image_path = await _resolve_image_path(image) if image is not None else None
-    results: list[MassAnnouncementResult] = []
 
-    for group_id in group_ids:
+    async def send(group_id: int) -> MassAnnouncementResult:
         context_error = await _check_mass_announcement_target_context(bot, group_id)
         if context_error is not None:
-            results.append(
-                MassAnnouncementResult(
-                    group_id=group_id,
-                    ok=False,
-                    error=context_error,
-                )
+            return MassAnnouncementResult(
+                group_id=group_id, ok=False, error=context_error
             )
+        error_msg = await send_onebot11_group_announcement_notice(
+            bot=bot,
+            event=event,
+            group_id=group_id,
+            content=content,
+            image_path=image_path,
+            action=action,
+        )
+        return MassAnnouncementResult(
+            group_id=group_id, ok=error_msg is None, error=error_msg
+        )
+
+    results = await fan_out(
+        bot,
+        group_ids,
+        send,
+        policy=_MASS_ANNOUNCEMENT_POLICY,
+        on_failure=_mass_announcement_refused,
+        on_result=_MassProgress(len(group_ids)).report,
+    )
+
+    await record_audit_fire_and_forget(
+        bot,
+        event,
+        CommandAudit(
+            action="mass_announcement",
+            group_id=event.group_id,
+            result=_format_mass_audit(results),
+        ),
+    )
+
+    return await mass_announcement_cmd.finish(
+        await _format_mass_announcement_summary(results)
+    )
+
+
+async def _check_mass_block_target(
+    session: async_scoped_session,
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+    group_id: int,
+    target_user_id: int,
+) -> tuple[str | None, bool]:
+    """检查单个目标群能否拉黑。
+
+    Returns:
+        ``(错误信息, 目标是否在群内)``；错误信息为 None 表示可以拉黑。
+    """
+    context_error = await _check_mass_announcement_target_context(bot, group_id)
+    if context_error is not None:
+        return context_error, False
+
+    if await _is_remote_protected_target(
+        session, bot, group_id, target_user_id, mass_block_cmd
+    ) and not await operator_is_superuser_onebot11(session, event.user_id):
+        return await _("目标用户受白名单保护，无法执行"), False
+
+    try:
+        target_info = await get_group_member_info(bot, group_id, target_user_id)
+    except OneBot11ActionFailed:
+        # 不在群内的用户仍写入黑名单，阻止其再次入群
+        return None, False
+
+    if target_info.get("role", "member") not in ("admin", "owner"):
+        return None, True
+
+    try:
+        operator_info = await get_group_member_info(bot, group_id, event.user_id)
+    except OneBot11ActionFailed:
+        operator_info = {}
+    if _operator_can_manage_privileged_target(
+        operator_info, event.user_id
+    ) or await operator_is_superuser_onebot11(session, event.user_id):
+        return None, True
+    return await _("目标用户权限过高，无法执行"), False
+
+
+async def _partition_mass_block_targets(
+    session: async_scoped_session,
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+    group_ids: list[int],
+    target_user_id: int,
+) -> tuple[list[MassBlockResult], list[int], list[int]]:
+    """将目标群分为拒绝执行、待拉黑与待踢出三类。"""
+    results: list[MassBlockResult] = []
+    blocked_groups: list[int] = []
+    kick_groups: list[int] = []
+    for group_id in group_ids:
+        error, in_group = await _check_mass_block_target(
+            session, bot, event, group_id, target_user_id
+        )
+        if error is not None:
+            results.append(MassBlockResult(group_id=group_id, ok=False, error=error))
             continue
+        blocked_groups.append(group_id)
+        if in_group:
+            kick_groups.append(group_id)
+        else:
+            results.append(MassBlockResult(group_id=group_id, ok=True))
+    return results, blocked_groups, kick_groups
+
+
+async def _mass_kick_refused(
+    group_id: int,
+    error: OneBot11ActionFailed,
+) -> MassBlockResult:
+    logger.error(f"批量拉黑踢出失败，目标群 {group_id} 操作被拒绝: {error!r}")
+    return MassBlockResult(group_id=group_id, ok=False, error=await _("操作被拒绝"))
+
+
+async def _kick_mass_block_targets(
+    bot: OneBot11Bot,
+    group_ids: list[int],
+    target_user_id: int,
+) -> list[MassBlockResult]:
+    """按 ``_MASS_KICK_POLICY`` 并发限速踢出目标用户。"""
 
-        try:
-            error_msg = await send_onebot11_group_announcement_notice(
-                bot=bot,
-                event=event,
-                group_id=group_id,
-                content=content,
-                image_path=image_path,
+    async def kick(group_id: int) -> MassBlockResult:
+        await _kick_remote_user(bot, group_id, target_user_id)
+        return MassBlockResult(group_id=group_id, ok=True)
+
+    return await fan_out(
+        bot,
+        group_ids,
+        kick,
+        policy=_MASS_KICK_POLICY,
+        on_failure=_mass_kick_refused,
+    )
+
+
+async def _format_mass_block_summary(
+    results: list[MassBlockResult],
+    target_user_id: int,
+) -> str:
+    success_groups = [result.group_id for result in results if result.ok]
+    failed_groups = [result.group_id for result in results if not result.ok]
+    message = await _(
+        "批量拉黑 {target_user_id} 完成：成功 {success_count} 个，"
+        "失败 {failure_count} 个。成功群：{success_groups}；失败群：{failed_groups}"
+    )
+    return message.format(
+        target_user_id=target_user_id,
+        success_count=len(success_groups),
+        failure_count=len(failed_groups),
+        success_groups=_format_group_id_list(success_groups),
+        failed_groups=_format_group_id_list(failed_groups),
+    )
+
+
+@selected_adapter_handle(mass_block_cmd, "~onebot.v11", "mass_block")
+async def onebot11_mass_block(
+    targets: str,
+    user: At | int,
+    bot: OneBot11Bot,
+    event: OneBot11GroupMessageEvent,
+    session: async_scoped_session,
+    duration: int | None = None,
+    reason: str | None = None,
+) -> Any:
+    """多群批量拉黑处理器。
+
+    黑名单记录以一次批量写入提交，踢人请求随后并发执行并限速。
+    """
+    config = await get_handle_config_manager().get_config("mass_block")
+    if not config.enabled:
+        return await mass_block_cmd.finish(await _("该功能已禁用"))
+    actual_duration = (
+        duration if duration is not None else config.defaults.get("block_duration")
+    )
+    default_reason_text = config.defaults.get("default_reason", "违反群规")
+
+    # 1. 解析目标群
+    group_ids = await _resolve_mass_announcement_targets(bot, targets, mass_block_cmd)
+    if group_ids is None:
+        return None
+    if len(group_ids) > _MASS_MAX_TARGETS:
+        return await mass_block_cmd.finish(
+            (await _("群发目标超过 {limit} 个，已拒绝执行")).format(
+                limit=_MASS_MAX_TARGETS
             )
-        except OneBot11ActionFailed as error:
-            logger.error(f"群发公告失败，目标群 {group_id} 操作被拒绝: {error!r}")
-            results.append(
-                MassAnnouncementResult(
+        )
+
+    # 2. 解析用户
+    try:
+        target_user_id, _target_name = await resolve_user_onebot11(user, bot, event)
+    except ValueError as e:
+        logger.warning(f"解析用户失败: {e}")
+        return await mass_block_cmd.finish(str(e))
+    if not await check_self_target(target_user_id, bot, event, mass_block_cmd, "拉黑"):
+        return None
+
+    # 3. 逐群检查上下文与目标权限
+    results, blocked_groups, kick_groups = await _partition_mass_block_targets(
+        session, bot, event, group_ids, target_user_id
+    )
+
+    # 4. 一次写入全部黑名单记录
+    reason_text = await _(default_reason_text) if reason is None else reason
+    expires_at = expires_at_from_duration(actual_duration)
+    try:
+        await bulk_upsert_blocks(
+            session,
+            [
+                BlocklistUpsert(
+                    platform_id=QQ_PLATFORM_ID,
+                    adapter_id=ONEBOT_V11_ADAPTER_ID,
+                    bot_id=bot_id(bot),
+                    scope="group",
                     group_id=group_id,
-                    ok=False,
-                    error=await _("操作被拒绝"),
+                    user_id=target_user_id,
+                    operator_id=event.user_id,
+                    reason=reason_text,
+                    expires_at=expires_at,
                 )
-            )
-            continue
-
-        if error_msg is not None:
-            results.append(
-                MassAnnouncementResult(group_id=group_id, ok=False, error=error_msg)
-            )
-            continue
+                for group_id in blocked_groups
+            ],
+        )
+        await session.commit()
+    except DatabaseError as error:
+        logger.error(f"批量拉黑失败，数据库异常: {error!r}")
+        return await mass_block_cmd.finish(await _("批量拉黑失败，数据库异常"))
 
-        results.append(MassAnnouncementResult(group_id=group_id, ok=True))
+    # 5. 并发踢出目标用户
+    results.extend(await _kick_mass_block_targets(bot, kick_groups, target_user_id))
+    results.sort(key=lambda result: group_ids.index(result.group_id))
 
+    # 6. 逐群结果合并为一条审计记录
     await record_audit_fire_and_forget(
         bot,
         event,
-        CommandAudit(action="mass_announcement", group_id=event.group_id),
+        CommandAudit(
+            action="mass_block",
+            target_user_id=target_user_id,
+            duration=actual_duration,
+            reason=reason_text,
+            group_id=event.group_id,
+            result=_format_mass_audit(results),
+        ),
     )
 
-    return await mass_announcement_cmd.finish(
-        await _format_mass_announcement_summary(results)
-    )
+    message = await _format_mass_block_summary(results, target_user_id)
+    logger.info(message)
+    return await mass_block_cmd.finish(message=message)
@@ -1,12 +1,9 @@
 from dataclasses import dataclass
-import hashlib
 from importlib import import_module
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Final
 
-import aiofiles
-import aiofiles.os
 from arclet.alconna import Alconna, Args
 from nonebot import require
 
@@ -14,8 +11,7 @@ require("nonebot_plugin_alconna")
 from nonebot_plugin_alconna import AlconnaMatcher, on_alconna
 from nonebot_plugin_alconna.uniseg import Image as UniImage
 
-from ....core.config import plugin_config
-from ....core.http_security import download_public_http_bytes
+from ....core.media_store import get_media_store
 from .triggers import COMMAND_TRIGGERS
 
 _SEND_ANNOUNCEMENT = COMMAND_TRIGGERS["send_announcement"]
@@ -29,25 +25,12 @@ class AnnouncementImagePath:
     local_path: Path
 
 
-def _announcement_image_cache_dir() -> Path:
-    return plugin_config.cache_dir / "announcement_images"
-
-
-async def _cache_image_bytes(raw_bytes: bytes) -> AnnouncementImagePath:
-    cache_dir = _announcement_image_cache_dir()
-    await aiofiles.os.makedirs(cache_dir, exist_ok=True)
-    md5 = hashlib.md5(raw_bytes).hexdigest()
-    cache_path = cache_dir / f"{md5}.png"
-    async with aiofiles.open(cache_path, "wb") as f:
-        await f.write(raw_bytes)
-    return AnnouncementImagePath(local_path=cache_path)
-
-
 async def _resolve_image_path(image: UniImage) -> AnnouncementImagePath | None:
     raw = getattr(image, "raw", None)
     if raw is not None:
-        raw_bytes = raw.getvalue() if isinstance(raw, BytesIO) else raw
-        return await _cache_image_bytes(raw_bytes)
+        raw_bytes = raw.getbuffer() if isinstance(raw, BytesIO) else raw
+        local_path = await get_media_store().put_bytes(raw_bytes)
+        return AnnouncementImagePath(local_path=local_path)
 
     path = getattr(image, "path", None)
     if path is not None:
@@ -56,12 +39,12 @@ async def _resolve_image_path(image: UniImage) -> AnnouncementImagePath | None:
 
     url = getattr(image, "url", None)
     if url is not None:
-        content = await download_public_http_bytes(
+        local_path = await get_media_store().put_url(
             str(url),
             max_bytes=_ANNOUNCEMENT_IMAGE_DOWNLOAD_MAX_BYTES,
         )
-        if content is not None:
-            return await _cache_image_bytes(content)
+        if local_path is not None:
+            return AnnouncementImagePath(local_path=local_path)
 
     return None
 
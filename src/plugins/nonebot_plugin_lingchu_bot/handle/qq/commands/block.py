@@ -17,6 +17,8 @@ _UNBLOCK_MEMBER = COMMAND_TRIGGERS["unblock_member"]
 _GLOBAL_UNBLOCK_MEMBER = COMMAND_TRIGGERS["global_unblock_member"]
 _CLEAR_BLOCKLIST = COMMAND_TRIGGERS["clear_blocklist"]
 _GLOBAL_CLEAR_BLOCKLIST = COMMAND_TRIGGERS["global_clear_blocklist"]
+_IMPORT_BLOCKLIST = COMMAND_TRIGGERS["import_blocklist"]
+_EXPORT_BLOCKLIST = COMMAND_TRIGGERS["export_blocklist"]
 
 block_member_cmd: type[AlconnaMatcher] = on_alconna(
     command=Alconna(
@@ -78,6 +80,23 @@ global_clear_blocklist_cmd: type[Matcher] = on_alconna(
     use_cmd_sep=True,
     use_cmd_start=True,
 )
+# 文件位于插件数据目录的 blocklist 子目录；后缀决定 CSV 或 JSON Lines 格式
+import_blocklist_cmd: type[AlconnaMatcher] = on_alconna(
+    command=Alconna(_IMPORT_BLOCKLIST.primary, Args["file", str]),
+    aliases=_IMPORT_BLOCKLIST.aliases,
+    priority=805,
+    block=True,
+    use_cmd_sep=True,
+    use_cmd_start=True,
+)
+export_blocklist_cmd: type[AlconnaMatcher] = on_alconna(
+    command=Alconna(_EXPORT_BLOCKLIST.primary, Args["file?", str, None]),
+    aliases=_EXPORT_BLOCKLIST.aliases,
+    priority=805,
+    block=True,
+    use_cmd_sep=True,
+    use_cmd_start=True,
+)
 
 _LAZY_EXPORTS = {
     "onebot11_block_member": "..adapters.onebot11.default.block",
@@ -86,6 +105,8 @@ _LAZY_EXPORTS = {
     "onebot11_global_unblock_member": "..adapters.onebot11.default.block",
     "onebot11_clear_blocklist": "..adapters.onebot11.default.block",
     "onebot11_global_clear_blocklist": "..adapters.onebot11.default.block",
+    "onebot11_import_blocklist": "..adapters.onebot11.default.block",
+    "onebot11_export_blocklist": "..adapters.onebot11.default.block",
     "onebot11_kick_blocklisted_message": "..adapters.onebot11.default.block",
     "onebot11_reject_blocklisted_group_request": "..adapters.onebot11.default.block",
 }
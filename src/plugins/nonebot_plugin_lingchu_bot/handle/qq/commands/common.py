@@ -6,6 +6,7 @@ from nonebot import require
 from nonebot.adapters import Bot, Event
 from nonebot.internal.matcher.matcher import Matcher, current_bot
 from nonebot.params import Depends
+from nonebot.typing import T_State
 
 require("nonebot_plugin_alconna")
 require("nonebot_plugin_orm")
@@ -92,8 +93,9 @@ def _permission_dependency(command_key: str) -> Any:
         bot: Bot,
         event: Event,
         session: async_scoped_session,
+        state: T_State,
     ) -> None:
-        decision = await check_permission(session, command_key, bot, event)
+        decision = await check_permission(session, command_key, bot, event, state=state)
         if not decision.allowed:
             await matcher.finish(await _("权限不足"))
 
@@ -1,11 +1,8 @@
-import hashlib
 from importlib import import_module
 from io import BytesIO
 from pathlib import Path
 from typing import Any
 
-import aiofiles
-import aiofiles.os
 from arclet.alconna import Alconna, Args
 from nonebot import require
 
@@ -13,8 +10,7 @@ require("nonebot_plugin_alconna")
 from nonebot_plugin_alconna import AlconnaMatcher, on_alconna
 from nonebot_plugin_alconna.uniseg import Image as UniImage
 
-from ....core.config import plugin_config
-from ....core.http_security import download_public_http_bytes
+from ....core.media_store import get_media_store
 from .triggers import COMMAND_TRIGGERS
 
 _SET_GROUP_NAME = COMMAND_TRIGGERS["set_group_name"]
@@ -27,14 +23,8 @@ async def _resolve_image_path(image: UniImage | None) -> Path | None:
         return None
     raw = getattr(image, "raw", None)
     if raw is not None:
-        raw_bytes = raw.getvalue() if isinstance(raw, BytesIO) else raw
-        cache_dir = plugin_config.cache_dir / "announcement_images"
-        await aiofiles.os.makedirs(cache_dir, exist_ok=True)
-        md5 = hashlib.md5(raw_bytes).hexdigest()
-        cache_path = cache_dir / f"{md5}.png"
-        async with aiofiles.open(cache_path, "wb") as f:
-            await f.write(raw_bytes)
-        return cache_path
+        raw_bytes = raw.getbuffer() if isinstance(raw, BytesIO) else raw
+        return await get_media_store().put_bytes(raw_bytes)
 
     path = getattr(image, "path", None)
     if path is not None:
@@ -42,18 +32,10 @@ async def _resolve_image_path(image: UniImage | None) -> Path | None:
 
     url = getattr(image, "url", None)
     if url is not None:
-        content = await download_public_http_bytes(
+        return await get_media_store().put_url(
             str(url),
             max_bytes=_AVATAR_IMAGE_DOWNLOAD_MAX_BYTES,
         )
-        if content is not None:
-            cache_dir = plugin_config.cache_dir / "announcement_images"
-            await aiofiles.os.makedirs(cache_dir, exist_ok=True)
-            md5 = hashlib.md5(content).hexdigest()
-            cache_path = cache_dir / f"{md5}.png"
-            async with aiofiles.open(cache_path, "wb") as f:
-                await f.write(content)
-            return cache_path
 
     return None
 
@@ -19,6 +19,7 @@ _REMOTE_WHOLE_UNMUTE = COMMAND_TRIGGERS["remote_whole_unmute"]
 _REMOTE_KICK = COMMAND_TRIGGERS["remote_kick"]
 _REMOTE_BLOCK = COMMAND_TRIGGERS["remote_block"]
 _REMOTE_UNBLOCK = COMMAND_TRIGGERS["remote_unblock"]
+_MASS_BLOCK = COMMAND_TRIGGERS["mass_block"]
 _REMOTE_ANNOUNCEMENT = COMMAND_TRIGGERS["remote_announcement"]
 _MASS_ANNOUNCEMENT = COMMAND_TRIGGERS["mass_announcement"]
 
@@ -117,6 +118,21 @@ remote_unblock_cmd: type[AlconnaMatcher] = on_alconna(
     use_cmd_start=True,
 )
 
+# 批量拉黑命令；目标为群号/群名称列表或“全部群”
+mass_block_cmd: type[AlconnaMatcher] = on_alconna(
+    command=Alconna(
+        _MASS_BLOCK.primary,
+        Args["targets", str]["user", At | int]["duration?", int, None][
+            "reason?", str, None
+        ],
+    ),
+    aliases=_MASS_BLOCK.aliases,
+    priority=805,
+    block=True,
+    use_cmd_sep=True,
+    use_cmd_start=True,
+)
+
 # 远程公告命令
 remote_announcement_cmd: type[AlconnaMatcher] = on_alconna(
     command=Alconna(
@@ -151,6 +167,7 @@ _LAZY_EXPORTS = {
     "onebot11_remote_kick": "..adapters.onebot11.default.remote",
     "onebot11_remote_block": "..adapters.onebot11.default.remote",
     "onebot11_remote_unblock": "..adapters.onebot11.default.remote",
+    "onebot11_mass_block": "..adapters.onebot11.default.remote",
     "onebot11_remote_announcement": "..adapters.onebot11.default.remote",
     "onebot11_mass_announcement": "..adapters.onebot11.default.remote",
 }
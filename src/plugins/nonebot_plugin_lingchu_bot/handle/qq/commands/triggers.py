@@ -358,6 +358,18 @@ _DEFAULT_COMMAND_TRIGGERS = {
         chinese_aliases=frozenset(),
         english_aliases=frozenset(),
     ),
+    "import_blocklist": CommandTrigger(
+        chinese="导入黑名单",
+        english="import-blocklist",
+        chinese_aliases=frozenset({"黑名单导入"}),
+        english_aliases=frozenset({"blocklist-import"}),
+    ),
+    "export_blocklist": CommandTrigger(
+        chinese="导出黑名单",
+        english="export-blocklist",
+        chinese_aliases=frozenset({"黑名单导出"}),
+        english_aliases=frozenset({"blocklist-export"}),
+    ),
     "protect_member": CommandTrigger(
         chinese="拉白",
         english="protect",
@@ -436,6 +448,12 @@ _DEFAULT_COMMAND_TRIGGERS = {
         chinese_aliases=frozenset({"跨群删黑", "远程删除黑名单"}),
         english_aliases=frozenset({"remote-unblock-member", "cross-group-unblock"}),
     ),
+    "mass_block": CommandTrigger(
+        chinese="批量拉黑",
+        english="mass-block",
+        chinese_aliases=frozenset({"多群拉黑"}),
+        english_aliases=frozenset({"multi-group-block"}),
+    ),
     "remote_announcement": CommandTrigger(
         chinese="远程公告",
         english="remote-announcement",
@@ -463,6 +481,12 @@ _DEFAULT_COMMAND_TRIGGERS = {
         chinese_aliases=frozenset({"重置配置", "重载灵初配置"}),
         english_aliases=frozenset({"reload-lingchu-config", "reset-config"}),
     ),
+    "scheduler_stats": CommandTrigger(
+        chinese="调度统计",
+        english="scheduler-stats",
+        chinese_aliases=frozenset({"定时任务统计"}),
+        english_aliases=frozenset({"job-stats"}),
+    ),
     "bot_silence": CommandTrigger(
         chinese="闭嘴",
         english="silence",
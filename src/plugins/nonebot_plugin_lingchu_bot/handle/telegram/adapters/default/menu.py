@@ -10,14 +10,15 @@ from typing import Any
 from nonebot import require
 from nonebot.adapters.telegram import Bot
 from nonebot.adapters.telegram.event import Event
+from nonebot.typing import T_State
 
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import async_scoped_session
 
 from .....permissions import allowed_command_keys
 from ....menu import (
-    MENU_FEATURES,
     menu_cmd,
+    menu_command_keys,
     menu_page_cmds,
     render_menu_index,
     render_menu_page,
@@ -32,20 +33,23 @@ async def _allowed_menu_keys(
     session: async_scoped_session,
     bot: Bot,
     event: Event | None,
+    state: T_State | None = None,
 ) -> frozenset[str] | None:
     if event is None:
         return None
-    command_keys = frozenset(feature.command_key for feature in MENU_FEATURES)
-    return await allowed_command_keys(session, bot, event, command_keys)
+    return await allowed_command_keys(
+        session, bot, event, menu_command_keys(), state=state
+    )
 
 
 @selected_adapter_handle(menu_cmd, "~telegram")
 async def telegram_menu(
     bot: Bot,
     session: async_scoped_session,
+    state: T_State,
     _event: Event | None = None,
 ) -> Any:
-    allowed = await _allowed_menu_keys(session, bot, _event)
+    allowed = await _allowed_menu_keys(session, bot, _event, state)
     return await menu_cmd.finish(
         message=render_menu_index(
             telegram_menu_context(),
@@ -61,9 +65,10 @@ def _register_menu_page(page_id: str) -> None:
     async def telegram_menu_page(
         bot: Bot,
         session: async_scoped_session,
+        state: T_State,
         _event: Event | None = None,
     ) -> Any:
-        allowed = await _allowed_menu_keys(session, bot, _event)
+        allowed = await _allowed_menu_keys(session, bot, _event, state)
         return await command.finish(
             message=render_menu_page(
                 page_id,
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
 import json
 import logging
+import random
 from typing import TYPE_CHECKING, Any
 
 from ..core.config import plugin_config
@@ -12,6 +14,8 @@ from ..platforms import get_platform_profile, resolve_adapter_id
 from .interfaces import PlatformContext
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from nonebot.adapters import Bot, Event
 
 logger = logging.getLogger(__name__)
@@ -20,6 +24,7 @@ ELLIPSIS_LENGTH = 3
 RAW_PAYLOAD_MAX_DEPTH = 8
 RAW_PAYLOAD_MAX_LENGTH = 8192
 DEFAULT_PROTOCOL_ID = "default"
+_FULL_SAMPLE_PERCENT = 100
 
 
 @dataclass(frozen=True, slots=True)
@@ -47,6 +52,8 @@ class NormalizedMessageEvent:
     text_summary: str | None
     raw_message: str | None
     raw_event: str | None
+    raw_payload_loader: Callable[[], tuple[str | None, str | None]] | None = None
+    """Deferred ``(raw_message, raw_event)`` serializer, when requested."""
 
 
 def _truncate(value: str | None, limit: int | None = None) -> str | None:
@@ -257,6 +264,54 @@ def _raw_event(event: Event) -> str | None:
     return _json_summary(event)
 
 
+def _dump_model(value: Any) -> dict[str, Any] | None:
+    model_dump = getattr(value, "model_dump", None)
+    if not callable(model_dump) or type(value).__module__ == "unittest.mock":
+        return None
+    try:
+        dumped = model_dump(mode="json", by_alias=True, exclude_none=False)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return dumped if isinstance(dumped, dict) else None
+
+
+def _dumps_summary(value: Any) -> str:
+    return (
+        _truncate(
+            json.dumps(value, ensure_ascii=False, sort_keys=True),
+            RAW_PAYLOAD_MAX_LENGTH,
+        )
+        or ""
+    )
+
+
+def serialize_raw_payloads(event: Event) -> tuple[str | None, str | None]:
+    """Serialize an event into ``(raw_message, raw_event)`` JSON summaries.
+
+    Pydantic events are dumped once in JSON mode and ``raw_message`` is taken
+    from the dumped ``message`` field; other events fall back to the
+    recursive :func:`_jsonable` walk.
+    """
+    dumped = _dump_model(event)
+    if dumped is None:
+        return (_raw_message(event), _raw_event(event))
+    raw_message = (
+        _dumps_summary(dumped["message"])
+        if dumped.get("message") is not None
+        else _raw_message(event)
+    )
+    return (raw_message, _dumps_summary(dumped))
+
+
+def _should_store_raw_payloads(event_category: str | None) -> bool:
+    if event_category != "message":
+        return True
+    percent = plugin_config.message_store_raw_payload_sample_percent
+    if percent >= _FULL_SAMPLE_PERCENT:
+        return True
+    return percent > 0 and random.random() * _FULL_SAMPLE_PERCENT < percent
+
+
 def resolve_platform_context(bot: Bot) -> PlatformContext | None:
     """Resolve a Bot instance to its platform context.
 
@@ -275,8 +330,19 @@ def resolve_platform_context(bot: Bot) -> PlatformContext | None:
     )
 
 
-def normalize_message_event(bot: Bot, event: Event) -> NormalizedMessageEvent | None:
-    """Normalize an adapter event into message-store metadata."""
+def normalize_message_event(
+    bot: Bot,
+    event: Event,
+    *,
+    defer_raw_payloads: bool = False,
+) -> NormalizedMessageEvent | None:
+    """Normalize an adapter event into message-store metadata.
+
+    Raw payloads are kept for every non-message event and for the sampled
+    share of message events. With ``defer_raw_payloads`` the serialization is
+    returned as ``raw_payload_loader`` so the caller can run it off the
+    latency path, e.g. in a background writer.
+    """
     adapter = _adapter_name(bot)
     adapter_identity = _adapter_identity(adapter)
     if adapter_identity is None:
@@ -292,15 +358,25 @@ def normalize_message_event(bot: Bot, event: Event) -> NormalizedMessageEvent |
         conversation_id=_conversation_id(event),
         message_id=_message_id(event),
     )
+    event_category = _event_category(event)
+    raw_message: str | None = None
+    raw_event: str | None = None
+    raw_payload_loader = None
+    if _should_store_raw_payloads(event_category):
+        if defer_raw_payloads:
+            raw_payload_loader = partial(serialize_raw_payloads, event)
+        else:
+            raw_message, raw_event = serialize_raw_payloads(event)
     return NormalizedMessageEvent(
         identity=identity,
         user_id=_user_id(event),
         event_type=_event_type(event),
-        event_category=_event_category(event),
+        event_category=event_category,
         message_type=_message_type(event),
         text_summary=_plain_text(event),
-        raw_message=_raw_message(event),
-        raw_event=_raw_event(event),
+        raw_message=raw_message,
+        raw_event=raw_event,
+        raw_payload_loader=raw_payload_loader,
     )
 
 
@@ -327,4 +403,5 @@ __all__ = [
     "_user_id",
     "normalize_message_event",
     "resolve_platform_context",
+    "serialize_raw_payloads",
 ]
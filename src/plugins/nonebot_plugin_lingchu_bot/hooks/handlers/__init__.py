@@ -7,6 +7,7 @@ from . import (
     bot_connection as bot_connection,
     lifecycle as lifecycle,
     message_store as message_store,
+    permissions as permissions,
 )
 
-__all__ = ["api_audit", "bot_connection", "lifecycle", "message_store"]
+__all__ = ["api_audit", "bot_connection", "lifecycle", "message_store", "permissions"]
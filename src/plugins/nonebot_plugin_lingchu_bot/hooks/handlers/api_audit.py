@@ -6,7 +6,7 @@ from typing import Any
 
 from nonebot.adapters import Bot
 
-from ...core.async_utils import fire_and_forget
+from ...core.async_utils import AUDIT_LANE, submit_background
 from ...core.config import plugin_config
 from ...services.message_store import handle_api_called
 from ..adapters import resolve_platform_context
@@ -39,7 +39,8 @@ async def on_called_api(
     platform_context = resolve_platform_context(bot)
     if platform_context is None:
         return
-    fire_and_forget(
+    submit_background(
+        AUDIT_LANE,
         handle_api_called(platform_context, exception, api, data, result),
         name="record_api_call",
     )
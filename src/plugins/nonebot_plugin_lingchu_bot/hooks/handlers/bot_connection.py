@@ -5,7 +5,11 @@ from __future__ import annotations
 from nonebot import get_driver
 from nonebot.adapters import Bot
 
-from ...core.async_utils import fire_and_forget
+from ...core.async_utils import (
+    MESSAGE_STORE_LANE,
+    NOTICE_LANE,
+    submit_background,
+)
 from ...services.message_store import record_bot_lifecycle
 from ...services.protocol_restart_feedback import send_pending_restart_feedback
 
@@ -15,17 +19,24 @@ driver = get_driver()
 @driver.on_bot_connect
 async def on_bot_connect(bot: Bot) -> None:
     """Record bot lifecycle and send pending restart feedback on connect."""
-    fire_and_forget(
-        record_bot_lifecycle(bot, "bot_connected"), name="record_bot_lifecycle"
+    submit_background(
+        MESSAGE_STORE_LANE,
+        record_bot_lifecycle(bot, "bot_connected"),
+        name="record_bot_lifecycle",
     )
-    fire_and_forget(
-        send_pending_restart_feedback(bot), name="send_protocol_restart_feedback"
+    submit_background(
+        NOTICE_LANE,
+        send_pending_restart_feedback(bot),
+        name="send_protocol_restart_feedback",
+        key=f"restart_feedback:{bot.self_id}",
     )
 
 
 @driver.on_bot_disconnect
 async def on_bot_disconnect(bot: Bot) -> None:
     """Record bot lifecycle on disconnect."""
-    fire_and_forget(
-        record_bot_lifecycle(bot, "bot_disconnected"), name="record_bot_lifecycle"
+    submit_background(
+        MESSAGE_STORE_LANE,
+        record_bot_lifecycle(bot, "bot_disconnected"),
+        name="record_bot_lifecycle",
     )
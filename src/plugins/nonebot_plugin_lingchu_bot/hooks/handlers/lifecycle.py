@@ -7,7 +7,9 @@ import asyncio
 from nonebot import get_driver, logger
 
 from ...core.async_utils import drain_background_tasks
+from ...core.http_security import close_public_http_downloader
 from ...core.runtime_config import flush_runtime_configs_on_shutdown
+from ...services.expiry import shutdown_expiry_service
 from ...services.message_store import shutdown_message_store
 from ...services.scheduler import shutdown_scheduler_service
 from ...start.startup import startup
@@ -25,9 +27,11 @@ async def on_startup() -> None:
 async def on_shutdown() -> None:
     """Shut down Lingchu runtime services when the NoneBot driver stops."""
     services = (
+        ("expiry", shutdown_expiry_service),
         ("scheduler", shutdown_scheduler_service),
         ("message store", shutdown_message_store),
         ("runtime config", flush_runtime_configs_on_shutdown),
+        ("http downloader", close_public_http_downloader),
         ("background tasks", drain_background_tasks),
     )
 
@@ -12,11 +12,10 @@ from nonebot.message import (
 )
 from nonebot.typing import T_State
 
-from ...core.async_utils import fire_and_forget
 from ...core.config import plugin_config
 from ...services.message_store import (
     STATE_KEY,
-    handle_event_received,
+    enqueue_event_received,
     handle_matcher_result,
 )
 from ..adapters import MessageIdentity, normalize_message_event
@@ -28,14 +27,14 @@ async def message_store_preprocessor(
     event: Event,
     state: T_State,
 ) -> None:
-    """Store incoming event metadata before matcher processing."""
+    """Queue incoming event metadata for the batched writer before matchers run."""
     if not plugin_config.message_store_enabled:
         return
-    normalized = normalize_message_event(bot, event)
+    normalized = normalize_message_event(bot, event, defer_raw_payloads=True)
     if normalized is None:
         return
     state[STATE_KEY] = normalized.identity
-    fire_and_forget(handle_event_received(normalized), name="record_event_received")
+    enqueue_event_received(normalized)
 
 
 @event_postprocessor
@@ -74,7 +73,4 @@ async def message_store_run_postprocessor(
     identity = state.get(STATE_KEY)
     if not isinstance(identity, MessageIdentity):
         return
-    fire_and_forget(
-        handle_matcher_result(identity, matcher, exception),
-        name="record_matcher_result",
-    )
+    handle_matcher_result(identity, matcher, exception)
@@ -0,0 +1,18 @@
+"""Permission runtime hook handlers."""
+
+from __future__ import annotations
+
+from nonebot.message import event_preprocessor
+from nonebot.typing import T_State
+
+from ...permissions.service import PERMISSION_STATE_KEY, EventPermissionCache
+
+
+@event_preprocessor
+async def permission_cache_preprocessor(state: T_State) -> None:
+    """Seed one permission cache that every matcher of this event shares.
+
+    NoneBot hands each matcher a shallow copy of the event state, so an object
+    stored here is the same instance for all of them.
+    """
+    state[PERMISSION_STATE_KEY] = EventPermissionCache()
@@ -14,6 +14,11 @@ if TYPE_CHECKING:
 DOMAIN = "messages"
 DEFAULT_LOCALE = "en_US"
 LOCALES_DIR = Path(__file__).parent / "locales"
+_TRANSLATION_CACHE_SIZE = 16
+
+# Catalogs that finished loading, keyed by normalized locale.  Async helpers
+# read it directly so warm lookups never hop to a worker thread.
+_loaded_catalogs: dict[str, gettext_module.NullTranslations] = {}
 
 
 def normalize_locale(locale: str | None) -> str:
@@ -49,7 +54,7 @@ def get_configured_locale() -> str:
         return DEFAULT_LOCALE
 
 
-@lru_cache(maxsize=16)
+@lru_cache(maxsize=_TRANSLATION_CACHE_SIZE)
 def get_translation(locale: str | None = None) -> gettext_module.NullTranslations:
     """Return a cached gettext translation object."""
     return gettext_module.translation(
@@ -63,8 +68,19 @@ def get_translation(locale: str | None = None) -> gettext_module.NullTranslation
 async def get_translation_async(
     locale: str | None = None,
 ) -> gettext_module.NullTranslations:
-    """Return a cached gettext translation object without blocking the loop."""
-    return await asyncio.to_thread(get_translation, locale)
+    """Return a cached gettext translation object without blocking the loop.
+
+    Loaded catalogs are returned synchronously; only a cold locale is read
+    from disk in a worker thread.
+    """
+    normalized = normalize_locale(locale)
+    translation = _loaded_catalogs.get(normalized)
+    if translation is not None:
+        return translation
+    translation = await asyncio.to_thread(get_translation, normalized)
+    if len(_loaded_catalogs) < _TRANSLATION_CACHE_SIZE:
+        _loaded_catalogs[normalized] = translation
+    return translation
 
 
 def gettext(message: str, locale: str | None = None) -> str:
@@ -0,0 +1,82 @@
+"""scheduled job runs
+
+迁移 ID: h8c9d0e1f2a3
+父迁移: d7e8f9a0b1c2, g7b8c9d0e1f2
+创建时间: 2026-10-18 00:00:00
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import DATETIME as MYSQL_DATETIME
+from sqlalchemy.dialects.oracle import NUMBER as ORACLE_NUMBER
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+CompatBoolean = sa.Boolean().with_variant(
+    ORACLE_NUMBER(1, asdecimal=False),
+    "oracle",
+)
+CompatDateTimeTZ = sa.DateTime(timezone=True).with_variant(
+    MYSQL_DATETIME(fsp=6),
+    "mysql",
+    "mariadb",
+)
+
+revision: str = "h8c9d0e1f2a3"
+# 同时合并 ``d7e8f9a0b1c2`` 与 ``g7b8c9d0e1f2`` 两个分支头。
+down_revision: str | Sequence[str] | None = ("d7e8f9a0b1c2", "g7b8c9d0e1f2")
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_SCHEDULED_JOB_RUNS_INDEX_COLUMNS: tuple[str, ...] = (
+    "job_id",
+    "handler_key",
+    "started_at",
+)
+
+
+def upgrade(name: str = "") -> None:
+    if name:
+        return
+
+    op.create_table(
+        "lingchu_scheduled_job_runs",
+        sa.Column("id", sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column("job_id", sa.String(length=128), nullable=False),
+        sa.Column("handler_key", sa.String(length=128), nullable=False),
+        sa.Column("started_at", CompatDateTimeTZ, nullable=False),
+        sa.Column("finished_at", CompatDateTimeTZ, nullable=False),
+        sa.Column("duration_ms", sa.Float(), nullable=True),
+        sa.Column("result", sa.Text(), nullable=True),
+        sa.Column("exception", sa.Text(), nullable=True),
+        sa.Column("misfired", CompatBoolean, nullable=False),
+        sa.Column("skipped", CompatBoolean, nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_lingchu_scheduled_job_runs")),
+        info={"bind_key": "nonebot_plugin_lingchu_bot"},
+    )
+    for column in _SCHEDULED_JOB_RUNS_INDEX_COLUMNS:
+        op.create_index(
+            op.f(f"ix_lingchu_scheduled_job_runs_{column}"),
+            "lingchu_scheduled_job_runs",
+            [column],
+            unique=False,
+        )
+
+
+def downgrade(name: str = "") -> None:
+    if name:
+        return
+
+    for column in tuple(reversed(_SCHEDULED_JOB_RUNS_INDEX_COLUMNS)):
+        op.drop_index(
+            op.f(f"ix_lingchu_scheduled_job_runs_{column}"),
+            table_name="lingchu_scheduled_job_runs",
+        )
+    op.drop_table("lingchu_scheduled_job_runs")
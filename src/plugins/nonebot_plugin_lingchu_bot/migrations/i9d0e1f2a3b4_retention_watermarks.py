@@ -0,0 +1,55 @@
+"""retention watermarks
+
+迁移 ID: i9d0e1f2a3b4
+父迁移: h8c9d0e1f2a3
+创建时间: 2026-10-18 00:00:00
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import DATETIME as MYSQL_DATETIME
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+CompatDateTimeTZ = sa.DateTime(timezone=True).with_variant(
+    MYSQL_DATETIME(fsp=6),
+    "mysql",
+    "mariadb",
+)
+
+revision: str = "i9d0e1f2a3b4"
+down_revision: str | Sequence[str] | None = "h8c9d0e1f2a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade(name: str = "") -> None:
+    if name:
+        return
+
+    op.create_table(
+        "lingchu_retention_watermarks",
+        sa.Column("id", sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column("table_name", sa.String(length=128), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", CompatDateTimeTZ, nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_lingchu_retention_watermarks")),
+        sa.UniqueConstraint(
+            "table_name",
+            name=op.f("uq_lingchu_retention_watermarks_table_name"),
+        ),
+        info={"bind_key": "nonebot_plugin_lingchu_bot"},
+    )
+
+
+def downgrade(name: str = "") -> None:
+    if name:
+        return
+
+    op.drop_table("lingchu_retention_watermarks")
@@ -0,0 +1,99 @@
+"""message index audit
+
+迁移 ID: j0e1f2a3b4c5
+父迁移: i9d0e1f2a3b4
+创建时间: 2026-10-18 00:30:00
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "j0e1f2a3b4c5"
+down_revision: str | Sequence[str] | None = "i9d0e1f2a3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_EVENT_COLUMNS = (
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "framework_id",
+    "bot_id",
+    "conversation_id",
+    "user_id",
+    "message_id",
+    "event_type",
+    "event_category",
+    "message_type",
+    "process_status",
+    "created_at",
+    "updated_at",
+)
+_AUDIT_COLUMNS = (
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "framework_id",
+    "bot_id",
+    "audit_type",
+    "event_type",
+    "created_at",
+)
+# Every read filters on ``bot_id`` first and retention seeks ``(created_at, id)``,
+# so none of the single-column indexes is used any more.
+_DROPPED_INDEXES = (
+    ("lingchu_message_records", _EVENT_COLUMNS),
+    ("lingchu_qq_onebot_v11_nonebot_event_records", _EVENT_COLUMNS),
+    ("lingchu_audit_records", _AUDIT_COLUMNS),
+    ("lingchu_qq_onebot_v11_nonebot_audit_records", _AUDIT_COLUMNS),
+)
+_COMPOSITE_INDEXES = (
+    *(
+        (f"ix_{prefix}_{name}", table, columns)
+        for prefix, table in (
+            ("lingchu_message_records", "lingchu_message_records"),
+            ("lingchu_qq_ob11_nb_event", "lingchu_qq_onebot_v11_nonebot_event_records"),
+        )
+        for name, columns in (
+            ("conversation_recent", ["bot_id", "conversation_id", "created_at", "id"]),
+            ("user_recent", ["bot_id", "user_id", "created_at"]),
+            ("bot_recent", ["bot_id", "created_at"]),
+            ("expiry", ["created_at", "id"]),
+        )
+    ),
+    ("ix_lingchu_audit_records_expiry", "lingchu_audit_records", ["created_at", "id"]),
+    (
+        "ix_lingchu_qq_ob11_nb_audit_expiry",
+        "lingchu_qq_onebot_v11_nonebot_audit_records",
+        ["created_at", "id"],
+    ),
+)
+
+
+def upgrade(name: str = "") -> None:
+    if name:
+        return
+
+    for index_name, table, columns in _COMPOSITE_INDEXES:
+        op.create_index(index_name, table, columns, unique=False)
+    for table, columns in _DROPPED_INDEXES:
+        for column in columns:
+            op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table)
+
+
+def downgrade(name: str = "") -> None:
+    if name:
+        return
+
+    for table, columns in _DROPPED_INDEXES:
+        for column in columns:
+            op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
+    for index_name, table, _columns in reversed(_COMPOSITE_INDEXES):
+        op.drop_index(index_name, table_name=table)
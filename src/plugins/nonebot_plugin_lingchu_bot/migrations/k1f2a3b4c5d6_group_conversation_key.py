@@ -0,0 +1,145 @@
+"""group conversation key
+
+迁移 ID: k1f2a3b4c5d6
+父迁移: j0e1f2a3b4c5
+创建时间: 2026-10-18 02:00:00
+
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+from alembic import op
+import sqlalchemy as sa
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "k1f2a3b4c5d6"
+down_revision: str | Sequence[str] | None = "j0e1f2a3b4c5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_MESSAGE_TABLES = (
+    "lingchu_message_records",
+    "lingchu_qq_onebot_v11_nonebot_event_records",
+)
+_IDENTITY_COLUMNS = (
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "bot_id",
+    "conversation_id",
+    "message_id",
+)
+_BATCH_SIZE = 1000
+# Older writers stored the bare group ID or the OneBot session ID
+# ``group_<group_id>_<user_id>``; the JSON payload is the last resort.
+_LEGACY_KEY = re.compile(r"(\d+)|group_(\d+)_\d+")
+
+
+def _group_id(conversation_id: str | None, raw_event: str | None) -> str | None:
+    if conversation_id is not None:
+        match = _LEGACY_KEY.fullmatch(conversation_id)
+        if match is not None:
+            return match.group(1) or match.group(2)
+    if raw_event is None:
+        return None
+    try:
+        payload = json.loads(raw_event)
+    except json.JSONDecodeError:
+        return None
+    group_id = payload.get("group_id") if isinstance(payload, dict) else None
+    if isinstance(group_id, bool) or not isinstance(group_id, (int, str)):
+        return None
+    group_id = str(group_id)
+    return group_id if group_id.isdigit() else None
+
+
+def _identity(row: Any, conversation_id: str) -> tuple[Any, ...]:
+    owner = tuple(row[column] for column in _IDENTITY_COLUMNS[:4])
+    return (*owner, conversation_id, row["message_id"])
+
+
+def _backfill(table_name: str) -> None:
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer()),
+        *(sa.column(column, sa.String(length=128)) for column in _IDENTITY_COLUMNS),
+        sa.column("message_type", sa.String(length=64)),
+        sa.column("raw_event", sa.Text()),
+    )
+    identity = [table.c[column] for column in _IDENTITY_COLUMNS]
+    after_id = 0
+    while True:
+        rows = list(
+            bind.execute(
+                sa
+                .select(table.c.id, *identity, table.c.raw_event)
+                .where(
+                    table.c.id > after_id,
+                    table.c.message_type == "group",
+                    sa.or_(
+                        table.c.conversation_id.is_(None),
+                        table.c.conversation_id.not_like("group:%"),
+                    ),
+                )
+                .order_by(table.c.id)
+                .limit(_BATCH_SIZE)
+            ).mappings()
+        )
+        if not rows:
+            return
+        after_id = rows[-1]["id"]
+        targets: dict[int, str] = {}
+        for row in rows:
+            group_id = _group_id(row["conversation_id"], row["raw_event"])
+            if group_id is not None:
+                targets[row["id"]] = f"group:{group_id}"
+        if not targets:
+            continue
+        # A row already stored under the new key wins; its legacy twin keeps
+        # the old key rather than breaking the identity constraint.
+        taken = {
+            tuple(existing)
+            for existing in bind.execute(
+                sa.select(*identity).where(
+                    table.c.conversation_id.in_(set(targets.values())),
+                    table.c.message_id.in_(
+                        {row["message_id"] for row in rows} - {None}
+                    ),
+                )
+            )
+        }
+        for row in rows:
+            conversation_id = targets.get(row["id"])
+            if conversation_id is None:
+                continue
+            key = _identity(row, conversation_id)
+            if row["message_id"] is not None:
+                if key in taken:
+                    continue
+                taken.add(key)
+            bind.execute(
+                table
+                .update()
+                .where(table.c.id == row["id"])
+                .values(conversation_id=conversation_id)
+            )
+
+
+def upgrade(name: str = "") -> None:
+    """Store every group message under the ``group:<group_id>`` key."""
+    if name:
+        return
+    for table_name in _MESSAGE_TABLES:
+        _backfill(table_name)
+
+
+def downgrade(name: str = "") -> None:
+    """Keep normalized keys because the legacy form of each row is not recorded."""
+    _ = name
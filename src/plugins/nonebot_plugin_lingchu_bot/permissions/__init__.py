@@ -17,10 +17,20 @@ from .config import (
     get_platform_runtime_passthrough_config,
     update_platform_runtime_passthrough_config,
 )
+from .index import (
+    PermissionIndex,
+    get_permission_index,
+    invalidate_permission_index,
+    load_permission_index,
+)
 from .service import (
+    PERMISSION_STATE_KEY,
+    EventPermissionCache,
     allowed_command_keys,
+    allowed_command_keys_for_context,
     bind_platform_account,
     check_permission,
+    event_permission_cache,
     platform_runtime_passthrough_enabled,
     resolve_permission_context,
     resolve_user_identity,
@@ -33,22 +43,30 @@ from .types import (
 )
 
 __all__ = [
+    "PERMISSION_STATE_KEY",
+    "EventPermissionCache",
     "IdentityGroupCreate",
     "PermissionConfigError",
     "PermissionContext",
     "PermissionDecision",
     "PermissionDeniedError",
+    "PermissionIndex",
     "PlatformIdentityGroupSeed",
     "PlatformPermissionMappingUpdate",
     "add_identity_group_member",
     "allowed_command_keys",
+    "allowed_command_keys_for_context",
     "assert_superuser",
     "bind_platform_account",
     "check_permission",
     "create_platform_identity_group",
     "delete_platform_identity_group",
+    "event_permission_cache",
+    "get_permission_index",
     "get_platform_runtime_passthrough_config",
+    "invalidate_permission_index",
     "list_identity_group_members",
+    "load_permission_index",
     "platform_runtime_passthrough_enabled",
     "remove_identity_group_member",
     "resolve_permission_context",
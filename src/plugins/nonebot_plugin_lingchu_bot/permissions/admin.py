@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any
 
 from ..database.models import IdentityMembership, PlatformIdentityGroup
 from ..repositories import permissions as repo
+from .index import invalidate_permission_index
 from .types import IdentityGroupCreate, PermissionContext
 
 if TYPE_CHECKING:
@@ -32,7 +33,7 @@ async def create_platform_identity_group(
 ) -> PlatformIdentityGroup:
     await assert_superuser(session, actor)
     actor_uid = actor.uid if isinstance(actor, PermissionContext) else str(actor)
-    return await repo.upsert_identity_group(
+    group = await repo.upsert_identity_group(
         session,
         group_id=request.group_id,
         platform_id=request.platform_id,
@@ -41,6 +42,8 @@ async def create_platform_identity_group(
         builtin=False,
         managed_by=actor_uid,
     )
+    invalidate_permission_index(session)
+    return group
 
 
 async def update_platform_identity_group(
@@ -63,6 +66,7 @@ async def update_platform_identity_group(
     values = dict(fields)
     if values:
         await repo.update_identity_group(session, group_id, values)
+        invalidate_permission_index(session)
     updated = await repo.get_identity_group(session, group_id)
     if updated is None:
         raise ValueError(f"Unknown identity group after update: {group_id}")
@@ -84,7 +88,9 @@ async def delete_platform_identity_group(
     grants = await repo.list_grants(session, group_ids=(group_id,))
     if memberships or grants:
         raise ValueError(f"Identity group is still in use: {group_id}")
-    return await repo.delete_identity_group(session, group_id)
+    result = await repo.delete_identity_group(session, group_id)
+    invalidate_permission_index(session)
+    return result
 
 
 async def add_identity_group_member(
@@ -100,13 +106,15 @@ async def add_identity_group_member(
     group = await repo.get_identity_group(session, group_id)
     if group is None:
         raise ValueError(f"Unknown identity group: {group_id}")
-    return await repo.upsert_membership(
+    membership = await repo.upsert_membership(
         session,
         uid=uid,
         group_id=group_id,
         scope_type=scope_type,
         scope_id=scope_id,
     )
+    invalidate_permission_index(session)
+    return membership
 
 
 async def remove_identity_group_member(
@@ -119,13 +127,15 @@ async def remove_identity_group_member(
     scope_id: str | None = None,
 ) -> tuple[int, bool]:
     await assert_superuser(session, actor)
-    return await repo.delete_membership(
+    result = await repo.delete_membership(
         session,
         uid=uid,
         group_id=group_id,
         scope_type=scope_type,
         scope_id=scope_id,
     )
+    invalidate_permission_index(session)
+    return result
 
 
 async def list_identity_group_members(
@@ -9,6 +9,7 @@ from ..core.config import get_runtime_config
 from ..handle.menu import MENU_FEATURES
 from ..platforms import iter_platform_profiles
 from ..repositories import permissions as repo
+from .index import invalidate_permission_index
 from .platforms import iter_default_identity_groups
 
 if TYPE_CHECKING:
@@ -27,6 +28,7 @@ async def validate_and_seed_permission_system(
 
     await repo.seed_identity_groups(session, iter_default_identity_groups())
     await _sync_superusers(session, superusers)
+    invalidate_permission_index(session)
 
 
 def _resolve_superusers_config() -> dict[str, dict[str, str]]:
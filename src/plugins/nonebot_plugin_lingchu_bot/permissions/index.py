@@ -0,0 +1,205 @@
+"""Process-local compiled permission index.
+
+Identity groups, memberships and grants are small and change only through
+``permissions.admin`` and ``permissions.bootstrap``.  They are compiled into
+plain dictionaries so runtime permission checks need no SQL.  Writers call
+:func:`invalidate_permission_index`, which drops the index immediately and
+again once the writing session commits or rolls back; the next check reloads
+it.  ``permission_index_ttl_seconds`` adds a periodic reload for deployments
+where another process may write the tables.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.config import plugin_config
+from ..repositories import permissions as repo
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+SESSION_DIRTY_KEY = "lingchu_permission_index_dirty"
+
+
+@dataclass(frozen=True, slots=True)
+class MembershipEntry:
+    group_id: str
+    scope_type: str
+    scope_id: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class PermissionIndex:
+    """Immutable snapshot of the permission tables."""
+
+    group_platforms: Mapping[str, str]
+    ancestors: Mapping[str, frozenset[str]]
+    granted_commands: Mapping[str, frozenset[str]]
+    memberships: Mapping[str, tuple[MembershipEntry, ...]]
+    superusers: frozenset[str]
+
+    def is_superuser(self, uid: str) -> bool:
+        return uid in self.superusers
+
+    def memberships_for(self, uid: str) -> tuple[MembershipEntry, ...]:
+        return self.memberships.get(uid, ())
+
+    def expand_groups(
+        self,
+        group_ids: Iterable[str],
+        platform_id: str | None = None,
+    ) -> frozenset[str]:
+        """Add ancestor groups, following only groups of ``platform_id``."""
+        expanded: set[str] = set()
+        for group_id in group_ids:
+            if platform_id is None or self.group_platforms.get(group_id) == platform_id:
+                expanded |= self.ancestors.get(group_id, frozenset({group_id}))
+            else:
+                expanded.add(group_id)
+        return frozenset(expanded)
+
+    def granted_groups(
+        self,
+        group_ids: Iterable[str],
+        command_key: str,
+    ) -> frozenset[str]:
+        return frozenset(
+            group_id
+            for group_id in group_ids
+            if command_key in self.granted_commands.get(group_id, ())
+        )
+
+    def granted_command_keys(self, group_ids: Iterable[str]) -> frozenset[str]:
+        """Return every command key allowed for any of ``group_ids``."""
+        keys: set[str] = set()
+        for group_id in group_ids:
+            keys |= self.granted_commands.get(group_id, frozenset())
+        return frozenset(keys)
+
+
+@dataclass(slots=True)
+class _IndexState:
+    index: PermissionIndex | None = None
+    loaded_at: float = 0.0
+    generation: int = 0
+
+
+_state = _IndexState()
+
+
+def compile_permission_index(
+    groups: Iterable[Any],
+    memberships: Iterable[Any],
+    grants: Iterable[Any],
+) -> PermissionIndex:
+    """Build a :class:`PermissionIndex` from permission table rows."""
+    parents: dict[str, str | None] = {}
+    group_platforms: dict[str, str] = {}
+    for group in groups:
+        parents[group.group_id] = group.parent_group_id
+        group_platforms[group.group_id] = group.platform_id
+
+    ancestors: dict[str, frozenset[str]] = {}
+    for group_id, platform_id in group_platforms.items():
+        chain = {group_id}
+        current = group_id
+        while group_platforms.get(current) == platform_id:
+            parent = parents.get(current)
+            if parent is None or parent in chain:
+                break
+            chain.add(parent)
+            current = parent
+        ancestors[group_id] = frozenset(chain)
+
+    granted: defaultdict[str, set[str]] = defaultdict(set)
+    for grant in grants:
+        if grant.effect == repo.ALLOW_EFFECT:
+            granted[grant.group_id].add(grant.command_key)
+
+    by_uid: defaultdict[str, list[MembershipEntry]] = defaultdict(list)
+    superusers: set[str] = set()
+    for membership in memberships:
+        by_uid[membership.uid].append(
+            MembershipEntry(
+                group_id=membership.group_id,
+                scope_type=membership.scope_type,
+                scope_id=membership.scope_id,
+            )
+        )
+        if (
+            membership.group_id == repo.SUPERUSERS_GROUP_ID
+            and membership.scope_type == "global"
+            and membership.scope_id is None
+        ):
+            superusers.add(membership.uid)
+
+    return PermissionIndex(
+        group_platforms=group_platforms,
+        ancestors=ancestors,
+        granted_commands={
+            group_id: frozenset(keys) for group_id, keys in granted.items()
+        },
+        memberships={uid: tuple(entries) for uid, entries in by_uid.items()},
+        superusers=frozenset(superusers),
+    )
+
+
+async def load_permission_index(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+) -> PermissionIndex:
+    """Reload the index from the database and cache it for later checks.
+
+    A load that races with :func:`invalidate_permission_index` is returned to
+    its caller but not cached.
+    """
+    generation = _state.generation
+    index = compile_permission_index(
+        await repo.list_identity_groups(session, limit=0),
+        await repo.list_memberships(session, limit=0),
+        await repo.list_grants(session, limit=0),
+    )
+    if generation == _state.generation:
+        _state.index = index
+        _state.loaded_at = time.monotonic()
+    return index
+
+
+async def get_permission_index(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+) -> PermissionIndex:
+    """Return the cached index, loading it when missing or expired."""
+    index = _state.index
+    ttl = plugin_config.permission_index_ttl_seconds
+    if index is not None and (ttl <= 0 or time.monotonic() - _state.loaded_at < ttl):
+        return index
+    return await load_permission_index(session)
+
+
+def invalidate_permission_index(
+    session: AsyncSession | async_scoped_session[AsyncSession] | None = None,
+) -> None:
+    """Drop the cached index after a permission table write.
+
+    With ``session`` the index is dropped again when that session commits or
+    rolls back, so a reload from another session cannot keep pre-commit rows.
+    """
+    _state.generation += 1
+    _state.index = None
+    if session is not None:
+        session.info[SESSION_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_transaction(session: Session) -> None:
+    if session.info.pop(SESSION_DIRTY_KEY, False):
+        invalidate_permission_index()
@@ -2,17 +2,49 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from ..core.mutable_settings import get_mutable_settings
 from ..platforms import get_platform_profile, resolve_adapter_id
 from ..repositories import permissions as repo
+from .index import PermissionIndex, get_permission_index
 from .platforms import resolve_runtime_identity_groups
 from .types import PermissionContext, PermissionDecision
 
 if TYPE_CHECKING:
+    from collections.abc import MutableMapping
+
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
+PERMISSION_STATE_KEY = "_lingchu_permission_cache"
+
+
+@dataclass(slots=True)
+class EventPermissionCache:
+    """Permission facts resolved once per event and shared by its matchers."""
+
+    context: PermissionContext | None = None
+    effective_group_ids: frozenset[str] | None = None
+
+
+def event_permission_cache(
+    state: MutableMapping[Any, Any] | None,
+) -> EventPermissionCache | None:
+    """Return the permission cache stored in an event ``T_State``.
+
+    NoneBot gives every matcher a shallow copy of the event state, so the
+    cache must be seeded by an event preprocessor to be shared; a missing
+    cache is created in ``state`` and only lives as long as that copy.
+    """
+    if state is None:
+        return None
+    cache = state.get(PERMISSION_STATE_KEY)
+    if not isinstance(cache, EventPermissionCache):
+        cache = EventPermissionCache()
+        state[PERMISSION_STATE_KEY] = cache
+    return cache
+
 
 async def resolve_user_identity(
     session: AsyncSession | async_scoped_session[AsyncSession],
@@ -44,7 +76,12 @@ async def resolve_permission_context(
     session: AsyncSession | async_scoped_session[AsyncSession],
     bot: Any,
     event: Any,
+    *,
+    state: MutableMapping[Any, Any] | None = None,
 ) -> PermissionContext:
+    cache = event_permission_cache(state)
+    if cache is not None and cache.context is not None:
+        return cache.context
     adapter_name = _adapter_name(bot)
     adapter_id = resolve_adapter_id(adapter_name) if adapter_name is not None else None
     profile = get_platform_profile(adapter_id or "") if adapter_id is not None else None
@@ -66,7 +103,7 @@ async def resolve_permission_context(
         uid=uid,
     )
     runtime_groups = await resolve_runtime_identity_groups(bot, event, base_context)
-    return PermissionContext(
+    context = PermissionContext(
         platform_id=base_context.platform_id,
         adapter_id=base_context.adapter_id,
         account_id=base_context.account_id,
@@ -75,6 +112,9 @@ async def resolve_permission_context(
         uid=base_context.uid,
         runtime_group_ids=runtime_groups,
     )
+    if cache is not None:
+        cache.context = context
+    return context
 
 
 async def check_permission(
@@ -82,20 +122,27 @@ async def check_permission(
     command_key: str,
     bot: Any,
     event: Any,
+    *,
+    state: MutableMapping[Any, Any] | None = None,
 ) -> PermissionDecision:
-    context = await resolve_permission_context(session, bot, event)
-    return await check_permission_for_context(session, command_key, context)
+    context = await resolve_permission_context(session, bot, event, state=state)
+    return await check_permission_for_context(
+        session, command_key, context, cache=event_permission_cache(state)
+    )
 
 
 async def check_permission_for_context(
     session: AsyncSession | async_scoped_session[AsyncSession],
     command_key: str,
     context: PermissionContext,
+    *,
+    cache: EventPermissionCache | None = None,
 ) -> PermissionDecision:
     if context.uid is None:
         return PermissionDecision(allowed=False, reason="anonymous")
 
-    if await repo.is_superuser(session, context.uid):
+    index = await get_permission_index(session)
+    if index.is_superuser(context.uid):
         return PermissionDecision(
             allowed=True,
             reason="superuser",
@@ -103,20 +150,8 @@ async def check_permission_for_context(
             matched_groups=frozenset({repo.SUPERUSERS_GROUP_ID}),
         )
 
-    effective_groups = await _effective_group_ids(session, context)
-    if not effective_groups:
-        return PermissionDecision(
-            allowed=False,
-            reason="missing_grant",
-            uid=context.uid,
-        )
-
-    grants = await repo.list_grants(
-        session, group_ids=effective_groups, command_key=command_key
-    )
-    allowed_groups = frozenset(
-        grant.group_id for grant in grants if grant.effect == repo.ALLOW_EFFECT
-    )
+    effective_groups = _effective_group_ids(index, context, cache)
+    allowed_groups = index.granted_groups(effective_groups, command_key)
     if allowed_groups:
         return PermissionDecision(
             allowed=True,
@@ -142,16 +177,34 @@ async def allowed_command_keys(
     bot: Any,
     event: Any,
     command_keys: frozenset[str],
+    *,
+    state: MutableMapping[Any, Any] | None = None,
 ) -> frozenset[str]:
-    context = await resolve_permission_context(session, bot, event)
-    if context.uid is not None and await repo.is_superuser(session, context.uid):
+    context = await resolve_permission_context(session, bot, event, state=state)
+    return await allowed_command_keys_for_context(
+        session, command_keys, context, cache=event_permission_cache(state)
+    )
+
+
+async def allowed_command_keys_for_context(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    command_keys: frozenset[str],
+    context: PermissionContext,
+    *,
+    cache: EventPermissionCache | None = None,
+) -> frozenset[str]:
+    """Return the subset of ``command_keys`` that ``context`` may run.
+
+    Equivalent to calling :func:`check_permission_for_context` per key, but
+    effective groups are expanded once and their grants are read together.
+    """
+    if context.uid is None:
+        return frozenset()
+    index = await get_permission_index(session)
+    if index.is_superuser(context.uid):
         return command_keys
-    allowed: set[str] = set()
-    for command_key in command_keys:
-        decision = await check_permission_for_context(session, command_key, context)
-        if decision.allowed:
-            allowed.add(command_key)
-    return frozenset(allowed)
+    effective_groups = _effective_group_ids(index, context, cache)
+    return command_keys & index.granted_command_keys(effective_groups)
 
 
 def _adapter_name(bot: Any) -> str | None:
@@ -205,41 +258,24 @@ def _membership_matches_context(membership: Any, context: PermissionContext) ->
     )
 
 
-async def _with_ancestor_groups(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    group_ids: set[str],
-    platform_id: str | None = None,
-) -> frozenset[str]:
-    if not group_ids:
-        return frozenset()
-    groups = {
-        group.group_id: group
-        for group in await repo.list_identity_groups(session, platform_id)
-    }
-    expanded = set(group_ids)
-    stack = list(group_ids)
-    while stack:
-        group_id = stack.pop()
-        group = groups.get(group_id)
-        parent_group_id = getattr(group, "parent_group_id", None)
-        if parent_group_id and parent_group_id not in expanded:
-            expanded.add(parent_group_id)
-            stack.append(parent_group_id)
-    return frozenset(expanded)
-
-
-async def _effective_group_ids(
-    session: AsyncSession | async_scoped_session[AsyncSession],
+def _effective_group_ids(
+    index: PermissionIndex,
     context: PermissionContext,
+    cache: EventPermissionCache | None = None,
 ) -> frozenset[str]:
     if context.uid is None:
         return frozenset()
+    if cache is not None and cache.effective_group_ids is not None:
+        return cache.effective_group_ids
     direct_groups: set[str] = (
         set(context.runtime_group_ids)
         if platform_runtime_passthrough_enabled(context)
         else set()
     )
-    for membership in await repo.list_memberships(session, uid=context.uid):
+    for membership in index.memberships_for(context.uid):
         if _membership_matches_context(membership, context):
             direct_groups.add(membership.group_id)
-    return await _with_ancestor_groups(session, direct_groups, context.platform_id)
+    effective_groups = index.expand_groups(direct_groups, context.platform_id)
+    if cache is not None:
+        cache.effective_group_ids = effective_groups
+    return effective_groups
@@ -4,14 +4,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from sqlalchemy import or_
 
 from ..database.models import SubjectPolicyEntry
-from ..database.orm_crud import delete, get_one, upsert
+from ..database.orm_crud import bulk_upsert, delete, upsert
+from ..repositories.expiry import note_expiry
+from ..repositories.scoped_lookup import ScopeFilter, find_active_scoped_entry
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
 BlockScope = Literal["group", "global"]
@@ -50,20 +54,27 @@ def expires_at_from_duration(duration: int | None) -> datetime | None:
     return datetime.now(UTC) + timedelta(seconds=duration)
 
 
-async def upsert_subject_policy(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    request: SubjectPolicyUpsert,
-) -> SubjectPolicyEntry:
-    now = datetime.now(UTC)
-    scope_key = scope_key_for(request.scope, request.group_id)
-    values = {
+_POLICY_CONFLICT_FIELDS = (
+    "policy_type",
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "bot_id",
+    "scope",
+    "scope_key",
+    "user_id",
+)
+
+
+def _policy_values(request: SubjectPolicyUpsert, now: datetime) -> dict[str, Any]:
+    return {
         "policy_type": request.policy_type,
         "platform_id": request.platform_id,
         "adapter_id": request.adapter_id,
         "protocol_id": request.protocol_id or "unknown",
         "bot_id": request.bot_id,
         "scope": request.scope,
-        "scope_key": scope_key,
+        "scope_key": scope_key_for(request.scope, request.group_id),
         "group_id": None if request.scope == "global" else str(request.group_id),
         "user_id": str(request.user_id),
         "operator_id": None
@@ -74,20 +85,20 @@ async def upsert_subject_policy(
         "created_at": now,
         "updated_at": now,
     }
+
+
+async def upsert_subject_policy(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    request: SubjectPolicyUpsert,
+) -> SubjectPolicyEntry:
+    now = datetime.now(UTC)
+    values = _policy_values(request, now)
+    note_expiry(session, request.expires_at)
     return await upsert(
         session,
         SubjectPolicyEntry,
         values,
-        conflict_fields=[
-            "policy_type",
-            "platform_id",
-            "adapter_id",
-            "protocol_id",
-            "bot_id",
-            "scope",
-            "scope_key",
-            "user_id",
-        ],
+        conflict_fields=list(_POLICY_CONFLICT_FIELDS),
         update_values={
             "operator_id": values["operator_id"],
             "reason": request.reason,
@@ -97,6 +108,29 @@ async def upsert_subject_policy(
     )
 
 
+async def bulk_upsert_subject_policies(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    requests: Sequence[SubjectPolicyUpsert],
+) -> int:
+    """Upsert ``requests`` with one multi-row statement.
+
+    Returns:
+        The number of rows submitted after in-batch dedupe.
+
+    Raises:
+        DatabaseError: If the statement fails.
+    """
+    now = datetime.now(UTC)
+    for request in requests:
+        note_expiry(session, request.expires_at)
+    return await bulk_upsert(
+        session,
+        SubjectPolicyEntry,
+        [_policy_values(request, now) for request in requests],
+        conflict_fields=_POLICY_CONFLICT_FIELDS,
+    )
+
+
 async def remove_subject_policy(
     session: AsyncSession | async_scoped_session[AsyncSession],
     *,
@@ -147,24 +181,6 @@ async def clear_subject_policy(
     return await delete(session, SubjectPolicyEntry, filters)
 
 
-async def cleanup_expired_subject_policies(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    *,
-    now: datetime | None = None,
-) -> tuple[int, bool]:
-    """Delete every expired subject policy entry."""
-    cutoff = datetime.now(UTC) if now is None else now
-    return await delete(
-        session,
-        SubjectPolicyEntry,
-        {},
-        conditions=[
-            SubjectPolicyEntry.expires_at.is_not(None),
-            SubjectPolicyEntry.expires_at <= cutoff,
-        ],
-    )
-
-
 async def find_active_subject_policy(
     session: AsyncSession | async_scoped_session[AsyncSession],
     *,
@@ -176,66 +192,28 @@ async def find_active_subject_policy(
     group_id: str | int,
     user_id: str | int,
 ) -> SubjectPolicyEntry | None:
-    global_entry = await _find_active_subject_policy_for_scope(
-        session,
-        policy_type=policy_type,
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        protocol_id=protocol_id or "unknown",
-        bot_id=bot_id,
-        scope="global",
-        group_id=None,
-        user_id=user_id,
-    )
-    if global_entry is not None:
-        return global_entry
-    return await _find_active_subject_policy_for_scope(
+    """Return the active global or group policy in one query, global first.
+
+    Expired rows are ignored; ``services/expiry.py`` deletes them at their
+    deadline.
+    """
+    return await find_active_scoped_entry(
         session,
-        policy_type=policy_type,
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        protocol_id=protocol_id,
-        bot_id=bot_id,
-        scope="group",
-        group_id=group_id,
-        user_id=user_id,
+        SubjectPolicyEntry,
+        {
+            "policy_type": policy_type,
+            "platform_id": platform_id,
+            "adapter_id": adapter_id,
+            "bot_id": bot_id,
+            "user_id": str(user_id),
+        },
+        [
+            ScopeFilter("global", GLOBAL_SCOPE_KEY, protocol_id or "unknown"),
+            ScopeFilter("group", scope_key_for("group", group_id), protocol_id),
+        ],
     )
 
 
-async def _find_active_subject_policy_for_scope(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    *,
-    policy_type: SubjectPolicyType,
-    platform_id: str,
-    adapter_id: str,
-    protocol_id: str | None = None,
-    bot_id: str,
-    scope: BlockScope,
-    group_id: str | int | None,
-    user_id: str | int,
-) -> SubjectPolicyEntry | None:
-    filters = {
-        "policy_type": policy_type,
-        "platform_id": platform_id,
-        "adapter_id": adapter_id,
-        "bot_id": bot_id,
-        "scope": scope,
-        "scope_key": GLOBAL_SCOPE_KEY
-        if scope == "global"
-        else scope_key_for(scope, group_id),
-        "user_id": str(user_id),
-    }
-    if protocol_id is not None:
-        filters["protocol_id"] = protocol_id
-    entry = await get_one(session, SubjectPolicyEntry, filters)
-    if entry is None:
-        return None
-    if entry.expires_at is None or entry.expires_at > datetime.now(UTC):
-        return entry
-    await delete(session, SubjectPolicyEntry, filters)
-    return None
-
-
 def active_subject_policy_condition() -> object:
     now = datetime.now(UTC)
     return or_(
@@ -0,0 +1,149 @@
+"""Per-bot cache of the OneBot V11 implementation behind each bot.
+
+Menus and implementation-specific commands branch on ``get_version_info``.
+Its result only changes when the protocol side reconnects, so it is parsed
+once per connection: the connect hook in
+``handle/qq/adapters/onebot11/default/capabilities.py`` loads it and the
+disconnect hook drops it.  :func:`get_onebot_capabilities` loads on demand
+when the connect hook has not finished (or failed).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from packaging.version import InvalidVersion, Version
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from nonebot.adapters.onebot.v11 import Bot
+
+NAPCAT = "napcat"
+GROUP_NOTICE = "group_notice"
+GROUP_PORTRAIT = "group_portrait"
+
+_NAPCAT_APP_NAME = "NapCat.Onebot"
+_NAPCAT_MIN_VERSION = Version("4.18.0")
+_UNKNOWN_VERSION = Version("0")
+
+
+@dataclass(frozen=True, slots=True)
+class OneBotCapabilities:
+    """Parsed ``get_version_info`` of one bot's protocol side.
+
+    ``actions`` maps a feature such as :data:`GROUP_NOTICE` to the
+    implementation that serves it; unsupported features are absent.
+    """
+
+    app_name: str | None
+    app_version: str | None
+    protocol_version: str | None
+    version: Version
+    actions: Mapping[str, str] = field(default_factory=dict)
+
+    def implementation(self, feature: str) -> str | None:
+        """Return the implementation serving ``feature``, if any."""
+        return self.actions.get(feature)
+
+
+def build_onebot_capabilities(version_info: Mapping[str, Any]) -> OneBotCapabilities:
+    """Parse a ``get_version_info`` result.
+
+    Unparsable versions count as ``0``, so no version-gated action is
+    enabled for them.
+    """
+    # OneBot V11 适配器解包响应，get_version_info() 直接返回 data 字段
+    data = version_info.get("data", version_info)
+    app_name = _string_or_none(data.get("app_name"))
+    app_version = _string_or_none(data.get("app_version"))
+    try:
+        version = Version(app_version or "0")
+    except InvalidVersion:
+        version = _UNKNOWN_VERSION
+    actions: dict[str, str] = {}
+    if app_name == _NAPCAT_APP_NAME and version >= _NAPCAT_MIN_VERSION:
+        actions = {GROUP_NOTICE: NAPCAT, GROUP_PORTRAIT: NAPCAT}
+    return OneBotCapabilities(
+        app_name=app_name,
+        app_version=app_version,
+        protocol_version=_string_or_none(data.get("protocol_version")),
+        version=version,
+        actions=actions,
+    )
+
+
+@dataclass(slots=True)
+class _CapabilityState:
+    capabilities: dict[str, OneBotCapabilities] = field(default_factory=dict)
+    inflight: dict[str, asyncio.Task[OneBotCapabilities]] = field(default_factory=dict)
+    # Bumped per bot on invalidation, so one bot's reconnect leaves the
+    # loads of every other bot in place.
+    generations: dict[str, int] = field(default_factory=dict)
+
+
+_state = _CapabilityState()
+
+
+async def get_onebot_capabilities(bot: Bot) -> OneBotCapabilities:
+    """Return the cached capabilities of ``bot``, loading them when missing.
+
+    Concurrent loads for the same bot share one ``get_version_info`` call.
+    API errors propagate and are not cached.
+    """
+    bot_id = str(bot.self_id)
+    cached = _state.capabilities.get(bot_id)
+    if cached is not None:
+        return cached
+    return await load_onebot_capabilities(bot)
+
+
+async def load_onebot_capabilities(bot: Bot) -> OneBotCapabilities:
+    """Fetch and cache the capabilities of ``bot``, joining a running load."""
+    bot_id = str(bot.self_id)
+    task = _state.inflight.get(bot_id)
+    if task is None:
+        generation = _state.generations.get(bot_id, 0)
+        task = asyncio.ensure_future(_load(bot, bot_id, generation))
+        _state.inflight[bot_id] = task
+        task.add_done_callback(lambda done: _discard_inflight(bot_id, done))
+    return await asyncio.shield(task)
+
+
+def invalidate_onebot_capabilities(bot_id: str | None = None) -> None:
+    """Drop the capabilities of ``bot_id``, or of every bot when omitted.
+
+    A load of a dropped bot that is still running is not cached.
+    """
+    bot_ids = {*_state.inflight, *_state.generations} if bot_id is None else {bot_id}
+    for key in bot_ids:
+        _state.generations[key] = _state.generations.get(key, 0) + 1
+    if bot_id is None:
+        _state.capabilities.clear()
+        _state.inflight.clear()
+        return
+    _state.capabilities.pop(bot_id, None)
+    _state.inflight.pop(bot_id, None)
+
+
+async def _load(bot: Bot, bot_id: str, generation: int) -> OneBotCapabilities:
+    capabilities = build_onebot_capabilities(await bot.get_version_info())
+    if generation == _state.generations.get(bot_id, 0):
+        _state.capabilities[bot_id] = capabilities
+    return capabilities
+
+
+def _discard_inflight(bot_id: str, task: asyncio.Task[OneBotCapabilities]) -> None:
+    if _state.inflight.get(bot_id) is task:
+        del _state.inflight[bot_id]
+    if not task.cancelled():
+        # Mark the error as retrieved even when every waiter was cancelled.
+        task.exception()
+
+
+def _string_or_none(value: Any) -> str | None:
+    if value is None:
+        return None
+    return str(value)
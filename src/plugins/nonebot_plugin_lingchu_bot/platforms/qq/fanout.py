@@ -0,0 +1,127 @@
+"""Bounded, rate-limited fan-out of OneBot V11 calls across many groups.
+
+Mass commands run the same per-group work once for every target group.
+:func:`fan_out` keeps at most ``policy.concurrency`` of them in flight, takes
+one token from a per-bot token bucket before every attempt and retries
+``ActionFailed`` with jittered exponential backoff.  Buckets are shared by
+every fan-out of the same bot and policy, so two mass commands issued at
+once still respect one rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import random
+import time
+from typing import TYPE_CHECKING
+
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+
+    from nonebot.adapters.onebot.v11 import Bot
+
+
+@dataclass(frozen=True, slots=True)
+class FanoutPolicy:
+    """Limits for one kind of fan-out.
+
+    Each bot may start ``rate`` attempts per second after an initial
+    ``burst``.  A failed attempt is retried up to ``retries`` times after
+    ``backoff_seconds * 2 ** attempt`` seconds, scaled by a random factor
+    in ``[0.5, 1.5)``.
+    """
+
+    concurrency: int
+    rate: float
+    burst: int
+    retries: int = 2
+    backoff_seconds: float = 1.0
+
+
+@dataclass(slots=True)
+class _TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in FIFO order.
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1.0
+                self.updated_at = time.monotonic()
+            self.tokens -= 1
+
+
+_buckets: dict[tuple[str, FanoutPolicy], _TokenBucket] = {}
+
+
+def _bucket(bot: Bot, policy: FanoutPolicy) -> _TokenBucket:
+    key = (str(bot.self_id), policy)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _TokenBucket(
+            rate=policy.rate,
+            capacity=float(policy.burst),
+            tokens=float(policy.burst),
+            updated_at=time.monotonic(),
+        )
+        _buckets[key] = bucket
+    return bucket
+
+
+def reset_fanout_rate_limits() -> None:
+    """Forget every token bucket, refilling all bots to their burst."""
+    _buckets.clear()
+
+
+async def fan_out[T, R](
+    bot: Bot,
+    items: Sequence[T],
+    action: Callable[[T], Awaitable[R]],
+    *,
+    policy: FanoutPolicy,
+    on_failure: Callable[[T, ActionFailed], Awaitable[R]],
+    on_result: Callable[[T, R], Awaitable[None]] | None = None,
+) -> list[R]:
+    """Run ``action`` for every item and return the results in input order.
+
+    ``on_failure`` turns the last ``ActionFailed`` of an item whose retries
+    are exhausted into its result.  ``on_result`` is awaited with each result
+    as soon as it is ready, in completion order.
+    """
+    bucket = _bucket(bot, policy)
+    slots = asyncio.Semaphore(policy.concurrency)
+
+    async def attempt(item: T) -> R:
+        retry = 0
+        while True:
+            await bucket.acquire()
+            try:
+                return await action(item)
+            except ActionFailed as error:
+                if retry >= policy.retries:
+                    return await on_failure(item, error)
+            jitter = random.uniform(0.5, 1.5)
+            await asyncio.sleep(policy.backoff_seconds * 2**retry * jitter)
+            retry += 1
+
+    async def run(item: T) -> R:
+        async with slots:
+            result = await attempt(item)
+        if on_result is not None:
+            await on_result(item, result)
+        return result
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
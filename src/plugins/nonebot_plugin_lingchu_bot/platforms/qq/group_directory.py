@@ -0,0 +1,164 @@
+"""Per-bot OneBot V11 group list cache with a prebuilt name index.
+
+Remote commands resolve group names against ``get_group_list``.  The list is
+fetched once per bot, kept for ``onebot_group_list_ttl_seconds`` and dropped
+early when the bot joins or leaves a group (see
+``handle/qq/adapters/onebot11/default/group_directory.py``).  Name lookups
+use an exact-name map and a bigram index instead of scanning every group.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING, Any
+
+from ...core.config import plugin_config
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from nonebot.adapters.onebot.v11 import Bot
+
+_NGRAM = 2
+
+
+@dataclass(frozen=True, slots=True)
+class GroupEntry:
+    group_id: int
+    group_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class GroupDirectory:
+    """Immutable snapshot of one bot's group list."""
+
+    groups: tuple[GroupEntry, ...]
+    by_id: dict[int, GroupEntry] = field(repr=False)
+    by_name: dict[str, tuple[GroupEntry, ...]] = field(repr=False)
+    grams: dict[str, frozenset[int]] = field(repr=False)
+
+    def __contains__(self, group_id: int) -> bool:
+        return group_id in self.by_id
+
+    def group_ids(self) -> list[int]:
+        return list(self.by_id)
+
+    def match(self, name: str) -> tuple[GroupEntry, ...]:
+        """Return groups named exactly ``name``, else groups containing it.
+
+        Substring candidates come from the bigram index (single characters
+        for one-character queries) and keep the original list order.
+        """
+        exact = self.by_name.get(name)
+        if exact is not None:
+            return exact
+        positions: frozenset[int] | None = None
+        for gram in _grams(name):
+            posting = self.grams.get(gram, frozenset())
+            positions = posting if positions is None else positions & posting
+            if not positions:
+                return ()
+        if positions is None:
+            return self.groups
+        return tuple(
+            self.groups[position]
+            for position in sorted(positions)
+            if name in self.groups[position].group_name
+        )
+
+
+def build_group_directory(group_list: Iterable[Any]) -> GroupDirectory:
+    """Index a ``get_group_list`` result.
+
+    Raises:
+        KeyError: If an entry has no ``group_id``.
+        TypeError: If the list or an entry has an unexpected shape.
+        ValueError: If a ``group_id`` is not numeric.
+    """
+    groups: list[GroupEntry] = []
+    by_id: dict[int, GroupEntry] = {}
+    by_name: dict[str, list[GroupEntry]] = {}
+    grams: dict[str, set[int]] = {}
+    for item in group_list:
+        entry = GroupEntry(int(item["group_id"]), str(item.get("group_name") or ""))
+        if entry.group_id in by_id:
+            continue
+        position = len(groups)
+        groups.append(entry)
+        by_id[entry.group_id] = entry
+        by_name.setdefault(entry.group_name, []).append(entry)
+        for gram in {*entry.group_name, *_grams(entry.group_name)}:
+            grams.setdefault(gram, set()).add(position)
+    return GroupDirectory(
+        groups=tuple(groups),
+        by_id=by_id,
+        by_name={name: tuple(entries) for name, entries in by_name.items()},
+        grams={gram: frozenset(positions) for gram, positions in grams.items()},
+    )
+
+
+@dataclass(slots=True)
+class _DirectoryState:
+    directories: dict[str, tuple[GroupDirectory, float]] = field(default_factory=dict)
+    inflight: dict[str, asyncio.Task[GroupDirectory]] = field(default_factory=dict)
+    generation: int = 0
+
+
+_state = _DirectoryState()
+
+
+async def get_group_directory(bot: Bot) -> GroupDirectory:
+    """Return the cached group directory of ``bot``, loading it when stale.
+
+    Concurrent loads for the same bot share one ``get_group_list`` call.
+    Errors from the API or :func:`build_group_directory` propagate and are
+    not cached.
+    """
+    bot_id = str(bot.self_id)
+    cached = _state.directories.get(bot_id)
+    ttl = plugin_config.onebot_group_list_ttl_seconds
+    if cached is not None and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+    task = _state.inflight.get(bot_id)
+    if task is None:
+        task = asyncio.ensure_future(_load(bot, bot_id, _state.generation))
+        _state.inflight[bot_id] = task
+        task.add_done_callback(lambda done: _discard_inflight(bot_id, done))
+    return await asyncio.shield(task)
+
+
+def invalidate_group_directory(bot_id: str | None = None) -> None:
+    """Drop the directory of ``bot_id``, or of every bot when omitted."""
+    _state.generation += 1
+    if bot_id is None:
+        _state.directories.clear()
+        _state.inflight.clear()
+        return
+    _state.directories.pop(bot_id, None)
+    _state.inflight.pop(bot_id, None)
+
+
+async def _load(bot: Bot, bot_id: str, generation: int) -> GroupDirectory:
+    directory = build_group_directory(await bot.get_group_list())
+    if (
+        plugin_config.onebot_group_list_ttl_seconds > 0
+        and generation == _state.generation
+    ):
+        _state.directories[bot_id] = (directory, time.monotonic())
+    return directory
+
+
+def _discard_inflight(bot_id: str, task: asyncio.Task[GroupDirectory]) -> None:
+    if _state.inflight.get(bot_id) is task:
+        del _state.inflight[bot_id]
+    if not task.cancelled():
+        # Mark the error as retrieved even when every waiter was cancelled.
+        task.exception()
+
+
+def _grams(text: str) -> set[str]:
+    if len(text) < _NGRAM:
+        return set(text)
+    return {text[index : index + _NGRAM] for index in range(len(text) - _NGRAM + 1)}
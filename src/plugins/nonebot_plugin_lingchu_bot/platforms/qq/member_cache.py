@@ -0,0 +1,155 @@
+"""Per-bot TTL cache for OneBot V11 ``get_group_member_info`` lookups.
+
+Privilege checks ask NapCat for the same member several times within one
+command.  Results are cached per ``(bot, group, user)`` for
+``onebot_member_cache_ttl_seconds`` and dropped early by the group notice
+preprocessor in ``handle/qq/adapters/onebot11/default/member_cache.py``.
+Concurrent lookups of the same member share one API call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Any
+
+from ...core.config import plugin_config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from nonebot.adapters.onebot.v11 import Bot
+
+type MemberKey = tuple[str, int, int]
+
+_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class MemberCacheStats:
+    """Point-in-time counters for the member info cache."""
+
+    hits: int
+    misses: int
+    coalesced: int
+    invalidations: int
+    size: int
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    info: dict[str, Any]
+    loaded_at: float
+
+
+@dataclass(slots=True)
+class _CacheState:
+    entries: dict[MemberKey, _CacheEntry]
+    inflight: dict[MemberKey, asyncio.Task[dict[str, Any]]]
+    generation: int = 0
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+_state = _CacheState(entries={}, inflight={})
+
+
+async def get_group_member_info(
+    bot: Bot,
+    group_id: int,
+    user_id: int,
+) -> dict[str, Any]:
+    """Return member info for ``user_id`` in ``group_id``, cached per bot.
+
+    Misses call the API with ``no_cache=True`` so the protocol side cache
+    cannot serve stale roles.  API errors propagate and are not cached.
+    The returned mapping is shared between callers and must not be mutated.
+    """
+    key = (str(bot.self_id), int(group_id), int(user_id))
+    entry = _state.entries.get(key)
+    ttl = plugin_config.onebot_member_cache_ttl_seconds
+    if entry is not None and time.monotonic() - entry.loaded_at < ttl:
+        _state.hits += 1
+        return entry.info
+
+    task = _state.inflight.get(key)
+    if task is not None:
+        _state.coalesced += 1
+    else:
+        _state.misses += 1
+        task = asyncio.ensure_future(_fetch(bot, key, _state.generation))
+        _state.inflight[key] = task
+        task.add_done_callback(lambda done: _discard_inflight(key, done))
+    return await asyncio.shield(task)
+
+
+async def get_bot_member_info(bot: Bot, group_id: int) -> dict[str, Any]:
+    """Return the bot's own member info in ``group_id``.
+
+    Raises:
+        ValueError: If ``bot.self_id`` is not numeric.
+    """
+    return await get_group_member_info(bot, group_id, int(bot.self_id))
+
+
+def invalidate_group_member(
+    bot_id: str,
+    group_id: int,
+    user_id: int | None = None,
+) -> None:
+    """Drop one cached member, or every member of ``group_id`` when omitted.
+
+    In-flight lookups are detached too, so later callers fetch fresh data.
+    """
+    if user_id is not None:
+        _drop(lambda key: key == (bot_id, group_id, user_id))
+    else:
+        _drop(lambda key: key[:2] == (bot_id, group_id))
+
+
+def clear_member_cache(bot_id: str | None = None) -> None:
+    """Drop every cached member of ``bot_id``, or of all bots."""
+    _drop(lambda key: bot_id is None or key[0] == bot_id)
+
+
+def get_member_cache_stats() -> MemberCacheStats:
+    """Return hit, miss and coalescing counters for the member cache."""
+    return MemberCacheStats(
+        hits=_state.hits,
+        misses=_state.misses,
+        coalesced=_state.coalesced,
+        invalidations=_state.invalidations,
+        size=len(_state.entries),
+    )
+
+
+def _drop(matches: Callable[[MemberKey], bool]) -> None:
+    _state.generation += 1
+    _state.invalidations += 1
+    for cache in (_state.entries, _state.inflight):
+        for key in [key for key in cache if matches(key)]:
+            del cache[key]
+
+
+async def _fetch(bot: Bot, key: MemberKey, generation: int) -> dict[str, Any]:
+    _, group_id, user_id = key
+    info = await bot.get_group_member_info(
+        group_id=group_id, user_id=user_id, no_cache=True
+    )
+    ttl = plugin_config.onebot_member_cache_ttl_seconds
+    if ttl > 0 and generation == _state.generation:
+        if key not in _state.entries and len(_state.entries) >= _MAX_ENTRIES:
+            del _state.entries[next(iter(_state.entries))]
+        _state.entries[key] = _CacheEntry(info=info, loaded_at=time.monotonic())
+    return info
+
+
+def _discard_inflight(key: MemberKey, task: asyncio.Task[dict[str, Any]]) -> None:
+    if _state.inflight.get(key) is task:
+        del _state.inflight[key]
+    if not task.cancelled():
+        # Mark the error as retrieved even when every waiter was cancelled.
+        task.exception()
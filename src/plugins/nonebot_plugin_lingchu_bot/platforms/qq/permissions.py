@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from nonebot.adapters.onebot.v11 import Bot
 
 from ...permissions.types import PermissionContext, PlatformIdentityGroupSeed
+from .member_cache import get_group_member_info
 
 logger = logging.getLogger(__name__)
 
@@ -71,9 +72,8 @@ async def _fetch_role_from_api(
     if context.scope_id is None or context.account_id is None:
         return None
     try:
-        info = await bot.get_group_member_info(
-            group_id=int(context.scope_id),
-            user_id=int(context.account_id),
+        info = await get_group_member_info(
+            bot, int(context.scope_id), int(context.account_id)
         )
     except (ActionFailed, NetworkError):
         logger.warning(
@@ -5,19 +5,53 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 import inspect
-from typing import TYPE_CHECKING, Literal
+from itertools import batched
+from typing import TYPE_CHECKING, Any, Literal
 
 from sqlalchemy import or_
 
 from ..database.models import BlocklistEntry
-from ..database.orm_crud import ROWCOUNT_UNKNOWN, delete, get_one, upsert
+from ..database.orm_crud import (
+    bulk_upsert,
+    delete,
+    list_items,
+    upsert,
+)
+from .blocklist_index import (
+    BlockKey,
+    IndexedBlock,
+    begin_blocklist_index_reload,
+    block_key,
+    discard_block,
+    forget_blocks,
+    probe_block,
+    record_block,
+    replace_blocklist_index,
+)
+from .expiry import as_utc, note_expiry
+from .scoped_lookup import ScopeFilter, find_active_scoped_entry
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
+    from ..permissions.subject_policy import SubjectPolicyUpsert
+
 BlockScope = Literal["group", "global"]
 
 GLOBAL_SCOPE_KEY = "*"
+BULK_UPSERT_CHUNK_SIZE = 500
+
+# Matches ``uq_lingchu_blocklist_entry_identity``.
+_BLOCK_IDENTITY_FIELDS = (
+    "platform_id",
+    "adapter_id",
+    "bot_id",
+    "scope",
+    "scope_key",
+    "user_id",
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -51,19 +85,14 @@ def expires_at_from_duration(duration: int | None) -> datetime | None:
     return datetime.now(UTC) + timedelta(seconds=duration)
 
 
-async def upsert_block(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    request: BlocklistUpsert,
-) -> BlocklistEntry:
-    now = datetime.now(UTC)
-    scope_key = scope_key_for(request.scope, request.group_id)
-    values = {
+def _block_values(request: BlocklistUpsert, now: datetime) -> dict[str, Any]:
+    return {
         "platform_id": request.platform_id,
         "adapter_id": request.adapter_id,
         "protocol_id": request.protocol_id or "unknown",
         "bot_id": request.bot_id,
         "scope": request.scope,
-        "scope_key": scope_key,
+        "scope_key": scope_key_for(request.scope, request.group_id),
         "group_id": None if request.scope == "global" else str(request.group_id),
         "user_id": str(request.user_id),
         "operator_id": None
@@ -74,6 +103,32 @@ async def upsert_block(
         "created_at": now,
         "updated_at": now,
     }
+
+
+def _index_upserted_block(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    request: BlocklistUpsert,
+) -> None:
+    record_block(
+        session,
+        block_key(
+            request.platform_id,
+            request.adapter_id,
+            request.bot_id,
+            scope_key_for(request.scope, request.group_id),
+            request.user_id,
+        ),
+        IndexedBlock(request.protocol_id or "unknown", request.expires_at),
+    )
+    note_expiry(session, request.expires_at)
+
+
+async def upsert_block(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    request: BlocklistUpsert,
+) -> BlocklistEntry:
+    now = datetime.now(UTC)
+    values = _block_values(request, now)
     nested = session.begin_nested()
     if inspect.isawaitable(nested):
         nested = await nested
@@ -92,7 +147,7 @@ async def upsert_block(
                 "user_id",
             ],
             update_values={
-                "protocol_id": request.protocol_id or "unknown",
+                "protocol_id": values["protocol_id"],
                 "operator_id": values["operator_id"],
                 "reason": request.reason,
                 "expires_at": request.expires_at,
@@ -100,9 +155,68 @@ async def upsert_block(
             },
         )
         await _sync_blocked_policy_upsert(session, request)
+    _index_upserted_block(session, request)
     return entry
 
 
+async def bulk_upsert_blocks(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    requests: Iterable[BlocklistUpsert],
+    *,
+    chunk_size: int = BULK_UPSERT_CHUNK_SIZE,
+) -> int:
+    """Upsert a stream of entries with chunked multi-row statements.
+
+    Each chunk writes the blocklist rows and their ``blocked`` subject
+    policies in two statements, without per-entry savepoints; the caller's
+    transaction makes the whole import atomic.
+
+    Returns:
+        The number of blocklist rows submitted after in-chunk dedupe.
+
+    Raises:
+        DatabaseError: If a statement fails.
+        ValueError: If a group-scoped request has no ``group_id``.
+    """
+    from ..permissions.subject_policy import bulk_upsert_subject_policies
+
+    written = 0
+    for chunk in batched(requests, chunk_size, strict=False):
+        now = datetime.now(UTC)
+        written += await bulk_upsert(
+            session,
+            BlocklistEntry,
+            [_block_values(request, now) for request in chunk],
+            conflict_fields=_BLOCK_IDENTITY_FIELDS,
+        )
+        await bulk_upsert_subject_policies(
+            session, [_blocked_policy_request(request) for request in chunk]
+        )
+        for request in chunk:
+            _index_upserted_block(session, request)
+    return written
+
+
+async def list_blocks(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    *,
+    platform_id: str | None = None,
+    adapter_id: str | None = None,
+    bot_id: str | None = None,
+) -> list[BlocklistEntry]:
+    """Return every stored entry, optionally narrowed to one bot."""
+    filters = {
+        key: value
+        for key, value in (
+            ("platform_id", platform_id),
+            ("adapter_id", adapter_id),
+            ("bot_id", bot_id),
+        )
+        if value is not None
+    }
+    return await list_items(session, BlocklistEntry, filters, order_by=["id"], limit=0)
+
+
 async def remove_block(
     session: AsyncSession | async_scoped_session[AsyncSession],
     *,
@@ -125,6 +239,11 @@ async def remove_block(
     if protocol_id is not None:
         filters["protocol_id"] = protocol_id
     result = await delete(session, BlocklistEntry, filters)
+    forget_blocks(
+        session,
+        block_key(platform_id, adapter_id, bot_id, filters["scope_key"], user_id),
+        protocol_id,
+    )
     await _sync_blocked_policy_remove(
         session,
         platform_id=platform_id,
@@ -158,6 +277,11 @@ async def clear_blocklist(
     if protocol_id is not None:
         filters["protocol_id"] = protocol_id
     result = await delete(session, BlocklistEntry, filters)
+    forget_blocks(
+        session,
+        (platform_id, adapter_id, bot_id, filters["scope_key"]),
+        protocol_id,
+    )
     await _sync_blocked_policy_clear(
         session,
         platform_id=platform_id,
@@ -180,111 +304,128 @@ async def find_active_block(
     group_id: str | int,
     user_id: str | int,
 ) -> BlocklistEntry | None:
-    global_entry = await _find_active_block_for_scope(
-        session,
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        protocol_id=protocol_id,
-        bot_id=bot_id,
-        scope="global",
-        group_id=None,
-        user_id=user_id,
-    )
-    if global_entry is not None:
-        return global_entry
-    return await _find_active_block_for_scope(
-        session,
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        protocol_id=protocol_id,
-        bot_id=bot_id,
-        scope="group",
-        group_id=group_id,
-        user_id=user_id,
-    )
-
-
-async def _find_active_block_for_scope(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    *,
-    platform_id: str,
-    adapter_id: str,
-    protocol_id: str | None = None,
-    bot_id: str,
-    scope: BlockScope,
-    group_id: str | int | None,
-    user_id: str | int,
-) -> BlocklistEntry | None:
+    """Return the active global or group entry, preferring the global one.
+
+    Scopes the blocklist index rules out are not queried; the rest are read
+    in one query.  An index older than its TTL is reloaded first.  Expired
+    rows are ignored but not deleted here.
+    """
+    generation = begin_blocklist_index_reload()
+    if generation is not None:
+        replace_blocklist_index(
+            await _active_index_entries(session), generation=generation
+        )
+    probes: list[tuple[str, BlockKey, IndexedBlock]] = []
+    for scope_key in (GLOBAL_SCOPE_KEY, scope_key_for("group", group_id)):
+        key = block_key(platform_id, adapter_id, bot_id, scope_key, user_id)
+        seen = probe_block(key)
+        if seen is not None:
+            probes.append((scope_key, key, seen))
+    if not probes:
+        return None
     filters = {
         "platform_id": platform_id,
         "adapter_id": adapter_id,
         "bot_id": bot_id,
-        "scope": scope,
-        "scope_key": scope_key_for(scope, group_id),
         "user_id": str(user_id),
     }
     if protocol_id is not None:
         filters["protocol_id"] = protocol_id
-    entry = await get_one(session, BlocklistEntry, filters)
-    if entry is None:
-        return None
-    if entry.expires_at is None:
-        return entry
-    if entry.expires_at > datetime.now(UTC):
-        return entry
-    await delete(session, BlocklistEntry, filters)
-    return None
+    entry = await find_active_scoped_entry(
+        session,
+        BlocklistEntry,
+        filters,
+        [
+            ScopeFilter(
+                "global" if scope_key == GLOBAL_SCOPE_KEY else "group", scope_key
+            )
+            for scope_key, _, _ in probes
+        ],
+    )
+    if protocol_id is None:
+        # Scopes ordered before the returned entry have no active row.
+        for scope_key, key, seen in probes:
+            if entry is not None and entry.scope_key == scope_key:
+                break
+            discard_block(key, seen)
+    return entry
 
 
-async def cleanup_expired_blocks(
+async def load_blocklist_index(
     session: AsyncSession | async_scoped_session[AsyncSession],
-) -> tuple[int, bool]:
-    now = datetime.now(UTC)
-    blocklist_result = await delete(
+    *,
+    ttl_seconds: float = 0,
+) -> int:
+    """Index every active entry so misses skip the database.
+
+    With a positive ``ttl_seconds`` a lookup reloads the index once it is
+    that old, picking up rows written by other processes.
+
+    Returns:
+        The number of indexed entries.
+    """
+    return replace_blocklist_index(
+        await _active_index_entries(session), ttl_seconds=ttl_seconds
+    )
+
+
+async def _active_index_entries(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+) -> list[tuple[BlockKey, IndexedBlock]]:
+    entries = await list_items(
         session,
         BlocklistEntry,
-        {},
         conditions=[
-            BlocklistEntry.expires_at.is_not(None),
-            BlocklistEntry.expires_at <= now,
+            or_(
+                BlocklistEntry.expires_at.is_(None),
+                BlocklistEntry.expires_at > datetime.now(UTC),
+            )
         ],
+        limit=0,
     )
-    from ..permissions.subject_policy import cleanup_expired_subject_policies
+    return [
+        (
+            block_key(
+                entry.platform_id,
+                entry.adapter_id,
+                entry.bot_id,
+                entry.scope_key,
+                entry.user_id,
+            ),
+            IndexedBlock(
+                entry.protocol_id,
+                None if entry.expires_at is None else as_utc(entry.expires_at),
+            ),
+        )
+        for entry in entries
+    ]
 
-    policy_result = await cleanup_expired_subject_policies(session, now=now)
-    if not blocklist_result[1] or not policy_result[1]:
-        return ROWCOUNT_UNKNOWN, False
-    return blocklist_result[0] + policy_result[0], True
 
+def _blocked_policy_request(request: BlocklistUpsert) -> SubjectPolicyUpsert:
+    from ..permissions.subject_policy import SubjectPolicyUpsert
 
-def active_block_condition() -> object:
-    """Return the SQL condition used by callers that need active entries."""
-    now = datetime.now(UTC)
-    return or_(BlocklistEntry.expires_at.is_(None), BlocklistEntry.expires_at > now)
+    return SubjectPolicyUpsert(
+        policy_type="blocked",
+        platform_id=request.platform_id,
+        adapter_id=request.adapter_id,
+        protocol_id=request.protocol_id or "unknown",
+        bot_id=request.bot_id,
+        scope=request.scope,
+        group_id=request.group_id,
+        user_id=request.user_id,
+        operator_id=request.operator_id,
+        reason=request.reason,
+        expires_at=request.expires_at,
+    )
 
 
 async def _sync_blocked_policy_upsert(
     session: AsyncSession | async_scoped_session[AsyncSession],
     request: BlocklistUpsert,
 ) -> None:
-    from ..permissions.subject_policy import SubjectPolicyUpsert, upsert_subject_policy
+    from ..permissions.subject_policy import upsert_subject_policy
 
-    await upsert_subject_policy(
-        session,
-        SubjectPolicyUpsert(
-            policy_type="blocked",
-            platform_id=request.platform_id,
-            adapter_id=request.adapter_id,
-            protocol_id=request.protocol_id or "unknown",
-            bot_id=request.bot_id,
-            scope=request.scope,
-            group_id=request.group_id,
-            user_id=request.user_id,
-            operator_id=request.operator_id,
-            reason=request.reason,
-            expires_at=request.expires_at,
-        ),
-    )
+    await upsert_subject_policy(session, _blocked_policy_request(request))
 
 
 async def _sync_blocked_policy_remove(
@@ -0,0 +1,229 @@
+"""Process-local index of active blocklist keys.
+
+Blocklist checks run on every group message while almost no sender is
+blocked.  Once :func:`replace_blocklist_index` has installed the active rows,
+``find_active_block`` probes this key map first and queries the database only
+for keys it contains.  The index may hold stale keys (they cost one query and
+are then discarded) but must never miss a live block, so writers add keys
+immediately and again after commit, while removals wait for the commit.  An
+index that was never loaded answers "maybe" for every key.
+
+Rows written by another process (``lc blocklist import``, a direct database
+edit) bypass those hooks, so a loaded index expires after its TTL and the
+next lookup reloads it from the database.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+# (platform_id, adapter_id, bot_id, scope_key, user_id)
+type BlockKey = tuple[str, str, str, str, str]
+
+SESSION_PENDING_KEY = "lingchu_blocklist_index_pending"
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedBlock:
+    protocol_id: str
+    expires_at: datetime | None
+
+
+UNINDEXED = IndexedBlock("", None)
+
+
+@dataclass(frozen=True, slots=True)
+class _PendingAdd:
+    key: BlockKey
+    block: IndexedBlock
+
+
+@dataclass(frozen=True, slots=True)
+class _PendingRemove:
+    prefix: tuple[str, ...]
+    protocol_id: str | None
+
+
+@dataclass(slots=True)
+class _IndexState:
+    blocks: dict[BlockKey, IndexedBlock] | None = None
+    ttl_seconds: float = 0
+    loaded_at: float = 0.0
+    # Bumped by every indexed write, so a reload can tell it raced one.
+    generation: int = 0
+
+
+_state = _IndexState()
+
+
+def block_key(
+    platform_id: str,
+    adapter_id: str,
+    bot_id: str,
+    scope_key: str,
+    user_id: str | int,
+) -> BlockKey:
+    return (platform_id, adapter_id, bot_id, scope_key, str(user_id))
+
+
+def replace_blocklist_index(
+    entries: Iterable[tuple[BlockKey, IndexedBlock]],
+    *,
+    ttl_seconds: float | None = None,
+    generation: int | None = None,
+) -> int:
+    """Install a fresh index and return the number of indexed keys.
+
+    ``ttl_seconds`` (kept from the previous load when omitted) is how long
+    the index is trusted before a lookup reloads it; ``0`` never reloads.
+    ``generation`` comes from :func:`begin_blocklist_index_reload`.  When a
+    writer indexed a key since then, the current keys are kept as well,
+    because the loaded rows may predate that commit.
+    """
+    blocks = dict(entries)
+    current = _state.blocks
+    if generation is not None and generation != _state.generation and current:
+        blocks.update(current)
+    _state.blocks = blocks
+    if ttl_seconds is not None:
+        _state.ttl_seconds = ttl_seconds
+    _state.loaded_at = time.monotonic()
+    return len(blocks)
+
+
+def begin_blocklist_index_reload() -> int | None:
+    """Claim a due reload and return the generation it starts from.
+
+    Returns ``None`` while the index is unloaded, younger than its TTL or
+    has no TTL.  Claiming restarts the TTL, so concurrent lookups keep using
+    the current index instead of reloading it too.
+    """
+    if _state.blocks is None or _state.ttl_seconds <= 0:
+        return None
+    now = time.monotonic()
+    if now - _state.loaded_at < _state.ttl_seconds:
+        return None
+    _state.loaded_at = now
+    return _state.generation
+
+
+def reset_blocklist_index() -> None:
+    """Unload the index so every lookup falls back to the database."""
+    _state.blocks = None
+    _state.ttl_seconds = 0
+
+
+def probe_block(key: BlockKey) -> IndexedBlock | None:
+    """Return ``None`` only when ``key`` is certainly not actively blocked.
+
+    Otherwise the returned snapshot is passed back to :func:`discard_block`
+    if the database disagrees.  :data:`UNINDEXED` stands for "unknown" while
+    no index is loaded.
+    """
+    blocks = _state.blocks
+    if blocks is None:
+        return UNINDEXED
+    block = blocks.get(key)
+    if block is None:
+        return None
+    if block.expires_at is not None and block.expires_at <= datetime.now(UTC):
+        # The row itself is removed by ``services/expiry.py``.
+        del blocks[key]
+        return None
+    return block
+
+
+def discard_block(key: BlockKey, seen: IndexedBlock) -> None:
+    """Forget ``key`` after the database found no active row for it.
+
+    Nothing happens when a writer replaced ``seen`` meanwhile, so a lookup
+    that queried just before a commit cannot drop the committed block.
+    """
+    if _state.blocks is not None and _state.blocks.get(key) is seen:
+        del _state.blocks[key]
+
+
+def expire_blocks(keys: Iterable[BlockKey], until: datetime) -> None:
+    """Drop ``keys`` whose indexed expiry is at or before ``until``.
+
+    Keys re-blocked with a later expiry in the meantime are kept.
+    """
+    blocks = _state.blocks
+    if blocks is None:
+        return
+    for key in keys:
+        block = blocks.get(key)
+        if block and block.expires_at is not None and block.expires_at <= until:
+            del blocks[key]
+
+
+def record_block(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    key: BlockKey,
+    block: IndexedBlock,
+) -> None:
+    """Index ``key`` now and again when ``session`` commits.
+
+    The second write restores keys discarded by readers that queried before
+    the commit became visible.
+    """
+    if _state.blocks is None:
+        return
+    _state.blocks[key] = block
+    _state.generation += 1
+    session.info.setdefault(SESSION_PENDING_KEY, []).append(_PendingAdd(key, block))
+
+
+def forget_blocks(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    prefix: tuple[str, ...],
+    protocol_id: str | None = None,
+) -> None:
+    """Drop keys starting with ``prefix`` once ``session`` commits.
+
+    With ``protocol_id`` only keys written by that protocol are dropped,
+    matching the filtered ``DELETE``.
+    """
+    if _state.blocks is None:
+        return
+    session.info.setdefault(SESSION_PENDING_KEY, []).append(
+        _PendingRemove(prefix, protocol_id)
+    )
+
+
+def _apply(changes: Iterable[_PendingAdd | _PendingRemove]) -> None:
+    blocks = _state.blocks
+    if blocks is None:
+        return
+    for change in changes:
+        if isinstance(change, _PendingAdd):
+            # A fresh snapshot invalidates discards based on the eager write.
+            blocks[change.key] = replace(change.block)
+            _state.generation += 1
+            continue
+        width = len(change.prefix)
+        for key in [key for key in blocks if key[:width] == change.prefix]:
+            if change.protocol_id in (None, blocks[key].protocol_id):
+                del blocks[key]
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    _apply(session.info.pop(SESSION_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    # Keys added before the rollback stay; the next lookup discards them.
+    session.info.pop(SESSION_PENDING_KEY, None)
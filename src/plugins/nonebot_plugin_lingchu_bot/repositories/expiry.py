@@ -0,0 +1,96 @@
+"""Expiry bookkeeping shared by blocklist and subject policy entries.
+
+Repositories record new ``expires_at`` deadlines in ``session.info``;
+``services/expiry.py`` schedules them once the session commits and later
+reaps the due rows in bounded chunks with :func:`reap_expired_entries`.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC
+from typing import TYPE_CHECKING
+
+from ..database.models import BlocklistEntry, SubjectPolicyEntry
+from ..database.orm_crud import delete, list_items
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+SESSION_DEADLINES_KEY = "lingchu_expiry_deadlines"
+
+
+def as_utc(value: datetime) -> datetime:
+    """Attach UTC to timestamps read back naive (SQLite, MySQL/MariaDB)."""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def note_expiry(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    expires_at: datetime | None,
+) -> None:
+    """Remember ``expires_at`` so it is scheduled when ``session`` commits."""
+    if expires_at is not None:
+        session.info.setdefault(SESSION_DEADLINES_KEY, []).append(expires_at)
+
+
+async def list_pending_deadlines(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[BlocklistEntry | SubjectPolicyEntry],
+    *,
+    after: datetime,
+) -> list[datetime]:
+    """Return the ``expires_at`` values later than ``after``."""
+    entries = await list_items(
+        session,
+        model,
+        conditions=[model.expires_at > after],
+        limit=0,
+    )
+    return [as_utc(entry.expires_at) for entry in entries if entry.expires_at]
+
+
+async def reap_expired_entries[T: (BlocklistEntry, SubjectPolicyEntry)](
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[T],
+    *,
+    since: datetime | None,
+    until: datetime,
+    limit: int,
+) -> list[T]:
+    """Delete up to ``limit`` rows that expired in ``(since, until]`` by key.
+
+    The range scan runs on the ``expires_at`` index; ``since=None`` scans
+    every expired row.  The ``DELETE`` re-checks ``expires_at`` so a row
+    extended after the scan survives.  Deleted rows drop out of the range,
+    so callers repeat the call until it returns fewer than ``limit`` rows.
+
+    Returns:
+        The rows selected for deletion.
+
+    Raises:
+        DatabaseError: If the scan or the delete fails.
+    """
+    conditions = [model.expires_at.is_not(None), model.expires_at <= until]
+    if since is not None:
+        conditions.append(model.expires_at > since)
+    entries = await list_items(
+        session,
+        model,
+        conditions=conditions,
+        order_by=["expires_at"],
+        limit=limit,
+    )
+    if entries:
+        # Detach the snapshots so the bulk DELETE does not re-evaluate the
+        # guard in Python against naive timestamps loaded from SQLite.
+        for entry in entries:
+            session.expunge(entry)
+        await delete(
+            session,
+            model,
+            {"id": tuple(entry.id for entry in entries)},
+            conditions=[model.expires_at <= until],
+        )
+    return entries
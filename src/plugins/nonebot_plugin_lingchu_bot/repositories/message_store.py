@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, tuple_
 
 from ..database.models import (
     AuditRecord,
@@ -14,11 +14,36 @@ from ..database.models import (
     QQOneBotV11NoneBotAuditRecord,
     QQOneBotV11NoneBotEventRecord,
 )
-from ..database.orm_crud import create, delete, get_one, list_items, update, upsert
+from ..database.orm_crud import (
+    bulk_upsert,
+    create,
+    list_items,
+    update,
+    upsert,
+)
+from .expiry import as_utc
+from .record_buckets import bucket_for_write, buckets_for_read
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from sqlalchemy import ColumnElement
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
+EVENT_IDENTITY_FIELDS = (
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "bot_id",
+    "conversation_id",
+    "message_id",
+)
+# Matcher results arrive within a flush interval of their receipt; only the
+# buckets overlapping this window are updated.
+MATCHER_RESULT_WINDOW = timedelta(hours=1)
+
+type EventRecord = MessageRecord | QQOneBotV11NoneBotEventRecord
+
 
 @dataclass(frozen=True, slots=True)
 class AuditEvent:
@@ -45,6 +70,40 @@ class EventStoreWrite:
     event_category: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class MatcherResultWrite:
+    platform_id: str
+    adapter_id: str
+    bot_id: str
+    conversation_id: str | None
+    message_id: str
+    process_status: str
+    exception_summary: str | None = None
+    protocol_id: str | None = None
+    framework_id: str = "nonebot"
+
+
+@dataclass(frozen=True, slots=True)
+class ReceivedEventWrite:
+    platform_id: str
+    adapter_id: str
+    bot_id: str
+    event_type: str
+    conversation_id: str | None
+    user_id: str | None
+    message_id: str | None
+    message_type: str | None
+    text_summary: str | None
+    raw_message: str | None
+    raw_event: str | None
+    received_at: datetime
+    protocol_id: str | None = None
+    framework_id: str = "nonebot"
+    event_category: str | None = None
+    process_status: str = "received"
+    exception_summary: str | None = None
+
+
 def event_record_model_for(
     *,
     platform_id: str,
@@ -75,6 +134,11 @@ def audit_record_model_for(
     return AuditRecord
 
 
+def group_conversation_id(group_id: int | str) -> str:
+    """Return the ``conversation_id`` stored for events of a group chat."""
+    return f"group:{group_id}"
+
+
 def _event_category_from_type(event_type: str) -> str | None:
     head = event_type.split(".", maxsplit=1)[0].strip()
     return head or None
@@ -100,10 +164,14 @@ async def record_event_received(
 ) -> MessageRecord | QQOneBotV11NoneBotEventRecord:
     """Create or update an incoming message record."""
     now = datetime.now(UTC)
-    model = event_record_model_for(
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        framework_id=framework_id,
+    model = await bucket_for_write(
+        session,
+        event_record_model_for(
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            framework_id=framework_id,
+        ),
+        now,
     )
     insert_values: dict[str, Any] = {
         "platform_id": platform_id,
@@ -131,61 +199,162 @@ async def record_event_received(
         session,
         model,
         insert_values,
-        conflict_fields=[
-            "platform_id",
-            "adapter_id",
-            "protocol_id",
-            "bot_id",
-            "conversation_id",
-            "message_id",
-        ],
+        conflict_fields=list(EVENT_IDENTITY_FIELDS),
     )
 
 
-async def record_matcher_result(
+async def record_events_received(
     session: AsyncSession | async_scoped_session[AsyncSession],
+    events: Sequence[ReceivedEventWrite],
+) -> int:
+    """Insert or refresh queued incoming events with one upsert per partition."""
+    if not events:
+        return 0
+    now = datetime.now(UTC)
+    rows_by_model: dict[
+        type[MessageRecord | QQOneBotV11NoneBotEventRecord],
+        list[dict[str, Any]],
+    ] = {}
+    for event in events:
+        model = await bucket_for_write(
+            session,
+            event_record_model_for(
+                platform_id=event.platform_id,
+                adapter_id=event.adapter_id,
+                framework_id=event.framework_id,
+            ),
+            event.received_at,
+        )
+        rows_by_model.setdefault(model, []).append({
+            "platform_id": event.platform_id,
+            "adapter_id": event.adapter_id,
+            "protocol_id": event.protocol_id,
+            "framework_id": event.framework_id,
+            "bot_id": event.bot_id,
+            "conversation_id": event.conversation_id,
+            "user_id": event.user_id,
+            "message_id": event.message_id,
+            "event_type": event.event_type,
+            "event_category": event.event_category
+            or _event_category_from_type(event.event_type),
+            "message_type": event.message_type,
+            "text_summary": event.text_summary,
+            "raw_message": event.raw_message,
+            "raw_event": event.raw_event,
+            "process_status": event.process_status,
+            "exception_summary": event.exception_summary,
+            "created_at": event.received_at,
+            "updated_at": now,
+        })
+    written = 0
+    for model, rows in rows_by_model.items():
+        written += await bulk_upsert(
+            session,
+            model,
+            rows,
+            conflict_fields=EVENT_IDENTITY_FIELDS,
+        )
+    return written
+
+
+def _identity_match_condition(
+    model: type[MessageRecord | QQOneBotV11NoneBotEventRecord],
+    results: Sequence[MatcherResultWrite],
+) -> ColumnElement[bool]:
+    """Build ``(identity) IN (...)`` row-value filters, one per key shape.
+
+    A missing ``protocol_id`` leaves that column unfiltered and a missing
+    ``conversation_id`` matches ``IS NULL``, mirroring the single-row lookup.
+    """
+    rows_by_shape: dict[tuple[bool, bool], list[tuple[str | None, ...]]] = {}
+    for result in results:
+        has_protocol = result.protocol_id is not None
+        has_conversation = result.conversation_id is not None
+        values: dict[str, str | None] = {
+            "platform_id": result.platform_id,
+            "adapter_id": result.adapter_id,
+            "protocol_id": result.protocol_id,
+            "bot_id": result.bot_id,
+            "conversation_id": result.conversation_id,
+            "message_id": result.message_id,
+        }
+        names = _identity_match_fields(
+            has_protocol=has_protocol,
+            has_conversation=has_conversation,
+        )
+        rows_by_shape.setdefault((has_protocol, has_conversation), []).append(
+            tuple(values[name] for name in names)
+        )
+    clauses: list[ColumnElement[bool]] = []
+    for (has_protocol, has_conversation), rows in rows_by_shape.items():
+        names = _identity_match_fields(
+            has_protocol=has_protocol,
+            has_conversation=has_conversation,
+        )
+        clause = tuple_(*(getattr(model, name) for name in names)).in_(rows)
+        if not has_conversation:
+            clause = and_(clause, model.conversation_id.is_(None))
+        clauses.append(clause)
+    return or_(*clauses)
+
+
+def _identity_match_fields(
     *,
-    platform_id: str,
-    adapter_id: str,
-    protocol_id: str | None = None,
-    bot_id: str,
-    conversation_id: str | None,
-    message_id: str | None,
-    process_status: str,
-    exception_summary: str | None = None,
-    framework_id: str = "nonebot",
-) -> bool:
-    """Update the processing status for a stored message record."""
-    if message_id is None:
-        return False
-    filters = {
-        "platform_id": platform_id,
-        "adapter_id": adapter_id,
-        "bot_id": bot_id,
-        "conversation_id": conversation_id,
-        "message_id": message_id,
-    }
-    if protocol_id is not None:
-        filters["protocol_id"] = protocol_id
-    model = event_record_model_for(
-        platform_id=platform_id,
-        adapter_id=adapter_id,
-        framework_id=framework_id,
+    has_protocol: bool,
+    has_conversation: bool,
+) -> tuple[str, ...]:
+    return tuple(
+        name
+        for name in EVENT_IDENTITY_FIELDS
+        if (name != "protocol_id" or has_protocol)
+        and (name != "conversation_id" or has_conversation)
     )
-    record = await get_one(session, model, filters)
-    if record is None:
-        return False
-    await update(
-        session,
-        model,
-        {"id": record.id},
-        {
-            "process_status": process_status,
-            "exception_summary": exception_summary,
-            "updated_at": datetime.now(UTC),
-        },
-    )
-    return True
+
+
+async def record_matcher_results(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    results: Sequence[MatcherResultWrite],
+) -> int:
+    """Apply matcher statuses to stored rows with one UPDATE per status group.
+
+    Rows are looked up in the buckets written during the last
+    :data:`MATCHER_RESULT_WINDOW`.  Returns the number of affected rows when
+    the driver reports it.
+    """
+    now = datetime.now(UTC)
+    groups: dict[
+        tuple[
+            type[MessageRecord | QQOneBotV11NoneBotEventRecord],
+            str,
+            str | None,
+        ],
+        list[MatcherResultWrite],
+    ] = {}
+    for result in results:
+        model = event_record_model_for(
+            platform_id=result.platform_id,
+            adapter_id=result.adapter_id,
+            framework_id=result.framework_id,
+        )
+        key = (model, result.process_status, result.exception_summary)
+        groups.setdefault(key, []).append(result)
+    updated = 0
+    for (parent, process_status, exception_summary), items in groups.items():
+        for model in buckets_for_read(parent, since=now - MATCHER_RESULT_WINDOW):
+            rowcount, known = await update(
+                session,
+                model,
+                {},
+                {
+                    "process_status": process_status,
+                    "exception_summary": exception_summary,
+                    "updated_at": now,
+                },
+                conditions=[_identity_match_condition(model, items)],
+            )
+            if known:
+                updated += rowcount
+    return updated
 
 
 async def record_api_call(
@@ -193,10 +362,15 @@ async def record_api_call(
     event: AuditEvent,
 ) -> AuditRecord | QQOneBotV11NoneBotAuditRecord:
     """Record a platform API or lifecycle event as an audit record."""
-    model = audit_record_model_for(
-        platform_id=event.platform_id,
-        adapter_id=event.adapter_id,
-        framework_id=event.framework_id,
+    now = datetime.now(UTC)
+    model = await bucket_for_write(
+        session,
+        audit_record_model_for(
+            platform_id=event.platform_id,
+            adapter_id=event.adapter_id,
+            framework_id=event.framework_id,
+        ),
+        now,
     )
     return await create(
         session,
@@ -211,8 +385,54 @@ async def record_api_call(
         data_summary=event.data_summary,
         result_summary=event.result_summary,
         exception_summary=event.exception_summary,
-        created_at=datetime.now(UTC),
+        created_at=now,
+    )
+
+
+async def _list_across_buckets(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    models: list[type[EventRecord]],
+    filters: dict[str, Any],
+    *,
+    order_by: list[str],
+    limit: int,
+    conditions: Callable[[type[EventRecord]], list[ColumnElement[bool]]] | None = None,
+) -> list[EventRecord]:
+    """List ``models`` newest bucket first and merge the pages by recency.
+
+    ``models`` is a :func:`buckets_for_read` result: time buckets, newest
+    first, followed by the partition table that may hold rows of any age.
+    """
+
+    async def page(model: type[EventRecord], page_limit: int) -> list[EventRecord]:
+        if conditions is None:
+            return await list_items(
+                session, model, filters, order_by=order_by, limit=page_limit
+            )
+        return await list_items(
+            session,
+            model,
+            filters,
+            conditions=conditions(model),
+            order_by=order_by,
+            limit=page_limit,
+        )
+
+    *buckets, parent = models
+    records: list[EventRecord] = []
+    for model in buckets:
+        records.extend(await page(model, limit - len(records) if limit else 0))
+        if limit and len(records) >= limit:
+            break
+    parent_records = await page(parent, limit)
+    if not records:
+        return parent_records
+    merged = sorted(
+        [*records, *parent_records],
+        key=lambda record: (as_utc(record.created_at), record.id),
+        reverse=True,
     )
+    return merged[:limit] if limit else merged
 
 
 async def list_recent_messages(
@@ -226,7 +446,7 @@ async def list_recent_messages(
     user_id: str | None = None,
     limit: int = 100,
     framework_id: str = "nonebot",
-) -> list[MessageRecord | QQOneBotV11NoneBotEventRecord]:
+) -> list[EventRecord]:
     """List recent message records using common query dimensions."""
     filters: dict[str, Any] = {"platform_id": platform_id}
     if adapter_id is not None:
@@ -244,9 +464,9 @@ async def list_recent_messages(
         adapter_id=adapter_id,
         framework_id=framework_id,
     )
-    return await list_items(
+    return await _list_across_buckets(
         session,
-        model,
+        buckets_for_read(model),
         filters,
         order_by=["-created_at"],
         limit=limit,
@@ -264,16 +484,16 @@ async def list_conversation_messages(
     conversation_type: str,
     conversation_id: str,
     limit: int,
-) -> list[MessageRecord | QQOneBotV11NoneBotEventRecord]:
+) -> list[EventRecord]:
     """List one exact conversation before applying a bounded page."""
     model = event_record_model_for(
         platform_id=platform_id,
         adapter_id=adapter_id,
         framework_id=framework_id,
     )
-    return await list_items(
+    return await _list_across_buckets(
         session,
-        model,
+        buckets_for_read(model),
         {
             "platform_id": platform_id,
             "adapter_id": adapter_id,
@@ -288,6 +508,29 @@ async def list_conversation_messages(
     )
 
 
+async def _anchor_exists(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    parent: type[EventRecord],
+    filters: dict[str, Any],
+    *,
+    received_at: datetime,
+    record_id: int,
+) -> bool:
+    for model in buckets_for_read(parent, since=received_at, until=received_at):
+        if await list_items(
+            session,
+            model,
+            filters,
+            conditions=[
+                model.created_at == received_at,
+                model.id == record_id,
+            ],
+            limit=1,
+        ):
+            return True
+    return False
+
+
 async def list_conversation_message_page(
     session: AsyncSession | async_scoped_session[AsyncSession],
     *,
@@ -303,12 +546,9 @@ async def list_conversation_message_page(
     after_record_id: str | None,
     window_received_at: datetime | None,
     window_record_id: str | None,
-) -> tuple[
-    list[MessageRecord | QQOneBotV11NoneBotEventRecord],
-    bool,
-]:
+) -> tuple[list[EventRecord], bool]:
     """Read one exact conversation within a frozen keyset window."""
-    model = event_record_model_for(
+    parent = event_record_model_for(
         platform_id=platform_id,
         adapter_id=adapter_id,
         framework_id=framework_id,
@@ -329,97 +569,60 @@ async def list_conversation_message_page(
         return ([], False)
     anchor_exists = True
     if after_received_at is not None and after_id is not None:
-        anchor_exists = bool(
-            await list_items(
-                session,
-                model,
-                filters,
-                conditions=[
-                    model.created_at == after_received_at,
-                    model.id == after_id,
-                ],
-                limit=1,
-            )
+        anchor_exists = await _anchor_exists(
+            session,
+            parent,
+            filters,
+            received_at=after_received_at,
+            record_id=after_id,
         )
-    conditions = []
-    if window_received_at is not None and window_id is not None:
-        conditions.append(
-            or_(
-                model.created_at < window_received_at,
-                and_(
-                    model.created_at == window_received_at,
-                    model.id <= window_id,
-                ),
+
+    def conditions(model: type[EventRecord]) -> list[ColumnElement[bool]]:
+        keyset: list[ColumnElement[bool]] = []
+        if window_received_at is not None and window_id is not None:
+            keyset.append(
+                or_(
+                    model.created_at < window_received_at,
+                    and_(
+                        model.created_at == window_received_at,
+                        model.id <= window_id,
+                    ),
+                )
             )
-        )
-    if after_received_at is not None and after_id is not None:
-        conditions.append(
-            or_(
-                model.created_at < after_received_at,
-                and_(
-                    model.created_at == after_received_at,
-                    model.id < after_id,
-                ),
+        if after_received_at is not None and after_id is not None:
+            keyset.append(
+                or_(
+                    model.created_at < after_received_at,
+                    and_(
+                        model.created_at == after_received_at,
+                        model.id < after_id,
+                    ),
+                )
             )
+        return keyset
+
+    bounds = [
+        received_at
+        for received_at, record_id in (
+            (window_received_at, window_id),
+            (after_received_at, after_id),
         )
-    records = await list_items(
+        if received_at is not None and record_id is not None
+    ]
+    records = await _list_across_buckets(
         session,
-        model,
+        buckets_for_read(parent, until=min(bounds, default=None)),
         filters,
         conditions=conditions,
         order_by=["-created_at", "-id"],
         limit=limit,
     )
     if anchor_exists and after_received_at is not None and after_id is not None:
-        anchor_exists = bool(
-            await list_items(
-                session,
-                model,
-                filters,
-                conditions=[
-                    model.created_at == after_received_at,
-                    model.id == after_id,
-                ],
-                limit=1,
-            )
+        anchor_exists = await _anchor_exists(
+            session,
+            parent,
+            filters,
+            received_at=after_received_at,
+            record_id=after_id,
         )
     return (records, anchor_exists)
-
-
-async def cleanup_expired_messages(
-    session: AsyncSession | async_scoped_session[AsyncSession],
-    *,
-    retention_days: int,
-) -> tuple[int, bool]:
-    """Delete expired message and audit records."""
-    if retention_days <= 0:
-        return (0, True)
-    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
-    msg_count, msg_known = await delete(
-        session,
-        MessageRecord,
-        {},
-        conditions=[MessageRecord.created_at < cutoff],
-    )
-    audit_count, audit_known = await delete(
-        session,
-        AuditRecord,
-        {},
-        conditions=[AuditRecord.created_at < cutoff],
-    )
-    partition_msg_count, partition_msg_known = await delete(
-        session,
-        QQOneBotV11NoneBotEventRecord,
-        {},
-        conditions=[QQOneBotV11NoneBotEventRecord.created_at < cutoff],
-    )
-    partition_audit_count, partition_audit_known = await delete(
-        session,
-        QQOneBotV11NoneBotAuditRecord,
-        {},
-        conditions=[QQOneBotV11NoneBotAuditRecord.created_at < cutoff],
-    )
-    return (
-        msg_count + audit_count + partition_msg_count + partition_audit_count,
-        msg_known and audit_known and partition_msg_known and partition_audit_known,
-    )
@@ -188,6 +188,8 @@ async def delete_identity_group(
 async def list_identity_groups(
     session: AsyncSession | async_scoped_session[AsyncSession],
     platform_id: str | None = None,
+    *,
+    limit: int = 100,
 ) -> list[PlatformIdentityGroup]:
     filters = {"platform_id": platform_id} if platform_id is not None else None
     return await list_items(
@@ -195,6 +197,7 @@ async def list_identity_groups(
         PlatformIdentityGroup,
         filters,
         order_by=["group_id"],
+        limit=limit,
     )
 
 
@@ -336,6 +339,7 @@ async def list_memberships(
     group_id: str | None = None,
     scope_type: str | None = None,
     scope_id: str | None = None,
+    limit: int = 100,
 ) -> list[IdentityMembership]:
     filters: dict[str, object] = {}
     if uid is not None:
@@ -351,6 +355,7 @@ async def list_memberships(
         IdentityMembership,
         filters or None,
         order_by=["group_id", "uid"],
+        limit=limit,
     )
 
 
@@ -405,6 +410,7 @@ async def list_grants(
     *,
     group_ids: Iterable[str] | None = None,
     command_key: str | None = None,
+    limit: int = 100,
 ) -> list[PermissionGrant]:
     filters: dict[str, object] = {}
     if group_ids is not None:
@@ -416,4 +422,5 @@ async def list_grants(
         PermissionGrant,
         filters or None,
         order_by=["command_key"],
+        limit=limit,
     )
@@ -0,0 +1,362 @@
+"""Time-bucketed child tables of the QQ OneBot V11 NoneBot partition.
+
+With :func:`configure_record_buckets` set to ``"week"`` or ``"month"``, new
+event and audit rows of the partition go to one child table per period
+(``<partition>_w20260105``, ``<partition>_m202601``) instead of the ever
+growing partition table.  Each child carries its own copy of the partition
+indexes and is mapped as a concrete subclass of the partition model, so the
+repository code keeps working on ``model.created_at`` and friends.
+
+Children are created on first write with ``CREATE TABLE IF NOT EXISTS`` and
+are not part of the migrated schema.  Readers route to the children that
+overlap their time window plus the partition table itself, which keeps the
+rows written before bucketing was enabled.  Retention drops whole expired
+children instead of deleting their rows.
+
+The set of known children is process-local: :func:`load_record_buckets`
+reflects it from the database at startup and brings the indexes of existing
+children in line with the partition model, and creations and drops are
+applied once their session commits.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import re
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+from sqlalchemy import Index, MetaData, Table, UniqueConstraint, event, inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable, DropTable
+from sqlalchemy.sql.elements import conv
+
+from ..database.models import (
+    QQOneBotV11NoneBotAuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+)
+from ..database.orm_crud import DatabaseError
+from .expiry import as_utc
+
+if TYPE_CHECKING:
+    from nonebot_plugin_orm import Model
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+type BucketPeriod = Literal["none", "week", "month"]
+
+BUCKETED_MODELS: tuple[type[Model], ...] = (
+    QQOneBotV11NoneBotEventRecord,
+    QQOneBotV11NoneBotAuditRecord,
+)
+SESSION_PENDING_KEY = "lingchu_record_buckets_pending"
+
+_bucket_metadata = MetaData(
+    naming_convention=QQOneBotV11NoneBotEventRecord.metadata.naming_convention
+)
+_bucket_models: dict[str, type[Any]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class RecordBucket:
+    """One child table holding rows created in ``[starts_at, ends_at)``."""
+
+    model: type[Any]
+    table_name: str
+    starts_at: datetime
+    ends_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class _PendingChange:
+    parent: str
+    bucket: RecordBucket
+    dropped: bool = False
+
+
+@dataclass(slots=True)
+class _BucketState:
+    period: BucketPeriod = "none"
+    buckets: dict[str, dict[str, RecordBucket]] = field(default_factory=dict)
+
+
+_state = _BucketState()
+
+
+def configure_record_buckets(period: BucketPeriod) -> None:
+    """Select the bucket period used for new rows; ``"none"`` disables it."""
+    _state.period = period
+
+
+def reset_record_buckets() -> None:
+    """Forget the period and every known bucket."""
+    _state.period = "none"
+    _state.buckets.clear()
+
+
+def bucket_bounds(at: datetime, period: BucketPeriod) -> tuple[datetime, datetime]:
+    """Return the UTC ``[start, end)`` of the ``period`` bucket holding ``at``."""
+    at = as_utc(at).astimezone(UTC)
+    if period == "week":
+        day = at.date() - timedelta(days=at.weekday())
+        starts_at = datetime(day.year, day.month, day.day, tzinfo=UTC)
+        return (starts_at, starts_at + timedelta(days=7))
+    if period == "month":
+        starts_at = datetime(at.year, at.month, 1, tzinfo=UTC)
+        year, month = divmod(at.month, 12)
+        return (starts_at, datetime(at.year + year, month + 1, 1, tzinfo=UTC))
+    msg = f"unsupported bucket period: {period}"
+    raise ValueError(msg)
+
+
+def bucket_table_name(parent: str, starts_at: datetime, period: BucketPeriod) -> str:
+    """Return the child table name of the bucket starting at ``starts_at``."""
+    if period == "week":
+        return f"{parent}_w{starts_at:%Y%m%d}"
+    return f"{parent}_m{starts_at:%Y%m}"
+
+
+def _parse_bucket_bounds(
+    parent: str, table_name: str
+) -> tuple[datetime, datetime] | None:
+    match = re.fullmatch(rf"{re.escape(parent)}_(?:m(\d{{6}})|w(\d{{8}}))", table_name)
+    if match is None:
+        return None
+    month, week = match.groups()
+    try:
+        if month is not None:
+            starts_at = datetime.strptime(month, "%Y%m").replace(tzinfo=UTC)
+            return bucket_bounds(starts_at, "month")
+        starts_at = datetime.strptime(week, "%Y%m%d").replace(tzinfo=UTC)
+    except ValueError:
+        return None
+    if starts_at.weekday() != 0:
+        return None
+    return bucket_bounds(starts_at, "week")
+
+
+def _child_name(name: str, parent: str, table_name: str) -> conv:
+    if parent in name:
+        return conv(name.replace(parent, table_name, 1))
+    return conv(f"{name}_{table_name.removeprefix(parent).lstrip('_')}")
+
+
+def _bucket_model(parent_model: type[Model], table_name: str) -> type[Any]:
+    model = _bucket_models.get(table_name)
+    if model is not None:
+        return model
+    source = parent_model.__table__
+    table = Table(
+        table_name,
+        _bucket_metadata,
+        *(column._copy() for column in source.columns),
+    )
+    # Copied columns index themselves; rebuild every source index instead so
+    # composite indexes are copied too.
+    table.indexes.clear()
+    for index in source.indexes:
+        Index(
+            _child_name(str(index.name), source.name, table_name),
+            *(table.c[column.name] for column in index.columns),
+            unique=bool(index.unique),
+        )
+    for constraint in source.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            table.append_constraint(
+                UniqueConstraint(
+                    *(table.c[column.name] for column in constraint.columns),
+                    name=_child_name(str(constraint.name), source.name, table_name),
+                )
+            )
+    suffix = table_name.removeprefix(source.name)
+    model = type(
+        f"{parent_model.__name__}{suffix}",
+        (parent_model,),
+        {
+            "__table__": table,
+            "__mapper_args__": {"concrete": True},
+            "__module__": __name__,
+        },
+    )
+    _bucket_models[table_name] = model
+    return model
+
+
+def _known(parent: str) -> dict[str, RecordBucket]:
+    return _state.buckets.setdefault(parent, {})
+
+
+def known_buckets(parent_model: type[Model]) -> list[RecordBucket]:
+    """Return the known children of ``parent_model``, newest first."""
+    return sorted(
+        _known(parent_model.__table__.name).values(),
+        key=lambda bucket: bucket.starts_at,
+        reverse=True,
+    )
+
+
+async def load_record_buckets(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+) -> int:
+    """Replace the known buckets with the child tables present in the database.
+
+    Indexes the partition model no longer declares are dropped from each
+    child and missing ones are created; the caller commits.
+
+    Raises:
+        DatabaseError: If the tables cannot be read or their indexes synced.
+    """
+
+    def table_names(connection: Connection) -> list[str]:
+        return inspect(connection).get_table_names()
+
+    def sync_indexes(connection: Connection) -> None:
+        for buckets in _state.buckets.values():
+            for bucket in buckets.values():
+                _sync_bucket_indexes(connection, bucket.model.__table__)
+
+    try:
+        connection = await session.connection()
+        names = await connection.run_sync(table_names)
+    except SQLAlchemyError as exc:
+        raise DatabaseError("Failed to list record bucket tables") from exc
+    _state.buckets.clear()
+    for parent_model in BUCKETED_MODELS:
+        parent = parent_model.__table__.name
+        for name in names:
+            bounds = _parse_bucket_bounds(parent, name)
+            if bounds is not None:
+                _known(parent)[name] = RecordBucket(
+                    _bucket_model(parent_model, name), name, *bounds
+                )
+    try:
+        await connection.run_sync(sync_indexes)
+    except SQLAlchemyError as exc:
+        raise DatabaseError("Failed to sync record bucket indexes") from exc
+    return sum(len(buckets) for buckets in _state.buckets.values())
+
+
+def _sync_bucket_indexes(connection: Connection, table: Table) -> None:
+    expected = {str(index.name) for index in table.indexes}
+    reflected = Table(table.name, MetaData(), autoload_with=connection)
+    for index in reflected.indexes:
+        if not index.unique and index.name not in expected:
+            index.drop(connection)
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+async def bucket_for_write[T: Model](
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[T],
+    at: datetime,
+) -> type[T]:
+    """Return the model that stores a ``model`` row created at ``at``.
+
+    Creates the child table when its bucket is new.  Models outside
+    :data:`BUCKETED_MODELS`, or any model while bucketing is disabled, are
+    returned unchanged.
+
+    Raises:
+        DatabaseError: If the child table cannot be created.
+    """
+    if _state.period == "none" or model not in BUCKETED_MODELS:
+        return model
+    parent = model.__table__.name
+    starts_at, ends_at = bucket_bounds(at, _state.period)
+    table_name = bucket_table_name(parent, starts_at, _state.period)
+    bucket = _known(parent).get(table_name)
+    if bucket is not None:
+        return cast("type[T]", bucket.model)
+    pending: list[_PendingChange] = session.info.setdefault(SESSION_PENDING_KEY, [])
+    for change in pending:
+        if change.bucket.table_name == table_name and not change.dropped:
+            return cast("type[T]", change.bucket.model)
+    bucket = RecordBucket(
+        _bucket_model(model, table_name), table_name, starts_at, ends_at
+    )
+
+    def create(connection: Connection) -> None:
+        table = bucket.model.__table__
+        connection.execute(CreateTable(table, if_not_exists=True))
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+    try:
+        connection = await session.connection()
+        await connection.run_sync(create)
+    except SQLAlchemyError as exc:
+        raise DatabaseError(f"Failed to create record bucket {table_name}") from exc
+    pending.append(_PendingChange(parent, bucket))
+    return cast("type[T]", bucket.model)
+
+
+def buckets_for_read[T: Model](
+    model: type[T],
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[type[T]]:
+    """Return the models to read for rows created in ``[since, until]``.
+
+    Known children overlapping the window come first, newest first, followed
+    by ``model`` itself for rows written before bucketing.
+    """
+    if model not in BUCKETED_MODELS:
+        return [model]
+    since = None if since is None else as_utc(since)
+    until = None if until is None else as_utc(until)
+    children = [
+        cast("type[T]", bucket.model)
+        for bucket in known_buckets(model)
+        if (since is None or bucket.ends_at > since)
+        and (until is None or bucket.starts_at <= until)
+    ]
+    return [*children, model]
+
+
+def buckets_before(parent_model: type[Model], cutoff: datetime) -> list[RecordBucket]:
+    """Return known children starting before ``cutoff``, oldest first."""
+    cutoff = as_utc(cutoff)
+    return [
+        bucket
+        for bucket in reversed(known_buckets(parent_model))
+        if bucket.starts_at < cutoff
+    ]
+
+
+async def drop_bucket(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    parent_model: type[Model],
+    bucket: RecordBucket,
+) -> None:
+    """Drop the child table of ``bucket``; it is forgotten on commit.
+
+    Raises:
+        DatabaseError: If the table cannot be dropped.
+    """
+    try:
+        await session.execute(DropTable(bucket.model.__table__, if_exists=True))
+    except SQLAlchemyError as exc:
+        raise DatabaseError(
+            f"Failed to drop record bucket {bucket.table_name}"
+        ) from exc
+    session.info.setdefault(SESSION_PENDING_KEY, []).append(
+        _PendingChange(parent_model.__table__.name, bucket, dropped=True)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    for change in session.info.pop(SESSION_PENDING_KEY, ()):
+        if change.dropped:
+            _known(change.parent).pop(change.bucket.table_name, None)
+        else:
+            _known(change.parent)[change.bucket.table_name] = change.bucket
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    # A rolled back CREATE TABLE IF NOT EXISTS is simply repeated next time.
+    session.info.pop(SESSION_PENDING_KEY, None)
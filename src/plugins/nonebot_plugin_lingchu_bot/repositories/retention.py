@@ -0,0 +1,146 @@
+"""Chunked deletion of expired message and audit rows.
+
+Rows are deleted in ascending primary-key chunks so no single statement
+holds a long write lock.  Each sweep first seeks the ``(created_at, id)``
+expiry index for the last expired id and never walks the key past it, so
+retained rows are not read.  A sweep that stops early leaves the last
+deleted id in ``lingchu_retention_watermarks`` and the next sweep resumes
+after it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database.models import (
+    AuditRecord,
+    MessageRecord,
+    QQOneBotV11NoneBotAuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+    RetentionWatermark,
+)
+from ..database.orm_crud import DatabaseError, delete, get_one, list_ids, upsert
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+type RetentionModel = type[
+    MessageRecord
+    | AuditRecord
+    | QQOneBotV11NoneBotEventRecord
+    | QQOneBotV11NoneBotAuditRecord
+]
+
+RETENTION_MODELS: tuple[RetentionModel, ...] = (
+    MessageRecord,
+    AuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+    QQOneBotV11NoneBotAuditRecord,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DeletedChunk:
+    """Outcome of one chunk; ``last_id`` is ``None`` when nothing was due."""
+
+    selected: int
+    deleted: int
+    last_id: int | None
+    known: bool
+
+
+async def get_watermark(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    table_name: str,
+) -> int:
+    """Return the id an unfinished sweep of ``table_name`` stopped at, or 0."""
+    watermark = await get_one(session, RetentionWatermark, {"table_name": table_name})
+    return 0 if watermark is None else watermark.last_id
+
+
+async def save_watermark(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    table_name: str,
+    last_id: int,
+) -> None:
+    now = datetime.now(UTC)
+    await upsert(
+        session,
+        RetentionWatermark,
+        {"table_name": table_name, "last_id": last_id, "updated_at": now},
+        conflict_fields=["table_name"],
+        update_values={"last_id": last_id, "updated_at": now},
+    )
+
+
+async def clear_watermark(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    table_name: str,
+) -> None:
+    await delete(session, RetentionWatermark, {"table_name": table_name})
+
+
+async def last_expired_id(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: RetentionModel,
+    *,
+    cutoff: datetime,
+) -> int | None:
+    """Return the largest id created before ``cutoff``, or ``None``.
+
+    Reads only the expired entries of the ``(created_at, id)`` index.
+
+    Raises:
+        DatabaseError: If the lookup fails.
+    """
+    # ``max(id)`` would let the planner walk the key down from the newest row,
+    # through every retained one; ``id + 0`` keeps it on the expiry index.
+    try:
+        return await session.scalar(
+            select(func.max(model.id + 0)).where(model.created_at < cutoff)
+        )
+    except SQLAlchemyError as exc:
+        raise DatabaseError("Failed to find the last expired id") from exc
+
+
+async def delete_expired_chunk(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: RetentionModel,
+    *,
+    cutoff: datetime,
+    after_id: int,
+    up_to_id: int,
+    batch_size: int,
+) -> DeletedChunk:
+    """Delete up to ``batch_size`` rows created before ``cutoff`` by id.
+
+    Only ids in ``(after_id, up_to_id]`` are considered, in ascending order;
+    ``up_to_id`` comes from :func:`last_expired_id`.
+
+    Raises:
+        DatabaseError: If the id scan or the delete fails.
+    """
+    ids = await list_ids(
+        session,
+        model,
+        conditions=[
+            model.id > after_id,
+            model.id <= up_to_id,
+            model.created_at < cutoff,
+        ],
+        limit=batch_size,
+    )
+    if not ids:
+        return DeletedChunk(selected=0, deleted=0, last_id=None, known=True)
+    deleted, known = await delete(session, model, {"id": tuple(ids)})
+    return DeletedChunk(
+        selected=len(ids),
+        deleted=deleted if known else len(ids),
+        last_id=ids[-1],
+        known=known,
+    )
@@ -1,4 +1,4 @@
-"""Repository helpers for persistent scheduler job specs."""
+"""Repository helpers for persistent scheduler job specs and run history."""
 
 from __future__ import annotations
 
@@ -6,8 +6,8 @@ from datetime import UTC, datetime
 import json
 from typing import TYPE_CHECKING, Any
 
-from ..database.models import ScheduledJob
-from ..database.orm_crud import delete, get_one, list_items, upsert
+from ..database.models import ScheduledJob, ScheduledJobRun
+from ..database.orm_crud import create, delete, get_one, list_items, upsert
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
@@ -106,3 +106,65 @@ def decode_job_payload(
             "scheduled job kwargs must be a JSON object",
         )
     return trigger_kwargs, args, kwargs
+
+
+async def save_job_run(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    *,
+    job_id: str,
+    handler_key: str,
+    started_at: datetime,
+    finished_at: datetime,
+    duration_ms: float | None = None,
+    result: Any = None,
+    exception: str | None = None,
+    misfired: bool = False,
+    skipped: bool = False,
+) -> ScheduledJobRun:
+    """Insert one run; ``result`` is stored as JSON, tuples becoming arrays."""
+    return await create(
+        session,
+        ScheduledJobRun,
+        job_id=job_id,
+        handler_key=handler_key,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_ms=duration_ms,
+        result=None
+        if result is None
+        else json.dumps(result, ensure_ascii=False, default=repr),
+        exception=exception,
+        misfired=misfired,
+        skipped=skipped,
+    )
+
+
+async def list_job_runs(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    *,
+    limit: int,
+) -> list[ScheduledJobRun]:
+    """Return the latest ``limit`` runs, newest first."""
+    return await list_items(
+        session,
+        ScheduledJobRun,
+        order_by=["-started_at", "-id"],
+        limit=limit,
+    )
+
+
+async def delete_job_runs_before(
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    before: datetime,
+) -> tuple[int, bool]:
+    """Delete runs that started before ``before``."""
+    return await delete(
+        session,
+        ScheduledJobRun,
+        {},
+        conditions=[ScheduledJobRun.started_at < before],
+    )
+
+
+def decode_job_run_result(run: ScheduledJobRun) -> Any:
+    return None if run.result is None else _json_load(run.result)
@@ -0,0 +1,63 @@
+"""Single-query lookup for user entries stored per global and group scope."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import and_, or_
+
+from ..database.models import BlocklistEntry, SubjectPolicyEntry
+from ..database.orm_crud import list_items
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+
+@dataclass(frozen=True, slots=True)
+class ScopeFilter:
+    """One ``(scope, scope_key)`` pair, optionally pinned to a protocol."""
+
+    scope: str
+    scope_key: str
+    protocol_id: str | None = None
+
+
+async def find_active_scoped_entry[T: (BlocklistEntry, SubjectPolicyEntry)](
+    session: AsyncSession | async_scoped_session[AsyncSession],
+    model: type[T],
+    filters: Mapping[str, Any],
+    scopes: Sequence[ScopeFilter],
+) -> T | None:
+    """Return the active entry of the first matching scope in one query.
+
+    Global rows sort before group rows.  Expired rows are skipped and left to the
+    expiry service, so the lookup never writes.
+
+    Raises:
+        DatabaseError: If the query fails.
+    """
+    if not scopes:
+        return None
+    scope_conditions = []
+    for item in scopes:
+        conditions = [model.scope == item.scope, model.scope_key == item.scope_key]
+        if item.protocol_id is not None:
+            conditions.append(model.protocol_id == item.protocol_id)
+        scope_conditions.append(and_(*conditions))
+    entries = await list_items(
+        session,
+        model,
+        dict(filters),
+        # "global" < "group", so the global entry wins when both exist.
+        order_by=["scope"],
+        conditions=[
+            or_(*scope_conditions),
+            or_(model.expires_at.is_(None), model.expires_at > datetime.now(UTC)),
+        ],
+        limit=1,
+    )
+    return entries[0] if entries else None
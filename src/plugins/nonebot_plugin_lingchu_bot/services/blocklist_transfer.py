@@ -0,0 +1,247 @@
+"""CSV and JSON Lines import/export for the blocklist.
+
+Both formats carry the columns in :data:`BLOCKLIST_TRANSFER_FIELDS`; the file
+suffix selects the format.  Imports stream the file into
+:func:`~..repositories.blocklist.bulk_upsert_blocks` inside one transaction,
+so a malformed line rolls the whole import back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from datetime import UTC, datetime
+import json
+from typing import TYPE_CHECKING, Any, Literal
+
+from nonebot import require
+
+require("nonebot_plugin_orm")
+from nonebot_plugin_orm import get_session
+
+from ..repositories.blocklist import (
+    BlocklistUpsert,
+    bulk_upsert_blocks,
+    list_blocks,
+)
+from ..repositories.expiry import as_utc
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from pathlib import Path
+
+    from ..database.models import BlocklistEntry
+
+BlocklistFormat = Literal["csv", "jsonl"]
+
+BLOCKLIST_TRANSFER_FIELDS = (
+    "platform_id",
+    "adapter_id",
+    "protocol_id",
+    "bot_id",
+    "scope",
+    "group_id",
+    "user_id",
+    "operator_id",
+    "reason",
+    "expires_at",
+)
+_REQUIRED_FIELDS = ("platform_id", "adapter_id", "bot_id", "user_id")
+_SUFFIX_FORMATS: dict[str, BlocklistFormat] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+class BlocklistTransferError(ValueError):
+    """Raised when a blocklist file cannot be read or has an invalid record."""
+
+
+def blocklist_format(path: Path) -> BlocklistFormat:
+    """Return the transfer format selected by the suffix of ``path``.
+
+    Raises:
+        BlocklistTransferError: If the suffix is not ``.csv`` or ``.jsonl``.
+    """
+    try:
+        return _SUFFIX_FORMATS[path.suffix.lower()]
+    except KeyError:
+        msg = f"unsupported blocklist file type: {path.suffix or path.name}"
+        raise BlocklistTransferError(msg) from None
+
+
+def read_blocklist(
+    path: Path,
+    overrides: Mapping[str, str] | None = None,
+) -> Iterator[BlocklistUpsert]:
+    """Yield one request per record of ``path``.
+
+    ``overrides`` replaces columns of every record, e.g. ``bot_id`` so a list
+    exported by another bot is imported for the current one.
+
+    Raises:
+        BlocklistTransferError: On an unreadable file or an invalid record.
+    """
+    file_format = blocklist_format(path)
+    try:
+        with path.open(encoding="utf-8", newline="") as file:
+            records = (
+                _csv_records(file) if file_format == "csv" else _jsonl_records(file)
+            )
+            for line, record in records:
+                yield _request_from_record(line, {**record, **(overrides or {})})
+    except OSError as error:
+        msg = f"cannot read {path}: {error}"
+        raise BlocklistTransferError(msg) from error
+
+
+def write_blocklist(path: Path, entries: Iterable[BlocklistEntry]) -> int:
+    """Write ``entries`` to ``path`` and return how many were written.
+
+    Raises:
+        BlocklistTransferError: On an unsupported suffix or a write failure.
+    """
+    file_format = blocklist_format(path)
+    written = 0
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="") as file:
+            if file_format == "csv":
+                writer = csv.writer(file)
+                writer.writerow(BLOCKLIST_TRANSFER_FIELDS)
+                for entry in entries:
+                    record = _record_from_entry(entry)
+                    writer.writerow(
+                        record[field] or "" for field in BLOCKLIST_TRANSFER_FIELDS
+                    )
+                    written += 1
+            else:
+                for entry in entries:
+                    record = _record_from_entry(entry)
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    written += 1
+    except OSError as error:
+        msg = f"cannot write {path}: {error}"
+        raise BlocklistTransferError(msg) from error
+    return written
+
+
+async def import_blocklist(
+    path: Path,
+    overrides: Mapping[str, str] | None = None,
+) -> int:
+    """Import ``path`` in one transaction and return the rows written.
+
+    Raises:
+        BlocklistTransferError: On an unreadable file or an invalid record.
+        DatabaseError: If a bulk upsert fails.
+    """
+    async with get_session() as session, session.begin():
+        return await bulk_upsert_blocks(session, read_blocklist(path, overrides))
+
+
+async def export_blocklist(
+    path: Path,
+    *,
+    platform_id: str | None = None,
+    adapter_id: str | None = None,
+    bot_id: str | None = None,
+) -> int:
+    """Export stored entries, optionally for one bot, to ``path``.
+
+    Raises:
+        BlocklistTransferError: On an unsupported suffix or a write failure.
+        DatabaseError: If the entries cannot be read.
+    """
+    blocklist_format(path)
+    async with get_session() as session:
+        entries = await list_blocks(
+            session, platform_id=platform_id, adapter_id=adapter_id, bot_id=bot_id
+        )
+    return await asyncio.to_thread(write_blocklist, path, entries)
+
+
+def _csv_records(file: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    reader = csv.DictReader(file)
+    if "user_id" not in (reader.fieldnames or ()):
+        msg = "line 1: CSV header has no user_id column"
+        raise BlocklistTransferError(msg)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _jsonl_records(file: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as error:
+            msg = f"line {line}: invalid JSON: {error}"
+            raise BlocklistTransferError(msg) from error
+        if not isinstance(record, dict):
+            msg = f"line {line}: expected a JSON object"
+            raise BlocklistTransferError(msg)
+        yield line, record
+
+
+def _request_from_record(line: int, record: Mapping[str, Any]) -> BlocklistUpsert:
+    values = {field: _text(record.get(field)) for field in BLOCKLIST_TRANSFER_FIELDS}
+    for field in _REQUIRED_FIELDS:
+        if values[field] is None:
+            msg = f"line {line}: {field} is required"
+            raise BlocklistTransferError(msg)
+    scope = values["scope"] or ("group" if values["group_id"] else "global")
+    if scope not in {"group", "global"}:
+        msg = f"line {line}: scope must be group or global, not {scope!r}"
+        raise BlocklistTransferError(msg)
+    if scope == "group" and values["group_id"] is None:
+        msg = f"line {line}: group_id is required for group scope"
+        raise BlocklistTransferError(msg)
+    return BlocklistUpsert(
+        platform_id=str(values["platform_id"]),
+        adapter_id=str(values["adapter_id"]),
+        bot_id=str(values["bot_id"]),
+        scope="group" if scope == "group" else "global",
+        group_id=values["group_id"] if scope == "group" else None,
+        user_id=str(values["user_id"]),
+        operator_id=values["operator_id"],
+        reason=values["reason"],
+        expires_at=_parse_expires_at(line, values["expires_at"]),
+        protocol_id=values["protocol_id"],
+    )
+
+
+def _text(value: object) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _parse_expires_at(line: int, value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        return as_utc(datetime.fromisoformat(value))
+    except ValueError as error:
+        msg = f"line {line}: expires_at is not an ISO 8601 timestamp: {value!r}"
+        raise BlocklistTransferError(msg) from error
+
+
+def _record_from_entry(entry: BlocklistEntry) -> dict[str, str | None]:
+    return {
+        "platform_id": entry.platform_id,
+        "adapter_id": entry.adapter_id,
+        "protocol_id": entry.protocol_id,
+        "bot_id": entry.bot_id,
+        "scope": entry.scope,
+        "group_id": entry.group_id,
+        "user_id": entry.user_id,
+        "operator_id": entry.operator_id,
+        "reason": entry.reason,
+        "expires_at": None
+        if entry.expires_at is None
+        else as_utc(entry.expires_at).astimezone(UTC).isoformat(),
+    }
@@ -0,0 +1,215 @@
+"""Precise expiry of temporary blocklist entries and subject policies.
+
+Pending ``expires_at`` deadlines are kept in a min-heap and one APScheduler
+``date`` job is armed for the earliest of them.  When it fires, every row
+that expired since the last watermark is deleted by primary key, in
+bounded chunks that each commit on their own, and an
+:class:`ExpiryEvent` is published to the registered listeners.  The interval
+cleanup job in ``services/scheduler.py`` calls :func:`reap_expired` as a
+safety net for deadlines written by other processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import heapq
+import logging
+
+from apscheduler.jobstores.base import JobLookupError
+from nonebot import require
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+require("nonebot_plugin_apscheduler")
+from nonebot_plugin_apscheduler import scheduler
+
+require("nonebot_plugin_orm")
+from nonebot_plugin_orm import get_session
+
+from ..database.models import BlocklistEntry, SubjectPolicyEntry
+from ..database.orm_crud import DatabaseError
+from ..repositories.blocklist_index import BlockKey, block_key, expire_blocks
+from ..repositories.expiry import (
+    SESSION_DEADLINES_KEY,
+    list_pending_deadlines,
+    reap_expired_entries,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_JOB_ID = "lingchu.expiry"
+_RETRY_DELAY = timedelta(minutes=1)
+# Keeps each ``id IN (...)`` delete well under SQLite's bound-variable limit.
+_REAP_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True, slots=True)
+class ExpiryEvent:
+    """Rows deleted by one reap, up to and including ``until``."""
+
+    until: datetime
+    blocks: tuple[BlockKey, ...]
+    subject_policies: int
+
+
+type ExpiryListener = Callable[[ExpiryEvent], None]
+
+
+@dataclass(slots=True)
+class _ExpiryState:
+    deadlines: list[datetime] = field(default_factory=list)
+    armed_at: datetime | None = None
+    watermark: datetime | None = None
+    running: bool = False
+    listeners: list[ExpiryListener] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+_state = _ExpiryState()
+
+
+def add_expiry_listener(listener: ExpiryListener) -> None:
+    """Call ``listener`` after every reap that committed."""
+    _state.listeners.append(listener)
+
+
+def schedule_expiry(expires_at: datetime) -> None:
+    """Fire a reap at ``expires_at``; ignored until the service is running."""
+    if not _state.running:
+        return
+    heapq.heappush(_state.deadlines, expires_at)
+    _arm()
+
+
+async def initialize_expiry_service() -> None:
+    """Load pending deadlines from both tables and arm the first one."""
+    now = datetime.now(UTC)
+    try:
+        async with get_session() as session:
+            deadlines = [
+                *await list_pending_deadlines(session, BlocklistEntry, after=now),
+                *await list_pending_deadlines(session, SubjectPolicyEntry, after=now),
+            ]
+    except DatabaseError:
+        logger.exception("Failed to load blocklist and subject policy deadlines")
+        deadlines = []
+    heapq.heapify(deadlines)
+    _state.deadlines = deadlines
+    _state.running = True
+    _arm()
+
+
+async def shutdown_expiry_service() -> None:
+    """Disarm the expiry job and forget pending deadlines."""
+    _state.running = False
+    _state.deadlines.clear()
+    _state.watermark = None
+    if _state.armed_at is None:
+        return
+    _state.armed_at = None
+    try:
+        scheduler.remove_job(EXPIRY_JOB_ID)
+    except JobLookupError:
+        logger.debug("Expiry job %s was not present at shutdown", EXPIRY_JOB_ID)
+
+
+async def reap_expired(now: datetime | None = None) -> ExpiryEvent:
+    """Delete rows that expired since the last reap and publish them.
+
+    The first reap after startup scans every expired row; later reaps only
+    scan the ``expires_at`` range after the previous watermark.  Each chunk
+    of at most ``_REAP_BATCH_SIZE`` rows is deleted in its own transaction.
+
+    Raises:
+        DatabaseError: If the scan or delete fails; the watermark is kept.
+    """
+    async with _state.lock:
+        until = datetime.now(UTC) if now is None else now
+        blocks = await _reap_in_chunks(BlocklistEntry, until)
+        keys = tuple(
+            block_key(
+                entry.platform_id,
+                entry.adapter_id,
+                entry.bot_id,
+                entry.scope_key,
+                entry.user_id,
+            )
+            for entry in blocks
+        )
+        policies = await _reap_in_chunks(SubjectPolicyEntry, until)
+        _state.watermark = until
+    expired = ExpiryEvent(until=until, blocks=keys, subject_policies=len(policies))
+    expire_blocks(expired.blocks, until)
+    for listener in tuple(_state.listeners):
+        try:
+            listener(expired)
+        except Exception:
+            logger.exception("Expiry listener %r failed", listener)
+    return expired
+
+
+async def _reap_in_chunks[T: (BlocklistEntry, SubjectPolicyEntry)](
+    model: type[T], until: datetime
+) -> list[T]:
+    reaped: list[T] = []
+    while True:
+        async with get_session() as session, session.begin():
+            chunk = await reap_expired_entries(
+                session,
+                model,
+                since=_state.watermark,
+                until=until,
+                limit=_REAP_BATCH_SIZE,
+            )
+        reaped.extend(chunk)
+        if len(chunk) < _REAP_BATCH_SIZE:
+            return reaped
+
+
+async def _fire() -> None:
+    _state.armed_at = None
+    now = datetime.now(UTC)
+    try:
+        await reap_expired(now)
+    except DatabaseError:
+        logger.exception("Failed to reap expired blocklist and subject policies")
+        while _state.deadlines and _state.deadlines[0] <= now:
+            heapq.heappop(_state.deadlines)
+        if _state.running:
+            heapq.heappush(_state.deadlines, now + _RETRY_DELAY)
+    else:
+        while _state.deadlines and _state.deadlines[0] <= now:
+            heapq.heappop(_state.deadlines)
+    if _state.running:
+        _arm()
+
+
+def _arm() -> None:
+    if not _state.deadlines:
+        return
+    deadline = _state.deadlines[0]
+    if _state.armed_at is not None and _state.armed_at <= deadline:
+        return
+    scheduler.add_job(
+        _fire,
+        "date",
+        run_date=deadline,
+        id=EXPIRY_JOB_ID,
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+    _state.armed_at = deadline
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_after_commit(session: Session) -> None:
+    for expires_at in session.info.pop(SESSION_DEADLINES_KEY, ()):
+        schedule_expiry(expires_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(SESSION_DEADLINES_KEY, None)
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 from nonebot import require
 
@@ -14,8 +19,12 @@ from ..core.config import plugin_config
 from ..database.orm_crud import DatabaseError
 from ..platforms import get_platform_profile, resolve_adapter_id
 from ..repositories import message_store as repository
+from ..repositories.record_buckets import configure_record_buckets, load_record_buckets
+from .retention import sweep_expired_records
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from nonebot.adapters import Bot
     from nonebot.matcher import Matcher
 
@@ -24,12 +33,60 @@ if TYPE_CHECKING:
         NormalizedMessageEvent,
         PlatformContext,
     )
+    from ..repositories.record_buckets import BucketPeriod
 
 logger = logging.getLogger(__name__)
 SCHEDULER_CLEANUP_HANDLER_KEY = "message_store.cleanup_expired_messages"
 STATE_KEY = "_lingchu_message_record_identity"
 SUMMARY_LIMIT = 500
 ELLIPSIS_LENGTH = 3
+EVENT_WRITER_TASK_NAME = "message_store_event_writer"
+
+
+@dataclass(frozen=True, slots=True)
+class EventWriteQueueStats:
+    """Point-in-time counters for the write-behind event queue."""
+
+    depth: int
+    enqueued: int
+    written: int
+    coalesced: int
+    dropped: int
+    flushes: int
+    failed_flushes: int
+    last_flush_seconds: float
+    max_flush_seconds: float
+    total_flush_seconds: float
+
+
+@dataclass(slots=True)
+class _EventWriteQueue:
+    pending: list[repository.ReceivedEventWrite] = field(default_factory=list)
+    pending_index: dict[MessageIdentity, int] = field(default_factory=dict)
+    raw_payload_loaders: dict[int, Callable[[], tuple[str | None, str | None]]] = field(
+        default_factory=dict
+    )
+    status_updates: dict[MessageIdentity, repository.MatcherResultWrite] = field(
+        default_factory=dict
+    )
+    has_items: asyncio.Event = field(default_factory=asyncio.Event)
+    batch_full: asyncio.Event = field(default_factory=asyncio.Event)
+    flush_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    writer: asyncio.Task[None] | None = None
+    closed: bool = False
+    overflowing: bool = False
+    enqueued: int = 0
+    written: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    last_flush_seconds: float = 0.0
+    max_flush_seconds: float = 0.0
+    total_flush_seconds: float = 0.0
+
+
+_event_queue = _EventWriteQueue()
 
 
 def _truncate(value: str | None, limit: int | None = None) -> str | None:
@@ -54,34 +111,255 @@ async def initialize_message_store() -> None:
     if not plugin_config.message_store_enabled:
         logger.info("Message store is disabled")
         return
+    _event_queue.closed = False
+    configure_record_buckets(
+        cast("BucketPeriod", plugin_config.message_store_partition_period)
+    )
+    try:
+        async with get_session() as session:
+            buckets = await load_record_buckets(session)
+            await session.commit()
+    except DatabaseError:
+        logger.exception("Failed to load message store time buckets")
+    else:
+        if buckets:
+            logger.info("Loaded %d message store time buckets", buckets)
     logger.info("Message store initialized")
 
 
 async def shutdown_message_store() -> None:
-    """Run lightweight shutdown maintenance for message storage."""
+    """Drain queued event writes and run lightweight shutdown maintenance.
+
+    Shutdown sweeps at most one chunk per table; the scheduled cleanup job
+    resumes from the persisted watermark.
+    """
+    if not plugin_config.message_store_enabled:
+        return
+    await stop_event_writer()
+    await cleanup_expired_messages(max_chunks=1)
+
+
+def get_event_queue_stats() -> EventWriteQueueStats:
+    """Return queue depth and flush latency counters for the event writer."""
+    queue = _event_queue
+    return EventWriteQueueStats(
+        depth=_queue_depth(),
+        enqueued=queue.enqueued,
+        written=queue.written,
+        coalesced=queue.coalesced,
+        dropped=queue.dropped,
+        flushes=queue.flushes,
+        failed_flushes=queue.failed_flushes,
+        last_flush_seconds=queue.last_flush_seconds,
+        max_flush_seconds=queue.max_flush_seconds,
+        total_flush_seconds=queue.total_flush_seconds,
+    )
+
+
+def _queue_depth() -> int:
+    return len(_event_queue.pending) + len(_event_queue.status_updates)
+
+
+def _received_event_write(
+    normalized: NormalizedMessageEvent,
+) -> repository.ReceivedEventWrite:
+    identity = normalized.identity
+    return repository.ReceivedEventWrite(
+        platform_id=identity.platform_id,
+        adapter_id=identity.adapter_id,
+        protocol_id=identity.protocol_id,
+        framework_id=identity.framework_id,
+        bot_id=identity.bot_id,
+        conversation_id=identity.conversation_id,
+        user_id=normalized.user_id,
+        message_id=identity.message_id,
+        event_type=normalized.event_type,
+        event_category=normalized.event_category,
+        message_type=normalized.message_type,
+        text_summary=normalized.text_summary,
+        raw_message=normalized.raw_message,
+        raw_event=normalized.raw_event,
+        received_at=datetime.now(UTC),
+    )
+
+
+def enqueue_event_received(normalized: NormalizedMessageEvent) -> bool:
+    """Queue an incoming normalized event for the batched background writer.
+
+    Returns ``False`` when the store is disabled or the queue is full and the
+    event was dropped.
+    """
     if not plugin_config.message_store_enabled:
+        return False
+    queue = _event_queue
+    if _queue_is_full():
+        return False
+    if normalized.identity.message_id is not None:
+        queue.pending_index[normalized.identity] = len(queue.pending)
+    if normalized.raw_payload_loader is not None:
+        queue.raw_payload_loaders[len(queue.pending)] = normalized.raw_payload_loader
+    queue.pending.append(_received_event_write(normalized))
+    queue.enqueued += 1
+    _wake_event_writer()
+    return True
+
+
+def _queue_is_full() -> bool:
+    queue = _event_queue
+    depth = _queue_depth()
+    if depth < plugin_config.message_store_write_queue_limit:
+        return False
+    queue.dropped += 1
+    if not queue.overflowing:
+        queue.overflowing = True
+        logger.warning(
+            "Message store write queue is full (%d); dropping incoming writes",
+            depth,
+        )
+    return True
+
+
+def _wake_event_writer() -> None:
+    queue = _event_queue
+    queue.has_items.set()
+    if _queue_depth() >= plugin_config.message_store_write_batch_size:
+        queue.batch_full.set()
+    _ensure_event_writer()
+
+
+def _ensure_event_writer() -> None:
+    queue = _event_queue
+    if queue.closed or (queue.writer is not None and not queue.writer.done()):
         return
-    await cleanup_expired_messages()
+    queue.writer = asyncio.create_task(_run_event_writer(), name=EVENT_WRITER_TASK_NAME)
+
+
+async def _run_event_writer() -> None:
+    """Flush the queue when a batch fills up or the flush interval elapses."""
+    queue = _event_queue
+    while not queue.closed:
+        await queue.has_items.wait()
+        if (
+            not queue.closed
+            and _queue_depth() < plugin_config.message_store_write_batch_size
+        ):
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(
+                    plugin_config.message_store_write_interval_ms / 1000
+                ):
+                    await queue.batch_full.wait()
+        queue.has_items.clear()
+        queue.batch_full.clear()
+        await flush_event_queue()
+
+
+async def flush_event_queue() -> int:
+    """Write every queued event and status now; return the rows submitted."""
+    queue = _event_queue
+    async with queue.flush_lock:
+        if not queue.pending and not queue.status_updates:
+            return 0
+        batch = queue.pending
+        loaders = queue.raw_payload_loaders
+        statuses = list(queue.status_updates.values())
+        queue.pending = []
+        queue.pending_index = {}
+        queue.raw_payload_loaders = {}
+        queue.status_updates = {}
+        queue.overflowing = False
+        batch_size = plugin_config.message_store_write_batch_size
+        started = time.perf_counter()
+        _load_raw_payloads(batch, loaders)
+        try:
+            async with get_session() as session:
+                written = 0
+                for offset in range(0, len(batch), batch_size):
+                    written += await repository.record_events_received(
+                        session,
+                        batch[offset : offset + batch_size],
+                    )
+                for offset in range(0, len(statuses), batch_size):
+                    await repository.record_matcher_results(
+                        session,
+                        statuses[offset : offset + batch_size],
+                    )
+                await session.commit()
+        except DatabaseError:
+            logger.exception(
+                "Failed to flush %d queued message events and %d statuses",
+                len(batch),
+                len(statuses),
+            )
+            queue.failed_flushes += 1
+            queue.dropped += len(batch) + len(statuses)
+            return 0
+        finally:
+            elapsed = time.perf_counter() - started
+            queue.last_flush_seconds = elapsed
+            queue.max_flush_seconds = max(queue.max_flush_seconds, elapsed)
+            queue.total_flush_seconds += elapsed
+        queue.flushes += 1
+        queue.written += written
+        return written + len(statuses)
+
+
+def _load_raw_payloads(
+    batch: list[repository.ReceivedEventWrite],
+    loaders: dict[int, Callable[[], tuple[str | None, str | None]]],
+) -> None:
+    """Serialize deferred raw payloads in place, once per batch row."""
+    for index, loader in loaders.items():
+        try:
+            raw_message, raw_event = loader()
+        except (TypeError, ValueError):
+            logger.exception("Failed to serialize deferred raw message payloads")
+            continue
+        batch[index] = replace(
+            batch[index], raw_message=raw_message, raw_event=raw_event
+        )
+
+
+async def stop_event_writer() -> None:
+    """Stop the background writer and drain every queued event."""
+    queue = _event_queue
+    queue.closed = True
+    queue.has_items.set()
+    queue.batch_full.set()
+    writer = queue.writer
+    queue.writer = None
+    if writer is not None and writer is not asyncio.current_task():
+        await writer
+    await flush_event_queue()
 
 
-async def cleanup_expired_messages() -> tuple[int, bool]:
-    """Delete expired message records according to configuration."""
+async def cleanup_expired_messages(
+    *, max_chunks: int | None = None
+) -> tuple[int, bool]:
+    """Delete expired message and audit records in rate-limited chunks.
+
+    ``max_chunks`` bounds the chunks swept per table; ``None`` sweeps until
+    no expired row is left.
+    """
     if (
         not plugin_config.message_store_enabled
         or not plugin_config.message_store_cleanup_enabled
     ):
         return (0, True)
     try:
-        async with get_session() as session:
-            result = await repository.cleanup_expired_messages(
-                session,
-                retention_days=plugin_config.message_store_retention_days,
-            )
-            await session.commit()
-            return result
+        progress = await sweep_expired_records(
+            retention_days=plugin_config.message_store_retention_days,
+            batch_size=plugin_config.message_store_cleanup_batch_size,
+            pause_seconds=plugin_config.message_store_cleanup_pause_ms / 1000,
+            max_chunks=max_chunks,
+            vacuum=plugin_config.message_store_cleanup_incremental_vacuum,
+        )
     except DatabaseError:
         logger.exception("Failed to cleanup expired message records")
         return (0, False)
+    return (
+        sum(item.deleted for item in progress),
+        all(item.known for item in progress),
+    )
 
 
 async def record_bot_lifecycle(bot: Bot, event_type: str) -> bool:
@@ -126,65 +404,47 @@ async def record_bot_lifecycle(bot: Bot, event_type: str) -> bool:
     return True
 
 
-async def handle_event_received(normalized: NormalizedMessageEvent) -> None:
-    """Persist an incoming normalized message event."""
-    if not plugin_config.message_store_enabled:
-        return
-    identity = normalized.identity
-    try:
-        async with get_session() as session:
-            await repository.record_event_received(
-                session,
-                platform_id=identity.platform_id,
-                adapter_id=identity.adapter_id,
-                protocol_id=identity.protocol_id,
-                framework_id=identity.framework_id,
-                bot_id=identity.bot_id,
-                conversation_id=identity.conversation_id,
-                user_id=normalized.user_id,
-                message_id=identity.message_id,
-                event_type=normalized.event_type,
-                event_category=normalized.event_category,
-                message_type=normalized.message_type,
-                text_summary=normalized.text_summary,
-                raw_message=normalized.raw_message,
-                raw_event=normalized.raw_event,
-            )
-            await session.commit()
-    except DatabaseError:
-        logger.exception("Failed to record incoming message event")
-
-
-async def handle_matcher_result(
+def handle_matcher_result(
     identity: MessageIdentity,
     matcher: Matcher,
     exception: Exception | None,
 ) -> bool:
-    """Update processing status for a stored message record."""
-    if not plugin_config.message_store_enabled:
+    """Record a matcher outcome for the batched writer.
+
+    The status is merged into the queued receipt when it has not been written
+    yet; otherwise it is queued for the next flush's batched ``UPDATE``.
+    """
+    if not plugin_config.message_store_enabled or identity.message_id is None:
         return False
     status = "handled" if exception is None else "failed"
     if getattr(matcher, "block", False):
         status = f"{status}:blocked"
-    try:
-        async with get_session() as session:
-            result = await repository.record_matcher_result(
-                session,
-                platform_id=identity.platform_id,
-                adapter_id=identity.adapter_id,
-                protocol_id=identity.protocol_id,
-                framework_id=identity.framework_id,
-                bot_id=identity.bot_id,
-                conversation_id=identity.conversation_id,
-                message_id=identity.message_id,
-                process_status=status,
-                exception_summary=_stringify(exception),
-            )
-            await session.commit()
-            return result
-    except DatabaseError:
-        logger.exception("Failed to update message processing status")
+    exception_summary = _stringify(exception)
+    queue = _event_queue
+    index = queue.pending_index.get(identity)
+    if index is not None:
+        queue.pending[index] = replace(
+            queue.pending[index],
+            process_status=status,
+            exception_summary=exception_summary,
+        )
+        queue.coalesced += 1
+        return True
+    if identity not in queue.status_updates and _queue_is_full():
         return False
+    queue.status_updates[identity] = repository.MatcherResultWrite(
+        platform_id=identity.platform_id,
+        adapter_id=identity.adapter_id,
+        protocol_id=identity.protocol_id,
+        framework_id=identity.framework_id,
+        bot_id=identity.bot_id,
+        conversation_id=identity.conversation_id,
+        message_id=identity.message_id,
+        process_status=status,
+        exception_summary=exception_summary,
+    )
+    _wake_event_writer()
+    return True
 
 
 async def handle_api_called(
@@ -0,0 +1,195 @@
+"""Incremental retention sweeper for the message and audit tables.
+
+Each table in :data:`~..repositories.retention.RETENTION_MODELS` is swept on
+its own: expired rows are deleted in primary-key-ordered chunks of
+``batch_size``, every chunk commits in its own transaction and the sweeper
+pauses between chunks so event writes are not starved of the SQLite write
+lock.  A sweep never walks the key past the last expired id, which it finds
+through the ``(created_at, id)`` expiry index.  The last deleted id is
+persisted after each chunk, so a sweep that is stopped early (``max_chunks``,
+shutdown, a database error) resumes there.
+
+Time buckets of the partition tables (see
+:mod:`~..repositories.record_buckets`) that ended before the cutoff are
+dropped whole; only the bucket straddling the cutoff is swept row by row.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import TYPE_CHECKING
+
+from nonebot import require
+
+require("nonebot_plugin_orm")
+from nonebot_plugin_orm import get_session
+
+from ..database.sqlite_pragmas import incremental_vacuum
+from ..repositories import retention as repository
+from ..repositories.record_buckets import buckets_before, drop_bucket
+
+if TYPE_CHECKING:
+    from ..repositories.record_buckets import RecordBucket
+    from ..repositories.retention import RetentionModel
+
+logger = logging.getLogger(__name__)
+_sweep_lock = asyncio.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionProgress:
+    """Rows one sweep deleted from ``table_name``.
+
+    ``finished`` is false when the sweep stopped at ``max_chunks`` with rows
+    still due; the next sweep resumes after the persisted watermark.
+    ``dropped`` buckets were removed with ``DROP TABLE`` and report no row
+    count.
+    """
+
+    table_name: str
+    deleted: int
+    chunks: int
+    known: bool
+    finished: bool
+    dropped: bool = False
+
+
+async def sweep_expired_rows(
+    model: RetentionModel,
+    cutoff: datetime,
+    *,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    max_chunks: int | None = None,
+) -> RetentionProgress:
+    """Delete rows of ``model`` created before ``cutoff``, chunk by chunk.
+
+    Raises:
+        DatabaseError: If a chunk fails; earlier chunks stay committed.
+    """
+    # Bucket models inherit ``__tablename__`` from their partition model.
+    table_name = model.__table__.name
+    async with get_session() as session:
+        after_id = await repository.get_watermark(session, table_name)
+        last_id = await repository.last_expired_id(session, model, cutoff=cutoff)
+    # Rows after the last expired id are retained; stop the key walk there.
+    up_to_id = after_id if last_id is None else last_id
+    deleted = chunks = 0
+    known = True
+    while max_chunks is None or chunks < max_chunks:
+        async with get_session() as session, session.begin():
+            chunk = await repository.delete_expired_chunk(
+                session,
+                model,
+                cutoff=cutoff,
+                after_id=after_id,
+                up_to_id=up_to_id,
+                batch_size=batch_size,
+            )
+            finished = chunk.selected < batch_size
+            if chunk.last_id is not None and not finished:
+                await repository.save_watermark(session, table_name, chunk.last_id)
+            elif after_id:
+                await repository.clear_watermark(session, table_name)
+        if chunk.selected:
+            chunks += 1
+            deleted += chunk.deleted
+            known = known and chunk.known
+            logger.debug(
+                "Retention sweep of %s: chunk %d deleted %d rows up to id %s",
+                table_name,
+                chunks,
+                chunk.deleted,
+                chunk.last_id,
+            )
+        if finished:
+            break
+        after_id = chunk.last_id or after_id
+        if pause_seconds > 0:
+            await asyncio.sleep(pause_seconds)
+    else:
+        finished = False
+    if deleted:
+        logger.info(
+            "Retention sweep of %s deleted %d rows in %d chunks%s",
+            table_name,
+            deleted,
+            chunks,
+            "" if finished else "; more rows remain",
+        )
+    return RetentionProgress(
+        table_name=table_name,
+        deleted=deleted,
+        chunks=chunks,
+        known=known,
+        finished=finished,
+    )
+
+
+async def drop_expired_bucket(
+    parent: RetentionModel, bucket: RecordBucket
+) -> RetentionProgress:
+    """Drop ``bucket`` of ``parent`` and any watermark left on it.
+
+    Raises:
+        DatabaseError: If the table cannot be dropped.
+    """
+    async with get_session() as session, session.begin():
+        await drop_bucket(session, parent, bucket)
+        await repository.clear_watermark(session, bucket.table_name)
+    logger.info("Retention sweep dropped expired bucket %s", bucket.table_name)
+    return RetentionProgress(
+        table_name=bucket.table_name,
+        deleted=0,
+        chunks=0,
+        known=False,
+        finished=True,
+        dropped=True,
+    )
+
+
+async def sweep_expired_records(
+    *,
+    retention_days: int,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    max_chunks: int | None = None,
+    vacuum: bool = False,
+) -> list[RetentionProgress]:
+    """Sweep every retention table for rows older than ``retention_days``.
+
+    ``retention_days <= 0`` keeps every row.  With ``vacuum`` enabled,
+    ``PRAGMA incremental_vacuum`` runs once after a sweep that deleted rows.
+
+    Raises:
+        DatabaseError: If a chunk or the vacuum fails.
+    """
+    if retention_days <= 0:
+        return []
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+    progress: list[RetentionProgress] = []
+    async with _sweep_lock:
+        for parent in repository.RETENTION_MODELS:
+            targets: list[RetentionModel] = [parent]
+            for bucket in buckets_before(parent, cutoff):
+                if bucket.ends_at <= cutoff:
+                    progress.append(await drop_expired_bucket(parent, bucket))
+                else:
+                    targets.append(bucket.model)
+            progress.extend([
+                await sweep_expired_rows(
+                    model,
+                    cutoff,
+                    batch_size=batch_size,
+                    pause_seconds=pause_seconds,
+                    max_chunks=max_chunks,
+                )
+                for model in targets
+            ])
+        if vacuum and any(item.deleted or item.dropped for item in progress):
+            async with get_session() as session, session.begin():
+                await incremental_vacuum(session)
+    return progress
@@ -1,12 +1,34 @@
-"""Persistent scheduler service backed by nonebot-plugin-apscheduler."""
+"""Persistent scheduler service backed by nonebot-plugin-apscheduler.
+
+Decoded job specs are cached by job id when jobs are loaded or registered, so
+a job fire dispatches its handler without a database read.  Each entry keeps
+the row's ``updated_at`` as its version; with
+``scheduler_verify_job_version`` enabled a fire re-reads the row and decodes
+it again only when that version changed out of band.
+
+Each handler call is timed and recorded, with its result or exception, in
+``services/scheduler_history.py``; runs APScheduler drops as missed or skips
+because of ``max_instances`` are recorded from its job events.
+"""
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import UTC, datetime
 import inspect
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+)
 from apscheduler.jobstores.base import JobLookupError
 from nonebot import require
 
@@ -16,19 +38,41 @@ from nonebot_plugin_apscheduler import scheduler
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import get_session
 
+from ..core.config import plugin_config
 from ..database.orm_crud import DatabaseError
-from ..repositories import (
-    blocklist as blocklist_repository,
-    scheduler_jobs as repository,
+from ..repositories import scheduler_jobs as repository
+from ..repositories.expiry import as_utc
+from .expiry import reap_expired
+from .scheduler_history import (
+    JobRun,
+    persist_job_run,
+    record_job_run,
+    remember_job_run,
 )
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 
+    from ..database.models import ScheduledJob
+
 logger = logging.getLogger(__name__)
 SchedulerHandler = Callable[..., Awaitable[Any] | Any]
 _handlers: dict[str, SchedulerHandler] = {}
 _runtime_job_ids: set[str] = set()
+_pending_run_writes: set[asyncio.Task[None]] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedJobSpec:
+    """Decoded handler call of a persisted job, versioned by ``updated_at``."""
+
+    handler_key: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    version: datetime
+
+
+_job_specs: dict[str, CachedJobSpec] = {}
 
 BLOCKLIST_CLEANUP_HANDLER_KEY = "blocklist.cleanup_expired_blocks"
 BLOCKLIST_CLEANUP_INTERVAL_MINUTES = 5
@@ -51,13 +95,17 @@ async def _maybe_await(value: Awaitable[Any] | Any) -> Any:
 
 
 async def _cleanup_expired_blocks_job() -> tuple[int, bool]:
-    """Run blocklist and subject-policy expiration cleanup for APScheduler."""
+    """Reap expired rows the expiry timer did not know about.
+
+    Precise expiry is handled by ``services/expiry.py``; this interval job
+    only scans the ``expires_at`` range after the last reap.
+    """
     try:
-        async with get_session() as session, session.begin():
-            return await blocklist_repository.cleanup_expired_blocks(session)
+        expired = await reap_expired()
     except DatabaseError:
         logger.exception("Failed to cleanup expired blocklist and subject policies")
         return (0, False)
+    return len(expired.blocks) + expired.subject_policies, True
 
 
 def _register_builtin_handlers() -> None:
@@ -105,24 +153,151 @@ def _schedule_runtime_job(
     _runtime_job_ids.add(job_id)
 
 
-async def execute_persistent_job(job_id: str) -> None:
-    """Load a persisted scheduler job and dispatch its registered handler."""
+def _build_job_spec(
+    job: ScheduledJob,
+    args: list[Any],
+    kwargs: dict[str, Any],
+) -> CachedJobSpec:
+    """Snapshot ``job`` while its session is open, copying the payload.
+
+    Callers install the result only once the row is committed.
+    """
+    return CachedJobSpec(
+        handler_key=job.handler_key,
+        args=tuple(deepcopy(args)),
+        kwargs=deepcopy(kwargs),
+        version=as_utc(job.updated_at),
+    )
+
+
+def invalidate_job_spec(job_id: str | None = None) -> None:
+    """Drop the cached spec of ``job_id``, or of every job when omitted."""
+    if job_id is None:
+        _job_specs.clear()
+    else:
+        _job_specs.pop(job_id, None)
+
+
+def _warn_missing_handler(job_id: str, handler_key: str) -> None:
+    logger.warning(
+        "Scheduled job %s has no registered handler %s",
+        job_id,
+        handler_key,
+    )
+
+
+async def _load_job_spec(
+    job_id: str,
+    cached: CachedJobSpec | None,
+) -> CachedJobSpec | None:
+    """Read the job row, decoding it only when its version moved."""
     async with get_session() as session:
         job = await repository.get_job_spec(session, job_id)
         if job is None or not job.enabled:
+            invalidate_job_spec(job_id)
+            return None
+        if cached is not None and cached.version == as_utc(job.updated_at):
+            return cached
+        if job.handler_key not in _handlers:
+            _warn_missing_handler(job_id, job.handler_key)
+            return None
+        _, args, kwargs = repository.decode_job_payload(job)
+        spec = _build_job_spec(job, args, kwargs)
+    _job_specs[job_id] = spec
+    return spec
+
+
+async def execute_persistent_job(job_id: str) -> None:
+    """Dispatch the registered handler of a persisted scheduler job.
+
+    The cached spec is used as is unless it is missing or
+    ``scheduler_verify_job_version`` asks for a version check.
+    """
+    spec = _job_specs.get(job_id)
+    if spec is None or plugin_config.scheduler_verify_job_version:
+        spec = await _load_job_spec(job_id, spec)
+        if spec is None:
             return
-        handler_key = job.handler_key
-        handler = _handlers.get(handler_key)
-        if handler is None:
-            logger.warning(
-                "Scheduled job %s has no registered handler %s",
+    handler = _handlers.get(spec.handler_key)
+    if handler is None:
+        _warn_missing_handler(job_id, spec.handler_key)
+        return
+
+    started_at = datetime.now(UTC)
+    started = time.perf_counter()
+    try:
+        result = await _maybe_await(handler(*spec.args, **spec.kwargs))
+    except Exception as exc:
+        await record_job_run(
+            _finished_run(
                 job_id,
-                handler_key,
+                spec.handler_key,
+                started_at,
+                started,
+                exception=f"{type(exc).__name__}: {exc}",
             )
-            return
-        _, args, kwargs = repository.decode_job_payload(job)
+        )
+        raise
+    await record_job_run(
+        _finished_run(job_id, spec.handler_key, started_at, started, result=result)
+    )
 
-    await _maybe_await(handler(*args, **kwargs))
+
+def _finished_run(
+    job_id: str,
+    handler_key: str,
+    started_at: datetime,
+    started: float,
+    *,
+    result: Any = None,
+    exception: str | None = None,
+) -> JobRun:
+    duration_ms = (time.perf_counter() - started) * 1000
+    return JobRun(
+        job_id=job_id,
+        handler_key=handler_key,
+        started_at=started_at,
+        finished_at=datetime.now(UTC),
+        duration_ms=duration_ms,
+        result=result,
+        exception=exception,
+    )
+
+
+def _record_unstarted_runs(event: JobExecutionEvent | JobSubmissionEvent) -> None:
+    """Record runs APScheduler missed or skipped because of ``max_instances``."""
+    if event.job_id not in _runtime_job_ids:
+        return
+    spec = _job_specs.get(event.job_id)
+    skipped = event.code == EVENT_JOB_MAX_INSTANCES
+    run_times = (
+        event.scheduled_run_times
+        if isinstance(event, JobSubmissionEvent)
+        else [event.scheduled_run_time]
+    )
+    now = datetime.now(UTC)
+    for run_time in run_times:
+        run = JobRun(
+            job_id=event.job_id,
+            handler_key=event.job_id if spec is None else spec.handler_key,
+            started_at=run_time.astimezone(UTC),
+            finished_at=now,
+            misfired=not skipped,
+            skipped=skipped,
+        )
+        logger.warning(
+            "Scheduled job %s %s its run at %s",
+            run.job_id,
+            "skipped" if skipped else "missed",
+            run.started_at.isoformat(),
+        )
+        remember_job_run(run)
+        try:
+            task = asyncio.get_running_loop().create_task(persist_job_run(run))
+        except RuntimeError:
+            continue
+        _pending_run_writes.add(task)
+        task.add_done_callback(_pending_run_writes.discard)
 
 
 async def register_persistent_job(
@@ -143,7 +318,7 @@ async def register_persistent_job(
         raise ValueError(f"unknown scheduler handler: {handler_key}")
 
     async with get_session() as session, session.begin():
-        await repository.save_job_spec(
+        job = await repository.save_job_spec(
             session,
             job_id=job_id,
             handler_key=handler_key,
@@ -156,8 +331,11 @@ async def register_persistent_job(
             max_instances=max_instances,
             misfire_grace_time=misfire_grace_time,
         )
-    if not enabled:
+        spec = _build_job_spec(job, args or [], kwargs or {}) if enabled else None
+    if spec is None:
+        invalidate_job_spec(job_id)
         return
+    _job_specs[job_id] = spec
 
     _schedule_runtime_job(
         job_id=job_id,
@@ -172,6 +350,10 @@ async def register_persistent_job(
 async def initialize_scheduler_service() -> None:
     """Rehydrate enabled persisted jobs into the runtime scheduler."""
     _register_builtin_handlers()
+    scheduler.add_listener(
+        _record_unstarted_runs,
+        EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+    )
     try:
         async with get_session() as session, session.begin():
             await _ensure_builtin_jobs(session)
@@ -179,6 +361,7 @@ async def initialize_scheduler_service() -> None:
             # 在 session 内解码 payload 并提取标量字段,避免 ORM 对象
             # 在 session 关闭(commit)后访问属性触发 DetachedInstanceError。
             job_specs: list[dict[str, Any]] = []
+            cached_specs: dict[str, CachedJobSpec] = {}
             for job in jobs:
                 if job.handler_key not in _handlers:
                     logger.warning(
@@ -188,13 +371,14 @@ async def initialize_scheduler_service() -> None:
                     )
                     continue
                 try:
-                    trigger_kwargs, _, _ = repository.decode_job_payload(job)
+                    trigger_kwargs, args, kwargs = repository.decode_job_payload(job)
                 except (TypeError, ValueError):
                     logger.exception(
                         "Failed to schedule persisted job %s",
                         job.job_id,
                     )
                     continue
+                cached_specs[job.job_id] = _build_job_spec(job, args, kwargs)
                 job_specs.append({
                     "job_id": job.job_id,
                     "trigger_type": job.trigger_type,
@@ -207,6 +391,7 @@ async def initialize_scheduler_service() -> None:
         logger.exception("Failed to load persisted scheduler jobs")
         return
 
+    _job_specs.update(cached_specs)
     for spec in job_specs:
         _schedule_runtime_job(
             job_id=spec["job_id"],
@@ -227,12 +412,14 @@ async def remove_persistent_job(job_id: str) -> tuple[int, bool]:
         _runtime_job_ids.discard(job_id)
     else:
         _runtime_job_ids.discard(job_id)
+    invalidate_job_spec(job_id)
     async with get_session() as session, session.begin():
         return await repository.delete_job_spec(session, job_id)
 
 
 async def shutdown_scheduler_service() -> None:
     """Remove Lingchu-owned runtime jobs before the scheduler shuts down."""
+    scheduler.remove_listener(_record_unstarted_runs)
     first_error: Exception | None = None
     for job_id in tuple(_runtime_job_ids):
         try:
@@ -246,5 +433,8 @@ async def shutdown_scheduler_service() -> None:
         finally:
             _runtime_job_ids.discard(job_id)
     _handlers.clear()
+    invalidate_job_spec()
+    if _pending_run_writes:
+        await asyncio.gather(*_pending_run_writes, return_exceptions=True)
     if first_error is not None:
         raise first_error
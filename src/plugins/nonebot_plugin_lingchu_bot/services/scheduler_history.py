@@ -0,0 +1,186 @@
+"""Run history and latency statistics of persistent scheduler jobs.
+
+Every execution, misfire and overlap skip of a persisted job becomes a
+:class:`JobRun`.  The latest :data:`RUN_HISTORY_SIZE` runs stay in an
+in-memory ring buffer and each run is also written to
+``lingchu_scheduled_job_runs``, pruning rows older than
+:data:`RUN_RETENTION` on the way.  :func:`job_run_stats` aggregates the
+buffer into per-handler p50/p95 durations; :func:`load_job_run_stats` does
+the same from the table for processes that did not run the jobs, such as
+``lc scheduler stats``.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+from typing import TYPE_CHECKING, Any
+
+from nonebot import require
+
+require("nonebot_plugin_orm")
+from nonebot_plugin_orm import get_session
+
+from ..database.orm_crud import DatabaseError
+from ..repositories import scheduler_jobs as repository
+from ..repositories.expiry import as_utc
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from datetime import datetime
+
+    from ..database.models import ScheduledJobRun
+
+logger = logging.getLogger(__name__)
+
+RUN_HISTORY_SIZE = 512
+RUN_RETENTION = timedelta(days=30)
+
+
+@dataclass(frozen=True, slots=True)
+class JobRun:
+    """One execution of a scheduled job, or a run APScheduler did not start.
+
+    ``misfired`` runs were dropped past their ``misfire_grace_time`` and
+    ``skipped`` runs overlapped a previous one beyond ``max_instances``;
+    neither has a duration.
+    """
+
+    job_id: str
+    handler_key: str
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: float | None = None
+    result: Any = None
+    exception: str | None = None
+    misfired: bool = False
+    skipped: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class JobRunStats:
+    """Aggregated runs of one handler key; durations are in milliseconds."""
+
+    handler_key: str
+    runs: int
+    failures: int
+    misfires: int
+    skips: int
+    p50_ms: float | None
+    p95_ms: float | None
+    last_started_at: datetime
+
+
+_runs: deque[JobRun] = deque(maxlen=RUN_HISTORY_SIZE)
+
+
+def remember_job_run(run: JobRun) -> None:
+    """Append ``run`` to the ring buffer without persisting it."""
+    _runs.append(run)
+
+
+def recent_job_runs(handler_key: str | None = None) -> list[JobRun]:
+    """Return buffered runs, oldest first, optionally for one handler key."""
+    return [run for run in _runs if handler_key in {None, run.handler_key}]
+
+
+def clear_job_runs() -> None:
+    """Forget every buffered run."""
+    _runs.clear()
+
+
+def percentile(values: Sequence[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return None
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize_job_runs(runs: Iterable[JobRun]) -> list[JobRunStats]:
+    """Aggregate ``runs`` per handler key, sorted by key."""
+    grouped: dict[str, list[JobRun]] = {}
+    for run in runs:
+        grouped.setdefault(run.handler_key, []).append(run)
+    stats: list[JobRunStats] = []
+    for handler_key in sorted(grouped):
+        group = grouped[handler_key]
+        durations = sorted(
+            run.duration_ms for run in group if run.duration_ms is not None
+        )
+        stats.append(
+            JobRunStats(
+                handler_key=handler_key,
+                runs=len(durations),
+                failures=sum(run.exception is not None for run in group),
+                misfires=sum(run.misfired for run in group),
+                skips=sum(run.skipped for run in group),
+                p50_ms=percentile(durations, 0.5),
+                p95_ms=percentile(durations, 0.95),
+                last_started_at=max(run.started_at for run in group),
+            )
+        )
+    return stats
+
+
+def job_run_stats() -> list[JobRunStats]:
+    """Aggregate the runs buffered by this process."""
+    return summarize_job_runs(_runs)
+
+
+async def persist_job_run(run: JobRun) -> None:
+    """Write ``run`` and prune expired rows; failures are only logged."""
+    try:
+        async with get_session() as session, session.begin():
+            await repository.save_job_run(
+                session,
+                job_id=run.job_id,
+                handler_key=run.handler_key,
+                started_at=run.started_at,
+                finished_at=run.finished_at,
+                duration_ms=run.duration_ms,
+                result=run.result,
+                exception=run.exception,
+                misfired=run.misfired,
+                skipped=run.skipped,
+            )
+            await repository.delete_job_runs_before(
+                session, run.started_at - RUN_RETENTION
+            )
+    except DatabaseError:
+        logger.exception("Failed to persist run of scheduled job %s", run.job_id)
+
+
+async def record_job_run(run: JobRun) -> None:
+    """Buffer ``run`` and persist it."""
+    remember_job_run(run)
+    await persist_job_run(run)
+
+
+async def load_job_run_stats(limit: int = RUN_HISTORY_SIZE) -> list[JobRunStats]:
+    """Aggregate the latest ``limit`` persisted runs.
+
+    Raises:
+        DatabaseError: If the runs cannot be read.
+    """
+    async with get_session() as session:
+        rows = await repository.list_job_runs(session, limit=limit)
+        runs = [_run_from_row(row) for row in rows]
+    return summarize_job_runs(runs)
+
+
+def _run_from_row(row: ScheduledJobRun) -> JobRun:
+    return JobRun(
+        job_id=row.job_id,
+        handler_key=row.handler_key,
+        started_at=as_utc(row.started_at),
+        finished_at=as_utc(row.finished_at),
+        duration_ms=row.duration_ms,
+        result=repository.decode_job_run_result(row),
+        exception=row.exception,
+        misfired=row.misfired,
+        skipped=row.skipped,
+    )
@@ -6,17 +6,20 @@ from nonebot import get_adapters, logger, require
 require("nonebot_plugin_orm")
 from nonebot_plugin_orm import get_session
 
+from ..core.config import plugin_config
 from ..core.runtime_config import load_runtime_configs_on_startup
 from ..database.orm_crud import DatabaseError
 from ..handle.qq.adapters import import_handle
 from ..i18n import _async as _, warm_translation_cache
-from ..permissions import validate_and_seed_permission_system
+from ..permissions import load_permission_index, validate_and_seed_permission_system
 from ..platforms import (
     resolve_enabled_adapters,
     resolve_registered_adapters,
     validate_enabled_adapters_loaded,
 )
+from ..repositories.blocklist import load_blocklist_index
 from ..repositories.registry import seed_registry_tables
+from ..services.expiry import initialize_expiry_service
 from ..services.message_store import (
     SCHEDULER_CLEANUP_HANDLER_KEY,
     cleanup_expired_messages,
@@ -57,6 +60,11 @@ async def startup() -> None:
         async with get_session() as session, session.begin():
             await seed_registry_tables(session)
             await validate_and_seed_permission_system(session)
+        async with get_session() as session:
+            await load_permission_index(session)
+            await load_blocklist_index(
+                session, ttl_seconds=plugin_config.blocklist_index_ttl_seconds
+            )
 
     await _retry_startup_step(seed_database, "database seed")
     await import_handle("command")
@@ -67,6 +75,7 @@ async def startup() -> None:
         cleanup_expired_messages,
     )
     await initialize_scheduler_service()
+    await initialize_expiry_service()
 
 
 async def _retry_startup_step(step: Any, name: str) -> None:
@@ -248,6 +248,36 @@ async def _cleanup_orm_scoped_session() -> AsyncIterator[None]:
             await scoped.remove()
 
 
+@pytest.fixture(autouse=True)
+def _clear_onebot_caches() -> Generator[None]:
+    """Drop cached OneBot lookups so mocked bots never leak between tests."""
+    yield
+    from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.capabilities import (
+        invalidate_onebot_capabilities,
+    )
+    from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.group_directory import (
+        invalidate_group_directory,
+    )
+    from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.member_cache import (
+        clear_member_cache,
+    )
+
+    clear_member_cache()
+    invalidate_group_directory()
+    invalidate_onebot_capabilities()
+
+
+@pytest.fixture(autouse=True)
+async def _close_public_http_downloader() -> AsyncIterator[None]:
+    """Drop the shared download session and DNS answers of mocked drivers."""
+    yield
+    from src.plugins.nonebot_plugin_lingchu_bot.core.http_security import (
+        close_public_http_downloader,
+    )
+
+    await close_public_http_downloader()
+
+
 def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
     """为所有异步测试统一配置事件循环作用域。
 
@@ -26,6 +26,9 @@ def _clear_lingchu_env(monkeypatch: pytest.MonkeyPatch) -> None:
         "LINGCHU_MESSAGE_STORE_SUMMARY_LIMIT",
         "LINGCHU_MESSAGE_STORE_RECORD_API_CALLS",
         "LINGCHU_MESSAGE_STORE_CLEANUP_ENABLED",
+        "LINGCHU_MESSAGE_STORE_WRITE_BATCH_SIZE",
+        "LINGCHU_MESSAGE_STORE_WRITE_INTERVAL_MS",
+        "LINGCHU_MESSAGE_STORE_WRITE_QUEUE_LIMIT",
         "LINGCHU_RECALL_MESSAGE_DEFAULT_COUNT",
         "LINGCHU_PROTECTED_SUBJECT_FEATURE_KEYS",
     ):
@@ -68,6 +71,98 @@ def test_env_fallback_parses_integer_values(monkeypatch: pytest.MonkeyPatch) ->
     assert settings.recall_message_default_count == 20
 
 
+def test_env_fallback_parses_message_store_write_queue_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_WRITE_BATCH_SIZE", "50")
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_WRITE_INTERVAL_MS", "250")
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_WRITE_QUEUE_LIMIT", "2000")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.message_store_write_batch_size == 50
+    assert settings.message_store_write_interval_ms == 250
+    assert settings.message_store_write_queue_limit == 2000
+
+
+def test_env_fallback_parses_message_store_cleanup_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_CLEANUP_BATCH_SIZE", "250")
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_CLEANUP_PAUSE_MS", "0")
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_CLEANUP_INCREMENTAL_VACUUM", "true")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.message_store_cleanup_batch_size == 250
+    assert settings.message_store_cleanup_pause_ms == 0
+    assert settings.message_store_cleanup_incremental_vacuum is True
+    assert DeploymentSettings().message_store_cleanup_batch_size == 1000
+
+
+def test_env_fallback_rejects_non_positive_cleanup_batch_size(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_CLEANUP_BATCH_SIZE", "0")
+
+    with pytest.raises(
+        SettingsValidationError, match="message_store_cleanup_batch_size"
+    ):
+        DeploymentSettings.from_mapping({})
+
+
+def test_env_fallback_parses_message_store_partition_period(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_PARTITION_PERIOD", "Week")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.message_store_partition_period == "week"
+    assert DeploymentSettings().message_store_partition_period == "none"
+
+
+def test_env_fallback_rejects_unknown_partition_period(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_PARTITION_PERIOD", "day")
+
+    with pytest.raises(SettingsValidationError, match="message_store_partition_period"):
+        DeploymentSettings.from_mapping({})
+
+
+def test_env_fallback_parses_raw_payload_sample_percent(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_RAW_PAYLOAD_SAMPLE_PERCENT", "5")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.message_store_raw_payload_sample_percent == 5
+
+
+@pytest.mark.parametrize("value", ["-1", "101"])
+def test_env_fallback_rejects_out_of_range_raw_payload_sample_percent(
+    monkeypatch: pytest.MonkeyPatch,
+    value: str,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_RAW_PAYLOAD_SAMPLE_PERCENT", value)
+
+    with pytest.raises(
+        SettingsValidationError, match="message_store_raw_payload_sample_percent"
+    ):
+        DeploymentSettings.from_mapping({})
+
+
+def test_env_fallback_rejects_non_positive_write_batch_size(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MESSAGE_STORE_WRITE_BATCH_SIZE", "0")
+
+    with pytest.raises(SettingsValidationError, match="message_store_write_batch_size"):
+        DeploymentSettings.from_mapping({})
+
+
 def test_env_fallback_parses_adapter_and_superuser_key(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -108,3 +203,76 @@ def test_mapping_values_still_take_precedence_over_env(
     })
 
     assert settings.lingchu_superusers == {"mapping_user": {"qq": "2"}}
+
+
+def test_env_fallback_parses_permission_index_ttl_seconds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_PERMISSION_INDEX_TTL_SECONDS", "60")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.permission_index_ttl_seconds == 60
+
+
+def test_env_fallback_parses_blocklist_index_ttl_seconds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert DeploymentSettings.from_mapping({}).blocklist_index_ttl_seconds == 60
+
+    monkeypatch.setenv("LINGCHU_BLOCKLIST_INDEX_TTL_SECONDS", "0")
+
+    assert DeploymentSettings.from_mapping({}).blocklist_index_ttl_seconds == 0
+
+
+def test_env_fallback_rejects_negative_permission_index_ttl_seconds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_PERMISSION_INDEX_TTL_SECONDS", "-1")
+
+    with pytest.raises(SettingsValidationError, match="permission_index_ttl_seconds"):
+        DeploymentSettings.from_mapping({})
+
+
+def test_env_fallback_parses_onebot_member_cache_ttl_seconds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_ONEBOT_MEMBER_CACHE_TTL_SECONDS", "0")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.onebot_member_cache_ttl_seconds == 0
+    assert DeploymentSettings().onebot_member_cache_ttl_seconds == 30
+
+
+def test_env_fallback_parses_onebot_group_list_ttl_seconds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_ONEBOT_GROUP_LIST_TTL_SECONDS", "60")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.onebot_group_list_ttl_seconds == 60
+    assert DeploymentSettings().onebot_group_list_ttl_seconds == 300
+
+
+def test_env_fallback_parses_media_cache_max_bytes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_MEDIA_CACHE_MAX_BYTES", "1048576")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.media_cache_max_bytes == 1048576
+    assert DeploymentSettings().media_cache_max_bytes == 256 * 1024 * 1024
+
+
+def test_env_fallback_parses_scheduler_verify_job_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LINGCHU_SCHEDULER_VERIFY_JOB_VERSION", "true")
+
+    settings = DeploymentSettings.from_mapping({})
+
+    assert settings.scheduler_verify_job_version is True
+    assert DeploymentSettings().scheduler_verify_job_version is False
@@ -8,9 +8,12 @@ import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.core import async_utils
 from src.plugins.nonebot_plugin_lingchu_bot.core.async_utils import (
+    LaneConfig,
     drain_background_tasks,
     fire_and_forget,
     get_background_tasks,
+    get_lane_stats,
+    submit_background,
 )
 
 
@@ -23,8 +26,21 @@ async def _drain_until_done(task: asyncio.Task[Any]) -> None:
 
 
 @pytest.fixture(autouse=True)
-def _isolate_background_tasks():
+def _isolate_background_tasks(monkeypatch: pytest.MonkeyPatch):
     async_utils._background_tasks.clear()
+    monkeypatch.setattr(
+        async_utils,
+        "_lanes",
+        {
+            "bounded": async_utils._Lane(
+                name="bounded", config=LaneConfig(concurrency=1, max_queue=1)
+            ),
+            "coalescing": async_utils._Lane(
+                name="coalescing",
+                config=LaneConfig(concurrency=1, max_queue=1, policy="coalesce"),
+            ),
+        },
+    )
     yield
     async_utils._background_tasks.clear()
 
@@ -145,3 +161,116 @@ async def test_drain_background_tasks_cancels_tasks_after_timeout() -> None:
     assert task.cancelled()
     await _drain_until_done(task)
     warning_mock.assert_called_once()
+
+
+def test_default_lanes_cover_audit_message_store_and_notices() -> None:
+    assert set(async_utils.DEFAULT_LANES) == {
+        async_utils.AUDIT_LANE,
+        async_utils.MESSAGE_STORE_LANE,
+        async_utils.NOTICE_LANE,
+    }
+
+
+@pytest.mark.asyncio
+async def test_submit_background_caps_concurrency_and_queues_excess() -> None:
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def worker(label: str) -> None:
+        order.append(label)
+        await release.wait()
+
+    assert submit_background("bounded", worker("first"), name="first") is True
+    assert submit_background("bounded", worker("second"), name="second") is True
+    await asyncio.sleep(0)
+
+    stats = get_lane_stats()["bounded"]
+    assert (stats.running, stats.queued) == (1, 1)
+    assert order == ["first"]
+
+    release.set()
+    await drain_background_tasks()
+
+    stats = get_lane_stats()["bounded"]
+    assert order == ["first", "second"]
+    assert (stats.running, stats.queued) == (0, 0)
+    assert stats.completed == 2
+    assert stats.max_latency_seconds >= stats.last_latency_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_submit_background_drops_when_lane_queue_is_full() -> None:
+    release = asyncio.Event()
+
+    async def worker() -> None:
+        await release.wait()
+
+    dropped = worker()
+    with patch.object(async_utils.logger, "warning") as warning_mock:
+        submit_background("bounded", worker(), name="running")
+        submit_background("bounded", worker(), name="queued")
+        accepted = submit_background("bounded", dropped, name="dropped")
+        submit_background("bounded", worker(), name="dropped-again")
+
+    assert accepted is False
+    assert dropped.cr_frame is None
+    assert get_lane_stats()["bounded"].dropped == 2
+    warning_mock.assert_called_once()
+
+    release.set()
+    await drain_background_tasks()
+
+
+@pytest.mark.asyncio
+async def test_submit_background_coalesces_waiting_job_with_same_key() -> None:
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def worker(label: str) -> None:
+        ran.append(label)
+        await release.wait()
+
+    submit_background("coalescing", worker("running"), name="a", key="k")
+    submit_background("coalescing", worker("stale"), name="b", key="k")
+    accepted = submit_background("coalescing", worker("latest"), name="c", key="k")
+
+    assert accepted is True
+    assert get_lane_stats()["coalescing"].coalesced == 1
+
+    release.set()
+    await drain_background_tasks()
+
+    assert ran == ["running", "latest"]
+
+
+@pytest.mark.asyncio
+async def test_lane_counts_failures_and_logs_exception() -> None:
+    async def failing() -> None:
+        raise ValueError("lane failure")
+
+    with patch.object(async_utils, "logger") as logger_mock:
+        submit_background("bounded", failing(), name="failing")
+        await drain_background_tasks()
+
+    assert get_lane_stats()["bounded"].failed == 1
+    logger_mock.exception.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_drain_background_tasks_discards_queued_lane_jobs_on_timeout() -> None:
+    async def worker() -> None:
+        await asyncio.Event().wait()
+
+    queued = worker()
+    submit_background("bounded", worker(), name="stuck")
+    submit_background("bounded", queued, name="waiting")
+    await asyncio.sleep(0)
+
+    with patch.object(async_utils.logger, "warning") as warning_mock:
+        await drain_background_tasks(drain_timeout=0.001)
+
+    assert queued.cr_frame is None
+    stats = get_lane_stats()["bounded"]
+    assert stats.queued == 0
+    assert stats.dropped == 1
+    warning_mock.assert_called_once()
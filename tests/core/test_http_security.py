@@ -1,4 +1,6 @@
+import asyncio
 from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 import socket
 from types import SimpleNamespace
 from typing import Any, cast
@@ -8,22 +10,44 @@ import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.core import http_security
 from src.plugins.nonebot_plugin_lingchu_bot.core.http_security import (
+    PublicHTTPDownloader,
     UnsafeDownloadURLError,
+    _ByteBudget,
     _header_value,
     _is_forbidden_address,
     _parse_http_url,
     _read_response_content,
     _redirect_url,
     _request_one_hop,
-    _response_content_bytes,
+    _response_chunk,
     _response_peer_host,
     _validate_declared_response_size,
     _validate_peer_host,
-    download_public_http_bytes,
     validate_public_http_url,
 )
 
 
+@dataclass(slots=True)
+class MemorySink:
+    data: bytearray = field(default_factory=bytearray)
+
+    async def write(self, chunk: bytes | bytearray | memoryview, /) -> None:
+        self.data += chunk
+
+
+async def download_bytes(
+    url: str,
+    *,
+    max_bytes: int,
+    downloader: PublicHTTPDownloader | None = None,
+) -> bytes | None:
+    """Download ``url`` into memory through ``download_into``."""
+    sink = MemorySink()
+    target = downloader or http_security.get_public_http_downloader()
+    size = await target.download_into(url, sink, max_bytes=max_bytes)
+    return None if size is None else bytes(sink.data)
+
+
 @pytest.mark.asyncio
 async def test_validate_public_http_url_rejects_private_network(
     monkeypatch: pytest.MonkeyPatch,
@@ -87,12 +111,12 @@ def test_http_response_helpers_validate_binary_content_headers_and_size() -> Non
     assert _is_forbidden_address("93.184.216.34") is False
 
     assert _parse_http_url("https://example.com/image.png")[1] == 443
-    assert _response_content_bytes(b"png") == b"png"
-    assert _response_content_bytes(bytearray(b"png")) == b"png"
-    assert _response_content_bytes(memoryview(b"png")) == b"png"
-    assert _response_content_bytes("png") == b"png"
+    assert _response_chunk(b"png") == b"png"
+    assert _response_chunk(bytearray(b"png")) == b"png"
+    assert _response_chunk(memoryview(b"png")) == b"png"
+    assert _response_chunk("png") == b"png"
     with pytest.raises(UnsafeDownloadURLError):
-        _response_content_bytes(object())
+        _response_chunk(object())
 
     assert _header_value({"content-length": "3"}, "content-length") == "3"
     assert _header_value({"Content-Length": [b"3"]}, "content-length") == "3"
@@ -131,16 +155,18 @@ async def test_response_content_and_peer_validation_cover_stream_and_fallback_pa
         yield bytearray(b"12")
         yield memoryview(b"3")
 
-    assert await _read_response_content(chunks(), 3) == b"123"
+    sink = MemorySink()
+    assert await _read_response_content(chunks(), 3, sink) == 3
+    assert sink.data == b"123"
     with pytest.raises(UnsafeDownloadURLError):
-        await _read_response_content(b"1234", 3)
+        await _read_response_content(b"1234", 3, MemorySink())
 
     async def oversized_chunks() -> AsyncIterator[bytes]:
         yield b"12"
         yield b"34"
 
     with pytest.raises(UnsafeDownloadURLError):
-        await _read_response_content(oversized_chunks(), 3)
+        await _read_response_content(oversized_chunks(), 3, MemorySink())
 
     assert (
         _response_peer_host(SimpleNamespace(peer_address=("93.184.216.34", 443)))
@@ -212,13 +238,16 @@ async def test_request_one_hop_supports_httpx_and_aiohttp_clients() -> None:
             return HttpxContext()
 
     httpx_client = HttpxClient()
+    httpx_sink = MemorySink()
     httpx_response = await _request_one_hop(
         SimpleNamespace(client=httpx_client),
         request,
         max_bytes=2,
         allowed_addresses=allowed,
+        sink=httpx_sink,
     )
-    assert httpx_response.content == b"ok"
+    assert httpx_response.size == 2
+    assert httpx_sink.data == b"ok"
 
     async def aiohttp_body() -> AsyncIterator[bytes]:
         yield b"ok"
@@ -245,13 +274,16 @@ async def test_request_one_hop_supports_httpx_and_aiohttp_clients() -> None:
             return AiohttpContext()
 
     aiohttp_client = AiohttpClient()
+    aiohttp_sink = MemorySink()
     aiohttp_response = await _request_one_hop(
         SimpleNamespace(client=aiohttp_client),
         request,
         max_bytes=2,
         allowed_addresses=allowed,
+        sink=aiohttp_sink,
     )
-    assert aiohttp_response.content == b"ok"
+    assert aiohttp_response.size == 2
+    assert aiohttp_sink.data == b"ok"
 
 
 @pytest.mark.asyncio
@@ -284,13 +316,16 @@ async def test_request_one_hop_uses_generic_client_when_no_native_client() -> No
         def client(self) -> None:
             raise RuntimeError
 
+    sink = MemorySink()
     response = await _request_one_hop(
         GenericSession(),
         request,
         max_bytes=2,
         allowed_addresses=("93.184.216.34",),
+        sink=sink,
     )
-    assert response.content == b"ok"
+    assert response.size == 2
+    assert sink.data == b"ok"
 
 
 def test_redirect_and_request_helpers_reject_invalid_inputs() -> None:
@@ -304,7 +339,7 @@ def test_redirect_and_request_helpers_reject_invalid_inputs() -> None:
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_checks_status_and_size(
+async def test_download_into_checks_status_and_size(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -333,16 +368,13 @@ async def test_download_public_http_bytes_checks_status_and_size(
         lambda: SimpleNamespace(get_session=SessionContext),
     )
 
-    assert (
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=3)
-        == b"png"
-    )
+    assert await download_bytes("https://example.com/image.png", max_bytes=3) == b"png"
     with pytest.raises(UnsafeDownloadURLError):
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=2)
+        await download_bytes("https://example.com/image.png", max_bytes=2)
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_revalidates_each_redirect(
+async def test_download_into_revalidates_each_redirect(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     resolve = AsyncMock(
@@ -353,7 +385,7 @@ async def test_download_public_http_bytes_revalidates_each_redirect(
         side_effect=[
             SimpleNamespace(
                 status_code=302,
-                headers={"Location": "/image.png"},
+                headers={"Location": "https://cdn.example.com/image.png"},
                 content=b"",
                 peer_address=("93.184.216.34", 443),
             ),
@@ -379,19 +411,18 @@ async def test_download_public_http_bytes_revalidates_each_redirect(
         lambda: SimpleNamespace(get_session=SessionContext),
     )
 
-    assert (
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=3)
-        == b"png"
-    )
+    assert await download_bytes("https://example.com/image.png", max_bytes=3) == b"png"
     assert request.await_count == 2
     assert resolve.await_count == 2
+    assert resolve.await_args_list[1].args == ("cdn.example.com", 443)
     assert (
-        str(request.await_args_list[1].args[0].url) == "https://example.com/image.png"
+        str(request.await_args_list[1].args[0].url)
+        == "https://cdn.example.com/image.png"
     )
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_rejects_private_redirect(
+async def test_download_into_rejects_private_redirect(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -422,12 +453,12 @@ async def test_download_public_http_bytes_rejects_private_redirect(
     )
 
     with pytest.raises(UnsafeDownloadURLError):
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=3)
+        await download_bytes("https://example.com/image.png", max_bytes=3)
     request.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_rejects_https_downgrade(
+async def test_download_into_rejects_https_downgrade(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -458,11 +489,11 @@ async def test_download_public_http_bytes_rejects_https_downgrade(
     )
 
     with pytest.raises(UnsafeDownloadURLError):
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=3)
+        await download_bytes("https://example.com/image.png", max_bytes=3)
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_rejects_connection_address_mismatch(
+async def test_download_into_rejects_connection_address_mismatch(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -493,11 +524,11 @@ async def test_download_public_http_bytes_rejects_connection_address_mismatch(
     )
 
     with pytest.raises(UnsafeDownloadURLError):
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=3)
+        await download_bytes("https://example.com/image.png", max_bytes=3)
 
 
 @pytest.mark.asyncio
-async def test_download_public_http_bytes_limits_streamed_body(
+async def test_download_into_limits_streamed_body(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     monkeypatch.setattr(
@@ -533,4 +564,194 @@ async def test_download_public_http_bytes_limits_streamed_body(
     )
 
     with pytest.raises(UnsafeDownloadURLError):
-        await download_public_http_bytes("https://example.com/image.png", max_bytes=4)
+        await download_bytes("https://example.com/image.png", max_bytes=4)
+
+
+def _session_factory(request: AsyncMock) -> tuple[Any, list[str]]:
+    events: list[str] = []
+
+    class SessionContext:
+        async def __aenter__(self) -> Any:
+            events.append("open")
+            return SimpleNamespace(request=request)
+
+        async def __aexit__(self, *args: object) -> None:
+            events.append("close")
+
+    return SessionContext, events
+
+
+def _png_response(*, content: Any = b"png") -> SimpleNamespace:
+    return SimpleNamespace(
+        status_code=200,
+        content=content,
+        peer_address=("93.184.216.34", 443),
+    )
+
+
+@pytest.mark.asyncio
+async def test_downloader_reuses_one_session_and_caches_dns(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    resolve = AsyncMock(return_value=("93.184.216.34",))
+    monkeypatch.setattr(http_security, "resolve_host_addresses", resolve)
+    request = AsyncMock(side_effect=lambda _request: _png_response())
+    session_context, events = _session_factory(request)
+    monkeypatch.setattr(
+        http_security,
+        "get_driver",
+        lambda: SimpleNamespace(get_session=session_context),
+    )
+    downloader = PublicHTTPDownloader()
+
+    first, second = await asyncio.gather(
+        download_bytes("https://example.com/a.png", max_bytes=3, downloader=downloader),
+        download_bytes("https://EXAMPLE.com/b.png", max_bytes=3, downloader=downloader),
+    )
+
+    assert first == b"png"
+    assert second == b"png"
+    assert events == ["open"]
+    resolve.assert_awaited_once()
+
+    await downloader.close()
+    assert events == ["open", "close"]
+    assert await download_bytes(
+        "https://example.com/a.png", max_bytes=3, downloader=downloader
+    )
+    assert events == ["open", "close", "open"]
+    assert resolve.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_refreshes_expired_dns_and_still_pins_the_peer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    resolve = AsyncMock(side_effect=[("93.184.216.34",), ("1.1.1.1",)])
+    monkeypatch.setattr(http_security, "resolve_host_addresses", resolve)
+    request = AsyncMock(side_effect=lambda _request: _png_response())
+    session_context, _ = _session_factory(request)
+    monkeypatch.setattr(
+        http_security,
+        "get_driver",
+        lambda: SimpleNamespace(get_session=session_context),
+    )
+    downloader = PublicHTTPDownloader(dns_ttl_seconds=0)
+
+    assert await download_bytes(
+        "https://example.com/a.png", max_bytes=3, downloader=downloader
+    )
+    # The fresh answer no longer contains the address the server answers from.
+    with pytest.raises(UnsafeDownloadURLError):
+        await download_bytes(
+            "https://example.com/a.png", max_bytes=3, downloader=downloader
+        )
+    assert resolve.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_dns_cache_stays_bounded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(http_security, "_DNS_CACHE_MAX_ENTRIES", 2)
+    resolve = AsyncMock(return_value=("93.184.216.34",))
+    monkeypatch.setattr(http_security, "resolve_host_addresses", resolve)
+    downloader = PublicHTTPDownloader()
+
+    for host in ("a.example", "b.example", "c.example"):
+        await downloader._resolve(host, 443)
+    await downloader._resolve("c.example", 443)
+
+    assert list(downloader._dns_cache) == [("b.example", 443), ("c.example", 443)]
+    assert resolve.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_queues_downloads_beyond_capacity() -> None:
+    budget = _ByteBudget(4)
+    order: list[str] = []
+
+    async def hold(name: str, size: int, release: asyncio.Event) -> None:
+        async with budget.reserve(size):
+            order.append(name)
+            await release.wait()
+
+    first_release = asyncio.Event()
+    second_release = asyncio.Event()
+    first = asyncio.create_task(hold("first", 3, first_release))
+    await asyncio.sleep(0)
+    # Larger than the whole budget: waits until the budget is fully free.
+    second = asyncio.create_task(hold("second", 10, second_release))
+    await asyncio.sleep(0)
+
+    assert order == ["first"]
+    assert budget.available == 1
+    first_release.set()
+    await first
+    await asyncio.sleep(0)
+    assert order == ["first", "second"]
+    assert budget.available == 0
+    second_release.set()
+    await second
+    assert budget.available == 4
+
+
+@pytest.mark.asyncio
+async def test_download_into_reserves_max_bytes_from_the_budget(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        http_security,
+        "resolve_host_addresses",
+        AsyncMock(return_value=("93.184.216.34",)),
+    )
+    release = asyncio.Event()
+
+    async def body() -> AsyncIterator[bytes]:
+        await release.wait()
+        yield b"png"
+
+    request = AsyncMock(
+        side_effect=[_png_response(content=body()), _png_response(content=b"png")]
+    )
+    session_context, _ = _session_factory(request)
+    monkeypatch.setattr(
+        http_security,
+        "get_driver",
+        lambda: SimpleNamespace(get_session=session_context),
+    )
+    downloader = PublicHTTPDownloader(byte_budget=4)
+
+    first = asyncio.create_task(
+        download_bytes("https://example.com/a.png", max_bytes=3, downloader=downloader)
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        download_bytes("https://example.com/b.png", max_bytes=3, downloader=downloader)
+    )
+    await asyncio.sleep(0)
+
+    # The second download waits for the first one's reservation.
+    request.assert_awaited_once()
+    release.set()
+    assert await asyncio.gather(first, second) == [b"png", b"png"]
+    assert request.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_without_http_client_returns_none(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(http_security, "get_driver", SimpleNamespace)
+    downloader = PublicHTTPDownloader()
+
+    assert (
+        await download_bytes(
+            "https://example.com/a.png", max_bytes=3, downloader=downloader
+        )
+        is None
+    )
+    with pytest.raises(UnsafeDownloadURLError):
+        await download_bytes(
+            "https://example.com/a.png", max_bytes=-1, downloader=downloader
+        )
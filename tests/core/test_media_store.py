@@ -0,0 +1,200 @@
+import hashlib
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import aiofiles.os
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.core import media_store
+from src.plugins.nonebot_plugin_lingchu_bot.core.http_security import (
+    UnsafeDownloadURLError,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.core.media_store import (
+    MediaStore,
+    get_media_store,
+)
+
+
+def digest_name(content: bytes) -> str:
+    return f"{hashlib.sha256(content).hexdigest()}.png"
+
+
+def use_downloads(
+    monkeypatch: pytest.MonkeyPatch, bodies: dict[str, bytes | None]
+) -> AsyncMock:
+    async def download_into(url: str, sink: Any, **_kwargs: Any) -> int | None:
+        body = bodies[url]
+        if body is None:
+            return None
+        # Two chunks, so the digest has to be built incrementally.
+        await sink.write(body[:1])
+        await sink.write(memoryview(body)[1:])
+        return len(body)
+
+    download = AsyncMock(side_effect=download_into)
+    monkeypatch.setattr(
+        media_store,
+        "get_public_http_downloader",
+        lambda: SimpleNamespace(download_into=download),
+    )
+    return download
+
+
+async def stored_names(root: Path) -> list[str]:
+    return sorted(await aiofiles.os.listdir(root))
+
+
+@pytest.mark.asyncio
+async def test_put_bytes_stores_content_once(tmp_path: Path) -> None:
+    store = MediaStore(tmp_path, max_bytes=0)
+
+    first = await store.put_bytes(b"image")
+    os.utime(first, (0, 0))
+    second = await store.put_bytes(memoryview(b"image"))
+
+    assert first == second == tmp_path / digest_name(b"image")
+    assert await stored_names(tmp_path) == [digest_name(b"image")]
+    assert store.total_bytes == len(b"image")
+    # The hit refreshed the LRU timestamp instead of rewriting the file.
+    assert first.stat().st_mtime > 0
+
+
+@pytest.mark.asyncio
+async def test_put_url_hashes_the_stream_and_remembers_the_url(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    download = use_downloads(
+        monkeypatch,
+        {
+            "https://example.com/a.png": b"image",
+            "https://mirror.example/a.png": b"image",
+        },
+    )
+    store = MediaStore(tmp_path, max_bytes=0)
+
+    first = await store.put_url("https://example.com/a.png", max_bytes=10)
+    again = await store.put_url("https://example.com/a.png", max_bytes=10)
+    mirrored = await store.put_url("https://mirror.example/a.png", max_bytes=10)
+
+    assert first == again == mirrored == tmp_path / digest_name(b"image")
+    assert first is not None
+    assert first.read_bytes() == b"image"
+    assert download.await_count == 2
+    assert await stored_names(tmp_path) == [digest_name(b"image")]
+
+
+@pytest.mark.asyncio
+async def test_put_url_downloads_again_after_the_index_expires(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    download = use_downloads(monkeypatch, {"https://example.com/a.png": b"image"})
+    monkeypatch.setattr(media_store, "_URL_INDEX_TTL_SECONDS", 0)
+    store = MediaStore(tmp_path, max_bytes=0)
+
+    await store.put_url("https://example.com/a.png", max_bytes=10)
+    await store.put_url("https://example.com/a.png", max_bytes=10)
+
+    assert download.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_put_url_cleans_up_when_nothing_is_stored(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    use_downloads(monkeypatch, {"https://example.com/none.png": None})
+    store = MediaStore(tmp_path, max_bytes=0)
+
+    assert await store.put_url("https://example.com/none.png", max_bytes=10) is None
+
+    monkeypatch.setattr(
+        media_store,
+        "get_public_http_downloader",
+        lambda: SimpleNamespace(
+            download_into=AsyncMock(side_effect=UnsafeDownloadURLError("blocked"))
+        ),
+    )
+    with pytest.raises(UnsafeDownloadURLError):
+        await store.put_url("https://example.com/blocked.png", max_bytes=10)
+    assert await stored_names(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_eviction_drops_least_recently_used_files_and_their_urls(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    download = use_downloads(monkeypatch, {"https://example.com/a.png": b"aaaa"})
+    store = MediaStore(tmp_path, max_bytes=10)
+
+    await store.put_url("https://example.com/a.png", max_bytes=10)
+    await store.put_bytes(b"bbbb")
+    # Touch "a" so "b" becomes the least recently used file.
+    await store.put_url("https://example.com/a.png", max_bytes=10)
+    await store.put_bytes(b"cccc")
+
+    assert await stored_names(tmp_path) == sorted([
+        digest_name(b"aaaa"),
+        digest_name(b"cccc"),
+    ])
+    assert store.total_bytes == 8
+
+    await store.put_bytes(b"dddd")
+    await store.put_url("https://example.com/a.png", max_bytes=10)
+    assert download.await_count == 2
+
+    # A single file above the cap is kept until something newer arrives.
+    await store.put_bytes(b"x" * 20)
+    assert await stored_names(tmp_path) == [digest_name(b"x" * 20)]
+
+
+@pytest.mark.asyncio
+async def test_store_rebuilds_lru_order_from_disk(tmp_path: Path) -> None:
+    (tmp_path / "stale.part").write_bytes(b"partial")
+    old = tmp_path / digest_name(b"old")
+    old.write_bytes(b"old")
+    os.utime(old, (1, 1))
+    new = tmp_path / digest_name(b"new")
+    new.write_bytes(b"new")
+    store = MediaStore(tmp_path, max_bytes=8)
+
+    await store.put_bytes(b"newer")
+
+    assert await stored_names(tmp_path) == sorted([
+        digest_name(b"new"),
+        digest_name(b"newer"),
+    ])
+    assert store.total_bytes == len(b"new") + len(b"newer")
+
+
+@pytest.mark.asyncio
+async def test_store_forgets_files_removed_behind_its_back(tmp_path: Path) -> None:
+    store = MediaStore(tmp_path, max_bytes=0)
+    path = await store.put_bytes(b"image")
+    path.unlink()
+
+    assert await store.put_bytes(b"image") == path
+    assert path.read_bytes() == b"image"
+    assert store.total_bytes == len(b"image")
+
+
+def test_get_media_store_follows_the_configuration(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = SimpleNamespace(cache_dir=tmp_path, media_cache_max_bytes=10)
+    monkeypatch.setattr(media_store, "plugin_config", config)
+
+    store = get_media_store()
+    assert store is get_media_store()
+    assert store.root == tmp_path / "media"
+    assert store.max_bytes == 10
+
+    config.media_cache_max_bytes = 20
+    assert get_media_store() is not store
+    assert get_media_store().max_bytes == 20
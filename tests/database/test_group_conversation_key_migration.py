@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from importlib import import_module
+import json
+from unittest.mock import patch
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+import sqlalchemy as sa
+from sqlalchemy import create_engine
+
+TABLE = "lingchu_qq_onebot_v11_nonebot_event_records"
+
+
+def test_group_conversation_key_backfills_legacy_group_rows() -> None:
+    migration = import_module(
+        "src.plugins.nonebot_plugin_lingchu_bot.migrations."
+        "k1f2a3b4c5d6_group_conversation_key"
+    )
+    engine = create_engine("sqlite://")
+    try:
+        metadata = sa.MetaData()
+        for name in migration._MESSAGE_TABLES:
+            sa.Table(
+                name,
+                metadata,
+                sa.Column("id", sa.Integer(), primary_key=True),
+                *(
+                    sa.Column(column, sa.String(128))
+                    for column in migration._IDENTITY_COLUMNS
+                ),
+                sa.Column("message_type", sa.String(64)),
+                sa.Column("raw_event", sa.Text()),
+                sa.UniqueConstraint(*migration._IDENTITY_COLUMNS),
+            )
+        metadata.create_all(engine)
+        table = metadata.tables[TABLE]
+        identity = {
+            "platform_id": "qq",
+            "adapter_id": "~onebot.v11",
+            "protocol_id": "napcat",
+            "bot_id": "bot-1",
+        }
+        rows = [
+            ("1", "group", "868258211", None),
+            ("2", "group", "group_868258211_3128682634", None),
+            ("3", "group", None, json.dumps({"group_id": 868258211})),
+            ("4", "group", "group:868258211", None),
+            # Already stored under the new key, so the legacy twin stays put.
+            ("4", "group", "868258211", None),
+            ("5", "private", "3128682634", None),
+            ("6", "group", "chat-1", "not json"),
+        ]
+        with engine.begin() as connection:
+            connection.execute(
+                table.insert(),
+                [
+                    {
+                        **identity,
+                        "message_id": message_id,
+                        "message_type": message_type,
+                        "conversation_id": conversation_id,
+                        "raw_event": raw_event,
+                    }
+                    for message_id, message_type, conversation_id, raw_event in rows
+                ],
+            )
+
+        with engine.begin() as connection:
+            operations = Operations(MigrationContext.configure(connection))
+            with (
+                patch.object(migration, "op", operations),
+                patch.object(migration, "_BATCH_SIZE", 2),
+            ):
+                migration.upgrade()
+
+        with engine.connect() as connection:
+            stored = connection.execute(
+                sa.select(table.c.conversation_id).order_by(table.c.id)
+            ).scalars()
+            assert list(stored) == [
+                "group:868258211",
+                "group:868258211",
+                "group:868258211",
+                "group:868258211",
+                "868258211",
+                "3128682634",
+                "chat-1",
+            ]
+    finally:
+        engine.dispose()
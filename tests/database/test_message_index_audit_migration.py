@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from importlib import import_module
+from unittest.mock import patch
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+import sqlalchemy as sa
+from sqlalchemy import create_engine
+
+
+def _index_names(connection: sa.Connection, table: str) -> set[str]:
+    return {str(index["name"]) for index in sa.inspect(connection).get_indexes(table)}
+
+
+def test_message_index_audit_swaps_single_column_indexes_for_composites() -> None:
+    migration = import_module(
+        "src.plugins.nonebot_plugin_lingchu_bot.migrations."
+        "j0e1f2a3b4c5_message_index_audit"
+    )
+    engine = create_engine("sqlite://")
+    try:
+        metadata = sa.MetaData()
+        for table, columns in migration._DROPPED_INDEXES:
+            sa.Table(
+                table,
+                metadata,
+                sa.Column("id", sa.Integer(), primary_key=True),
+                *(sa.Column(column, sa.String(64), index=True) for column in columns),
+            )
+        metadata.create_all(engine)
+        event_table = "lingchu_qq_onebot_v11_nonebot_event_records"
+        with engine.connect() as connection:
+            legacy = _index_names(connection, event_table)
+
+        with engine.begin() as connection:
+            operations = Operations(MigrationContext.configure(connection))
+            with patch.object(migration, "op", operations):
+                migration.upgrade()
+                assert _index_names(connection, event_table) == {
+                    "ix_lingchu_qq_ob11_nb_event_conversation_recent",
+                    "ix_lingchu_qq_ob11_nb_event_user_recent",
+                    "ix_lingchu_qq_ob11_nb_event_bot_recent",
+                    "ix_lingchu_qq_ob11_nb_event_expiry",
+                }
+                assert _index_names(connection, "lingchu_audit_records") == {
+                    "ix_lingchu_audit_records_expiry"
+                }
+
+                migration.downgrade()
+                assert _index_names(connection, event_table) == legacy
+    finally:
+        engine.dispose()
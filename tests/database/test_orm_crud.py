@@ -32,6 +32,7 @@ from src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud import (
     _orders,
     async_iterate_safe,
     bulk_create,
+    bulk_upsert,
     count,
     create,
     delete,
@@ -1669,6 +1670,166 @@ class TestUpsert:
             )
 
 
+class TestBulkUpsert:
+    """Test suite for multi-row dialect-specific upsert helper."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_bulk_upsert_submits_one_statement(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        TestUpsert._set_dialect(mock_async_session, "sqlite")
+        stmt = TestUpsert._upsert_statement_mock()
+        rows = [{"id": ID_1, "name": "a"}, {"id": ID_2, "name": "b"}]
+
+        with patch(
+            "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk.sqlite_insert",
+            return_value=stmt,
+            create=True,
+        ) as sqlite_insert:
+            result = await bulk_upsert(
+                mock_async_session, mock_model, rows, conflict_fields=["id"]
+            )
+
+        assert result == COLLS_LEN_2
+        sqlite_insert.assert_called_once_with(mock_model)
+        stmt.values.assert_called_once_with(rows)
+        call_kwargs = stmt.on_conflict_do_update.call_args.kwargs
+        assert call_kwargs["index_elements"] == [mock_model.id]
+        assert set(call_kwargs["set_"]) == {"name"}
+        mock_async_session.execute.assert_awaited_once_with(stmt)
+        mock_async_session.flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_splits_rows_above_the_bind_limit(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        TestUpsert._set_dialect(mock_async_session, "sqlite")
+        stmt = TestUpsert._upsert_statement_mock()
+        rows = [{"id": index, "name": str(index)} for index in range(5)]
+
+        with (
+            patch(
+                "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk.sqlite_insert",
+                return_value=stmt,
+                create=True,
+            ),
+            patch(
+                "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk._BULK_UPSERT_MAX_PARAMS",
+                4,
+            ),
+        ):
+            result = await bulk_upsert(
+                mock_async_session, mock_model, rows, conflict_fields=["id"]
+            )
+
+        assert result == len(rows)
+        assert [call.args[0] for call in stmt.values.call_args_list] == [
+            rows[0:2],
+            rows[2:4],
+            rows[4:5],
+        ]
+        assert mock_async_session.execute.await_count == 3
+        mock_async_session.flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_keeps_last_row_per_conflict_key(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        TestUpsert._set_dialect(mock_async_session, "postgresql")
+        stmt = TestUpsert._upsert_statement_mock()
+        rows = [
+            {"id": ID_1, "name": "old"},
+            {"id": ID_2, "name": "b"},
+            {"id": ID_1, "name": "new"},
+        ]
+
+        with patch(
+            "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk.postgresql_insert",
+            return_value=stmt,
+            create=True,
+        ):
+            result = await bulk_upsert(
+                mock_async_session, mock_model, rows, conflict_fields=["id"]
+            )
+
+        assert result == COLLS_LEN_2
+        stmt.values.assert_called_once_with([
+            {"id": ID_1, "name": "new"},
+            {"id": ID_2, "name": "b"},
+        ])
+
+    @pytest.mark.asyncio
+    async def test_mysql_bulk_upsert_uses_on_duplicate_key_update(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        TestUpsert._set_dialect(mock_async_session, "mysql")
+        stmt = MagicMock()
+        stmt.values.return_value = stmt
+        stmt.on_duplicate_key_update.return_value = stmt
+
+        with patch(
+            "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk.mysql_insert",
+            return_value=stmt,
+            create=True,
+        ):
+            result = await bulk_upsert(
+                mock_async_session,
+                mock_model,
+                [{"id": ID_1, "name": "a"}],
+                conflict_fields=["id"],
+                update_values={"name": "updated"},
+            )
+
+        assert result == COLLS_LEN_1
+        stmt.on_duplicate_key_update.assert_called_once_with(name="updated")
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_empty_rows_is_noop(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        result = await bulk_upsert(
+            mock_async_session, mock_model, [], conflict_fields=["id"]
+        )
+
+        assert result == 0
+        mock_async_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_rejects_mismatched_columns(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        with pytest.raises(expected_exception=ValueError, match="same columns"):
+            await bulk_upsert(
+                mock_async_session,
+                mock_model,
+                [{"id": ID_1, "name": "a"}, {"id": ID_2, "age": 3}],
+                conflict_fields=["id"],
+            )
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_db_error(
+        self, mock_model: type[FakeModel], mock_async_session: Mock
+    ) -> None:
+        TestUpsert._set_dialect(mock_async_session, "sqlite")
+        stmt = TestUpsert._upsert_statement_mock()
+        mock_async_session.execute.side_effect = SQLAlchemyError()
+
+        with (
+            patch(
+                "src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud._bulk.sqlite_insert",
+                return_value=stmt,
+                create=True,
+            ),
+            pytest.raises(expected_exception=DatabaseError, match="Bulk upsert"),
+        ):
+            await bulk_upsert(
+                mock_async_session,
+                mock_model,
+                [{"id": ID_1, "name": "a"}],
+                conflict_fields=["id"],
+            )
+
+
 class TestListItems:
     """Test suite for list_items query operation.
 
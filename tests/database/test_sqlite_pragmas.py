@@ -137,3 +137,38 @@ async def test_pragmas_applied_through_real_async_engine(
             assert sync.scalar_one() == 1
     finally:
         await engine.dispose()
+
+
+async def test_incremental_vacuum_runs_only_on_sqlite(tmp_path: Path) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'vacuum.db'}")
+    try:
+        async with engine.connect() as conn:
+            # The connect hook already created the file; VACUUM applies the mode.
+            await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            await conn.exec_driver_sql("VACUUM")
+            await conn.exec_driver_sql("CREATE TABLE blobs (data BLOB)")
+            await conn.exec_driver_sql(
+                "INSERT INTO blobs SELECT zeroblob(4096) FROM "
+                "(WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 "
+                "FROM n WHERE i < 200) SELECT i FROM n)"
+            )
+            await conn.exec_driver_sql("DELETE FROM blobs")
+            await conn.commit()
+            freed = await conn.exec_driver_sql("PRAGMA freelist_count")
+            assert freed.scalar_one() > 1
+
+        async with AsyncSession(engine) as session, session.begin():
+            assert await sqlite_pragmas.incremental_vacuum(session) is True
+
+        async with engine.connect() as conn:
+            freed = await conn.exec_driver_sql("PRAGMA freelist_count")
+            assert freed.scalar_one() == 0
+    finally:
+        await engine.dispose()
+
+    postgres = MagicMock()
+    postgres.get_bind.return_value.dialect.name = "postgresql"
+    assert await sqlite_pragmas.incremental_vacuum(postgres) is False
+    postgres.execute.assert_not_called()
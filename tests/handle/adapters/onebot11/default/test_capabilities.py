@@ -0,0 +1,64 @@
+"""测试连接建立与断开时的 OneBot 实现能力缓存。"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.adapters.onebot11.default import (
+    capabilities as module,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.capabilities import (
+    GROUP_NOTICE,
+    NAPCAT,
+    get_onebot_capabilities,
+)
+
+_BOT_ID = "123456789"
+_NAPCAT_INFO = {
+    "app_name": "NapCat.Onebot",
+    "app_version": "4.18.0",
+    "protocol_version": "v11",
+}
+
+
+def _bot(*, return_value: object = None, side_effect: object = None) -> MagicMock:
+    bot = MagicMock(spec=OneBot11Bot)
+    bot.self_id = _BOT_ID
+    bot.get_version_info = AsyncMock(return_value=return_value, side_effect=side_effect)
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_connect_fills_the_cache_and_disconnect_drops_it() -> None:
+    bot = _bot(return_value=_NAPCAT_INFO)
+
+    await module.load_capabilities_on_connect(bot)
+    capabilities = await get_onebot_capabilities(bot)
+    await module.clear_capabilities_on_disconnect(bot)
+    await get_onebot_capabilities(bot)
+
+    assert capabilities.implementation(GROUP_NOTICE) == NAPCAT
+    assert bot.get_version_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_is_retried_on_first_use() -> None:
+    bot = _bot(side_effect=[ActionFailed(), _NAPCAT_INFO])
+
+    await module.load_capabilities_on_connect(bot)
+    capabilities = await get_onebot_capabilities(bot)
+
+    assert capabilities.app_name == "NapCat.Onebot"
+    assert bot.get_version_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_ignores_other_adapters() -> None:
+    bot = SimpleNamespace(self_id=_BOT_ID, get_version_info=AsyncMock())
+
+    await module.load_capabilities_on_connect(bot)
+
+    bot.get_version_info.assert_not_awaited()
@@ -0,0 +1,45 @@
+"""测试入群/退群通知触发的群列表缓存失效。"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.adapters.onebot11.default import (
+    group_directory as module,
+)
+
+_BOT_ID = 123456789
+_GROUP_ID = 200001
+
+
+@pytest.mark.asyncio
+async def test_bot_membership_notice_invalidates_directory() -> None:
+    """机器人自身入群或退群时丢弃群列表缓存。"""
+    event = SimpleNamespace(self_id=_BOT_ID, group_id=_GROUP_ID, user_id=_BOT_ID)
+
+    with patch.object(module, "invalidate_group_directory") as invalidate:
+        await module.invalidate_group_directory_on_notice(event)
+
+    invalidate.assert_called_once_with(str(_BOT_ID))
+
+
+@pytest.mark.asyncio
+async def test_member_notice_keeps_directory() -> None:
+    """普通成员入群或退群不影响群列表。"""
+    event = SimpleNamespace(self_id=_BOT_ID, group_id=_GROUP_ID, user_id=100001)
+
+    with patch.object(module, "invalidate_group_directory") as invalidate:
+        await module.invalidate_group_directory_on_notice(event)
+
+    invalidate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bot_disconnect_clears_its_directory() -> None:
+    with patch.object(module, "invalidate_group_directory") as invalidate:
+        await module.clear_group_directory_on_disconnect(
+            SimpleNamespace(self_id=str(_BOT_ID))
+        )
+
+    invalidate.assert_called_once_with(str(_BOT_ID))
@@ -0,0 +1,48 @@
+"""测试群成员通知触发的成员信息缓存失效。"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.adapters.onebot11.default import (
+    member_cache as module,
+)
+
+_BOT_ID = 123456789
+_GROUP_ID = 200001
+_USER_ID = 100001
+
+
+def _notice(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(self_id=_BOT_ID, group_id=_GROUP_ID, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("user_id", "expected_args"),
+    [
+        (_USER_ID, (str(_BOT_ID), _GROUP_ID, _USER_ID)),
+        (0, (str(_BOT_ID), _GROUP_ID)),
+        (_BOT_ID, (str(_BOT_ID), _GROUP_ID)),
+    ],
+)
+async def test_notice_invalidates_member_or_whole_group(
+    user_id: int,
+    expected_args: tuple[object, ...],
+) -> None:
+    """普通成员只失效自身；全体（0）或 bot 自身失效整个群。"""
+    with patch.object(module, "invalidate_group_member") as invalidate:
+        await module.invalidate_member_cache_on_notice(_notice(user_id))
+
+    invalidate.assert_called_once_with(*expected_args)
+
+
+@pytest.mark.asyncio
+async def test_bot_disconnect_clears_its_member_cache() -> None:
+    with patch.object(module, "clear_member_cache") as clear:
+        await module.clear_member_cache_on_disconnect(
+            SimpleNamespace(self_id=str(_BOT_ID))
+        )
+
+    clear.assert_called_once_with(str(_BOT_ID))
@@ -23,6 +23,7 @@ async def test_telegram_menu_filters_by_allowed_command_keys(
     await telegram_menu_module.telegram_menu(
         SimpleNamespace(),
         AsyncMock(),
+        {},
         SimpleNamespace(),
     )
 
@@ -39,7 +40,7 @@ async def test_telegram_menu_without_event_keeps_context_only(
     finish = AsyncMock()
     monkeypatch.setattr(telegram_menu_module.menu_cmd, "finish", finish)
 
-    await telegram_menu_module.telegram_menu(SimpleNamespace(), AsyncMock())
+    await telegram_menu_module.telegram_menu(SimpleNamespace(), AsyncMock(), {})
 
     assert finish.await_args is not None
     assert "灵初功能菜单" in finish.await_args.kwargs["message"]
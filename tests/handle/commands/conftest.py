@@ -1,3 +1,7 @@
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
@@ -26,6 +30,30 @@ def finish_text(mock_finish: MagicMock) -> str:
     return ""
 
 
+def use_media_store(
+    monkeypatch: pytest.MonkeyPatch, cache_dir: Path, max_bytes: int = 0
+) -> Path:
+    """Point the media store at ``cache_dir`` and return its media directory."""
+    from src.plugins.nonebot_plugin_lingchu_bot.core import media_store
+
+    monkeypatch.setattr(
+        media_store,
+        "plugin_config",
+        SimpleNamespace(cache_dir=cache_dir, media_cache_max_bytes=max_bytes),
+    )
+    return cache_dir / "media"
+
+
+def fake_download_into(content: bytes) -> Callable[..., Awaitable[int]]:
+    """Build a ``download_into`` stand-in that streams ``content`` to the sink."""
+
+    async def download_into(_url: str, sink: Any, **_kwargs: Any) -> int:
+        await sink.write(content)
+        return len(content)
+
+    return download_into
+
+
 @pytest.fixture
 def mock_onebot11_event() -> MagicMock:
     event = MagicMock(spec=OneBot11GroupMessageEvent)
@@ -2,17 +2,23 @@
 
 import hashlib
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, patch
 
 import aiofiles
 import pytest
 
+from src.plugins.nonebot_plugin_lingchu_bot.core import media_store
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands import announcement
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.announcement import (
     onebot_v11_send_group_announcement,
     send_group_announcement_cmd,
 )
-from tests.handle.commands.conftest import finish_text
+from tests.handle.commands.conftest import (
+    fake_download_into,
+    finish_text,
+    use_media_store,
+)
 
 
 def create_mock_image(raw: bytes | None = None) -> MagicMock:
@@ -87,9 +93,7 @@ async def test_onebot11_send_group_announcement_calls_extension_api_with_image(
     mock_onebot11_bot.call_api = AsyncMock()
     mock_onebot11_bot.get_group_member_info = AsyncMock(return_value={"role": "admin"})
 
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(announcement, "plugin_config", fake_config)
+    media_dir = use_media_store(monkeypatch, tmp_path)
 
     raw_bytes = b"fake-image-bytes"
     image = create_mock_image(raw=raw_bytes)
@@ -103,8 +107,8 @@ async def test_onebot11_send_group_announcement_calls_extension_api_with_image(
             session=mock_session,
         )
 
-    expected_md5 = hashlib.md5(raw_bytes).hexdigest()
-    expected_image = str(tmp_path / "announcement_images" / f"{expected_md5}.png")
+    expected_digest = hashlib.sha256(raw_bytes).hexdigest()
+    expected_image = str(media_dir / f"{expected_digest}.png")
     mock_onebot11_bot.call_api.assert_called_once_with(
         "_send_group_notice",
         group_id=mock_onebot11_event.group_id,
@@ -189,17 +193,15 @@ async def test_resolve_image_path_caches_raw_bytes(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """_resolve_image_path 通过 aiofiles 异步写入缓存文件。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(announcement, "plugin_config", fake_config)
+    media_dir = use_media_store(monkeypatch, tmp_path)
 
     raw_bytes = b"fake-image-bytes"
     image = create_mock_image(raw=raw_bytes)
 
     result = await announcement._resolve_image_path(image)
 
-    expected_md5 = hashlib.md5(raw_bytes).hexdigest()
-    expected_path = tmp_path / "announcement_images" / f"{expected_md5}.png"
+    expected_digest = hashlib.sha256(raw_bytes).hexdigest()
+    expected_path = media_dir / f"{expected_digest}.png"
     assert result is not None
     assert result.local_path == expected_path
     async with aiofiles.open(result.local_path, "rb") as f:
@@ -212,9 +214,7 @@ async def test_resolve_image_path_returns_path_attribute(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Raw 为空但 path 存在时，直接返回该路径。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(announcement, "plugin_config", fake_config)
+    use_media_store(monkeypatch, tmp_path)
 
     existing_path = tmp_path / "existing.png"
     image = MagicMock()
@@ -233,11 +233,13 @@ async def test_resolve_image_path_uses_bounded_public_download(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(announcement, "plugin_config", fake_config)
-    download = AsyncMock(return_value=b"safe-image")
-    monkeypatch.setattr(announcement, "download_public_http_bytes", download)
+    use_media_store(monkeypatch, tmp_path)
+    download = AsyncMock(side_effect=fake_download_into(b"safe-image"))
+    monkeypatch.setattr(
+        media_store,
+        "get_public_http_downloader",
+        lambda: SimpleNamespace(download_into=download),
+    )
 
     image = create_mock_image()
     image.url = "https://example.com/announcement.png"
@@ -247,5 +249,7 @@ async def test_resolve_image_path_uses_bounded_public_download(
     assert result is not None
     download.assert_awaited_once_with(
         "https://example.com/announcement.png",
+        ANY,
         max_bytes=10 * 1024 * 1024,
+        request_timeout=None,
     )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from types import SimpleNamespace
+from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -14,9 +15,11 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands import (
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.block import (
     block_member_cmd,
     clear_blocklist_cmd,
+    export_blocklist_cmd,
     global_block_member_cmd,
     global_clear_blocklist_cmd,
     global_unblock_member_cmd,
+    import_blocklist_cmd,
     unblock_member_cmd,
 )
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.triggers import (
@@ -24,6 +27,10 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.triggers import (
 )
 from tests.handle.commands.conftest import finish_text
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
 # 测试用 user_id 常量（避免 PLR2004 魔数值警告）
 # _TEST_USER_ID_BLOCK 不能等于 mock_onebot11_event.user_id（111222333），
 # 否则会触发"不能拉黑自己"拦截。
@@ -458,6 +465,105 @@ async def test_onebot11_unblock_member_with_direct_user_id(
 # ================= __getattr__ 懒加载导出测试 =================
 
 
+@pytest.fixture
+def transfer_dir(tmp_path: Path) -> Iterator[Path]:
+    directory = tmp_path / "blocklist"
+    directory.mkdir()
+    (directory / "list.csv").write_text("user_id\n1\n", encoding="utf-8")
+    (directory / ".hidden.csv").write_text("user_id\n", encoding="utf-8")
+    with patch.object(
+        block_module, "plugin_config", SimpleNamespace(data_dir=tmp_path)
+    ):
+        yield directory
+
+
+@pytest.mark.asyncio
+async def test_onebot11_import_blocklist_imports_for_current_bot(
+    mock_onebot11_bot: MagicMock,
+    mock_onebot11_event: MagicMock,
+    transfer_dir: Path,
+) -> None:
+
+    with (
+        patch.object(
+            block_module, "import_blocklist", AsyncMock(return_value=1)
+        ) as run,
+        patch.object(import_blocklist_cmd, "finish", AsyncMock()) as mock_finish,
+    ):
+        await block_module.onebot11_import_blocklist(
+            file="list.csv", bot=mock_onebot11_bot, event=mock_onebot11_event
+        )
+
+    assert run.await_args is not None
+    assert run.await_args.args == (
+        transfer_dir / "list.csv",
+        {"platform_id": "qq", "adapter_id": "~onebot.v11", "bot_id": "1000"},
+    )
+    assert "写入记录: 1" in finish_text(mock_finish)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("transfer_dir")
+@pytest.mark.parametrize("file", ["../secrets.csv", ".hidden.csv", "missing.csv"])
+async def test_onebot11_import_blocklist_rejects_unusable_files(
+    mock_onebot11_bot: MagicMock,
+    mock_onebot11_event: MagicMock,
+    file: str,
+) -> None:
+
+    with (
+        patch.object(block_module, "import_blocklist", AsyncMock()) as run,
+        patch.object(import_blocklist_cmd, "finish", AsyncMock()) as mock_finish,
+    ):
+        await block_module.onebot11_import_blocklist(
+            file=file, bot=mock_onebot11_bot, event=mock_onebot11_event
+        )
+
+    run.assert_not_awaited()
+    assert "黑名单文件" in finish_text(mock_finish)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("transfer_dir")
+async def test_onebot11_import_blocklist_reports_invalid_records(
+    mock_onebot11_bot: MagicMock,
+    mock_onebot11_event: MagicMock,
+) -> None:
+    error = block_module.BlocklistTransferError("line 1: user_id is required")
+
+    with (
+        patch.object(block_module, "import_blocklist", AsyncMock(side_effect=error)),
+        patch.object(import_blocklist_cmd, "finish", AsyncMock()) as mock_finish,
+    ):
+        await block_module.onebot11_import_blocklist(
+            file="list.csv", bot=mock_onebot11_bot, event=mock_onebot11_event
+        )
+
+    assert "line 1: user_id is required" in finish_text(mock_finish)
+
+
+@pytest.mark.asyncio
+async def test_onebot11_export_blocklist_defaults_to_csv(
+    mock_onebot11_bot: MagicMock,
+    mock_onebot11_event: MagicMock,
+    transfer_dir: Path,
+) -> None:
+    with (
+        patch.object(
+            block_module, "export_blocklist", AsyncMock(return_value=3)
+        ) as run,
+        patch.object(export_blocklist_cmd, "finish", AsyncMock()) as mock_finish,
+    ):
+        await block_module.onebot11_export_blocklist(
+            bot=mock_onebot11_bot, event=mock_onebot11_event
+        )
+
+    assert run.await_args is not None
+    assert run.await_args.args == (transfer_dir / "blocklist.csv",)
+    assert run.await_args.kwargs["bot_id"] == "1000"
+    assert "导出记录: 3" in finish_text(mock_finish)
+
+
 class TestLazyExports:
     """commands.block 模块 __getattr__ 懒加载导出测试（覆盖行 97-100）。"""
 
@@ -481,6 +587,8 @@ class TestLazyExports:
             "onebot11_global_unblock_member",
             "onebot11_clear_blocklist",
             "onebot11_global_clear_blocklist",
+            "onebot11_import_blocklist",
+            "onebot11_export_blocklist",
             "onebot11_kick_blocklisted_message",
             "onebot11_reject_blocklisted_group_request",
         )
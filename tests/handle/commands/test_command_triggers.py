@@ -172,6 +172,18 @@ EXPECTED_TRIGGERS: dict[str, ExpectedTrigger] = {
         "chinese_aliases": set(),
         "english_aliases": set(),
     },
+    "import_blocklist": {
+        "primary": "导入黑名单",
+        "english": "import-blocklist",
+        "chinese_aliases": {"黑名单导入"},
+        "english_aliases": {"blocklist-import"},
+    },
+    "export_blocklist": {
+        "primary": "导出黑名单",
+        "english": "export-blocklist",
+        "chinese_aliases": {"黑名单导出"},
+        "english_aliases": {"blocklist-export"},
+    },
     "protect_member": {
         "primary": "拉白",
         "english": "protect",
@@ -250,6 +262,12 @@ EXPECTED_TRIGGERS: dict[str, ExpectedTrigger] = {
         "chinese_aliases": {"跨群删黑", "远程删除黑名单"},
         "english_aliases": {"remote-unblock-member", "cross-group-unblock"},
     },
+    "mass_block": {
+        "primary": "批量拉黑",
+        "english": "mass-block",
+        "chinese_aliases": {"多群拉黑"},
+        "english_aliases": {"multi-group-block"},
+    },
     "remote_announcement": {
         "primary": "远程公告",
         "english": "remote-announcement",
@@ -274,6 +292,12 @@ EXPECTED_TRIGGERS: dict[str, ExpectedTrigger] = {
         "chinese_aliases": {"重置配置", "重载灵初配置"},
         "english_aliases": {"reload-lingchu-config", "reset-config"},
     },
+    "scheduler_stats": {
+        "primary": "调度统计",
+        "english": "scheduler-stats",
+        "chinese_aliases": {"定时任务统计"},
+        "english_aliases": {"job-stats"},
+    },
     "bot_silence": {
         "primary": "闭嘴",
         "english": "silence",
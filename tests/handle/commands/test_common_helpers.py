@@ -439,7 +439,7 @@ class TestFormatUserDisplayName:
 
 
 class TestRecordAuditFireAndForget:
-    """record_audit_fire_and_forget fire-and-forget 审计调度测试。"""
+    """record_audit_fire_and_forget 审计通道调度测试。"""
 
     @pytest.mark.asyncio
     async def test_schedules_audit_task_with_audit_prefix(
@@ -448,12 +448,13 @@ class TestRecordAuditFireAndForget:
         """调度时使用 audit:<action> 命名。"""
         captured: list[tuple[Any, str]] = []
 
-        def _spy(coro: Any, *, name: str = "fire_and_forget") -> Any:
+        def _spy(lane: str, coro: Any, *, name: str) -> bool:
+            assert lane == "audit"
             captured.append((coro, name))
-            return MagicMock()
+            return True
 
         with patch(
-            "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.fire_and_forget",
+            "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.submit_background",
             side_effect=_spy,
         ):
             await record_audit_fire_and_forget(
@@ -479,12 +480,13 @@ class TestRecordAuditFireAndForget:
         """可选字段缺省时仍正确调度。"""
         captured: list[tuple[Any, str]] = []
 
-        def _spy(coro: Any, *, name: str = "fire_and_forget") -> Any:
+        def _spy(lane: str, coro: Any, *, name: str) -> bool:
+            assert lane == "audit"
             captured.append((coro, name))
-            return MagicMock()
+            return True
 
         with patch(
-            "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.fire_and_forget",
+            "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.submit_background",
             side_effect=_spy,
         ):
             await record_audit_fire_and_forget(
@@ -505,13 +507,14 @@ class TestRecordAuditFireAndForget:
         """远程命令通过结构化审计对象携带目标群。"""
         captured: list[tuple[Any, str]] = []
 
-        def _spy(coro: Any, *, name: str = "fire_and_forget") -> Any:
+        def _spy(lane: str, coro: Any, *, name: str) -> bool:
+            assert lane == "audit"
             captured.append((coro, name))
-            return MagicMock()
+            return True
 
         with (
             patch(
-                "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.fire_and_forget",
+                "src.plugins.nonebot_plugin_lingchu_bot.core.async_utils.submit_background",
                 side_effect=_spy,
             ),
             patch(
@@ -1,5 +1,7 @@
 """测试群生命周期命令 - OneBot11 群 API 映射覆盖"""
 
+from collections.abc import Iterator
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from nonebot.adapters.onebot.v11.exception import ActionFailed as OneBot11ActionFailed
@@ -9,11 +11,16 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.lifecycle import
     onebot11_quit_group,
     onebot11_reset_runtime_config,
     onebot11_restart_protocol_endpoint,
+    onebot11_scheduler_stats,
     quit_group_cmd,
     reset_runtime_config_cmd,
     restart_protocol_endpoint_cmd,
+    scheduler_stats_cmd,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.services import (
+    protocol_restart_feedback,
+    scheduler_history,
 )
-from src.plugins.nonebot_plugin_lingchu_bot.services import protocol_restart_feedback
 from tests.handle.commands.conftest import finish_text
 
 
@@ -27,8 +34,12 @@ def mock_session() -> Mock:
 
 
 @pytest.fixture(autouse=True)
-def clear_restart_feedback() -> None:
+def clear_restart_feedback() -> Iterator[None]:
+    protocol_restart_feedback.clear_pending_restart_feedback()
+    scheduler_history.clear_job_runs()
+    yield
     protocol_restart_feedback.clear_pending_restart_feedback()
+    scheduler_history.clear_job_runs()
 
 
 @pytest.mark.asyncio
@@ -219,3 +230,47 @@ async def test_onebot11_reset_runtime_config_reloads_runtime_state(
 
     reload_runtime_configs.assert_awaited_once()
     assert finish_text(mock_finish) == "灵初配置已从磁盘重置"
+
+
+@pytest.mark.asyncio
+async def test_onebot11_scheduler_stats_reports_empty_history(
+    mock_onebot11_bot: MagicMock, mock_onebot11_event: MagicMock, mock_session: Mock
+) -> None:
+    with patch.object(scheduler_stats_cmd, "finish") as mock_finish:
+        await onebot11_scheduler_stats(
+            bot=mock_onebot11_bot,
+            event=mock_onebot11_event,
+            session=mock_session,
+        )
+
+    assert finish_text(mock_finish) == "暂无调度任务执行记录"
+
+
+@pytest.mark.asyncio
+async def test_onebot11_scheduler_stats_lists_percentiles_per_handler(
+    mock_onebot11_bot: MagicMock, mock_onebot11_event: MagicMock, mock_session: Mock
+) -> None:
+    now = datetime.now(UTC)
+    for duration_ms, skipped in ((10.0, False), (30.0, False), (None, True)):
+        scheduler_history.remember_job_run(
+            scheduler_history.JobRun(
+                job_id="cleanup",
+                handler_key="cleanup",
+                started_at=now,
+                finished_at=now,
+                duration_ms=duration_ms,
+                skipped=skipped,
+            )
+        )
+
+    with patch.object(scheduler_stats_cmd, "finish") as mock_finish:
+        await onebot11_scheduler_stats(
+            bot=mock_onebot11_bot,
+            event=mock_onebot11_event,
+            session=mock_session,
+        )
+
+    assert finish_text(mock_finish).splitlines() == [
+        "调度任务统计（最近 3 条记录）：",
+        "cleanup：执行 2 次，p50 10.0 ms，p95 30.0 ms，失败 0，错过 0，跳过 1",
+    ]
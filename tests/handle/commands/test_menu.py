@@ -1,6 +1,10 @@
+from dataclasses import replace
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+from nonebot.adapters.onebot.v11.event import (
+    GroupMessageEvent as OneBot11GroupMessageEvent,
+)
 import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.handle import menu
@@ -103,10 +107,68 @@ def test_set_menu_features_replaces_runtime_data() -> None:
             "zh_CN",
         )
         assert "自定义摘要" in rendered
+        assert menu.menu_command_keys() == frozenset({default_feature.command_key})
     finally:
         menu.set_menu_features(menu._DEFAULT_MENU_FEATURES)
 
 
+def test_rendered_menus_are_memoized_until_the_menu_changes() -> None:
+    context = qq_menu_context(adapter_id=ONEBOT_V11_ADAPTER_ID)
+    allowed = frozenset({"kick_member"})
+    render_page = Mock(wraps=menu._render_page)
+
+    with patch.object(menu, "_render_page", render_page):
+        first = render_menu_page("member-management", context, "zh_CN", allowed)
+        again = render_menu_page("member-management", context, "zh_CN", allowed)
+        render_menu_page("member-management", context, "en_US", allowed)
+        render_menu_page("member-management", context, "zh_CN", frozenset())
+        assert again is first
+        assert render_page.call_count == 3
+
+        try:
+            menu.set_menu_features(())
+            emptied = render_menu_page("member-management", context, "zh_CN", allowed)
+        finally:
+            menu.set_menu_features(menu._DEFAULT_MENU_FEATURES)
+
+    assert emptied != first
+    assert render_page.call_count == 4
+
+
+def test_menu_compilation_skips_unknown_command_keys() -> None:
+    default_feature = menu._DEFAULT_MENU_FEATURES[0]
+    unknown_feature = replace(default_feature, command_key="missing_command")
+
+    try:
+        menu.set_menu_features((unknown_feature, default_feature))
+        rendered = render_menu_page(
+            "member-management",
+            qq_menu_context(adapter_id=ONEBOT_V11_ADAPTER_ID),
+            "zh_CN",
+        )
+    finally:
+        menu.set_menu_features(menu._DEFAULT_MENU_FEATURES)
+
+    assert rendered.count("\n- ") == 1
+
+
+@pytest.mark.asyncio
+async def test_onebot11_menu_evaluates_all_menu_keys_in_one_batch() -> None:
+    session = AsyncMock()
+    bot = Mock()
+    event = MagicMock(spec=OneBot11GroupMessageEvent)
+    state: dict[str, object] = {}
+    allowed = AsyncMock(return_value=frozenset({"kick_member"}))
+
+    with patch.object(onebot_menu_module, "allowed_command_keys", allowed):
+        keys = await onebot_menu_module._allowed_menu_keys(session, bot, event, state)
+
+    assert keys == frozenset({"kick_member"})
+    allowed.assert_awaited_once_with(
+        session, bot, event, menu.menu_command_keys(), state=state
+    )
+
+
 def test_extension_features_have_implementation_availability() -> None:
     extension_features = {
         feature.command_key: feature
@@ -295,6 +357,21 @@ def test_onebot_low_versions_hide_extension_features() -> None:
     assert "设置群头像" not in napcat_rendered
 
 
+def test_onebot_invalid_version_hides_extension_features() -> None:
+    rendered = render_menu_page(
+        "group-chat-management",
+        qq_menu_context(
+            adapter_id=ONEBOT_V11_ADAPTER_ID,
+            implementation_name=NAPCAT_IMPL,
+            implementation_version="not-a-version",
+            protocol_version="v11",
+        ),
+        "zh_CN",
+    )
+
+    assert "发送群公告" not in rendered
+
+
 def test_fail_closed_when_platform_capability_missing() -> None:
     context = MenuRuntimeContext(
         platform_id="qq",
@@ -357,17 +434,18 @@ def test_remote_management_page_shows_announcement_for_napcat() -> None:
 @pytest.mark.asyncio
 async def test_onebot11_menu_reads_version_info_and_finishes() -> None:
     bot = SimpleNamespace(
+        self_id="10001",
         get_version_info=AsyncMock(
             return_value={
                 "protocol_version": "v11",
                 "app_name": NAPCAT_IMPL,
                 "app_version": "4.18.0",
             }
-        )
+        ),
     )
 
     with patch.object(menu_cmd, "finish") as mock_finish:
-        await onebot11_menu(bot=bot, session=Mock())
+        await onebot11_menu(bot=bot, session=Mock(), state={})
 
     bot.get_version_info.assert_awaited_once()
     assert "群聊管理" in finish_text(mock_finish)
@@ -378,19 +456,24 @@ async def test_onebot11_menu_reads_version_info_and_finishes() -> None:
 @pytest.mark.asyncio
 async def test_onebot11_menu_page_reads_version_info_and_finishes() -> None:
     bot = SimpleNamespace(
+        self_id="10001",
         get_version_info=AsyncMock(
             return_value={
                 "protocol_version": "v11",
                 "app_name": NAPCAT_IMPL,
                 "app_version": "4.18.0",
             }
-        )
+        ),
     )
     command = menu_page_cmds["group-chat-management"]
 
     with patch.object(command, "finish") as mock_finish:
-        await onebot11_menu_pages["group-chat-management"](bot=bot, session=Mock())
+        for _ in range(2):
+            await onebot11_menu_pages["group-chat-management"](
+                bot=bot, session=Mock(), state={}
+            )
 
+    # 实现能力按 bot 缓存，重复渲染不再查询协议端
     bot.get_version_info.assert_awaited_once()
     assert "设置群头像" in finish_text(mock_finish)
     assert "发送群公告" in finish_text(mock_finish)
@@ -398,13 +481,15 @@ async def test_onebot11_menu_page_reads_version_info_and_finishes() -> None:
 
 @pytest.mark.asyncio
 async def test_onebot11_menu_fails_closed_when_detection_fails() -> None:
-    bot = SimpleNamespace(get_version_info=AsyncMock(side_effect=RuntimeError("boom")))
+    bot = SimpleNamespace(
+        self_id="10001", get_version_info=AsyncMock(side_effect=RuntimeError("boom"))
+    )
 
     with (
         patch.object(onebot_menu_module.logger, "debug") as mock_debug,
         patch.object(menu_cmd, "finish") as mock_finish,
     ):
-        await onebot11_menu(bot=bot, session=Mock())
+        await onebot11_menu(bot=bot, session=Mock(), state={})
 
     mock_debug.assert_called_once()
     assert "发送群公告" not in finish_text(mock_finish)
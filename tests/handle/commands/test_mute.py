@@ -1,6 +1,5 @@
 """测试禁言命令 - 边界行为覆盖"""
 
-import json
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from nonebot_plugin_alconna.uniseg import At
@@ -28,7 +27,7 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.mute import (
 )
 
 RECALL_DELETE_COUNT = 2
-RECALL_QUERY_COUNT = 2
+RECALL_FETCH_LIMIT = 21
 
 
 def finish_message(mock_finish: MagicMock) -> object:
@@ -342,22 +341,22 @@ class TestOneBot11Mute:
         first_record = MagicMock(
             message_id="101",
             user_id="2001",
-            conversation_id=str(mock_onebot11_event.group_id),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         command_record = MagicMock(
             message_id="999",
             user_id="111222333",
-            conversation_id=str(mock_onebot11_event.group_id),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         admin_record = MagicMock(
             message_id="102",
             user_id="2002",
-            conversation_id=str(mock_onebot11_event.group_id),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         second_record = MagicMock(
             message_id="103",
             user_id="2003",
-            conversation_id=str(mock_onebot11_event.group_id),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         mock_onebot11_event.message_id = 999
         mock_onebot11_bot.get_msg = AsyncMock(
@@ -420,7 +419,7 @@ class TestOneBot11Mute:
                 event=mock_onebot11_event,
             )
 
-        assert list_recent.await_count == RECALL_QUERY_COUNT
+        list_recent.assert_awaited_once()
         assert list_recent.call_args.args[0] is mock_session
         assert list_recent.call_args.kwargs["bot_id"] == mock_onebot11_bot.self_id
         mock_onebot11_bot.delete_msg.assert_any_await(message_id=101)
@@ -429,7 +428,7 @@ class TestOneBot11Mute:
         assert "已撤回 2 条消息" in finish_text(mock_finish)
 
     @pytest.mark.asyncio
-    async def test_onebot11_recall_message_uses_legacy_session_records(
+    async def test_onebot11_recall_message_queries_the_group_conversation_key(
         self,
         mock_onebot11_bot: MagicMock,
         mock_onebot11_event: MagicMock,
@@ -438,8 +437,7 @@ class TestOneBot11Mute:
         record = MagicMock(
             message_id="101",
             user_id="2001",
-            conversation_id=f"group_{mock_onebot11_event.group_id}_2001",
-            raw_event=json.dumps({"group_id": mock_onebot11_event.group_id}),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         mock_onebot11_event.message_id = 999
         mock_onebot11_bot.get_msg = AsyncMock(
@@ -462,7 +460,7 @@ class TestOneBot11Mute:
             patch.object(
                 mute_module.message_repository,
                 "list_recent_messages",
-                AsyncMock(side_effect=[[record], []]),
+                AsyncMock(return_value=[record]),
             ) as list_recent,
             patch.object(
                 mute_module,
@@ -479,11 +477,14 @@ class TestOneBot11Mute:
                 event=mock_onebot11_event,
             )
 
-        assert list_recent.await_count == RECALL_QUERY_COUNT
-        assert list_recent.await_args_list[0].args[0] is mock_session
-        assert "conversation_id" not in list_recent.await_args_list[0].kwargs
-        assert list_recent.await_args_list[1].kwargs["conversation_id"] == str(
-            mock_onebot11_event.group_id
+        list_recent.assert_awaited_once_with(
+            mock_session,
+            platform_id="qq",
+            adapter_id="~onebot.v11",
+            bot_id=mock_onebot11_bot.self_id,
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
+            user_id=None,
+            limit=RECALL_FETCH_LIMIT,
         )
         mock_onebot11_bot.delete_msg.assert_awaited_once_with(message_id=101)
         assert "已撤回 1 条消息" in finish_text(mock_finish)
@@ -499,7 +500,7 @@ class TestOneBot11Mute:
         record = MagicMock(
             message_id="101",
             user_id="987654321",
-            conversation_id=str(mock_onebot11_event.group_id),
+            conversation_id=f"group:{mock_onebot11_event.group_id}",
         )
         mock_onebot11_event.message_id = 999
         mock_onebot11_bot.get_msg = AsyncMock(
@@ -541,6 +542,6 @@ class TestOneBot11Mute:
 
         assert list_recent.call_args.args[0] is mock_session
         assert list_recent.call_args.kwargs["user_id"] == "987654321"
-        assert list_recent.await_count == RECALL_QUERY_COUNT
+        list_recent.assert_awaited_once()
         mock_onebot11_bot.delete_msg.assert_awaited_once_with(message_id=101)
         assert "目标: @测试用户" in finish_text(mock_finish)
@@ -6,12 +6,12 @@ from io import BytesIO
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, patch
 
 import aiofiles
 import pytest
 
-from src.plugins.nonebot_plugin_lingchu_bot.core import http_security
+from src.plugins.nonebot_plugin_lingchu_bot.core import http_security, media_store
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands import profile
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.profile import (
     onebot11_set_group_avatar,
@@ -19,7 +19,11 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.profile import (
     set_group_avatar_cmd,
     set_group_name_cmd,
 )
-from tests.handle.commands.conftest import finish_text
+from tests.handle.commands.conftest import (
+    fake_download_into,
+    finish_text,
+    use_media_store,
+)
 
 
 def create_mock_image(raw: bytes | None = None) -> MagicMock:
@@ -152,17 +156,15 @@ async def test_resolve_image_path_caches_raw_bytes(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """_resolve_image_path 通过 aiofiles 异步写入缓存文件。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    media_dir = use_media_store(monkeypatch, tmp_path)
 
     raw_bytes = b"fake-avatar-bytes"
     image = create_mock_image(raw=raw_bytes)
 
     result = await profile._resolve_image_path(image)
 
-    expected_md5 = hashlib.md5(raw_bytes).hexdigest()
-    expected_path = tmp_path / "announcement_images" / f"{expected_md5}.png"
+    expected_digest = hashlib.sha256(raw_bytes).hexdigest()
+    expected_path = media_dir / f"{expected_digest}.png"
     assert result == expected_path
     assert result is not None
     async with aiofiles.open(result, "rb") as f:
@@ -174,9 +176,7 @@ async def test_resolve_image_path_returns_path_for_path_attribute(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """_resolve_image_path 直接返回 path 属性对应的 Path 对象。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    use_media_store(monkeypatch, tmp_path)
 
     expected_path = tmp_path / "avatar.png"
     image = MagicMock()
@@ -194,9 +194,7 @@ async def test_resolve_image_path_caches_raw_bytesio(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """_resolve_image_path 处理 BytesIO 类型的 raw 属性。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    media_dir = use_media_store(monkeypatch, tmp_path)
 
     raw_bytes = b"bytesio-avatar-bytes"
     image = MagicMock()
@@ -206,8 +204,8 @@ async def test_resolve_image_path_caches_raw_bytesio(
 
     result = await profile._resolve_image_path(image)
 
-    expected_md5 = hashlib.md5(raw_bytes).hexdigest()
-    expected_path = tmp_path / "announcement_images" / f"{expected_md5}.png"
+    expected_digest = hashlib.sha256(raw_bytes).hexdigest()
+    expected_path = media_dir / f"{expected_digest}.png"
     assert result == expected_path
     assert result is not None
     async with aiofiles.open(result, "rb") as f:
@@ -219,9 +217,7 @@ async def test_resolve_image_path_downloads_and_caches_url(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """_resolve_image_path 通过 driver session 下载 URL 图片并缓存。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    media_dir = use_media_store(monkeypatch, tmp_path)
 
     downloaded_content = b"downloaded-image-bytes"
     request_call = AsyncMock(
@@ -254,8 +250,8 @@ async def test_resolve_image_path_downloads_and_caches_url(
 
     result = await profile._resolve_image_path(image)
 
-    expected_md5 = hashlib.md5(downloaded_content).hexdigest()
-    expected_path = tmp_path / "announcement_images" / f"{expected_md5}.png"
+    expected_digest = hashlib.sha256(downloaded_content).hexdigest()
+    expected_path = media_dir / f"{expected_digest}.png"
     assert result == expected_path
     assert result is not None
     async with aiofiles.open(result, "rb") as f:
@@ -268,9 +264,7 @@ async def test_resolve_image_path_returns_none_when_driver_has_no_session(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Driver 没有 get_session 方法时，URL 图片返回 None。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    use_media_store(monkeypatch, tmp_path)
 
     fake_driver = SimpleNamespace()
     monkeypatch.setattr(http_security, "get_driver", lambda: fake_driver)
@@ -295,9 +289,7 @@ async def test_resolve_image_path_returns_none_when_no_resolvable_attribute(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """raw/path/url 均为 None 时返回 None。"""
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
+    use_media_store(monkeypatch, tmp_path)
 
     image = MagicMock()
     image.raw = None
@@ -314,11 +306,13 @@ async def test_resolve_image_path_uses_bounded_public_download_for_avatar(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    fake_config = MagicMock()
-    fake_config.cache_dir = tmp_path
-    monkeypatch.setattr(profile, "plugin_config", fake_config)
-    download = AsyncMock(return_value=b"safe-avatar")
-    monkeypatch.setattr(profile, "download_public_http_bytes", download)
+    use_media_store(monkeypatch, tmp_path)
+    download = AsyncMock(side_effect=fake_download_into(b"safe-avatar"))
+    monkeypatch.setattr(
+        media_store,
+        "get_public_http_downloader",
+        lambda: SimpleNamespace(download_into=download),
+    )
 
     image = create_mock_image()
     image.url = "https://example.com/avatar.png"
@@ -328,5 +322,7 @@ async def test_resolve_image_path_uses_bounded_public_download_for_avatar(
     assert result is not None
     download.assert_awaited_once_with(
         "https://example.com/avatar.png",
+        ANY,
         max_bytes=10 * 1024 * 1024,
+        request_timeout=None,
     )
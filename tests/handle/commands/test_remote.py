@@ -1,5 +1,7 @@
 """测试远程管理命令 - 边界行为覆盖"""
 
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
 import hashlib
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
@@ -8,7 +10,10 @@ from nonebot.adapters.onebot.v11 import Bot as OneBot11Bot
 from nonebot.adapters.onebot.v11.event import (
     GroupMessageEvent as OneBot11GroupMessageEvent,
 )
-from nonebot.adapters.onebot.v11.exception import ActionFailed as OneBot11ActionFailed
+from nonebot.adapters.onebot.v11.exception import (
+    ActionFailed as OneBot11ActionFailed,
+    NetworkError as OneBot11NetworkError,
+)
 from nonebot_plugin_alconna.uniseg import At
 import pytest
 
@@ -16,11 +21,9 @@ from src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud import DatabaseErr
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.adapters.onebot11.default import (
     remote as remote_module,
 )
-from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands import (
-    announcement as announcement_module,
-)
 from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.remote import (
     mass_announcement_cmd,
+    mass_block_cmd,
     remote_announcement_cmd,
     remote_block_cmd,
     remote_kick_cmd,
@@ -30,6 +33,11 @@ from src.plugins.nonebot_plugin_lingchu_bot.handle.qq.commands.remote import (
     remote_whole_mute_cmd,
     remote_whole_unmute_cmd,
 )
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.fanout import (
+    FanoutPolicy,
+    reset_fanout_rate_limits,
+)
+from tests.handle.commands.conftest import finish_text, use_media_store
 
 # 测试用群 ID 常量
 _GROUP_ID_1 = 111111111
@@ -40,6 +48,7 @@ _TARGET_USER_ID = 555555555
 # 通过对象引用访问远程处理器，避免硬编码模块路径
 _resolve_group_id = remote_module._resolve_group_id
 onebot11_mass_announcement = remote_module.onebot11_mass_announcement
+onebot11_mass_block = remote_module.onebot11_mass_block
 onebot11_remote_announcement = remote_module.onebot11_remote_announcement
 onebot11_remote_block = remote_module.onebot11_remote_block
 onebot11_remote_kick = remote_module.onebot11_remote_kick
@@ -60,10 +69,11 @@ def mock_session() -> Mock:
 
 
 @pytest.fixture(autouse=True)
-def _mock_record_audit_fire_and_forget():
+def record_audit() -> Iterator[AsyncMock]:
     """避免审计记录触发后台任务和数据库调用。"""
-    with patch.object(remote_module, "record_audit_fire_and_forget", new=AsyncMock()):
-        yield
+    audit = AsyncMock()
+    with patch.object(remote_module, "record_audit_fire_and_forget", new=audit):
+        yield audit
 
 
 @pytest.fixture(autouse=True)
@@ -246,6 +256,21 @@ class TestResolveMassAnnouncementTargets:
 
         assert result == [_GROUP_ID_1, _GROUP_ID_2, 333333333]
 
+    @pytest.mark.asyncio
+    async def test_resolve_named_targets_fetch_group_list_once(
+        self, mock_bot: MagicMock, mock_group_list: list[dict]
+    ) -> None:
+        mock_bot.get_group_list.return_value = mock_group_list
+
+        result = await remote_module._resolve_mass_announcement_targets(
+            mock_bot,
+            "测试群1，测试群2、其他",
+            mass_announcement_cmd,
+        )
+
+        assert result == [_GROUP_ID_1, _GROUP_ID_2, 333333333]
+        mock_bot.get_group_list.assert_awaited_once()
+
 
 class TestRemoteMute:
     """测试远程禁言命令。"""
@@ -819,9 +844,7 @@ class TestRemoteAnnouncement:
         }
         mock_bot.call_api.return_value = {}
 
-        fake_config = MagicMock()
-        fake_config.cache_dir = tmp_path / "default-cache"
-        monkeypatch.setattr(announcement_module, "plugin_config", fake_config)
+        media_dir = use_media_store(monkeypatch, tmp_path / "default-cache")
 
         raw_bytes = b"remote-announcement-image"
         image = MagicMock()
@@ -839,23 +862,26 @@ class TestRemoteAnnouncement:
                 image=image,
             )
 
-        expected_md5 = hashlib.md5(raw_bytes).hexdigest()
+        expected_digest = hashlib.sha256(raw_bytes).hexdigest()
         mock_bot.call_api.assert_called_once_with(
             "_send_group_notice",
             group_id=_GROUP_ID_1,
             content="测试公告内容",
-            image=str(
-                tmp_path
-                / "default-cache"
-                / "announcement_images"
-                / f"{expected_md5}.png"
-            ),
+            image=str(media_dir / f"{expected_digest}.png"),
         )
 
 
 class TestMassAnnouncement:
     """测试群发公告命令。"""
 
+    @pytest.fixture(autouse=True)
+    def _fast_fanout(self):
+        """去掉限速与重试退避等待。"""
+        policy = FanoutPolicy(concurrency=4, rate=1000.0, burst=100, backoff_seconds=0)
+        with patch.object(remote_module, "_MASS_ANNOUNCEMENT_POLICY", policy):
+            yield
+        reset_fanout_rate_limits()
+
     @pytest.mark.asyncio
     async def test_mass_announcement_defaults_to_all_groups(
         self,
@@ -894,6 +920,35 @@ class TestMassAnnouncement:
         ]
         assert "成功 3 个，失败 0 个" in str(mock_finish.call_args.args[0])
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [OneBot11ActionFailed(), OneBot11NetworkError()])
+    async def test_mass_announcement_reports_version_lookup_failure(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+        error: Exception,
+    ) -> None:
+        """获取协议端版本失败时回复操作被拒绝，不向任何群发送。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_version_info.side_effect = error
+
+        with patch.object(
+            mass_announcement_cmd, "finish", new_callable=AsyncMock
+        ) as mock_finish:
+            await onebot11_mass_announcement(
+                content="测试公告内容",
+                bot=mock_bot,
+                event=mock_event,
+                session=mock_session,
+                targets=None,
+                image=None,
+            )
+
+        mock_bot.call_api.assert_not_called()
+        mock_finish.assert_awaited_once_with("操作被拒绝")
+
     @pytest.mark.asyncio
     async def test_mass_announcement_sends_to_each_target(
         self,
@@ -938,6 +993,7 @@ class TestMassAnnouncement:
         mock_event: MagicMock,
         mock_group_list: list[dict],
         mock_session: Mock,
+        record_audit: AsyncMock,
     ) -> None:
         """单个目标发送失败时继续发送后续目标并汇总失败。"""
         mock_bot.get_group_list.return_value = mock_group_list
@@ -948,7 +1004,13 @@ class TestMassAnnouncement:
                 "app_name": "NapCat.Onebot",
             }
         }
-        mock_bot.call_api.side_effect = [OneBot11ActionFailed(), {}]
+
+        async def send_notice(_api: str, *, group_id: int, **_kwargs: str) -> dict:
+            if group_id == _GROUP_ID_1:
+                raise OneBot11ActionFailed
+            return {}
+
+        mock_bot.call_api.side_effect = send_notice
 
         with patch.object(
             mass_announcement_cmd, "finish", new_callable=AsyncMock
@@ -962,7 +1024,17 @@ class TestMassAnnouncement:
                 image=None,
             )
 
-        assert mock_bot.call_api.call_count == 2
+        # 失败目标按策略重试两次后放弃
+        assert mock_bot.call_api.call_count == 4
+        record_audit.assert_awaited_once_with(
+            mock_bot,
+            mock_event,
+            remote_module.CommandAudit(
+                action="mass_announcement",
+                group_id=_GROUP_ID_1,
+                result="111111111=操作被拒绝; 222222222=ok",
+            ),
+        )
         result_text = str(mock_finish.call_args.args[0])
         assert "成功 1 个，失败 1 个" in result_text
         assert "111111111" in result_text
@@ -995,6 +1067,77 @@ class TestMassAnnouncement:
 
         assert "群公告内容不能为空" in str(mock_finish.call_args.args[0])
 
+    @pytest.mark.asyncio
+    async def test_mass_announcement_resolves_version_once_and_reports_progress(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+    ) -> None:
+        """协议端版本只查询一次，每完成一批目标回复一次进度。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_version_info.return_value = {
+            "data": {
+                "protocol_version": "v11",
+                "app_version": "4.18.0",
+                "app_name": "NapCat.Onebot",
+            }
+        }
+        mock_bot.call_api.return_value = {}
+
+        with (
+            patch.object(remote_module, "_MASS_PROGRESS_INTERVAL", 1),
+            patch.object(
+                mass_announcement_cmd, "send", new_callable=AsyncMock
+            ) as mock_send,
+            patch.object(
+                mass_announcement_cmd, "finish", new_callable=AsyncMock
+            ) as mock_finish,
+        ):
+            await onebot11_mass_announcement(
+                content="测试公告内容",
+                bot=mock_bot,
+                event=mock_event,
+                session=mock_session,
+                targets="111111111,222222222,333333333",
+                image=None,
+            )
+
+        mock_bot.get_version_info.assert_awaited_once()
+        assert [item.args[0] for item in mock_send.await_args_list] == [
+            "群发公告进度：1/3",
+            "群发公告进度：2/3",
+        ]
+        assert "成功 3 个，失败 0 个" in str(mock_finish.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_mass_announcement_stops_on_unsupported_protocol(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+    ) -> None:
+        """协议端不支持群公告时不触达任何目标群。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_version_info.return_value = {"protocol_version": "v12"}
+
+        with patch.object(
+            mass_announcement_cmd, "finish", new_callable=AsyncMock
+        ) as mock_finish:
+            await onebot11_mass_announcement(
+                content="测试公告内容",
+                bot=mock_bot,
+                event=mock_event,
+                session=mock_session,
+                targets="111111111,222222222",
+                image=None,
+            )
+
+        mock_bot.call_api.assert_not_called()
+        assert "不支持的 OneBot 协议版本" in str(mock_finish.call_args.args[0])
+
     @pytest.mark.asyncio
     async def test_mass_announcement_sends_image_for_each_group(
         self,
@@ -1016,9 +1159,7 @@ class TestMassAnnouncement:
         }
         mock_bot.call_api.return_value = {}
 
-        fake_config = MagicMock()
-        fake_config.cache_dir = tmp_path / "default-cache"
-        monkeypatch.setattr(announcement_module, "plugin_config", fake_config)
+        media_dir = use_media_store(monkeypatch, tmp_path / "default-cache")
 
         raw_bytes = b"mass-announcement-image"
         image = MagicMock()
@@ -1036,29 +1177,19 @@ class TestMassAnnouncement:
                 image=image,
             )
 
-        expected_md5 = hashlib.md5(raw_bytes).hexdigest()
+        expected_digest = hashlib.sha256(raw_bytes).hexdigest()
         assert mock_bot.call_api.call_args_list == [
             call(
                 "_send_group_notice",
                 group_id=_GROUP_ID_1,
                 content="测试公告内容",
-                image=str(
-                    tmp_path
-                    / "default-cache"
-                    / "announcement_images"
-                    / f"{expected_md5}.png"
-                ),
+                image=str(media_dir / f"{expected_digest}.png"),
             ),
             call(
                 "_send_group_notice",
                 group_id=_GROUP_ID_2,
                 content="测试公告内容",
-                image=str(
-                    tmp_path
-                    / "default-cache"
-                    / "announcement_images"
-                    / f"{expected_md5}.png"
-                ),
+                image=str(media_dir / f"{expected_digest}.png"),
             ),
         ]
 
@@ -2046,3 +2177,207 @@ class TestMassAnnouncementErrorPaths:
                 image=None,
             )
         assert "失败 1 个" in str(mock_finish.call_args.args[0])
+
+
+def _member_roles(
+    mock_bot: MagicMock, roles: dict[tuple[int, int], str]
+) -> Callable[..., Awaitable[dict]]:
+    """按 (群号, 用户) 返回成员角色，未列出的目标用户视为不在群内。"""
+
+    async def get_group_member_info(
+        *, group_id: int, user_id: int, **_kwargs: object
+    ) -> dict:
+        if user_id == int(mock_bot.self_id):
+            return {"role": "admin", "user_id": user_id}
+        role = roles.get((group_id, user_id))
+        if role is None:
+            raise OneBot11ActionFailed
+        return {"role": role, "user_id": user_id}
+
+    return get_group_member_info
+
+
+class TestMassBlock:
+    """测试多群批量拉黑命令。"""
+
+    @pytest.fixture(autouse=True)
+    def _fast_fanout(self):
+        """去掉限速与重试退避等待。"""
+        policy = FanoutPolicy(concurrency=4, rate=1000.0, burst=100, backoff_seconds=0)
+        with patch.object(remote_module, "_MASS_KICK_POLICY", policy):
+            yield
+        reset_fanout_rate_limits()
+
+    async def _run(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_session: Mock,
+        targets: str,
+        bulk: AsyncMock,
+    ) -> str:
+        with (
+            patch.object(
+                remote_module,
+                "resolve_user_onebot11",
+                new=AsyncMock(return_value=(_TARGET_USER_ID, "测试用户")),
+            ),
+            patch.object(remote_module, "bulk_upsert_blocks", new=bulk),
+            patch.object(
+                mass_block_cmd, "finish", new_callable=AsyncMock
+            ) as mock_finish,
+        ):
+            await onebot11_mass_block(
+                targets=targets,
+                user=At("user", str(_TARGET_USER_ID)),
+                bot=mock_bot,
+                event=mock_event,
+                session=mock_session,
+                duration=3600,
+                reason="测试原因",
+            )
+        return finish_text(mock_finish)
+
+    @pytest.mark.asyncio
+    async def test_mass_block_writes_once_and_kicks_members(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+    ) -> None:
+        """全部目标群一次写入黑名单，只踢出在群内的目标。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_group_member_info.side_effect = _member_roles(
+            mock_bot, {(_GROUP_ID_1, _TARGET_USER_ID): "member"}
+        )
+        bulk = AsyncMock(return_value=2)
+
+        message = await self._run(
+            mock_bot, mock_event, mock_session, "111111111,222222222", bulk
+        )
+
+        assert bulk.await_args is not None
+        requests = bulk.await_args.args[1]
+        assert [request.group_id for request in requests] == [
+            _GROUP_ID_1,
+            _GROUP_ID_2,
+        ]
+        assert {request.user_id for request in requests} == {_TARGET_USER_ID}
+        mock_session.commit.assert_awaited_once()
+        mock_bot.set_group_kick.assert_awaited_once_with(
+            group_id=_GROUP_ID_1, user_id=_TARGET_USER_ID, reject_add_request=False
+        )
+        assert "成功 2 个，失败 0 个" in message
+
+    @pytest.mark.asyncio
+    async def test_mass_block_reports_refused_and_failed_groups(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+        record_audit: AsyncMock,
+    ) -> None:
+        """目标为管理员的群被拒绝，踢人失败的群计入失败。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_group_member_info.side_effect = _member_roles(
+            mock_bot,
+            {
+                (_GROUP_ID_1, _TARGET_USER_ID): "admin",
+                (_GROUP_ID_2, _TARGET_USER_ID): "member",
+            },
+        )
+        mock_bot.set_group_kick.side_effect = OneBot11ActionFailed()
+        bulk = AsyncMock(return_value=1)
+
+        with patch.object(
+            remote_module,
+            "operator_is_superuser_onebot11",
+            new=AsyncMock(return_value=False),
+        ):
+            message = await self._run(
+                mock_bot, mock_event, mock_session, "111111111,222222222", bulk
+            )
+
+        assert bulk.await_args is not None
+        requests = bulk.await_args.args[1]
+        assert [request.group_id for request in requests] == [_GROUP_ID_2]
+        # 踢人失败按策略重试两次后放弃，逐群结果写入同一条审计
+        assert mock_bot.set_group_kick.await_count == 3
+        record_audit.assert_awaited_once_with(
+            mock_bot,
+            mock_event,
+            remote_module.CommandAudit(
+                action="mass_block",
+                target_user_id=_TARGET_USER_ID,
+                duration=3600,
+                reason="测试原因",
+                group_id=_GROUP_ID_1,
+                result="111111111=目标用户权限过高，无法执行; 222222222=操作被拒绝",
+            ),
+        )
+        assert "成功 0 个，失败 2 个" in message
+
+    @pytest.mark.asyncio
+    async def test_mass_block_limits_concurrent_kicks(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+    ) -> None:
+        """同时进行的踢人请求不超过并发上限。"""
+        mock_bot.get_group_list.return_value = [
+            {**group, "self_role": "admin"} for group in mock_group_list
+        ]
+        group_ids = [group["group_id"] for group in mock_group_list]
+        mock_bot.get_group_member_info.side_effect = _member_roles(
+            mock_bot, {(group_id, _TARGET_USER_ID): "member" for group_id in group_ids}
+        )
+        active = 0
+        peak = 0
+
+        async def kick(**_kwargs: object) -> None:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+        mock_bot.set_group_kick.side_effect = kick
+
+        policy = FanoutPolicy(concurrency=2, rate=1000.0, burst=100)
+        with patch.object(remote_module, "_MASS_KICK_POLICY", policy):
+            message = await self._run(
+                mock_bot, mock_event, mock_session, "全部群", AsyncMock(return_value=3)
+            )
+
+        assert mock_bot.set_group_kick.await_count == len(group_ids)
+        assert peak == 2
+        assert "成功 3 个，失败 0 个" in message
+
+    @pytest.mark.asyncio
+    async def test_mass_block_database_error_skips_kicks(
+        self,
+        mock_bot: MagicMock,
+        mock_event: MagicMock,
+        mock_group_list: list[dict],
+        mock_session: Mock,
+    ) -> None:
+        """写入黑名单失败时不执行踢人。"""
+        mock_bot.get_group_list.return_value = mock_group_list
+        mock_bot.get_group_member_info.side_effect = _member_roles(
+            mock_bot, {(_GROUP_ID_1, _TARGET_USER_ID): "member"}
+        )
+
+        message = await self._run(
+            mock_bot,
+            mock_event,
+            mock_session,
+            "111111111",
+            AsyncMock(side_effect=DatabaseError("boom")),
+        )
+
+        mock_bot.set_group_kick.assert_not_awaited()
+        assert "批量拉黑失败，数据库异常" in message
@@ -44,17 +44,18 @@ def patched_runtime_config(
     return enabled_config
 
 
-def install_fire_and_forget_spy(
+def install_submit_background_spy(
     monkeypatch: pytest.MonkeyPatch,
 ) -> list[tuple[Any, str]]:
-    """Patch ``fire_and_forget`` on the handler module to capture coroutines."""
+    """Patch ``submit_background`` on the handler module to capture coroutines."""
     captured: list[tuple[Any, str]] = []
 
-    def _spy(coro: Any, *, name: str = "fire_and_forget") -> MagicMock:
+    def _spy(lane: str, coro: Any, *, name: str) -> bool:
+        assert lane == "audit"
         captured.append((coro, name))
-        return MagicMock()
+        return True
 
-    monkeypatch.setattr(handler_module, "fire_and_forget", _spy)
+    monkeypatch.setattr(handler_module, "submit_background", _spy)
     return captured
 
 
@@ -65,7 +66,7 @@ async def test_on_called_api_records_result(
     _ = patched_runtime_config
     record_api = AsyncMock()
     monkeypatch.setattr(message_store.repository, "record_api_call", record_api)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    captured = install_submit_background_spy(monkeypatch)
 
     await handler_module.on_called_api(
         make_bot(),
@@ -96,7 +97,7 @@ async def test_on_called_api_skips_when_message_store_disabled(
     patched_runtime_config.message_store_enabled = False
     record_api = AsyncMock()
     monkeypatch.setattr(message_store.repository, "record_api_call", record_api)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    captured = install_submit_background_spy(monkeypatch)
 
     await handler_module.on_called_api(make_bot(), None, "send_message", {}, {})
 
@@ -112,7 +113,7 @@ async def test_on_called_api_skips_when_api_calls_disabled(
     patched_runtime_config.message_store_record_api_calls = False
     record_api = AsyncMock()
     monkeypatch.setattr(message_store.repository, "record_api_call", record_api)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    captured = install_submit_background_spy(monkeypatch)
 
     await handler_module.on_called_api(make_bot(), None, "send_message", {}, {})
 
@@ -127,7 +128,7 @@ async def test_on_called_api_skips_unknown_adapter(
     _ = patched_runtime_config
     record_api = AsyncMock()
     monkeypatch.setattr(message_store.repository, "record_api_call", record_api)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    captured = install_submit_background_spy(monkeypatch)
 
     await handler_module.on_called_api(make_bot("Custom"), None, "send_message", {}, {})
 
@@ -142,7 +143,7 @@ async def test_on_called_api_swallows_database_errors(
     _ = patched_runtime_config
     record_api = AsyncMock(side_effect=DatabaseError("boom"))
     monkeypatch.setattr(message_store.repository, "record_api_call", record_api)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    captured = install_submit_background_spy(monkeypatch)
 
     await handler_module.on_called_api(make_bot(), None, "send_message", {}, {})
 
@@ -9,20 +9,22 @@ from src.plugins.nonebot_plugin_lingchu_bot.hooks.handlers import bot_connection
 
 
 @pytest.fixture
-def captured_fire_and_forget(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Any, str]]:
+def captured_submissions(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Any, str]]:
     captured: list[tuple[Any, str]] = []
 
-    def _spy(coro: Any, *, name: str = "fire_and_forget") -> None:
-        captured.append((coro, name))
+    def _spy(lane: str, coro: Any, *, name: str, key: str | None = None) -> bool:
+        _ = key
+        captured.append((coro, f"{lane}:{name}"))
+        return True
 
-    monkeypatch.setattr(bot_connection, "fire_and_forget", _spy)
+    monkeypatch.setattr(bot_connection, "submit_background", _spy)
     return captured
 
 
 @pytest.mark.asyncio
 async def test_on_bot_connect_records_lifecycle_and_sends_feedback(
     monkeypatch: pytest.MonkeyPatch,
-    captured_fire_and_forget: list[tuple[Any, str]],
+    captured_submissions: list[tuple[Any, str]],
 ) -> None:
     record_bot_lifecycle = AsyncMock()
     send_pending_restart_feedback = AsyncMock()
@@ -34,13 +36,13 @@ async def test_on_bot_connect_records_lifecycle_and_sends_feedback(
     bot = MagicMock()
     await bot_connection.on_bot_connect(bot)
 
-    assert [name for _, name in captured_fire_and_forget] == [
-        "record_bot_lifecycle",
-        "send_protocol_restart_feedback",
+    assert [name for _, name in captured_submissions] == [
+        "message-store:record_bot_lifecycle",
+        "notices:send_protocol_restart_feedback",
     ]
 
-    lifecycle_coro = captured_fire_and_forget[0][0]
-    feedback_coro = captured_fire_and_forget[1][0]
+    lifecycle_coro = captured_submissions[0][0]
+    feedback_coro = captured_submissions[1][0]
     await lifecycle_coro
     await feedback_coro
 
@@ -51,7 +53,7 @@ async def test_on_bot_connect_records_lifecycle_and_sends_feedback(
 @pytest.mark.asyncio
 async def test_on_bot_disconnect_records_lifecycle(
     monkeypatch: pytest.MonkeyPatch,
-    captured_fire_and_forget: list[tuple[Any, str]],
+    captured_submissions: list[tuple[Any, str]],
 ) -> None:
     record_bot_lifecycle = AsyncMock()
     monkeypatch.setattr(bot_connection, "record_bot_lifecycle", record_bot_lifecycle)
@@ -59,9 +61,11 @@ async def test_on_bot_disconnect_records_lifecycle(
     bot = MagicMock()
     await bot_connection.on_bot_disconnect(bot)
 
-    assert [name for _, name in captured_fire_and_forget] == ["record_bot_lifecycle"]
+    assert [name for _, name in captured_submissions] == [
+        "message-store:record_bot_lifecycle"
+    ]
 
-    await captured_fire_and_forget[0][0]
+    await captured_submissions[0][0]
 
     record_bot_lifecycle.assert_awaited_once_with(bot, "bot_disconnected")
 
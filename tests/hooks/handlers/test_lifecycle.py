@@ -24,6 +24,9 @@ async def test_on_shutdown_calls_scheduler_then_message_store(
 ) -> None:
     call_order: list[str] = []
 
+    async def _shutdown_expiry_service() -> None:
+        call_order.append("expiry")
+
     async def _shutdown_scheduler_service() -> None:
         call_order.append("scheduler")
 
@@ -34,6 +37,10 @@ async def test_on_shutdown_calls_scheduler_then_message_store(
         call_order.append("runtime_config")
         return (False, False)
 
+    async def _close_public_http_downloader() -> None:
+        call_order.append("http_downloader")
+
+    monkeypatch.setattr(lifecycle, "shutdown_expiry_service", _shutdown_expiry_service)
     monkeypatch.setattr(
         lifecycle, "shutdown_scheduler_service", _shutdown_scheduler_service
     )
@@ -43,6 +50,9 @@ async def test_on_shutdown_calls_scheduler_then_message_store(
         "flush_runtime_configs_on_shutdown",
         _flush_runtime_configs_on_shutdown,
     )
+    monkeypatch.setattr(
+        lifecycle, "close_public_http_downloader", _close_public_http_downloader
+    )
     monkeypatch.setattr(
         lifecycle,
         "drain_background_tasks",
@@ -52,9 +62,11 @@ async def test_on_shutdown_calls_scheduler_then_message_store(
     await lifecycle.on_shutdown()
 
     assert call_order == [
+        "expiry",
         "scheduler",
         "message_store",
         "runtime_config",
+        "http_downloader",
         "background_tasks",
     ]
 
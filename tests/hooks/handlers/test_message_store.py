@@ -49,6 +49,10 @@ def enabled_config() -> SimpleNamespace:
         message_store_summary_limit=10,
         message_store_record_api_calls=True,
         message_store_cleanup_enabled=True,
+        message_store_write_batch_size=200,
+        message_store_write_interval_ms=500,
+        message_store_write_queue_limit=10000,
+        message_store_raw_payload_sample_percent=100,
     )
 
 
@@ -63,18 +67,25 @@ def patched_runtime_config(
     return enabled_config
 
 
-def install_fire_and_forget_spy(
-    monkeypatch: pytest.MonkeyPatch,
-) -> list[tuple[Any, str]]:
-    """Patch ``fire_and_forget`` on the handler module to capture coroutines."""
-    captured: list[tuple[Any, str]] = []
+@pytest.fixture(autouse=True)
+def idle_event_queue(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Swap in a queue without a writer task so tests flush it explicitly."""
+    queue = message_store._EventWriteQueue()
+    queue.closed = True
+    monkeypatch.setattr(message_store, "_event_queue", queue)
+    return queue
 
-    def _spy(coro: Any, *, name: str = "fire_and_forget") -> MagicMock:
-        captured.append((coro, name))
-        return MagicMock()
 
-    monkeypatch.setattr(handler_module, "fire_and_forget", _spy)
-    return captured
+def make_identity() -> MessageIdentity:
+    return MessageIdentity(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        protocol_id="default",
+        framework_id="nonebot",
+        bot_id="bot-1",
+        conversation_id="group-1",
+        message_id="msg-1",
+    )
 
 
 async def test_message_store_preprocessor_records_event(
@@ -82,18 +93,17 @@ async def test_message_store_preprocessor_records_event(
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
+    record_events = AsyncMock(return_value=1)
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
     state: dict[str, Any] = {}
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_preprocessor(make_bot(), make_event(), state)
 
-    assert len(captured) == 1
-    coro, name = captured[0]
-    assert name == "record_event_received"
-    await coro
-    record_event.assert_awaited_once()
+    assert message_store.get_event_queue_stats().depth == 1
+    await message_store.flush_event_queue()
+    record_events.assert_awaited_once()
     assert isinstance(state[message_store.STATE_KEY], MessageIdentity)
 
 
@@ -103,14 +113,16 @@ async def test_message_store_preprocessor_skips_when_disabled(
 ) -> None:
     _ = patched_runtime_config
     patched_runtime_config.message_store_enabled = False
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    record_events = AsyncMock()
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
 
     await handler_module.message_store_preprocessor(make_bot(), make_event(), {})
 
-    assert captured == []
-    record_event.assert_not_awaited()
+    assert message_store.get_event_queue_stats().depth == 0
+    await message_store.flush_event_queue()
+    record_events.assert_not_awaited()
 
 
 async def test_message_store_preprocessor_skips_unknown_adapter(
@@ -118,16 +130,17 @@ async def test_message_store_preprocessor_skips_unknown_adapter(
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    record_events = AsyncMock()
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
 
     await handler_module.message_store_preprocessor(
         make_bot("Custom"), make_event(), {}
     )
 
-    assert captured == []
-    record_event.assert_not_awaited()
+    assert message_store.get_event_queue_stats().depth == 0
+    record_events.assert_not_awaited()
 
 
 async def test_message_store_preprocessor_records_meta_event(
@@ -135,24 +148,22 @@ async def test_message_store_preprocessor_records_meta_event(
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    record_events = AsyncMock(return_value=1)
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
     event = make_event()
     event.get_type.return_value = "meta_event"
     event.get_event_name.return_value = "meta_event.heartbeat"
 
     await handler_module.message_store_preprocessor(make_bot(), event, {})
+    await message_store.flush_event_queue()
 
-    assert len(captured) == 1
-    coro, name = captured[0]
-    assert name == "record_event_received"
-    await coro
-    record_event.assert_awaited_once()
-    assert record_event.await_args is not None
-    record_kwargs = record_event.await_args.kwargs
-    assert record_kwargs["event_type"] == "meta_event.heartbeat"
-    assert record_kwargs["event_category"] == "meta_event"
+    record_events.assert_awaited_once()
+    assert record_events.await_args is not None
+    (write,) = record_events.await_args.args[1]
+    assert write.event_type == "meta_event.heartbeat"
+    assert write.event_category == "meta_event"
 
 
 async def test_message_store_preprocessor_swallows_database_errors(
@@ -160,17 +171,16 @@ async def test_message_store_preprocessor_swallows_database_errors(
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock(side_effect=DatabaseError("boom"))
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
-    captured = install_fire_and_forget_spy(monkeypatch)
+    record_events = AsyncMock(side_effect=DatabaseError("boom"))
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
 
     await handler_module.message_store_preprocessor(make_bot(), make_event(), {})
 
-    assert len(captured) == 1
-    coro, name = captured[0]
-    assert name == "record_event_received"
-    await coro
-    record_event.assert_awaited_once()
+    assert await message_store.flush_event_queue() == 0
+    record_events.assert_awaited_once()
+    assert message_store.get_event_queue_stats().failed_flushes == 1
 
 
 async def test_run_postprocessor_updates_status(
@@ -178,120 +188,101 @@ async def test_run_postprocessor_updates_status(
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(return_value=True)
+    record_results = AsyncMock(return_value=1)
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
+        message_store.repository, "record_matcher_results", record_results
     )
     matcher = MagicMock()
     matcher.block = False
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_run_postprocessor(
         matcher,
         None,
         make_bot(),
         make_event(),
-        {message_store.STATE_KEY: identity},
+        {message_store.STATE_KEY: make_identity()},
     )
+    await message_store.flush_event_queue()
 
-    assert len(captured) == 1
-    coro, name = captured[0]
-    assert name == "record_matcher_result"
-    await coro
-    record_result.assert_awaited_once()
-    assert record_result.await_args is not None
-    assert record_result.await_args.kwargs["process_status"] == "handled"
+    record_results.assert_awaited_once()
+    assert record_results.await_args is not None
+    (write,) = record_results.await_args.args[1]
+    assert write.process_status == "handled"
 
 
-async def test_run_postprocessor_blocked_status(
+async def test_run_postprocessor_merges_into_queued_receipt(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(return_value=True)
+    record_events = AsyncMock(return_value=1)
+    record_results = AsyncMock()
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
+        message_store.repository, "record_events_received", record_events
     )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
+    monkeypatch.setattr(
+        message_store.repository, "record_matcher_results", record_results
     )
+    state: dict[str, Any] = {}
+    matcher = MagicMock()
+    matcher.block = False
+
+    await handler_module.message_store_preprocessor(make_bot(), make_event(), state)
+    await handler_module.message_store_run_postprocessor(
+        matcher, None, make_bot(), make_event(), state
+    )
+    await message_store.flush_event_queue()
+
+    record_results.assert_not_awaited()
+    assert record_events.await_args is not None
+    (write,) = record_events.await_args.args[1]
+    assert write.process_status == "handled"
+
+
+async def test_run_postprocessor_blocked_status(
+    patched_runtime_config: SimpleNamespace,
+    idle_event_queue: Any,
+) -> None:
+    _ = patched_runtime_config
     matcher = MagicMock()
     matcher.block = True
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_run_postprocessor(
         matcher,
         None,
         make_bot(),
         make_event(),
-        {message_store.STATE_KEY: identity},
+        {message_store.STATE_KEY: make_identity()},
     )
 
-    await captured[0][0]
-    assert record_result.await_args is not None
-    assert record_result.await_args.kwargs["process_status"] == "handled:blocked"
+    (write,) = idle_event_queue.status_updates.values()
+    assert write.process_status == "handled:blocked"
 
 
 async def test_run_postprocessor_failed_status(
-    monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    idle_event_queue: Any,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(return_value=True)
-    monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
-    )
     matcher = MagicMock()
     matcher.block = False
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_run_postprocessor(
         matcher,
         ValueError("oops"),
         make_bot(),
         make_event(),
-        {message_store.STATE_KEY: identity},
+        {message_store.STATE_KEY: make_identity()},
     )
 
-    await captured[0][0]
-    assert record_result.await_args is not None
-    assert record_result.await_args.kwargs["process_status"] == "failed"
+    (write,) = idle_event_queue.status_updates.values()
+    assert write.process_status == "failed"
 
 
 async def test_run_postprocessor_skips_when_no_identity(
-    monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock()
-    monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_run_postprocessor(
         MagicMock(),
@@ -301,32 +292,23 @@ async def test_run_postprocessor_skips_when_no_identity(
         {},
     )
 
-    assert captured == []
-    record_result.assert_not_awaited()
+    assert message_store.get_event_queue_stats().depth == 0
 
 
 async def test_run_postprocessor_skips_when_disabled(
-    monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
-    _ = patched_runtime_config
     patched_runtime_config.message_store_enabled = False
-    record_result = AsyncMock()
-    monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    captured = install_fire_and_forget_spy(monkeypatch)
 
     await handler_module.message_store_run_postprocessor(
         MagicMock(),
         None,
         make_bot(),
         make_event(),
-        {},
+        {message_store.STATE_KEY: make_identity()},
     )
 
-    assert captured == []
-    record_result.assert_not_awaited()
+    assert message_store.get_event_queue_stats().depth == 0
 
 
 async def test_event_postprocessor_and_run_preprocessor_noop(
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.hooks.handlers import (
+    permissions as handler_module,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.permissions import (
+    PERMISSION_STATE_KEY,
+    EventPermissionCache,
+)
+
+
+@pytest.mark.asyncio
+async def test_permission_cache_preprocessor_seeds_shared_cache() -> None:
+    state: dict[str, Any] = {}
+
+    await handler_module.permission_cache_preprocessor(state)
+
+    cache = state[PERMISSION_STATE_KEY]
+    assert isinstance(cache, EventPermissionCache)
+    assert state.copy()[PERMISSION_STATE_KEY] is cache
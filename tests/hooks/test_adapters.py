@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
+import json
+import timeit
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock
@@ -26,6 +30,12 @@ from src.plugins.nonebot_plugin_lingchu_bot.hooks.adapters import (
     normalize_message_event,
     resolve_platform_context,
 )
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.message_store import (
+    group_conversation_id,
+)
+
+SAMPLE_PERCENT = 25
+BENCHMARK_ROUNDS = 200
 
 
 def make_bot(adapter_name: str = "OneBot V11") -> MagicMock:
@@ -62,6 +72,7 @@ def enabled_config() -> SimpleNamespace:
         message_store_summary_limit=10,
         message_store_record_api_calls=True,
         message_store_cleanup_enabled=True,
+        message_store_raw_payload_sample_percent=100,
     )
 
 
@@ -128,6 +139,8 @@ def test_normalize_message_event_prefers_group_id_over_session_id(
 
     assert isinstance(normalized, NormalizedMessageEvent)
     assert normalized.identity.conversation_id == "group:868258211"
+    # Recall looks group messages up by this key.
+    assert group_conversation_id(868258211) == "group:868258211"
 
 
 def test_normalize_telegram_group_message_uses_chat_id(
@@ -375,3 +388,191 @@ def test_raw_message_falls_back_to_event_data() -> None:
     event.message = None
     event.data = SimpleNamespace(message="data-raw", segments=[])
     assert _raw_message(event) == '"data-raw"'
+
+
+def _onebot_group_message() -> Any:
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    return Adapter.json_to_event({
+        "time": 1700000000,
+        "self_id": 10000,
+        "post_type": "message",
+        "message_type": "group",
+        "sub_type": "normal",
+        "message_id": 42,
+        "group_id": 123456,
+        "user_id": 654321,
+        "anonymous": None,
+        "message": [
+            {"type": "text", "data": {"text": "hello "}},
+            {"type": "at", "data": {"qq": "10000"}},
+            {"type": "face", "data": {"id": "14"}},
+        ],
+        "raw_message": "hello [CQ:at,qq=10000][CQ:face,id=14]",
+        "font": 0,
+        "sender": {"user_id": 654321, "nickname": "tester", "role": "member"},
+    })
+
+
+def _onebot_group_notice() -> Any:
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    return Adapter.json_to_event({
+        "time": 1700000000,
+        "self_id": 10000,
+        "post_type": "notice",
+        "notice_type": "group_recall",
+        "group_id": 123456,
+        "user_id": 654321,
+        "operator_id": 654321,
+        "message_id": 42,
+    })
+
+
+def _telegram_group_message() -> Any:
+    from nonebot.adapters.telegram.event import Event
+
+    return Event.parse_event({
+        "update_id": 1,
+        "message": {
+            "message_id": 42,
+            "date": 1700000000,
+            "chat": {"id": -1001234567890, "type": "supergroup", "title": "Lingchu"},
+            "from": {
+                "id": 1234,
+                "is_bot": False,
+                "first_name": "Tester",
+                "username": "tester",
+            },
+            "text": "hello @lingchu_bot",
+            "entities": [{"type": "mention", "offset": 6, "length": 12}],
+        },
+    })
+
+
+def test_serialize_raw_payloads_matches_legacy_event_summary() -> None:
+    event = _onebot_group_message()
+
+    raw_message, raw_event = adapters.serialize_raw_payloads(event)
+
+    assert raw_event == _json_summary(event)
+    assert raw_message is not None
+    assert json.loads(raw_message)[0] == {"type": "text", "data": {"text": "hello "}}
+
+
+def test_serialize_raw_payloads_matches_legacy_telegram_summary() -> None:
+    event = _telegram_group_message()
+
+    raw_message, raw_event = adapters.serialize_raw_payloads(event)
+
+    assert raw_event == _json_summary(event)
+    assert raw_message is not None
+    assert json.loads(raw_message)[1] == {
+        "type": "mention",
+        "data": {"text": "@lingchu_bot"},
+    }
+
+
+def test_serialize_raw_payloads_falls_back_for_plain_objects() -> None:
+    event = make_event()
+
+    raw_message, raw_event = adapters.serialize_raw_payloads(event)
+
+    assert raw_message == _raw_message(event)
+    assert raw_event == _json_summary(event)
+
+
+def test_serialize_raw_payloads_falls_back_when_model_dump_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    event = _onebot_group_message()
+    monkeypatch.setattr(
+        type(event), "model_dump", MagicMock(side_effect=ValueError("boom"))
+    )
+
+    raw_message, raw_event = adapters.serialize_raw_payloads(event)
+
+    assert raw_message == _raw_message(event)
+    assert raw_event is not None
+
+
+def test_normalize_message_event_defers_raw_payloads(
+    monkeypatch: pytest.MonkeyPatch,
+    enabled_config: SimpleNamespace,
+) -> None:
+    monkeypatch.setattr(adapters, "plugin_config", enabled_config)
+    event = _onebot_group_message()
+
+    normalized = normalize_message_event(make_bot(), event, defer_raw_payloads=True)
+
+    assert normalized is not None
+    assert normalized.raw_message is None
+    assert normalized.raw_event is None
+    assert normalized.raw_payload_loader is not None
+    assert normalized.raw_payload_loader() == adapters.serialize_raw_payloads(event)
+
+
+def test_normalize_message_event_skips_unsampled_message_payloads(
+    monkeypatch: pytest.MonkeyPatch,
+    enabled_config: SimpleNamespace,
+) -> None:
+    enabled_config.message_store_raw_payload_sample_percent = 0
+    monkeypatch.setattr(adapters, "plugin_config", enabled_config)
+
+    message = normalize_message_event(make_bot(), _onebot_group_message())
+    notice = normalize_message_event(make_bot(), _onebot_group_notice())
+
+    assert message is not None
+    assert message.text_summary is not None
+    assert message.raw_message is None
+    assert message.raw_event is None
+    assert message.raw_payload_loader is None
+    assert notice is not None
+    assert notice.raw_event is not None
+
+
+def test_normalize_message_event_samples_message_payloads(
+    monkeypatch: pytest.MonkeyPatch,
+    enabled_config: SimpleNamespace,
+) -> None:
+    enabled_config.message_store_raw_payload_sample_percent = SAMPLE_PERCENT
+    monkeypatch.setattr(adapters, "plugin_config", enabled_config)
+    monkeypatch.setattr(adapters.random, "random", lambda: 0.2)
+    sampled = normalize_message_event(make_bot(), _onebot_group_message())
+    monkeypatch.setattr(adapters.random, "random", lambda: 0.3)
+    skipped = normalize_message_event(make_bot(), _onebot_group_message())
+
+    assert sampled is not None
+    assert sampled.raw_event is not None
+    assert skipped is not None
+    assert skipped.raw_event is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "make_event_fixture",
+    [_onebot_group_message, _onebot_group_notice, _telegram_group_message],
+)
+def test_serialize_raw_payloads_beats_the_legacy_walk(
+    make_event_fixture: Callable[[], Any],
+) -> None:
+    """The single-dump fast path is cheaper than the legacy recursive walk.
+
+    Excluded from the default run: coverage tracing and parallel workers
+    distort wall-clock ratios.  Run with ``-m benchmark --no-cov -p no:xdist``.
+    """
+    event = make_event_fixture()
+
+    legacy, fast = (
+        min(timeit.repeat(func, number=BENCHMARK_ROUNDS, repeat=5))
+        for func in (
+            partial(_legacy_raw_payloads, event),
+            partial(adapters.serialize_raw_payloads, event),
+        )
+    )
+
+    assert fast < legacy
+
+
+def _legacy_raw_payloads(event: Any) -> tuple[str | None, str | None]:
+    return (_raw_message(event), _json_summary(event))
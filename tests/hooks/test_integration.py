@@ -39,6 +39,7 @@ def test_hooks_package_import_registers_all_hooks() -> None:
         bot_connection,
         lifecycle,
         message_store,
+        permissions,
     )
 
     driver = nonebot.get_driver()
@@ -52,6 +53,7 @@ def test_hooks_package_import_registers_all_hooks() -> None:
     assert message_store.message_store_postprocessor in event_post_calls
     assert message_store.message_store_run_preprocessor in run_pre_calls
     assert message_store.message_store_run_postprocessor in run_post_calls
+    assert permissions.permission_cache_preprocessor in event_pre_calls
 
     assert api_audit.on_calling_api in Bot._calling_api_hook
     assert api_audit.on_called_api in Bot._called_api_hook
@@ -1,3 +1,7 @@
+import asyncio
+from collections.abc import Callable
+import time
+
 import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot import i18n as i18n_module
@@ -5,6 +9,8 @@ from src.plugins.nonebot_plugin_lingchu_bot.i18n import (
     DEFAULT_LOCALE,
     _,
     get_configured_locale,
+    get_translation,
+    get_translation_async,
     gettext,
     gettext_async,
     ngettext,
@@ -13,6 +19,8 @@ from src.plugins.nonebot_plugin_lingchu_bot.i18n import (
     warm_translation_cache,
 )
 
+BENCHMARK_ROUNDS = 200
+
 
 @pytest.mark.i18n
 def test_gettext_uses_configured_catalog(configured_locale: str) -> None:
@@ -144,3 +152,74 @@ async def test_warm_translation_cache_accepts_explicit_locales(
     locale: str,
 ) -> None:
     await warm_translation_cache([locale])
+
+
+@pytest.mark.asyncio
+async def test_get_translation_async_skips_thread_once_catalog_is_loaded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(i18n_module, "_loaded_catalogs", {})
+    to_thread_calls: list[object] = []
+    original_to_thread = asyncio.to_thread
+
+    async def counting_to_thread(
+        func: Callable[..., object], /, *args: object
+    ) -> object:
+        to_thread_calls.append(func)
+        return await original_to_thread(func, *args)
+
+    monkeypatch.setattr(i18n_module.asyncio, "to_thread", counting_to_thread)
+
+    cold = await get_translation_async("en-US")
+    warm = await get_translation_async("en_US.UTF-8")
+    translated = await gettext_async("全体禁言成功", locale="en_US")
+
+    assert cold is warm is get_translation("en_US")
+    assert translated == "Whole-group mute enabled"
+    assert len(to_thread_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_translation_async_bounds_loaded_catalogs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(i18n_module, "_loaded_catalogs", {})
+    monkeypatch.setattr(i18n_module, "_TRANSLATION_CACHE_SIZE", 1)
+
+    await get_translation_async("zh_CN")
+    await get_translation_async("en_US")
+
+    assert list(i18n_module._loaded_catalogs) == ["zh_CN"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_gettext_async_beats_a_thread_hop_per_string() -> None:
+    """A warm in-memory lookup is cheaper than a thread hop per string.
+
+    A handler formats about five strings.  Excluded from the default run
+    with the other wall-clock benchmarks; run with ``-m benchmark``.
+    """
+    await warm_translation_cache(["en_US"])
+    messages = ("全体禁言成功", "灵初功能菜单", "管理员操作「默认」") * 2
+
+    async def thread_hop_handler() -> list[str]:
+        return [
+            (await asyncio.to_thread(get_translation, "en_US")).gettext(message)
+            for message in messages[:5]
+        ]
+
+    async def fast_path_handler() -> list[str]:
+        return [await gettext_async(message, "en_US") for message in messages[:5]]
+
+    timings: dict[str, float] = {}
+    for name, handler in (
+        ("thread-hop", thread_hop_handler),
+        ("fast-path", fast_path_handler),
+    ):
+        started = time.perf_counter()
+        for _round in range(BENCHMARK_ROUNDS):
+            await handler()
+        timings[name] = (time.perf_counter() - started) / BENCHMARK_ROUNDS * 1e6
+    assert await fast_path_handler() == await thread_hop_handler()
+    assert timings["fast-path"] < timings["thread-hop"]
@@ -0,0 +1,22 @@
+"""Permission-specific pytest fixtures."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def _reset_permission_index() -> Iterator[None]:
+    """Keep the process-local permission index from leaking between tests."""
+    from src.plugins.nonebot_plugin_lingchu_bot.permissions.index import (
+        invalidate_permission_index,
+    )
+
+    invalidate_permission_index()
+    yield
+    invalidate_permission_index()
@@ -22,6 +22,7 @@ from src.plugins.nonebot_plugin_lingchu_bot.permissions import bootstrap
 from src.plugins.nonebot_plugin_lingchu_bot.permissions.bootstrap import (
     PermissionConfigError,
 )
+from src.plugins.nonebot_plugin_lingchu_bot.permissions.index import SESSION_DIRTY_KEY
 from src.plugins.nonebot_plugin_lingchu_bot.repositories import permissions as repo
 
 
@@ -495,7 +496,7 @@ def test_validate_platform_account_id_returns_stripped_str_for_non_qq_platform()
 async def test_validate_and_seed_permission_system_calls_seed_and_sync() -> None:
     """成功路径：调用 seed_identity_groups 与 _sync_superusers。"""
     superusers = {"user1": {"qq": "42"}}
-    mock_session = Mock()
+    mock_session = Mock(info={})
     with (
         patch.object(bootstrap, "_resolve_superusers_config", return_value=superusers),
         patch.object(bootstrap, "_sync_superusers", AsyncMock()) as sync_mock,
@@ -505,6 +506,7 @@ async def test_validate_and_seed_permission_system_calls_seed_and_sync() -> None
 
     seed_mock.assert_awaited_once()
     sync_mock.assert_awaited_once_with(mock_session, superusers)
+    assert mock_session.info[SESSION_DIRTY_KEY] is True
 
 
 @pytest.mark.asyncio
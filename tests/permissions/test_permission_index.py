@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    IdentityMembership,
+    PermissionGrant,
+    PlatformIdentityGroup,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.permissions import index as index_module
+from src.plugins.nonebot_plugin_lingchu_bot.permissions.admin import (
+    add_identity_group_member,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.permissions.index import (
+    SESSION_DIRTY_KEY,
+    compile_permission_index,
+    get_permission_index,
+    invalidate_permission_index,
+    load_permission_index,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.permissions.service import (
+    check_permission_for_context,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.permissions.types import PermissionContext
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import permissions as repo
+
+TTL_SECONDS = 30
+
+
+def identity_group(
+    group_id: str,
+    parent_group_id: str | None = None,
+    platform_id: str = "qq",
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        group_id=group_id, parent_group_id=parent_group_id, platform_id=platform_id
+    )
+
+
+@pytest.fixture
+async def permission_session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'index.db'}")
+    tables = (
+        PlatformIdentityGroup.__table__,
+        IdentityMembership.__table__,
+        PermissionGrant.__table__,
+    )
+    async with engine.begin() as connection:
+        for table in tables:
+            await connection.execute(CreateTable(table))
+
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def test_compile_permission_index_builds_platform_ancestor_closure() -> None:
+    index = compile_permission_index(
+        [
+            identity_group("qq.group"),
+            identity_group("qq.group.admin", "qq.group"),
+            identity_group("qq.group.owner", "qq.group.admin"),
+            identity_group("tg.chat", "qq.group", platform_id="telegram"),
+            identity_group("qq.loop.a", "qq.loop.b"),
+            identity_group("qq.loop.b", "qq.loop.a"),
+        ],
+        [],
+        [],
+    )
+
+    assert index.expand_groups({"qq.group.owner"}, "qq") == frozenset({
+        "qq.group.owner",
+        "qq.group.admin",
+        "qq.group",
+    })
+    assert index.expand_groups({"tg.chat"}, "qq") == frozenset({"tg.chat"})
+    assert index.expand_groups({"qq.loop.a"}, "qq") == frozenset({
+        "qq.loop.a",
+        "qq.loop.b",
+    })
+    assert index.expand_groups({"unknown"}, "qq") == frozenset({"unknown"})
+
+
+def test_compile_permission_index_maps_grants_memberships_and_superusers() -> None:
+    index = compile_permission_index(
+        [],
+        [
+            SimpleNamespace(
+                uid="root",
+                group_id=repo.SUPERUSERS_GROUP_ID,
+                scope_type="global",
+                scope_id=None,
+            ),
+            SimpleNamespace(
+                uid="alice", group_id="qq.custom", scope_type="group", scope_id="1"
+            ),
+        ],
+        [
+            SimpleNamespace(group_id="qq.custom", command_key="kick", effect="allow"),
+            SimpleNamespace(group_id="qq.custom", command_key="mute", effect="deny"),
+        ],
+    )
+
+    assert index.is_superuser("root") is True
+    assert index.is_superuser("alice") is False
+    assert [entry.group_id for entry in index.memberships_for("alice")] == ["qq.custom"]
+    assert index.memberships_for("bob") == ()
+    assert index.granted_groups({"qq.custom"}, "kick") == frozenset({"qq.custom"})
+    assert index.granted_groups({"qq.custom"}, "mute") == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_get_permission_index_loads_once_until_invalidated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    list_groups = AsyncMock(return_value=[])
+    monkeypatch.setattr(repo, "list_identity_groups", list_groups)
+    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
+    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=[]))
+    session = Mock()
+
+    first = await get_permission_index(session)
+    second = await get_permission_index(session)
+    invalidate_permission_index()
+    third = await get_permission_index(session)
+
+    assert first is second
+    assert third is not first
+    assert list_groups.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_permission_index_reloads_after_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(repo, "list_identity_groups", AsyncMock(return_value=[]))
+    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
+    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        index_module,
+        "plugin_config",
+        SimpleNamespace(permission_index_ttl_seconds=TTL_SECONDS),
+    )
+    now = 1000.0
+    monkeypatch.setattr(index_module.time, "monotonic", lambda: now)
+    session = Mock()
+
+    first = await get_permission_index(session)
+    now += TTL_SECONDS - 1
+    cached = await get_permission_index(session)
+    now += 1
+    reloaded = await get_permission_index(session)
+
+    assert cached is first
+    assert reloaded is not first
+
+
+@pytest.mark.asyncio
+async def test_load_racing_with_invalidation_is_not_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def list_groups_and_invalidate(
+        _session: object, **_kwargs: object
+    ) -> list[object]:
+        invalidate_permission_index()
+        return []
+
+    monkeypatch.setattr(repo, "list_identity_groups", list_groups_and_invalidate)
+    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
+    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=[]))
+
+    await load_permission_index(Mock())
+
+    assert index_module._state.index is None
+
+
+@pytest.mark.asyncio
+async def test_admin_write_invalidates_index_after_commit(
+    permission_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    context = PermissionContext(
+        platform_id="qq", adapter_id="~onebot.v11", account_id="1", uid="alice"
+    )
+    async with permission_session_factory() as session, session.begin():
+        await repo.upsert_identity_group(
+            session,
+            group_id="qq.custom",
+            platform_id="qq",
+            display_name="Custom",
+            builtin=False,
+        )
+        await repo.upsert_membership(
+            session, uid="root", group_id=repo.SUPERUSERS_GROUP_ID
+        )
+        await repo.grant_command(session, group_id="qq.custom", command_key="kick")
+
+    async with permission_session_factory() as session:
+        denied = await check_permission_for_context(session, "kick", context)
+    async with permission_session_factory() as session, session.begin():
+        await add_identity_group_member(session, "root", "alice", "qq.custom")
+        assert session.info[SESSION_DIRTY_KEY] is True
+        async with permission_session_factory() as reader:
+            await load_permission_index(reader)
+    async with permission_session_factory() as session:
+        allowed = await check_permission_for_context(session, "kick", context)
+
+    assert denied.allowed is False
+    assert allowed.allowed is True
+    assert allowed.matched_groups == frozenset({"qq.custom"})
+
+
+@pytest.mark.asyncio
+async def test_load_permission_index_reads_every_row(
+    permission_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    command_keys = [f"command_{number:03d}" for number in range(150)]
+    async with permission_session_factory() as session, session.begin():
+        await repo.upsert_identity_group(
+            session,
+            group_id="qq.custom",
+            platform_id="qq",
+            display_name="Custom",
+            builtin=False,
+        )
+        for command_key in command_keys:
+            await repo.grant_command(
+                session, group_id="qq.custom", command_key=command_key
+            )
+
+    async with permission_session_factory() as session:
+        index = await load_permission_index(session)
+
+    assert index.granted_command_keys({"qq.custom"}) == frozenset(command_keys)
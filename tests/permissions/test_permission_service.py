@@ -6,12 +6,16 @@ import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.permissions import service as service_module
 from src.plugins.nonebot_plugin_lingchu_bot.permissions.service import (
+    PERMISSION_STATE_KEY,
+    EventPermissionCache,
     _account_id,
     _scope,
     allowed_command_keys,
+    allowed_command_keys_for_context,
     bind_platform_account,
     check_permission,
     check_permission_for_context,
+    event_permission_cache,
     platform_runtime_passthrough_enabled,
 )
 from src.plugins.nonebot_plugin_lingchu_bot.permissions.types import PermissionContext
@@ -42,6 +46,50 @@ def event(user_id: int = 42) -> SimpleNamespace:
     )
 
 
+def identity_group(
+    group_id: str,
+    parent_group_id: str | None = None,
+    platform_id: str = "qq",
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        group_id=group_id, parent_group_id=parent_group_id, platform_id=platform_id
+    )
+
+
+def membership(
+    group_id: str,
+    *,
+    uid: str = "userA",
+    scope_type: str = "global",
+    scope_id: str | None = None,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        uid=uid, group_id=group_id, scope_type=scope_type, scope_id=scope_id
+    )
+
+
+def grant(
+    group_id: str, command_key: str = "member_mute", effect: str = "allow"
+) -> SimpleNamespace:
+    return SimpleNamespace(group_id=group_id, command_key=command_key, effect=effect)
+
+
+def patch_permission_tables(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    groups: list[SimpleNamespace] | None = None,
+    memberships: list[SimpleNamespace] | None = None,
+    grants: list[SimpleNamespace] | None = None,
+) -> None:
+    monkeypatch.setattr(
+        repo, "list_identity_groups", AsyncMock(return_value=groups or [])
+    )
+    monkeypatch.setattr(
+        repo, "list_memberships", AsyncMock(return_value=memberships or [])
+    )
+    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=grants or []))
+
+
 def test_telegram_event_identity_uses_from_and_chat() -> None:
     telegram_event = SimpleNamespace(
         from_=SimpleNamespace(id=1234),
@@ -63,7 +111,9 @@ async def test_superuser_permission_allows_command(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=True))
+    patch_permission_tables(
+        monkeypatch, memberships=[membership(repo.SUPERUSERS_GROUP_ID)]
+    )
 
     decision = await check_permission(mock_session, "member_mute", bot, event())
 
@@ -104,22 +154,13 @@ async def test_group_grant_permission_allows_child_runtime_group(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
-    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
-    monkeypatch.setattr(
-        repo,
-        "list_identity_groups",
-        AsyncMock(
-            return_value=[
-                SimpleNamespace(group_id="qq.group", parent_group_id=None),
-                SimpleNamespace(group_id="qq.group.member", parent_group_id="qq.group"),
-            ]
-        ),
-    )
-    monkeypatch.setattr(
-        repo,
-        "list_grants",
-        AsyncMock(return_value=[SimpleNamespace(group_id="qq.group", effect="allow")]),
+    patch_permission_tables(
+        monkeypatch,
+        groups=[
+            identity_group("qq.group"),
+            identity_group("qq.group.member", "qq.group"),
+        ],
+        grants=[grant("qq.group")],
     )
 
     decision = await check_permission(mock_session, "member_mute", bot, event())
@@ -140,7 +181,9 @@ async def test_allowed_command_keys_returns_all_for_superuser(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=True))
+    patch_permission_tables(
+        monkeypatch, memberships=[membership(repo.SUPERUSERS_GROUP_ID)]
+    )
 
     keys = await allowed_command_keys(
         mock_session, bot, event(), frozenset({"member_mute", "kick_member"})
@@ -196,9 +239,7 @@ async def test_check_permission_denies_when_no_effective_groups(
     monkeypatch: pytest.MonkeyPatch,
     mock_session: Mock,
 ) -> None:
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
-    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
-    monkeypatch.setattr(repo, "list_identity_groups", AsyncMock(return_value=[]))
+    patch_permission_tables(monkeypatch)
 
     decision = await check_permission_for_context(
         mock_session, "member_mute", _make_context()
@@ -215,32 +256,16 @@ async def test_check_permission_denies_when_no_allowed_grants(
     mock_session: Mock,
 ) -> None:
     context = _make_context(runtime_group_ids=frozenset({"qq.group.member"}))
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
-    monkeypatch.setattr(
-        repo,
-        "list_memberships",
-        AsyncMock(
-            return_value=[
-                SimpleNamespace(
-                    scope_type="group",
-                    scope_id="10001",
-                    group_id="qq.custom",
-                )
-            ]
-        ),
+    patch_permission_tables(
+        monkeypatch,
+        groups=[
+            identity_group("qq.group.member", "qq.group"),
+            identity_group("qq.group"),
+            identity_group("qq.custom"),
+        ],
+        memberships=[membership("qq.custom", scope_type="group", scope_id="10001")],
+        grants=[grant("qq.group", command_key="kick_member")],
     )
-    monkeypatch.setattr(
-        repo,
-        "list_identity_groups",
-        AsyncMock(
-            return_value=[
-                SimpleNamespace(group_id="qq.group.member", parent_group_id="qq.group"),
-                SimpleNamespace(group_id="qq.group", parent_group_id=None),
-                SimpleNamespace(group_id="qq.custom", parent_group_id=None),
-            ]
-        ),
-    )
-    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=[]))
 
     decision = await check_permission_for_context(mock_session, "member_mute", context)
 
@@ -260,10 +285,7 @@ async def test_allowed_command_keys_non_superuser_filters(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
-    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
-    monkeypatch.setattr(repo, "list_identity_groups", AsyncMock(return_value=[]))
-    monkeypatch.setattr(repo, "list_grants", AsyncMock(return_value=[]))
+    patch_permission_tables(monkeypatch)
 
     keys = await allowed_command_keys(
         mock_session, bot, event(), frozenset({"member_mute", "kick_member"})
@@ -279,12 +301,6 @@ async def test_allowed_command_keys_non_superuser_partial_filter(
     bot: MagicMock,
 ) -> None:
     """Non-superuser gets only the subset of commands they are granted."""
-
-    async def list_grants_side_effect(*_args: object, **kwargs: object) -> list[object]:
-        if kwargs.get("command_key") == "member_mute":
-            return [SimpleNamespace(group_id="qq.group", effect="allow")]
-        return []
-
     monkeypatch.setattr(
         service_module,
         "get_mutable_settings",
@@ -295,19 +311,17 @@ async def test_allowed_command_keys_non_superuser_partial_filter(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
-    monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
-    monkeypatch.setattr(
-        repo,
-        "list_identity_groups",
-        AsyncMock(
-            return_value=[
-                SimpleNamespace(group_id="qq.group", parent_group_id=None),
-                SimpleNamespace(group_id="qq.group.member", parent_group_id="qq.group"),
-            ]
-        ),
+    patch_permission_tables(
+        monkeypatch,
+        groups=[
+            identity_group("qq.group"),
+            identity_group("qq.group.member", "qq.group"),
+        ],
+        grants=[
+            grant("qq.group", command_key="member_mute"),
+            grant("qq.group", command_key="kick_member", effect="deny"),
+        ],
     )
-    monkeypatch.setattr(repo, "list_grants", list_grants_side_effect)
 
     keys = await allowed_command_keys(
         mock_session, bot, event(), frozenset({"member_mute", "kick_member"})
@@ -469,43 +483,102 @@ def test_membership_matches_wrong_scope_type() -> None:
 
 
 @pytest.mark.asyncio
-async def test_with_ancestor_groups_empty(mock_session: Mock) -> None:
-    result = await service_module._with_ancestor_groups(mock_session, set())
-    assert result == frozenset()
+async def test_check_permission_reuses_event_state_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_session: Mock,
+    bot: MagicMock,
+) -> None:
+    get_user = AsyncMock(return_value=SimpleNamespace(uid="userA"))
+    monkeypatch.setattr(repo, "get_user_by_platform_account", get_user)
+    patch_permission_tables(
+        monkeypatch,
+        memberships=[membership("admins")],
+        grants=[grant("admins"), grant("admins", command_key="kick_member")],
+    )
+    state: dict[object, object] = {}
+
+    first = await check_permission(
+        mock_session, "member_mute", bot, event(), state=state
+    )
+    second = await check_permission(
+        mock_session, "kick_member", bot, event(), state=state
+    )
+    keys = await allowed_command_keys(
+        mock_session, bot, event(), frozenset({"member_mute"}), state=state
+    )
+
+    assert first.allowed is True
+    assert second.allowed is True
+    assert keys == frozenset({"member_mute"})
+    get_user.assert_awaited_once()
+    cache = event_permission_cache(state)
+    assert cache is not None
+    assert cache.context is not None
+    assert cache.context.uid == "userA"
+    assert cache.effective_group_ids == frozenset({"admins"})
+
+
+def test_event_permission_cache_reuses_seeded_instance() -> None:
+    seeded = EventPermissionCache()
+    state: dict[object, object] = {PERMISSION_STATE_KEY: seeded}
+
+    assert event_permission_cache(state) is seeded
+    assert event_permission_cache(state.copy()) is seeded
+    assert event_permission_cache(None) is None
 
 
 @pytest.mark.asyncio
-async def test_with_ancestor_groups_no_parent(
+async def test_allowed_command_keys_for_context_matches_per_key_checks(
     monkeypatch: pytest.MonkeyPatch,
     mock_session: Mock,
 ) -> None:
-    monkeypatch.setattr(
-        repo,
-        "list_identity_groups",
-        AsyncMock(
-            return_value=[SimpleNamespace(group_id="qq.custom", parent_group_id=None)]
-        ),
-    )
-    result = await service_module._with_ancestor_groups(mock_session, {"qq.custom"})
-    assert result == frozenset({"qq.custom"})
+    patch_permission_tables(
+        monkeypatch,
+        groups=[
+            identity_group("qq.custom"),
+            identity_group("qq.custom.child", "qq.custom"),
+        ],
+        memberships=[
+            membership("qq.custom.child", uid="userA", scope_type="group", scope_id="1")
+        ],
+        grants=[
+            grant("qq.custom", command_key="member_mute"),
+            grant("qq.custom.child", command_key="set_member_card"),
+            grant("qq.custom", command_key="kick_member", effect="deny"),
+        ],
+    )
+    context = _make_context(scope_id="1")
+    command_keys = frozenset({
+        "member_mute",
+        "set_member_card",
+        "kick_member",
+        "unknown",
+    })
+    cache = EventPermissionCache(context=context)
+
+    keys = await allowed_command_keys_for_context(
+        mock_session, command_keys, context, cache=cache
+    )
+
+    expected = {
+        command_key
+        for command_key in command_keys
+        if (
+            await check_permission_for_context(mock_session, command_key, context)
+        ).allowed
+    }
+    assert keys == frozenset(expected) == frozenset({"member_mute", "set_member_card"})
+    assert cache.effective_group_ids == frozenset({"qq.custom", "qq.custom.child"})
 
 
 @pytest.mark.asyncio
-async def test_with_ancestor_groups_parent_expansion(
-    monkeypatch: pytest.MonkeyPatch,
+async def test_allowed_command_keys_for_context_rejects_anonymous(
     mock_session: Mock,
 ) -> None:
-    monkeypatch.setattr(
-        repo,
-        "list_identity_groups",
-        AsyncMock(
-            return_value=[
-                SimpleNamespace(group_id="qq.group.member", parent_group_id="qq.group"),
-                SimpleNamespace(group_id="qq.group", parent_group_id=None),
-            ]
-        ),
-    )
-    result = await service_module._with_ancestor_groups(
-        mock_session, {"qq.group.member"}
+    keys = await allowed_command_keys_for_context(
+        mock_session,
+        frozenset({"member_mute"}),
+        PermissionContext(platform_id="qq", adapter_id="~onebot.v11", account_id="42"),
     )
-    assert result == frozenset({"qq.group.member", "qq.group"})
+
+    assert keys == frozenset()
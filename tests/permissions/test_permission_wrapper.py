@@ -50,6 +50,7 @@ async def test_selected_adapter_handle_denies_before_business_handler(
     session = Mock()
     bot = FakeBot()
     event = FakeEvent()
+    state: dict[str, Any] = {}
     permission = AsyncMock(
         return_value=PermissionDecision(allowed=False, reason="anonymous")
     )
@@ -72,9 +73,10 @@ async def test_selected_adapter_handle_denies_before_business_handler(
         bot=bot,
         event=event,
         session=session,
+        state=state,
     )
 
-    permission.assert_awaited_once_with(session, "member_mute", bot, event)
+    permission.assert_awaited_once_with(session, "member_mute", bot, event, state=state)
     handler.assert_not_awaited()
     command.finished.assert_awaited_once_with("权限不足")
 
@@ -88,6 +90,7 @@ async def test_selected_adapter_handle_allows_business_handler(
     session = Mock()
     bot = FakeBot()
     event = FakeEvent()
+    state: dict[str, Any] = {}
     permission = AsyncMock(
         return_value=PermissionDecision(allowed=True, reason="granted")
     )
@@ -109,11 +112,12 @@ async def test_selected_adapter_handle_allows_business_handler(
         bot=bot,
         event=event,
         session=session,
+        state=state,
     )
     assert command.registered is not None
     result = await command.registered(value=1)
 
     assert result == "ok"
-    permission.assert_awaited_once_with(session, "member_mute", bot, event)
+    permission.assert_awaited_once_with(session, "member_mute", bot, event, state=state)
     handler.assert_awaited_once_with(value=1)
     command.finished.assert_not_awaited()
@@ -44,15 +44,20 @@ async def test_platform_runtime_groups_can_be_disabled_by_config(
         "get_user_by_platform_account",
         AsyncMock(return_value=SimpleNamespace(uid="userA")),
     )
-    monkeypatch.setattr(repo, "is_superuser", AsyncMock(return_value=False))
     monkeypatch.setattr(repo, "list_memberships", AsyncMock(return_value=[]))
     monkeypatch.setattr(
         repo,
         "list_identity_groups",
         AsyncMock(
             return_value=[
-                SimpleNamespace(group_id="qq.group", parent_group_id=None),
-                SimpleNamespace(group_id="qq.group.admin", parent_group_id="qq.group"),
+                SimpleNamespace(
+                    group_id="qq.group", parent_group_id=None, platform_id="qq"
+                ),
+                SimpleNamespace(
+                    group_id="qq.group.admin",
+                    parent_group_id="qq.group",
+                    platform_id="qq",
+                ),
             ]
         ),
     )
@@ -60,7 +65,11 @@ async def test_platform_runtime_groups_can_be_disabled_by_config(
         repo,
         "list_grants",
         AsyncMock(
-            return_value=[SimpleNamespace(group_id="qq.group.admin", effect="allow")]
+            return_value=[
+                SimpleNamespace(
+                    group_id="qq.group.admin", command_key="member_mute", effect="allow"
+                )
+            ]
         ),
     )
     monkeypatch.setattr(
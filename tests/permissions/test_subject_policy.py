@@ -10,6 +10,9 @@ import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.database.models import SubjectPolicyEntry
 from src.plugins.nonebot_plugin_lingchu_bot.permissions import subject_policy
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.scoped_lookup import (
+    ScopeFilter,
+)
 
 if TYPE_CHECKING:
     from unittest.mock import Mock
@@ -28,6 +31,7 @@ def mock_session() -> Mock:
     sess = AsyncMock()
     sess.add = MagicMock()
     sess.add_all = MagicMock()
+    sess.info = {}
     return sess
 
 
@@ -61,33 +65,13 @@ def test_subject_policy_does_not_import_blocklist_module() -> None:
 
 
 @pytest.mark.asyncio
-async def test_cleanup_expired_subject_policies_delegates_to_delete(
+async def test_protected_subject_reads_both_scopes_in_one_query(
     mock_session: Mock,
 ) -> None:
-    delete_mock = AsyncMock(return_value=(2, True))
-
-    with patch.object(subject_policy, "delete", delete_mock):
-        result = await subject_policy.cleanup_expired_subject_policies(mock_session)
-
-    assert result == (2, True)
-    assert delete_mock.await_args is not None
-    conditions = delete_mock.await_args.kwargs["conditions"]
-    delete_mock.assert_awaited_once_with(
-        mock_session,
-        SubjectPolicyEntry,
-        {},
-        conditions=conditions,
-    )
-    assert len(conditions) == 2
-
-
-@pytest.mark.asyncio
-async def test_protected_subject_prefers_global_scope(
-    mock_session: Mock,
-) -> None:
-    get_one_mock = AsyncMock(return_value=_entry())
+    entry = _entry()
+    find_mock = AsyncMock(return_value=entry)
 
-    with patch.object(subject_policy, "get_one", get_one_mock):
+    with patch.object(subject_policy, "find_active_scoped_entry", find_mock):
         result = await subject_policy.find_active_subject_policy(
             mock_session,
             policy_type="protected",
@@ -98,24 +82,30 @@ async def test_protected_subject_prefers_global_scope(
             user_id=456,
         )
 
-    assert result is not None
-    assert get_one_mock.await_count == 1
-    assert get_one_mock.call_args.args[0] is mock_session
-    assert get_one_mock.call_args.args[2]["policy_type"] == "protected"
-    assert get_one_mock.call_args.args[2]["scope"] == "global"
+    assert result is entry
+    find_mock.assert_awaited_once_with(
+        mock_session,
+        SubjectPolicyEntry,
+        {
+            "policy_type": "protected",
+            "platform_id": "qq",
+            "adapter_id": "~onebot.v11",
+            "bot_id": "bot-1",
+            "user_id": "456",
+        },
+        [ScopeFilter("global", "*", "unknown"), ScopeFilter("group", "123")],
+    )
 
 
 @pytest.mark.asyncio
-async def test_expired_subject_policy_is_deleted(mock_session: Mock) -> None:
-    expired = _entry(expires_at=datetime.now(UTC) - timedelta(seconds=1))
-    get_one_mock = AsyncMock(side_effect=[expired, None])
+async def test_find_active_subject_policy_never_deletes(mock_session: Mock) -> None:
     delete_mock = AsyncMock(return_value=(1, True))
 
     with (
-        patch.object(subject_policy, "get_one", get_one_mock),
+        patch.object(subject_policy, "find_active_scoped_entry", AsyncMock()),
         patch.object(subject_policy, "delete", delete_mock),
     ):
-        result = await subject_policy.find_active_subject_policy(
+        await subject_policy.find_active_subject_policy(
             mock_session,
             policy_type="protected",
             platform_id="qq",
@@ -125,8 +115,7 @@ async def test_expired_subject_policy_is_deleted(mock_session: Mock) -> None:
             user_id=456,
         )
 
-    assert result is None
-    delete_mock.assert_awaited_once()
+    delete_mock.assert_not_awaited()
 
 
 def test_expires_at_from_duration_none_returns_none() -> None:
@@ -332,65 +321,13 @@ async def test_clear_subject_policy_without_protocol_id(mock_session: Mock) -> N
 
 
 @pytest.mark.asyncio
-async def test_find_active_subject_policy_with_protocol_id(
+async def test_find_active_subject_policy_pins_protocol_id_in_both_scopes(
     mock_session: Mock,
 ) -> None:
-    entry = _entry()
-    get_one_mock = AsyncMock(return_value=entry)
+    find_mock = AsyncMock(return_value=None)
 
-    with patch.object(subject_policy, "get_one", get_one_mock):
-        result = await subject_policy.find_active_subject_policy(
-            mock_session,
-            policy_type="protected",
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            protocol_id="default",
-            bot_id="bot-1",
-            group_id=123,
-            user_id=456,
-        )
-
-    assert result is entry
-    assert get_one_mock.await_args is not None
-    filters = get_one_mock.await_args.args[2]
-    assert filters["protocol_id"] == "default"
-
-
-@pytest.mark.asyncio
-async def test_find_active_subject_policy_falls_back_to_group_scope(
-    mock_session: Mock,
-) -> None:
-    group_entry = _entry()
-    get_one_mock = AsyncMock(side_effect=[None, group_entry])
-
-    with patch.object(subject_policy, "get_one", get_one_mock):
-        result = await subject_policy.find_active_subject_policy(
-            mock_session,
-            policy_type="protected",
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            bot_id="bot-1",
-            group_id=123,
-            user_id=456,
-        )
-
-    assert result is group_entry
-    assert get_one_mock.await_count == 2
-    second_filters = get_one_mock.await_args_list[1].args[2]
-    assert second_filters["scope"] == "group"
-    assert second_filters["scope_key"] == "123"
-
-
-@pytest.mark.asyncio
-async def test_find_active_subject_policy_with_protocol_id_group_scope(
-    mock_session: Mock,
-) -> None:
-    """protocol_id filter is applied in the group-scope fallback path too."""
-    group_entry = _entry()
-    get_one_mock = AsyncMock(side_effect=[None, group_entry])
-
-    with patch.object(subject_policy, "get_one", get_one_mock):
-        result = await subject_policy.find_active_subject_policy(
+    with patch.object(subject_policy, "find_active_scoped_entry", find_mock):
+        await subject_policy.find_active_subject_policy(
             mock_session,
             policy_type="protected",
             platform_id="qq",
@@ -401,12 +338,10 @@ async def test_find_active_subject_policy_with_protocol_id_group_scope(
             user_id=456,
         )
 
-    assert result is group_entry
-    assert get_one_mock.await_count == 2
-    global_filters = get_one_mock.await_args_list[0].args[2]
-    group_filters = get_one_mock.await_args_list[1].args[2]
-    assert global_filters["protocol_id"] == "napcat"
-    assert group_filters["protocol_id"] == "napcat"
+    assert find_mock.call_args.args[3] == [
+        ScopeFilter("global", "*", "napcat"),
+        ScopeFilter("group", "123", "napcat"),
+    ]
 
 
 def test_active_subject_policy_condition_returns_clause() -> None:
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+from packaging.version import Version
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.capabilities import (
+    GROUP_NOTICE,
+    GROUP_PORTRAIT,
+    NAPCAT,
+    build_onebot_capabilities,
+    get_onebot_capabilities,
+    invalidate_onebot_capabilities,
+)
+
+BOT_ID = "1000"
+NAPCAT_INFO = {
+    "app_name": "NapCat.Onebot",
+    "app_version": "4.18.0",
+    "protocol_version": "v11",
+}
+
+
+def make_bot(side_effect: object, bot_id: str = BOT_ID) -> MagicMock:
+    bot = MagicMock()
+    bot.self_id = bot_id
+    bot.get_version_info = AsyncMock(side_effect=side_effect)
+    return bot
+
+
+@pytest.mark.parametrize(
+    ("version_info", "actions"),
+    [
+        (NAPCAT_INFO, {GROUP_NOTICE: NAPCAT, GROUP_PORTRAIT: NAPCAT}),
+        ({"data": NAPCAT_INFO}, {GROUP_NOTICE: NAPCAT, GROUP_PORTRAIT: NAPCAT}),
+        ({**NAPCAT_INFO, "app_version": "4.17.9"}, {}),
+        ({**NAPCAT_INFO, "app_version": "not-a-version"}, {}),
+        ({**NAPCAT_INFO, "app_name": "LLOneBot"}, {}),
+    ],
+)
+def test_build_resolves_the_action_table(
+    version_info: dict[str, object], actions: dict[str, str]
+) -> None:
+    capabilities = build_onebot_capabilities(version_info)
+
+    assert dict(capabilities.actions) == actions
+    assert capabilities.protocol_version == "v11"
+
+
+def test_build_keeps_raw_fields_and_parses_the_version() -> None:
+    capabilities = build_onebot_capabilities({"app_version": 4})
+
+    assert capabilities.app_name is None
+    assert capabilities.app_version == "4"
+    assert capabilities.version == Version("4")
+    assert capabilities.implementation(GROUP_NOTICE) is None
+
+
+@pytest.mark.asyncio
+async def test_capabilities_are_loaded_once_per_bot() -> None:
+    release = asyncio.Event()
+
+    async def slow_version_info() -> dict[str, str]:
+        await release.wait()
+        return NAPCAT_INFO
+
+    bot = make_bot(side_effect=slow_version_info)
+
+    waiters = [asyncio.ensure_future(get_onebot_capabilities(bot)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+    again = await get_onebot_capabilities(bot)
+
+    assert all(result is again for result in results)
+    bot.get_version_info.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached_and_invalidation_reloads() -> None:
+    bot = make_bot(side_effect=[ActionFailed(), NAPCAT_INFO, NAPCAT_INFO])
+
+    with pytest.raises(ActionFailed):
+        await get_onebot_capabilities(bot)
+    first = await get_onebot_capabilities(bot)
+    invalidate_onebot_capabilities(BOT_ID)
+    second = await get_onebot_capabilities(bot)
+
+    assert first == second
+    assert first is not second
+    assert bot.get_version_info.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidating_one_bot_keeps_other_bots_loads() -> None:
+    release = asyncio.Event()
+
+    async def slow_version_info() -> dict[str, str]:
+        await release.wait()
+        return NAPCAT_INFO
+
+    bot = make_bot(side_effect=slow_version_info)
+    other = make_bot(side_effect=slow_version_info, bot_id="2000")
+
+    loads = [
+        asyncio.ensure_future(get_onebot_capabilities(item)) for item in (bot, other)
+    ]
+    await asyncio.sleep(0)
+    invalidate_onebot_capabilities(BOT_ID)
+    release.set()
+    await asyncio.gather(*loads)
+    await get_onebot_capabilities(bot)
+    await get_onebot_capabilities(other)
+
+    # Only the invalidated bot's in-flight result was discarded.
+    assert bot.get_version_info.await_count == 2
+    other.get_version_info.assert_awaited_once()
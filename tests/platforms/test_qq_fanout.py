@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import Iterator
+import time
+from unittest.mock import MagicMock
+
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.fanout import (
+    FanoutPolicy,
+    fan_out,
+    reset_fanout_rate_limits,
+)
+
+FAST = FanoutPolicy(concurrency=2, rate=1000.0, burst=100, backoff_seconds=0)
+
+
+@pytest.fixture(autouse=True)
+def _reset_buckets() -> Iterator[None]:
+    yield
+    reset_fanout_rate_limits()
+
+
+def make_bot(self_id: str = "1000") -> MagicMock:
+    bot = MagicMock()
+    bot.self_id = self_id
+    return bot
+
+
+async def refused(item: int, _error: ActionFailed) -> str:
+    return f"{item}:refused"
+
+
+@pytest.mark.asyncio
+async def test_results_keep_input_order_within_the_concurrency_bound() -> None:
+    running = 0
+    peak = 0
+    reported: list[int] = []
+
+    async def action(item: int) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (5 - item))
+        running -= 1
+        return f"{item}:ok"
+
+    async def on_result(item: int, _result: str) -> None:
+        reported.append(item)
+
+    results = await fan_out(
+        make_bot(),
+        [1, 2, 3, 4],
+        action,
+        policy=FAST,
+        on_failure=refused,
+        on_result=on_result,
+    )
+
+    assert results == ["1:ok", "2:ok", "3:ok", "4:ok"]
+    assert peak == FAST.concurrency
+    assert sorted(reported) == [1, 2, 3, 4]
+    assert reported != [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_action_failed_is_retried_then_handed_to_on_failure() -> None:
+    attempts: dict[int, int] = {1: 0, 2: 0}
+
+    async def action(item: int) -> str:
+        attempts[item] += 1
+        if item == 1 or attempts[item] == 1:
+            raise ActionFailed
+        return f"{item}:ok"
+
+    results = await fan_out(make_bot(), [1, 2], action, policy=FAST, on_failure=refused)
+
+    assert results == ["1:refused", "2:ok"]
+    assert attempts == {1: FAST.retries + 1, 2: 2}
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_attempts_per_bot() -> None:
+    policy = FanoutPolicy(concurrency=4, rate=20.0, burst=1)
+
+    async def action(item: int) -> int:
+        return item
+
+    started = time.monotonic()
+    await fan_out(make_bot(), [1, 2], action, policy=policy, on_failure=refused)
+    await fan_out(make_bot(), [3], action, policy=policy, on_failure=refused)
+    spaced = time.monotonic() - started
+    started = time.monotonic()
+    await fan_out(make_bot("2000"), [4], action, policy=policy, on_failure=refused)
+    other_bot = time.monotonic() - started
+
+    # Three attempts on one bot after a burst of one wait two rate periods.
+    assert spaced >= 2 / policy.rate * 0.9
+    assert other_bot < 1 / policy.rate
@@ -0,0 +1,160 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq import group_directory
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.group_directory import (
+    build_group_directory,
+    get_group_directory,
+    invalidate_group_directory,
+)
+
+BOT_ID = "1000"
+GROUP_LIST: list[dict[str, object]] = [
+    {"group_id": 1, "group_name": "灵初测试群"},
+    {"group_id": 2, "group_name": "灵初开发群"},
+    {"group_id": 3, "group_name": "测试"},
+    {"group_id": 4, "group_name": "闲聊"},
+    {"group_id": 1, "group_name": "重复群号"},
+]
+
+
+def make_bot(group_list: object = None) -> MagicMock:
+    bot = MagicMock()
+    bot.self_id = BOT_ID
+    bot.get_group_list = AsyncMock(
+        return_value=GROUP_LIST if group_list is None else group_list
+    )
+    return bot
+
+
+def matched_ids(name: str) -> list[int]:
+    directory = build_group_directory(GROUP_LIST)
+    return [entry.group_id for entry in directory.match(name)]
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("测试", [3]),
+        ("灵初", [1, 2]),
+        ("测试群", [1]),
+        ("聊", [4]),
+        ("开发群", [2]),
+        ("不存在", []),
+        ("", [1, 2, 3, 4]),
+    ],
+)
+def test_match_prefers_exact_name_then_substring(
+    name: str,
+    expected: list[int],
+) -> None:
+    assert matched_ids(name) == expected
+
+
+def test_directory_skips_duplicate_ids_and_exposes_membership() -> None:
+    directory = build_group_directory(GROUP_LIST)
+
+    assert directory.group_ids() == [1, 2, 3, 4]
+    assert 4 in directory
+    assert 5 not in directory
+
+
+@pytest.mark.parametrize(
+    ("group_list", "error"),
+    [
+        ([{"group_name": "无群号键"}], KeyError),
+        ([{"group_id": "abc"}], ValueError),
+        (None, TypeError),
+    ],
+)
+def test_build_rejects_malformed_group_list(
+    group_list: Any,
+    error: type[Exception],
+) -> None:
+    with pytest.raises(error):
+        build_group_directory(group_list)
+
+
+@pytest.mark.asyncio
+async def test_directory_is_cached_until_invalidated() -> None:
+    bot = make_bot()
+
+    first = await get_group_directory(bot)
+    second = await get_group_directory(bot)
+    invalidate_group_directory(BOT_ID)
+    third = await get_group_directory(bot)
+
+    assert first is second
+    assert third is not first
+    assert bot.get_group_list.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_api_call() -> None:
+    release = asyncio.Event()
+
+    async def slow_group_list() -> list[dict[str, object]]:
+        await release.wait()
+        return GROUP_LIST
+
+    bot = make_bot()
+    bot.get_group_list = AsyncMock(side_effect=slow_group_list)
+
+    loads = [asyncio.create_task(get_group_directory(bot)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    directories = await asyncio.gather(*loads)
+
+    assert directories[0] is directories[1] is directories[2]
+    assert bot.get_group_list.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_api_errors_are_not_cached() -> None:
+    bot = make_bot()
+    bot.get_group_list = AsyncMock(side_effect=[ActionFailed(retcode=100), []])
+
+    with pytest.raises(ActionFailed):
+        await get_group_directory(bot)
+
+    assert (await get_group_directory(bot)).groups == ()
+
+
+@pytest.mark.asyncio
+async def test_directory_reloads_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(group_directory.time, "monotonic", lambda: now)
+    monkeypatch.setattr(
+        group_directory,
+        "plugin_config",
+        SimpleNamespace(onebot_group_list_ttl_seconds=300),
+    )
+    bot = make_bot()
+
+    await get_group_directory(bot)
+    now += 299
+    await get_group_directory(bot)
+    now += 1
+    await get_group_directory(bot)
+
+    assert bot.get_group_list.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_caching(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        group_directory,
+        "plugin_config",
+        SimpleNamespace(onebot_group_list_ttl_seconds=0),
+    )
+    bot = make_bot()
+
+    await get_group_directory(bot)
+    await get_group_directory(bot)
+
+    assert bot.get_group_list.await_count == 2
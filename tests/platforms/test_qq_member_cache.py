@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from nonebot.adapters.onebot.v11.exception import ActionFailed
+import pytest
+
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq import member_cache
+from src.plugins.nonebot_plugin_lingchu_bot.platforms.qq.member_cache import (
+    MemberCacheStats,
+    clear_member_cache,
+    get_bot_member_info,
+    get_group_member_info,
+    get_member_cache_stats,
+    invalidate_group_member,
+)
+
+GROUP_ID = 10001
+USER_ID = 42
+BOT_ID = "1000"
+
+
+def make_bot(return_value: object = None) -> MagicMock:
+    bot = MagicMock()
+    bot.self_id = BOT_ID
+    bot.get_group_member_info = AsyncMock(
+        return_value=return_value if return_value is not None else {"role": "admin"}
+    )
+    return bot
+
+
+def stats_delta(before: MemberCacheStats) -> tuple[int, int, int]:
+    after = get_member_cache_stats()
+    return (
+        after.hits - before.hits,
+        after.misses - before.misses,
+        after.coalesced - before.coalesced,
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookup_is_served_from_cache() -> None:
+    bot = make_bot()
+    before = get_member_cache_stats()
+
+    first = await get_group_member_info(bot, GROUP_ID, USER_ID)
+    second = await get_group_member_info(bot, GROUP_ID, USER_ID)
+
+    assert first == second == {"role": "admin"}
+    bot.get_group_member_info.assert_awaited_once_with(
+        group_id=GROUP_ID, user_id=USER_ID, no_cache=True
+    )
+    assert stats_delta(before) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_api_call() -> None:
+    release = asyncio.Event()
+
+    async def slow_member_info(**_kwargs: object) -> dict[str, str]:
+        await release.wait()
+        return {"role": "owner"}
+
+    bot = make_bot()
+    bot.get_group_member_info = AsyncMock(side_effect=slow_member_info)
+    before = get_member_cache_stats()
+
+    lookups = [
+        asyncio.create_task(get_group_member_info(bot, GROUP_ID, USER_ID))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*lookups)
+
+    assert results == [{"role": "owner"}] * 3
+    assert bot.get_group_member_info.await_count == 1
+    assert stats_delta(before) == (0, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_api_errors_are_not_cached() -> None:
+    bot = make_bot()
+    bot.get_group_member_info = AsyncMock(
+        side_effect=[ActionFailed(retcode=100), {"role": "member"}]
+    )
+
+    with pytest.raises(ActionFailed):
+        await get_group_member_info(bot, GROUP_ID, USER_ID)
+
+    assert await get_group_member_info(bot, GROUP_ID, USER_ID) == {"role": "member"}
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(member_cache.time, "monotonic", lambda: now)
+    monkeypatch.setattr(
+        member_cache,
+        "plugin_config",
+        SimpleNamespace(onebot_member_cache_ttl_seconds=30),
+    )
+    bot = make_bot()
+
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+    now += 29
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+    now += 1
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+
+    assert bot.get_group_member_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_caching(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        member_cache,
+        "plugin_config",
+        SimpleNamespace(onebot_member_cache_ttl_seconds=0),
+    )
+    bot = make_bot()
+
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+
+    assert bot.get_group_member_info.await_count == 2
+    assert get_member_cache_stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_member_group_and_bot_entries() -> None:
+    bot = make_bot()
+    other_bot = make_bot()
+    other_bot.self_id = "2000"
+    for user_id in (USER_ID, USER_ID + 1):
+        await get_group_member_info(bot, GROUP_ID, user_id)
+    await get_group_member_info(bot, GROUP_ID + 1, USER_ID)
+    await get_group_member_info(other_bot, GROUP_ID, USER_ID)
+
+    invalidate_group_member(BOT_ID, GROUP_ID, USER_ID)
+    assert get_member_cache_stats().size == 3
+    invalidate_group_member(BOT_ID, GROUP_ID)
+    assert get_member_cache_stats().size == 2
+    clear_member_cache(BOT_ID)
+    assert get_member_cache_stats().size == 1
+    clear_member_cache()
+    assert get_member_cache_stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_fetch_keeps_stale_result_out_of_cache() -> None:
+    async def member_info_then_invalidate(**_kwargs: object) -> dict[str, str]:
+        invalidate_group_member(BOT_ID, GROUP_ID, USER_ID)
+        return {"role": "member"}
+
+    bot = make_bot()
+    bot.get_group_member_info = AsyncMock(side_effect=member_info_then_invalidate)
+
+    await get_group_member_info(bot, GROUP_ID, USER_ID)
+
+    assert get_member_cache_stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_oldest_entry_when_full(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(member_cache, "_MAX_ENTRIES", 2)
+    bot = make_bot()
+
+    for user_id in (1, 2, 3):
+        await get_group_member_info(bot, GROUP_ID, user_id)
+    await get_group_member_info(bot, GROUP_ID, 1)
+
+    assert get_member_cache_stats().size == 2
+    assert bot.get_group_member_info.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_get_bot_member_info_uses_self_id() -> None:
+    bot = make_bot()
+
+    await get_bot_member_info(bot, GROUP_ID)
+
+    bot.get_group_member_info.assert_awaited_once_with(
+        group_id=GROUP_ID, user_id=int(BOT_ID), no_cache=True
+    )
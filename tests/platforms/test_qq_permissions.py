@@ -74,6 +74,7 @@ async def test_missing_role_calls_api_and_returns_role() -> None:
     bot.get_group_member_info.assert_awaited_once_with(
         group_id=10001,
         user_id=42,
+        no_cache=True,
     )
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from datetime import datetime
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -9,12 +9,13 @@ import pytest
 from src.plugins.nonebot_plugin_lingchu_bot.database.models import BlocklistEntry
 from src.plugins.nonebot_plugin_lingchu_bot.permissions import subject_policy
 from src.plugins.nonebot_plugin_lingchu_bot.repositories import blocklist
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.scoped_lookup import (
+    ScopeFilter,
+)
 
 if TYPE_CHECKING:
     from unittest.mock import Mock
 
-GET_ONE_GROUP_LOOKUP_COUNT = 2
-
 
 def _entry(*, expires_at: datetime | None = None) -> MagicMock:
     item = MagicMock(spec=BlocklistEntry)
@@ -295,31 +296,13 @@ async def test_remove_block_includes_protocol_id_filter_when_provided(
 
 
 @pytest.mark.asyncio
-async def test_find_active_block_prefers_global_entry(mock_session: Mock) -> None:
-    get_one_mock = AsyncMock(return_value=_entry())
-
-    with patch.object(blocklist, "get_one", get_one_mock):
-        result = await blocklist.find_active_block(
-            mock_session,
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            bot_id="bot-1",
-            group_id=123,
-            user_id=456,
-        )
-
-    assert result is not None
-    assert get_one_mock.await_count == 1
-    assert get_one_mock.call_args.args[2]["scope"] == "global"
-
-
-@pytest.mark.asyncio
-async def test_find_active_block_falls_back_to_group_entry(
+async def test_find_active_block_reads_both_scopes_in_one_query(
     mock_session: Mock,
 ) -> None:
-    get_one_mock = AsyncMock(side_effect=[None, _entry()])
+    entry = _entry()
+    find_mock = AsyncMock(return_value=entry)
 
-    with patch.object(blocklist, "get_one", get_one_mock):
+    with patch.object(blocklist, "find_active_scoped_entry", find_mock):
         result = await blocklist.find_active_block(
             mock_session,
             platform_id="qq",
@@ -329,24 +312,31 @@ async def test_find_active_block_falls_back_to_group_entry(
             user_id=456,
         )
 
-    assert result is not None
-    assert get_one_mock.await_count == GET_ONE_GROUP_LOOKUP_COUNT
-    assert get_one_mock.call_args_list[1].args[2]["scope"] == "group"
+    assert result is entry
+    find_mock.assert_awaited_once_with(
+        mock_session,
+        BlocklistEntry,
+        {
+            "platform_id": "qq",
+            "adapter_id": "~onebot.v11",
+            "bot_id": "bot-1",
+            "user_id": "456",
+        },
+        [ScopeFilter("global", "*"), ScopeFilter("group", "123")],
+    )
 
 
 @pytest.mark.asyncio
-async def test_find_active_block_lazily_deletes_expired_entries(
+async def test_find_active_block_never_deletes_on_the_read_path(
     mock_session: Mock,
 ) -> None:
-    expired = _entry(expires_at=datetime.now(UTC) - timedelta(seconds=1))
-    get_one_mock = AsyncMock(side_effect=[expired, None])
     delete_mock = AsyncMock(return_value=(1, True))
 
     with (
-        patch.object(blocklist, "get_one", get_one_mock),
+        patch.object(blocklist, "find_active_scoped_entry", AsyncMock()),
         patch.object(blocklist, "delete", delete_mock),
     ):
-        result = await blocklist.find_active_block(
+        await blocklist.find_active_block(
             mock_session,
             platform_id="qq",
             adapter_id="~onebot.v11",
@@ -355,8 +345,7 @@ async def test_find_active_block_lazily_deletes_expired_entries(
             user_id=456,
         )
 
-    assert result is None
-    delete_mock.assert_awaited_once()
+    delete_mock.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -384,14 +373,11 @@ async def test_clear_blocklist_includes_protocol_id_filter_when_provided(
 
 
 @pytest.mark.asyncio
-async def test_find_active_block_passes_protocol_id_and_returns_unexpired_entry() -> (
-    None
-):
-    future = datetime.now(UTC) + timedelta(seconds=60)
-    entry = _entry(expires_at=future)
-    get_one_mock = AsyncMock(return_value=entry)
-
-    with patch.object(blocklist, "get_one", get_one_mock):
+async def test_find_active_block_passes_protocol_id() -> None:
+    entry = _entry()
+    find_mock = AsyncMock(return_value=entry)
+
+    with patch.object(blocklist, "find_active_scoped_entry", find_mock):
         result = await blocklist.find_active_block(
             MagicMock(),
             platform_id="qq",
@@ -403,42 +389,7 @@ async def test_find_active_block_passes_protocol_id_and_returns_unexpired_entry(
         )
 
     assert result is entry
-    assert get_one_mock.call_args_list[0].args[2]["protocol_id"] == "napcat"
-
-
-@pytest.mark.asyncio
-async def test_cleanup_expired_blocks_deletes_blocklist_and_subject_policy_entries(
-    mock_session: Mock,
-) -> None:
-    delete_mock = AsyncMock(return_value=(3, True))
-    policy_cleanup_mock = AsyncMock(return_value=(2, True))
-
-    with (
-        patch.object(blocklist, "delete", delete_mock),
-        patch.object(
-            subject_policy,
-            "cleanup_expired_subject_policies",
-            policy_cleanup_mock,
-        ),
-    ):
-        result = await blocklist.cleanup_expired_blocks(mock_session)
-
-    assert result == (5, True)
-    delete_mock.assert_awaited_once()
-    kwargs = delete_mock.call_args.kwargs
-    assert "conditions" in kwargs
-    assert len(kwargs["conditions"]) == 2
-    assert policy_cleanup_mock.await_args is not None
-    policy_cleanup_mock.assert_awaited_once_with(
-        mock_session,
-        now=policy_cleanup_mock.await_args.kwargs["now"],
-    )
-
-
-def test_active_block_condition_returns_or_clause() -> None:
-    condition = blocklist.active_block_condition()
-
-    assert condition is not None
+    assert find_mock.call_args.args[2]["protocol_id"] == "napcat"
 
 
 @pytest.mark.asyncio
@@ -446,7 +397,6 @@ async def test_sync_blocked_policy_upsert_invokes_upsert_subject_policy(
     monkeypatch: pytest.MonkeyPatch,
     mock_session: Mock,
 ) -> None:
-    from src.plugins.nonebot_plugin_lingchu_bot.permissions import subject_policy
 
     upsert_mock = AsyncMock()
     monkeypatch.setattr(subject_policy, "upsert_subject_policy", upsert_mock)
@@ -481,7 +431,6 @@ async def test_sync_blocked_policy_remove_invokes_remove_subject_policy(
     monkeypatch: pytest.MonkeyPatch,
     mock_session: Mock,
 ) -> None:
-    from src.plugins.nonebot_plugin_lingchu_bot.permissions import subject_policy
 
     remove_mock = AsyncMock()
     monkeypatch.setattr(subject_policy, "remove_subject_policy", remove_mock)
@@ -511,7 +460,6 @@ async def test_sync_blocked_policy_clear_invokes_clear_subject_policy(
     monkeypatch: pytest.MonkeyPatch,
     mock_session: Mock,
 ) -> None:
-    from src.plugins.nonebot_plugin_lingchu_bot.permissions import subject_policy
 
     clear_mock = AsyncMock()
     monkeypatch.setattr(subject_policy, "clear_subject_policy", clear_mock)
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    BlocklistEntry,
+    SubjectPolicyEntry,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import (
+    blocklist,
+    blocklist_index,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.blocklist_index import (
+    UNINDEXED,
+    IndexedBlock,
+    begin_blocklist_index_reload,
+    block_key,
+    discard_block,
+    probe_block,
+    record_block,
+    replace_blocklist_index,
+    reset_blocklist_index,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.expiry import (
+    SESSION_DEADLINES_KEY,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.scoped_lookup import (
+    ScopeFilter,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from pathlib import Path
+
+PLATFORM_ID = "qq"
+ADAPTER_ID = "~onebot.v11"
+BOT_ID = "bot-1"
+GROUP_ID = 123
+
+
+@pytest.fixture(autouse=True)
+def _reset_index() -> Iterator[None]:
+    yield
+    reset_blocklist_index()
+
+
+@pytest.fixture
+async def blocklist_session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'blocklist.db'}")
+    async with engine.begin() as connection:
+        for table in (BlocklistEntry.__table__, SubjectPolicyEntry.__table__):
+            await connection.execute(CreateTable(table))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def group_key(user_id: int) -> tuple[str, str, str, str, str]:
+    return block_key(PLATFORM_ID, ADAPTER_ID, BOT_ID, str(GROUP_ID), user_id)
+
+
+def block_request(
+    user_id: int,
+    *,
+    scope: blocklist.BlockScope = "group",
+    protocol_id: str | None = None,
+    expires_at: datetime | None = None,
+) -> blocklist.BlocklistUpsert:
+    return blocklist.BlocklistUpsert(
+        platform_id=PLATFORM_ID,
+        adapter_id=ADAPTER_ID,
+        bot_id=BOT_ID,
+        scope=scope,
+        group_id=GROUP_ID,
+        user_id=user_id,
+        operator_id=None,
+        reason=None,
+        expires_at=expires_at,
+        protocol_id=protocol_id,
+    )
+
+
+def entry(
+    user_id: int,
+    *,
+    scope_key: str = str(GROUP_ID),
+    protocol_id: str = "unknown",
+    expires_at: datetime | None = None,
+) -> BlocklistEntry:
+    return BlocklistEntry(
+        platform_id=PLATFORM_ID,
+        adapter_id=ADAPTER_ID,
+        protocol_id=protocol_id,
+        bot_id=BOT_ID,
+        scope="global" if scope_key == "*" else "group",
+        scope_key=scope_key,
+        group_id=None if scope_key == "*" else scope_key,
+        user_id=str(user_id),
+        expires_at=expires_at,
+    )
+
+
+async def upsert_block(
+    session: AsyncSession, request: blocklist.BlocklistUpsert
+) -> None:
+    """Run ``upsert_block`` with its SQL stubbed; only the index is observed."""
+    with (
+        patch.object(blocklist, "upsert", AsyncMock()),
+        patch.object(blocklist, "_sync_blocked_policy_upsert", AsyncMock()),
+    ):
+        await blocklist.upsert_block(session, request)
+
+
+async def find(session: AsyncSession, user_id: int) -> BlocklistEntry | None:
+    return await blocklist.find_active_block(
+        session,
+        platform_id=PLATFORM_ID,
+        adapter_id=ADAPTER_ID,
+        bot_id=BOT_ID,
+        group_id=GROUP_ID,
+        user_id=user_id,
+    )
+
+
+def test_unloaded_index_cannot_rule_out_any_key() -> None:
+    assert probe_block(group_key(1)) is UNINDEXED
+
+
+def test_expired_keys_are_dropped_on_probe() -> None:
+    past = datetime.now(UTC) - timedelta(seconds=1)
+    replace_blocklist_index([(group_key(1), IndexedBlock("unknown", past))])
+
+    assert probe_block(group_key(1)) is None
+    assert blocklist_index._state.blocks == {}
+
+
+def test_discard_keeps_blocks_rewritten_after_the_probe() -> None:
+    replace_blocklist_index([(group_key(1), IndexedBlock("unknown", None))])
+    seen = probe_block(group_key(1))
+    assert seen is not None
+
+    record_block(AsyncMock(info={}), group_key(1), IndexedBlock("unknown", None))
+    discard_block(group_key(1), seen)
+
+    assert probe_block(group_key(1)) is not None
+
+
+@pytest.mark.asyncio
+async def test_load_indexes_only_active_entries(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    past = datetime.now(UTC) - timedelta(minutes=1)
+    async with blocklist_session_factory() as session, session.begin():
+        session.add_all([
+            entry(1),
+            entry(2, scope_key="*"),
+            entry(3, expires_at=past),
+        ])
+
+    async with blocklist_session_factory() as session:
+        loaded = await blocklist.load_blocklist_index(session)
+
+    assert loaded == 2
+    assert probe_block(group_key(1)) is not None
+    assert probe_block(block_key(PLATFORM_ID, ADAPTER_ID, BOT_ID, "*", 2))
+    assert probe_block(group_key(3)) is None
+
+
+@pytest.mark.asyncio
+async def test_unindexed_senders_skip_the_database(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with blocklist_session_factory() as session, session.begin():
+        session.add(entry(1, scope_key="*"))
+    async with blocklist_session_factory() as session:
+        await blocklist.load_blocklist_index(session)
+
+    async with blocklist_session_factory() as session:
+        with patch.object(
+            blocklist,
+            "find_active_scoped_entry",
+            wraps=blocklist.find_active_scoped_entry,
+        ) as lookup:
+            assert await find(session, 2) is None
+            assert lookup.await_count == 0
+            assert await find(session, 1) is not None
+            assert lookup.call_args.args[3] == [ScopeFilter("global", "*")]
+
+
+@pytest.mark.asyncio
+async def test_expired_index_picks_up_rows_from_other_processes(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with blocklist_session_factory() as session:
+        await blocklist.load_blocklist_index(session, ttl_seconds=60)
+    # Written without the repository, as `lc blocklist import` does elsewhere.
+    async with blocklist_session_factory() as session, session.begin():
+        session.add(entry(1))
+
+    async with blocklist_session_factory() as session:
+        assert await find(session, 1) is None
+        blocklist_index._state.loaded_at -= 60
+        assert await find(session, 1) is not None
+
+    assert begin_blocklist_index_reload() is None
+
+
+def test_reload_keeps_keys_indexed_while_it_ran() -> None:
+    replace_blocklist_index([], ttl_seconds=60)
+    blocklist_index._state.loaded_at -= 60
+    generation = begin_blocklist_index_reload()
+    assert generation is not None
+
+    record_block(AsyncMock(info={}), group_key(1), IndexedBlock("unknown", None))
+    replace_blocklist_index([], generation=generation)
+
+    assert probe_block(group_key(1)) is not None
+    assert blocklist_index._state.ttl_seconds == 60
+
+
+def test_index_without_ttl_is_never_reloaded() -> None:
+    replace_blocklist_index([])
+    blocklist_index._state.loaded_at -= 3600
+
+    assert begin_blocklist_index_reload() is None
+
+
+@pytest.mark.asyncio
+async def test_writes_update_the_index_on_commit(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    replace_blocklist_index([])
+
+    async with blocklist_session_factory() as session, session.begin():
+        await upsert_block(session, block_request(1))
+        assert probe_block(group_key(1)) is not None
+        session.add(entry(1))
+    assert probe_block(group_key(1)) is not None
+
+    async with blocklist_session_factory() as session, session.begin():
+        await blocklist.remove_block(
+            session,
+            platform_id=PLATFORM_ID,
+            adapter_id=ADAPTER_ID,
+            bot_id=BOT_ID,
+            scope="group",
+            group_id=GROUP_ID,
+            user_id=1,
+        )
+        assert probe_block(group_key(1)) is not None
+    assert probe_block(group_key(1)) is None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_removal_keeps_the_key(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    replace_blocklist_index([])
+    async with blocklist_session_factory() as session, session.begin():
+        await upsert_block(session, block_request(1))
+        session.add(entry(1))
+
+    async with blocklist_session_factory() as session:
+        await session.begin()
+        await blocklist.clear_blocklist(
+            session,
+            platform_id=PLATFORM_ID,
+            adapter_id=ADAPTER_ID,
+            bot_id=BOT_ID,
+            scope="group",
+            group_id=GROUP_ID,
+        )
+        await session.rollback()
+
+    assert probe_block(group_key(1)) is not None
+    async with blocklist_session_factory() as session:
+        assert await find(session, 1) is not None
+
+
+@pytest.mark.asyncio
+async def test_protocol_filtered_clear_keeps_other_protocols(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    replace_blocklist_index([])
+    async with blocklist_session_factory() as session, session.begin():
+        await upsert_block(session, block_request(1, protocol_id="napcat"))
+        await upsert_block(session, block_request(2, protocol_id="llonebot"))
+
+    async with blocklist_session_factory() as session, session.begin():
+        await blocklist.clear_blocklist(
+            session,
+            platform_id=PLATFORM_ID,
+            adapter_id=ADAPTER_ID,
+            protocol_id="napcat",
+            bot_id=BOT_ID,
+            scope="group",
+            group_id=GROUP_ID,
+        )
+
+    assert probe_block(group_key(1)) is None
+    assert probe_block(group_key(2)) is not None
+
+
+@pytest.mark.asyncio
+async def test_stale_keys_are_discarded_after_a_database_miss(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    replace_blocklist_index([(group_key(1), IndexedBlock("unknown", None))])
+
+    async with blocklist_session_factory() as session:
+        assert await find(session, 1) is None
+
+    assert probe_block(group_key(1)) is None
+
+
+@pytest.mark.asyncio
+async def test_group_hit_discards_the_stale_global_key(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    global_key = block_key(PLATFORM_ID, ADAPTER_ID, BOT_ID, "*", 1)
+    replace_blocklist_index([
+        (global_key, IndexedBlock("unknown", None)),
+        (group_key(1), IndexedBlock("unknown", None)),
+    ])
+    async with blocklist_session_factory() as session, session.begin():
+        session.add(entry(1))
+
+    async with blocklist_session_factory() as session:
+        assert await find(session, 1) is not None
+
+    assert probe_block(global_key) is None
+    assert probe_block(group_key(1)) is not None
+
+
+def test_expire_blocks_keeps_keys_extended_past_the_reap() -> None:
+    now = datetime.now(UTC)
+    replace_blocklist_index([
+        (group_key(1), IndexedBlock("unknown", now - timedelta(seconds=1))),
+        (group_key(2), IndexedBlock("unknown", now + timedelta(hours=1))),
+        (group_key(3), IndexedBlock("unknown", None)),
+    ])
+
+    blocklist_index.expire_blocks([group_key(1), group_key(2), group_key(3)], now)
+
+    assert blocklist_index._state.blocks is not None
+    assert set(blocklist_index._state.blocks) == {group_key(2), group_key(3)}
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_writes_both_tables_and_indexes_on_commit(
+    blocklist_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    replace_blocklist_index([])
+    later = datetime.now(UTC) + timedelta(hours=1)
+    async with blocklist_session_factory() as session, session.begin():
+        await blocklist.bulk_upsert_blocks(session, [block_request(1)])
+
+    async with blocklist_session_factory() as session, session.begin():
+        written = await blocklist.bulk_upsert_blocks(
+            session,
+            [block_request(1, expires_at=later), block_request(2), block_request(3)],
+            chunk_size=2,
+        )
+        assert set(session.info[SESSION_DEADLINES_KEY]) == {later}
+
+    assert written == 3
+    async with blocklist_session_factory() as session:
+        blocks = {
+            entry.user_id: entry.expires_at
+            for entry in await blocklist.list_blocks(session, bot_id=BOT_ID)
+        }
+        policies = set(await session.scalars(select(SubjectPolicyEntry.user_id)))
+    assert set(blocks) == {"1", "2", "3"}
+    assert blocks["1"] is not None
+    assert policies == {"1", "2", "3"}
+    assert probe_block(group_key(3)) is not None
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import BlocklistEntry
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import expiry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'expiry.db'}")
+    async with engine.begin() as connection:
+        await connection.execute(CreateTable(BlocklistEntry.__table__))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def block(user_id: int, expires_at: datetime | None) -> BlocklistEntry:
+    return BlocklistEntry(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        protocol_id="unknown",
+        bot_id="bot-1",
+        scope="global",
+        scope_key="*",
+        user_id=str(user_id),
+        expires_at=expires_at,
+    )
+
+
+def test_as_utc_only_fills_in_missing_timezones() -> None:
+    aware = datetime(2026, 1, 1, tzinfo=UTC)
+
+    assert expiry.as_utc(aware.replace(tzinfo=None)) == aware
+    assert expiry.as_utc(aware) is aware
+
+
+@pytest.mark.asyncio
+async def test_pending_deadlines_are_timezone_aware(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(1, now + timedelta(hours=1)),
+            block(2, now - timedelta(hours=1)),
+            block(3, None),
+        ])
+
+    async with session_factory() as session:
+        deadlines = await expiry.list_pending_deadlines(
+            session, BlocklistEntry, after=now
+        )
+
+    assert deadlines == [now + timedelta(hours=1)]
+
+
+@pytest.mark.asyncio
+async def test_reap_keeps_rows_extended_after_the_scan(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(1, now - timedelta(minutes=2)),
+            block(2, now - timedelta(minutes=1)),
+        ])
+    list_items = expiry.list_items
+
+    async def scan_then_extend(*args: Any, **kwargs: Any) -> list[BlocklistEntry]:
+        entries = await list_items(*args, **kwargs)
+        await args[0].execute(
+            update(BlocklistEntry)
+            .where(BlocklistEntry.user_id == "2")
+            .values(expires_at=now + timedelta(hours=1))
+        )
+        return entries
+
+    async with session_factory() as session, session.begin():
+        with patch.object(expiry, "list_items", scan_then_extend):
+            reaped = await expiry.reap_expired_entries(
+                session, BlocklistEntry, since=None, until=now, limit=10
+            )
+
+    assert [entry.user_id for entry in reaped] == ["1", "2"]
+    async with session_factory() as session:
+        assert list(await session.scalars(select(BlocklistEntry.user_id))) == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_reap_deletes_at_most_limit_rows_oldest_first(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(user_id, now - timedelta(minutes=user_id)) for user_id in range(1, 4)
+        ])
+
+    async with session_factory() as session, session.begin():
+        reaped = await expiry.reap_expired_entries(
+            session, BlocklistEntry, since=None, until=now, limit=2
+        )
+
+    assert [entry.user_id for entry in reaped] == ["3", "2"]
+    async with session_factory() as session:
+        assert list(await session.scalars(select(BlocklistEntry.user_id))) == ["1"]
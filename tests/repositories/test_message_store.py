@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
     AuditRecord,
@@ -15,10 +18,11 @@ from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
 from src.plugins.nonebot_plugin_lingchu_bot.repositories import message_store
 
 if TYPE_CHECKING:
+    from pathlib import Path
     from unittest.mock import Mock
 
 LIST_ITEMS_LIMIT = 10
-DELETE_CALL_COUNT = 4
+PARTITION_COUNT = 2
 
 
 def _message_record(*, record_id: int = 1) -> MagicMock:
@@ -176,6 +180,63 @@ async def test_record_event_received_with_message_id_calls_upsert(
     ]
 
 
+def _received_event_write(**overrides: Any) -> message_store.ReceivedEventWrite:
+    event = message_store.ReceivedEventWrite(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        bot_id="bot-1",
+        event_type="message.group",
+        conversation_id="group-1",
+        user_id="user-1",
+        message_id="msg-1",
+        message_type="group",
+        text_summary="hello",
+        raw_message='"hello"',
+        raw_event="{}",
+        received_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+    return replace(event, **overrides)
+
+
+@pytest.mark.asyncio
+async def test_record_events_received_bulk_upserts_per_partition(
+    mock_session: Mock,
+) -> None:
+    bulk_upsert_mock = AsyncMock(side_effect=lambda _s, _m, rows, **_kw: len(rows))
+    events = [
+        _received_event_write(message_id="msg-1"),
+        _received_event_write(message_id="msg-2"),
+        _received_event_write(platform_id="discord", adapter_id="discord"),
+    ]
+
+    with patch.object(message_store, "bulk_upsert", bulk_upsert_mock):
+        written = await message_store.record_events_received(mock_session, events)
+
+    assert written == len(events)
+    assert bulk_upsert_mock.await_count == PARTITION_COUNT
+    models = [call.args[1] for call in bulk_upsert_mock.await_args_list]
+    assert models == [QQOneBotV11NoneBotEventRecord, MessageRecord]
+    qq_rows = bulk_upsert_mock.await_args_list[0].args[2]
+    assert [row["message_id"] for row in qq_rows] == ["msg-1", "msg-2"]
+    assert qq_rows[0]["process_status"] == "received"
+    assert qq_rows[0]["event_category"] == "message"
+    assert qq_rows[0]["created_at"] == datetime(2026, 1, 1, tzinfo=UTC)
+    assert bulk_upsert_mock.await_args_list[0].kwargs["conflict_fields"] == (
+        message_store.EVENT_IDENTITY_FIELDS
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_events_received_empty_is_noop(mock_session: Mock) -> None:
+    bulk_upsert_mock = AsyncMock()
+
+    with patch.object(message_store, "bulk_upsert", bulk_upsert_mock):
+        written = await message_store.record_events_received(mock_session, [])
+
+    assert written == 0
+    bulk_upsert_mock.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_record_event_received_passes_protocol_id_through_to_create(
     mock_session: Mock,
@@ -233,131 +294,124 @@ async def test_record_event_received_passes_protocol_id_through_to_upsert(
     assert insert_values["protocol_id"] == "napcat"
 
 
-@pytest.mark.asyncio
-async def test_record_matcher_result_updates_record_when_found(
-    mock_session: Mock,
-) -> None:
-    record_mock = _message_record(record_id=42)
-    get_one_mock = AsyncMock(return_value=record_mock)
-    update_mock = AsyncMock()
-
-    with (
-        patch.object(message_store, "get_one", get_one_mock),
-        patch.object(message_store, "update", update_mock),
-    ):
-        result = await message_store.record_matcher_result(
-            mock_session,
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            protocol_id=None,
-            bot_id="bot-1",
-            conversation_id="group-1",
-            message_id="msg-1",
-            process_status="handled",
-            exception_summary="boom",
-        )
-
-    assert result is True
-    get_one_mock.assert_awaited_once()
-    assert get_one_mock.call_args.args[0] is mock_session
-    assert get_one_mock.call_args.args[1] is QQOneBotV11NoneBotEventRecord
-    assert get_one_mock.call_args.args[2] == {
-        "platform_id": "qq",
-        "adapter_id": "~onebot.v11",
-        "bot_id": "bot-1",
-        "conversation_id": "group-1",
-        "message_id": "msg-1",
-    }
-    update_mock.assert_awaited_once()
-    assert update_mock.call_args.args[0] is mock_session
-    assert update_mock.call_args.args[1] is QQOneBotV11NoneBotEventRecord
-    assert update_mock.call_args.args[2] == {"id": 42}
-    update_values = update_mock.call_args.args[3]
-    assert update_values["process_status"] == "handled"
-    assert update_values["exception_summary"] == "boom"
-    assert "updated_at" in update_values
+def _matcher_result(**overrides: Any) -> message_store.MatcherResultWrite:
+    result = message_store.MatcherResultWrite(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        bot_id="bot-1",
+        conversation_id="group-1",
+        message_id="msg-1",
+        process_status="handled",
+    )
+    return replace(result, **overrides)
 
 
 @pytest.mark.asyncio
-async def test_record_matcher_result_filters_by_protocol_id(
+async def test_record_matcher_results_runs_one_update_per_status(
     mock_session: Mock,
 ) -> None:
-    record_mock = _message_record(record_id=42)
-    get_one_mock = AsyncMock(return_value=record_mock)
-    update_mock = AsyncMock()
-
-    with (
-        patch.object(message_store, "get_one", get_one_mock),
-        patch.object(message_store, "update", update_mock),
-    ):
-        result = await message_store.record_matcher_result(
+    update_mock = AsyncMock(return_value=(1, True))
+
+    with patch.object(message_store, "update", update_mock):
+        updated = await message_store.record_matcher_results(
             mock_session,
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            protocol_id="napcat",
-            bot_id="bot-1",
-            conversation_id="group-1",
-            message_id="msg-1",
-            process_status="handled",
+            [
+                _matcher_result(message_id="msg-1"),
+                _matcher_result(message_id="msg-2"),
+                _matcher_result(
+                    message_id="msg-3",
+                    process_status="failed",
+                    exception_summary="boom",
+                ),
+            ],
         )
 
-    assert result is True
-    filters = get_one_mock.call_args.args[2]
-    assert filters["protocol_id"] == "napcat"
+    assert updated == PARTITION_COUNT
+    assert update_mock.await_count == PARTITION_COUNT
+    first, second = update_mock.await_args_list
+    assert first.args[0] is mock_session
+    assert first.args[1] is QQOneBotV11NoneBotEventRecord
+    assert first.args[2] == {}
+    assert first.args[3]["process_status"] == "handled"
+    assert first.args[3]["exception_summary"] is None
+    assert "updated_at" in first.args[3]
+    assert second.args[3]["process_status"] == "failed"
+    assert second.args[3]["exception_summary"] == "boom"
 
 
 @pytest.mark.asyncio
-async def test_record_matcher_result_returns_false_when_message_id_none(
+async def test_record_matcher_results_ignores_unknown_rowcount(
     mock_session: Mock,
 ) -> None:
-    get_one_mock = AsyncMock()
-    update_mock = AsyncMock()
-
-    with (
-        patch.object(message_store, "get_one", get_one_mock),
-        patch.object(message_store, "update", update_mock),
-    ):
-        result = await message_store.record_matcher_result(
-            mock_session,
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            protocol_id=None,
-            bot_id="bot-1",
-            conversation_id="group-1",
-            message_id=None,
-            process_status="handled",
+    update_mock = AsyncMock(return_value=(-1, False))
+
+    with patch.object(message_store, "update", update_mock):
+        updated = await message_store.record_matcher_results(
+            mock_session, [_matcher_result()]
         )
 
-    assert result is False
-    get_one_mock.assert_not_awaited()
-    update_mock.assert_not_awaited()
+    assert updated == 0
 
 
 @pytest.mark.asyncio
-async def test_record_matcher_result_returns_false_when_not_found(
-    mock_session: Mock,
+async def test_record_matcher_results_updates_rows_by_identity_tuple(
+    tmp_path: Path,
 ) -> None:
-    get_one_mock = AsyncMock(return_value=None)
-    update_mock = AsyncMock()
-
-    with (
-        patch.object(message_store, "get_one", get_one_mock),
-        patch.object(message_store, "update", update_mock),
-    ):
-        result = await message_store.record_matcher_result(
-            mock_session,
-            platform_id="qq",
-            adapter_id="~onebot.v11",
-            protocol_id=None,
-            bot_id="bot-1",
-            conversation_id="group-1",
-            message_id="msg-1",
-            process_status="handled",
-        )
-
-    assert result is False
-    get_one_mock.assert_awaited_once()
-    update_mock.assert_not_awaited()
+    """Batched status updates match rows on the full identity key in SQLite."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    table = QQOneBotV11NoneBotEventRecord.__table__
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(table.create)
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            await message_store.record_events_received(
+                session,
+                [
+                    _received_event_write(message_id="msg-1", protocol_id="napcat"),
+                    _received_event_write(message_id="msg-2", protocol_id="napcat"),
+                    _received_event_write(message_id="msg-3", conversation_id=None),
+                    _received_event_write(message_id="msg-4"),
+                ],
+            )
+            updated = await message_store.record_matcher_results(
+                session,
+                [
+                    _matcher_result(message_id="msg-1"),
+                    _matcher_result(
+                        message_id="msg-2",
+                        protocol_id="other",
+                        process_status="failed",
+                    ),
+                    _matcher_result(
+                        message_id="msg-3",
+                        conversation_id=None,
+                        process_status="failed",
+                        exception_summary="boom",
+                    ),
+                ],
+            )
+            await session.commit()
+            rows = (
+                await session.execute(
+                    select(
+                        QQOneBotV11NoneBotEventRecord.message_id,
+                        QQOneBotV11NoneBotEventRecord.process_status,
+                        QQOneBotV11NoneBotEventRecord.exception_summary,
+                    ).order_by(QQOneBotV11NoneBotEventRecord.message_id)
+                )
+            ).all()
+
+        assert updated == PARTITION_COUNT
+        assert [tuple(row) for row in rows] == [
+            ("msg-1", "handled", None),
+            ("msg-2", "received", None),
+            ("msg-3", "failed", "boom"),
+            ("msg-4", "received", None),
+        ]
+    finally:
+        await engine.dispose()
 
 
 @pytest.mark.asyncio
@@ -581,59 +635,3 @@ async def test_list_conversation_messages_keeps_other_platform_partition_keys(
         "message_type": "room",
         "conversation_id": "room-2",
     }
-
-
-@pytest.mark.asyncio
-async def test_cleanup_expired_messages_calls_delete_twice_and_returns_tuple(
-    mock_session: Mock,
-) -> None:
-    delete_mock = AsyncMock(side_effect=[(2, True), (1, True), (3, True), (4, True)])
-
-    with patch.object(message_store, "delete", delete_mock):
-        result = await message_store.cleanup_expired_messages(
-            mock_session,
-            retention_days=7,
-        )
-
-    assert result == (10, True)
-    assert delete_mock.await_count == DELETE_CALL_COUNT
-    assert delete_mock.call_args_list[0].args[0] is mock_session
-    assert delete_mock.call_args_list[0].args[1] is MessageRecord
-    assert delete_mock.call_args_list[1].args[1] is AuditRecord
-    assert delete_mock.call_args_list[2].args[1] is QQOneBotV11NoneBotEventRecord
-    assert delete_mock.call_args_list[3].args[1] is QQOneBotV11NoneBotAuditRecord
-    assert delete_mock.call_args_list[0].args[2] == {}
-    assert delete_mock.call_args_list[1].args[2] == {}
-    assert len(delete_mock.call_args_list[0].kwargs["conditions"]) == 1
-    assert len(delete_mock.call_args_list[1].kwargs["conditions"]) == 1
-
-
-@pytest.mark.asyncio
-async def test_cleanup_expired_messages_with_zero_retention_returns_empty(
-    mock_session: Mock,
-) -> None:
-    delete_mock = AsyncMock()
-
-    with patch.object(message_store, "delete", delete_mock):
-        result = await message_store.cleanup_expired_messages(
-            mock_session,
-            retention_days=0,
-        )
-
-    assert result == (0, True)
-    delete_mock.assert_not_awaited()
-
-
-@pytest.mark.asyncio
-async def test_cleanup_expired_messages_propagates_known_flag(
-    mock_session: Mock,
-) -> None:
-    delete_mock = AsyncMock(side_effect=[(1, True), (0, False), (2, True), (0, True)])
-
-    with patch.object(message_store, "delete", delete_mock):
-        result = await message_store.cleanup_expired_messages(
-            mock_session,
-            retention_days=7,
-        )
-
-    assert result == (3, False)
@@ -0,0 +1,281 @@
+"""Query-plan regression tests for the message store read and sweep paths.
+
+Every statement a repository call issues is captured and replayed through
+``EXPLAIN QUERY PLAN`` on SQLite without ``ANALYZE`` statistics, the state of
+a freshly migrated database.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    AuditRecord,
+    MessageRecord,
+    QQOneBotV11NoneBotAuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import (
+    message_store,
+    retention,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+    from pathlib import Path
+
+type Call = Callable[[AsyncSession], Awaitable[object]]
+
+MODELS = (
+    MessageRecord,
+    AuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+    QQOneBotV11NoneBotAuditRecord,
+)
+# (platform_id, adapter_id, index name prefix) of each event table.
+PARTITIONS = [
+    pytest.param("matrix", "matrix.v1", "ix_lingchu_message_records", id="generic"),
+    pytest.param("qq", "~onebot.v11", "ix_lingchu_qq_ob11_nb_event", id="qq"),
+]
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}")
+    async with engine.begin() as connection:
+        for model in MODELS:
+            await connection.run_sync(model.__table__.create)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def query_plans(engine: AsyncEngine, call: Call) -> list[list[str]]:
+    """Run ``call`` and return the plan of every read, update or delete."""
+    statements: list[tuple[str, Any]] = []
+
+    def capture(*args: Any) -> None:
+        statement, parameters = args[2], args[3]
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with async_sessionmaker(engine)() as session:
+            await call(session)
+            await session.commit()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    plans: list[list[str]] = []
+    async with engine.connect() as connection:
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+            plans.append([str(row[3]) for row in result])
+    assert plans
+    return plans
+
+
+def assert_indexed(plans: list[list[str]], *indexes: str) -> None:
+    """Assert no plan scans a table or sorts, and one uses any of ``indexes``."""
+    for plan in plans:
+        for detail in plan:
+            assert not detail.startswith("SCAN lingchu_"), plan
+            assert "TEMP B-TREE FOR ORDER BY" not in detail, plan
+    details = [detail for plan in plans for detail in plan]
+    assert any(index in detail for index in indexes for detail in details), plans
+
+
+def recent(platform_id: str, adapter_id: str, filters: dict[str, str]) -> Call:
+    async def call(session: AsyncSession) -> object:
+        return await message_store.list_recent_messages(
+            session,
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            bot_id=filters.get("bot_id"),
+            conversation_id=filters.get("conversation_id"),
+            user_id=filters.get("user_id"),
+        )
+
+    return call
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("platform_id", "adapter_id", "prefix"), PARTITIONS)
+async def test_conversation_page_uses_the_conversation_index(
+    engine: AsyncEngine, platform_id: str, adapter_id: str, prefix: str
+) -> None:
+    anchor = datetime(2026, 7, 18, 7, 5, tzinfo=UTC)
+
+    async def call(session: AsyncSession) -> object:
+        return await message_store.list_conversation_message_page(
+            session,
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            protocol_id="napcat",
+            framework_id="nonebot",
+            bot_id="bot-1",
+            conversation_type="group",
+            conversation_id="group-1",
+            limit=20,
+            after_received_at=anchor,
+            after_record_id="50",
+            window_received_at=anchor + timedelta(minutes=5),
+            window_record_id="80",
+        )
+
+    plans = await query_plans(engine, call)
+
+    assert_indexed(plans, f"{prefix}_conversation_recent")
+    assert any("INTEGER PRIMARY KEY (rowid=?)" in plan[0] for plan in plans)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("platform_id", "adapter_id", "prefix"), PARTITIONS)
+async def test_conversation_listing_uses_the_conversation_index(
+    engine: AsyncEngine, platform_id: str, adapter_id: str, prefix: str
+) -> None:
+    async def call(session: AsyncSession) -> object:
+        return await message_store.list_conversation_messages(
+            session,
+            platform_id=platform_id,
+            adapter_id=adapter_id,
+            protocol_id="napcat",
+            framework_id="nonebot",
+            bot_id="bot-1",
+            conversation_type="group",
+            conversation_id="group-1",
+            limit=20,
+        )
+
+    assert_indexed(await query_plans(engine, call), f"{prefix}_conversation_recent")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("platform_id", "adapter_id", "prefix"), PARTITIONS)
+@pytest.mark.parametrize(
+    ("filters", "indexes"),
+    [
+        pytest.param(
+            {"bot_id": "bot-1", "user_id": "42"}, ("_user_recent",), id="user"
+        ),
+        pytest.param(
+            {"bot_id": "bot-1", "conversation_id": "group-1"},
+            ("_conversation_recent",),
+            id="group",
+        ),
+        # Either recency index serves a user within one group.
+        pytest.param(
+            {"bot_id": "bot-1", "user_id": "42", "conversation_id": "group-1"},
+            ("_user_recent", "_conversation_recent"),
+            id="user-in-group",
+        ),
+        pytest.param({"bot_id": "bot-1"}, ("_bot_recent",), id="bot"),
+    ],
+)
+async def test_recall_candidates_use_recency_indexes(
+    engine: AsyncEngine,
+    platform_id: str,
+    adapter_id: str,
+    prefix: str,
+    filters: dict[str, str],
+    indexes: tuple[str, ...],
+) -> None:
+    plans = await query_plans(engine, recent(platform_id, adapter_id, filters))
+
+    assert_indexed(plans, *(f"{prefix}{index}" for index in indexes))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("platform_id", "adapter_id"), [("matrix", "matrix.v1"), ("qq", "~onebot.v11")]
+)
+async def test_matcher_results_use_the_identity_index(
+    engine: AsyncEngine, platform_id: str, adapter_id: str
+) -> None:
+    result = message_store.MatcherResultWrite(
+        platform_id=platform_id,
+        adapter_id=adapter_id,
+        protocol_id="napcat",
+        bot_id="bot-1",
+        conversation_id="group-1",
+        message_id="m-1",
+        process_status="handled",
+    )
+
+    async def call(session: AsyncSession) -> object:
+        return await message_store.record_matcher_results(session, [result])
+
+    plans = await query_plans(engine, call)
+
+    assert_indexed(plans, "sqlite_autoindex_")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+async def test_retention_chunks_walk_a_bounded_key_range(
+    engine: AsyncEngine, model: retention.RetentionModel
+) -> None:
+    platform_id, adapter_id = (
+        ("qq", "~onebot.v11") if "QQ" in model.__name__ else ("matrix", "matrix.v1")
+    )
+    async with async_sessionmaker(engine)() as session:
+        if model in {AuditRecord, QQOneBotV11NoneBotAuditRecord}:
+            await message_store.record_api_call(
+                session,
+                message_store.AuditEvent(
+                    platform_id=platform_id,
+                    adapter_id=adapter_id,
+                    bot_id="bot-1",
+                    api_name="send_msg",
+                    data_summary=None,
+                    result_summary=None,
+                    exception_summary=None,
+                ),
+            )
+        else:
+            await message_store.record_event_received(
+                session,
+                platform_id=platform_id,
+                adapter_id=adapter_id,
+                protocol_id="napcat",
+                bot_id="bot-1",
+                conversation_id="group-1",
+                user_id="42",
+                message_id="m-1",
+                event_type="message.group",
+                message_type="group",
+                text_summary=None,
+                raw_message=None,
+                raw_event=None,
+            )
+        await session.commit()
+
+    cutoff = datetime.now(UTC) + timedelta(days=1)
+
+    async def seek(session: AsyncSession) -> object:
+        return await retention.last_expired_id(session, model, cutoff=cutoff)
+
+    async def call(session: AsyncSession) -> object:
+        return await retention.delete_expired_chunk(
+            session, model, cutoff=cutoff, after_id=0, up_to_id=1, batch_size=100
+        )
+
+    assert_indexed(await query_plans(engine, seek), "_expiry (created_at<?)")
+    plans = await query_plans(engine, call)
+
+    assert len(plans) == 2
+    # The key walk is capped at the last expired id on both ends.
+    assert_indexed(plans, "INTEGER PRIMARY KEY (rowid>? AND rowid<?)")
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import Column, Index, MetaData, Table, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    MessageRecord,
+    QQOneBotV11NoneBotAuditRecord,
+    QQOneBotV11NoneBotEventRecord,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import (
+    message_store,
+    record_buckets,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.record_buckets import (
+    bucket_bounds,
+    bucket_for_write,
+    buckets_for_read,
+    configure_record_buckets,
+    known_buckets,
+    load_record_buckets,
+    reset_record_buckets,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from pathlib import Path
+
+EVENTS = QQOneBotV11NoneBotEventRecord
+PARENT = str(EVENTS.__tablename__)
+JAN = datetime(2026, 1, 20, 12, tzinfo=UTC)
+FEB = datetime(2026, 2, 3, 8, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _reset_buckets() -> Iterator[None]:
+    yield
+    reset_record_buckets()
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'buckets.db'}")
+    async with engine.begin() as connection:
+        for model in (EVENTS, QQOneBotV11NoneBotAuditRecord):
+            await connection.execute(CreateTable(model.__table__))
+            for index in model.__table__.indexes:
+                await connection.run_sync(index.create)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def received(message_id: str, at: datetime) -> message_store.ReceivedEventWrite:
+    return message_store.ReceivedEventWrite(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        protocol_id="napcat",
+        bot_id="bot-1",
+        event_type="message.group",
+        conversation_id="123",
+        user_id="42",
+        message_id=message_id,
+        message_type="group",
+        text_summary=message_id,
+        raw_message=None,
+        raw_event=None,
+        received_at=at,
+    )
+
+
+async def table_names(factory: async_sessionmaker[AsyncSession]) -> set[str]:
+    async with factory() as session:
+        connection = await session.connection()
+        return set(
+            await connection.run_sync(lambda sync: inspect(sync).get_table_names())
+        )
+
+
+def test_bucket_bounds_cover_weeks_and_months() -> None:
+    assert bucket_bounds(JAN, "week") == (
+        datetime(2026, 1, 19, tzinfo=UTC),
+        datetime(2026, 1, 26, tzinfo=UTC),
+    )
+    assert bucket_bounds(datetime(2026, 12, 31, 23, tzinfo=UTC), "month") == (
+        datetime(2026, 12, 1, tzinfo=UTC),
+        datetime(2027, 1, 1, tzinfo=UTC),
+    )
+    tokyo = timezone(timedelta(hours=9))
+    assert bucket_bounds(datetime(2026, 3, 1, 8, tzinfo=tokyo), "month")[0] == (
+        datetime(2026, 2, 1, tzinfo=UTC)
+    )
+    with pytest.raises(ValueError, match="unsupported"):
+        bucket_bounds(JAN, "none")
+
+
+@pytest.mark.asyncio
+async def test_disabled_bucketing_keeps_the_partition_model(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        assert await bucket_for_write(session, EVENTS, JAN) is EVENTS
+        configure_record_buckets("month")
+        assert await bucket_for_write(session, MessageRecord, JAN) is MessageRecord
+    assert buckets_for_read(EVENTS) == [EVENTS]
+
+
+@pytest.mark.asyncio
+async def test_writes_create_buckets_known_after_commit(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("month")
+
+    async with session_factory() as session:
+        written = await message_store.record_events_received(
+            session, [received("1", JAN), received("2", FEB)]
+        )
+        assert known_buckets(EVENTS) == []
+        await session.commit()
+
+    assert written == 2
+    assert [bucket.table_name for bucket in known_buckets(EVENTS)] == [
+        f"{PARENT}_m202602",
+        f"{PARENT}_m202601",
+    ]
+    january = known_buckets(EVENTS)[1].model
+    assert issubclass(january, EVENTS)
+    async with session_factory() as session:
+        assert list(await session.scalars(select(january.message_id))) == ["1"]
+        assert list(await session.scalars(select(EVENTS.id))) == []
+    assert "ix_lingchu_qq_ob11_nb_event_conversation_recent_m202601" in {
+        index.name for index in january.__table__.indexes
+    }
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_buckets_stay_unknown(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("week")
+
+    async with session_factory() as session:
+        await message_store.record_events_received(session, [received("1", JAN)])
+        await session.rollback()
+
+    assert known_buckets(EVENTS) == []
+
+
+@pytest.mark.asyncio
+async def test_load_reflects_bucket_tables(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("week")
+    async with session_factory() as session:
+        await bucket_for_write(session, EVENTS, JAN)
+        await bucket_for_write(session, QQOneBotV11NoneBotAuditRecord, FEB)
+        await session.commit()
+    async with session_factory() as session, session.begin():
+        # Not a Monday, so not a week bucket.
+        await session.execute(
+            CreateTable(
+                record_buckets._bucket_model(EVENTS, f"{PARENT}_w20260120").__table__
+            )
+        )
+    reset_record_buckets()
+
+    async with session_factory() as session:
+        loaded = await load_record_buckets(session)
+
+    assert loaded == 2
+    assert [bucket.starts_at for bucket in known_buckets(EVENTS)] == [
+        datetime(2026, 1, 19, tzinfo=UTC)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_syncs_bucket_indexes_with_the_partition_model(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("month")
+    async with session_factory() as session:
+        bucket = await bucket_for_write(session, EVENTS, JAN)
+        await session.commit()
+    table = bucket.__table__
+    reflected = Table(table.name, MetaData(), Column("user_id"))
+    stale = Index(f"ix_{table.name}_user_id", reflected.c.user_id)
+    async with session_factory() as session, session.begin():
+        connection = await session.connection()
+        await connection.run_sync(stale.create)
+        await connection.run_sync(next(iter(table.indexes)).drop)
+    reset_record_buckets()
+
+    async with session_factory() as session:
+        await load_record_buckets(session)
+        await session.commit()
+
+    async with session_factory() as session:
+        connection = await session.connection()
+        indexes = await connection.run_sync(
+            lambda sync: {
+                index["name"] for index in inspect(sync).get_indexes(table.name)
+            }
+        )
+    assert indexes == {str(index.name) for index in table.indexes}
+
+
+@pytest.mark.asyncio
+async def test_reads_merge_buckets_and_the_partition_table(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        await message_store.record_events_received(
+            session, [received("legacy", JAN - timedelta(days=40))]
+        )
+        await session.commit()
+    configure_record_buckets("month")
+    async with session_factory() as session:
+        await message_store.record_events_received(
+            session,
+            [received("jan", JAN), received("feb-1", FEB), received("feb-2", FEB)],
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        recent = await message_store.list_recent_messages(
+            session, adapter_id="~onebot.v11", bot_id="bot-1", limit=3
+        )
+        everything = await message_store.list_conversation_messages(
+            session,
+            platform_id="qq",
+            adapter_id="~onebot.v11",
+            protocol_id="napcat",
+            framework_id="nonebot",
+            bot_id="bot-1",
+            conversation_type="group",
+            conversation_id="123",
+            limit=10,
+        )
+
+    assert [record.message_id for record in recent] == ["feb-2", "feb-1", "jan"]
+    assert [record.message_id for record in everything] == [
+        "feb-2",
+        "feb-1",
+        "jan",
+        "legacy",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_walk_across_buckets(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("month")
+    async with session_factory() as session:
+        await message_store.record_events_received(
+            session, [received("jan", JAN), received("feb", FEB)]
+        )
+        await session.commit()
+
+    async def page(
+        after: message_store.EventRecord | None,
+    ) -> tuple[list[message_store.EventRecord], bool]:
+        async with session_factory() as session:
+            return await message_store.list_conversation_message_page(
+                session,
+                platform_id="qq",
+                adapter_id="~onebot.v11",
+                protocol_id="napcat",
+                framework_id="nonebot",
+                bot_id="bot-1",
+                conversation_type="group",
+                conversation_id="123",
+                limit=1,
+                after_received_at=None if after is None else after.created_at,
+                after_record_id=None if after is None else str(after.id),
+                window_received_at=None,
+                window_record_id=None,
+            )
+
+    first, _ = await page(None)
+    second, anchor_exists = await page(first[0])
+
+    assert [record.message_id for record in first] == ["feb"]
+    assert [record.message_id for record in second] == ["jan"]
+    assert anchor_exists is True
+
+
+@pytest.mark.asyncio
+async def test_matcher_results_and_audits_land_in_the_current_bucket(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("week")
+    now = datetime.now(UTC)
+    async with session_factory() as session:
+        await message_store.record_events_received(session, [received("1", now)])
+        await session.commit()
+
+    async with session_factory() as session:
+        updated = await message_store.record_matcher_results(
+            session,
+            [
+                message_store.MatcherResultWrite(
+                    platform_id="qq",
+                    adapter_id="~onebot.v11",
+                    protocol_id="napcat",
+                    bot_id="bot-1",
+                    conversation_id="123",
+                    message_id="1",
+                    process_status="handled",
+                )
+            ],
+        )
+        audit = await message_store.record_api_call(
+            session,
+            message_store.AuditEvent(
+                platform_id="qq",
+                adapter_id="~onebot.v11",
+                bot_id="bot-1",
+                api_name="send_msg",
+                data_summary=None,
+                result_summary=None,
+                exception_summary=None,
+            ),
+        )
+        await session.commit()
+
+    assert updated == 1
+    assert type(audit) is known_buckets(QQOneBotV11NoneBotAuditRecord)[0].model
+    bucket = known_buckets(EVENTS)[0].model
+    async with session_factory() as session:
+        assert await session.scalar(select(bucket.process_status)) == "handled"
+
+
+@pytest.mark.asyncio
+async def test_dropped_buckets_are_forgotten_on_commit(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    configure_record_buckets("month")
+    async with session_factory() as session:
+        await bucket_for_write(session, EVENTS, JAN)
+        await session.commit()
+    (bucket,) = known_buckets(EVENTS)
+
+    async with session_factory() as session, session.begin():
+        await record_buckets.drop_bucket(session, EVENTS, bucket)
+        assert known_buckets(EVENTS) == [bucket]
+
+    assert known_buckets(EVENTS) == []
+    assert bucket.table_name not in await table_names(session_factory)
+    assert record_buckets.buckets_before(EVENTS, FEB) == []
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    AuditRecord,
+    RetentionWatermark,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import retention
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+TABLE = str(AuditRecord.__tablename__)
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retention.db'}")
+    async with engine.begin() as connection:
+        for table in (AuditRecord.__table__, RetentionWatermark.__table__):
+            await connection.execute(CreateTable(table))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def audit(created_at: datetime) -> AuditRecord:
+    return AuditRecord(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        bot_id="bot-1",
+        audit_type="api",
+        event_type="send_msg",
+        created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_last_expired_id_returns_the_newest_expired_row(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    old = NOW - timedelta(days=2)
+    async with session_factory() as session, session.begin():
+        session.add_all([audit(old), audit(old), audit(NOW), audit(old), audit(NOW)])
+
+    async with session_factory() as session:
+        assert await retention.last_expired_id(session, AuditRecord, cutoff=NOW) == 4
+        assert await retention.last_expired_id(session, AuditRecord, cutoff=old) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_chunk_deletes_oldest_ids_after_the_watermark(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    old = NOW - timedelta(days=2)
+    async with session_factory() as session, session.begin():
+        session.add_all([audit(old), audit(old), audit(NOW), audit(old), audit(old)])
+
+    async with session_factory() as session, session.begin():
+        chunk = await retention.delete_expired_chunk(
+            session, AuditRecord, cutoff=NOW, after_id=1, up_to_id=4, batch_size=10
+        )
+
+    assert chunk == retention.DeletedChunk(selected=2, deleted=2, last_id=4, known=True)
+    async with session_factory() as session:
+        left = list(await session.scalars(select(AuditRecord.id)))
+    assert sorted(left) == [1, 3, 5]
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_chunk_reports_an_empty_chunk(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session, session.begin():
+        session.add(audit(NOW))
+
+    async with session_factory() as session, session.begin():
+        chunk = await retention.delete_expired_chunk(
+            session, AuditRecord, cutoff=NOW, after_id=0, up_to_id=1, batch_size=10
+        )
+
+    assert chunk == retention.DeletedChunk(
+        selected=0, deleted=0, last_id=None, known=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_watermark_round_trip(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session, session.begin():
+        assert await retention.get_watermark(session, TABLE) == 0
+        await retention.save_watermark(session, TABLE, 10)
+        await retention.save_watermark(session, TABLE, 25)
+
+    async with session_factory() as session:
+        assert await retention.get_watermark(session, TABLE) == 25
+
+    async with session_factory() as session, session.begin():
+        await retention.clear_watermark(session, TABLE)
+        assert await retention.get_watermark(session, TABLE) == 0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import BlocklistEntry
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import scoped_lookup
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.scoped_lookup import (
+    ScopeFilter,
+    find_active_scoped_entry,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+FILTERS = {"platform_id": "qq", "adapter_id": "~onebot.v11", "bot_id": "bot-1"}
+BOTH_SCOPES = [ScopeFilter("global", "*"), ScopeFilter("group", "123")]
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'scoped.db'}")
+    async with engine.begin() as connection:
+        await connection.execute(CreateTable(BlocklistEntry.__table__))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def entry(
+    scope_key: str,
+    *,
+    user_id: str = "456",
+    protocol_id: str = "unknown",
+    expires_at: datetime | None = None,
+) -> BlocklistEntry:
+    return BlocklistEntry(
+        **FILTERS,
+        protocol_id=protocol_id,
+        scope="global" if scope_key == "*" else "group",
+        scope_key=scope_key,
+        group_id=None if scope_key == "*" else scope_key,
+        user_id=user_id,
+        expires_at=expires_at,
+    )
+
+
+async def lookup(
+    session: AsyncSession,
+    scopes: list[ScopeFilter] = BOTH_SCOPES,
+) -> BlocklistEntry | None:
+    return await find_active_scoped_entry(
+        session, BlocklistEntry, {**FILTERS, "user_id": "456"}, scopes
+    )
+
+
+@pytest.mark.asyncio
+async def test_global_entry_wins_over_group_entry(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session, session.begin():
+        session.add_all([entry("123"), entry("*"), entry("*", user_id="789")])
+
+    async with session_factory() as session:
+        found = await lookup(session)
+
+    assert found is not None
+    assert found.scope_key == "*"
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_skipped_and_kept(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    past = datetime.now(UTC) - timedelta(seconds=1)
+    async with session_factory() as session, session.begin():
+        session.add_all([entry("*", expires_at=past), entry("123")])
+
+    async with session_factory() as session:
+        found = await lookup(session)
+        rows = await session.scalar(select(func.count()).select_from(BlocklistEntry))
+
+    assert found is not None
+    assert found.scope_key == "123"
+    assert rows == 2
+
+
+@pytest.mark.asyncio
+async def test_scope_protocol_only_narrows_its_own_scope(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session, session.begin():
+        session.add_all([entry("*", protocol_id="napcat"), entry("123")])
+
+    async with session_factory() as session:
+        found = await lookup(
+            session,
+            [ScopeFilter("global", "*", "unknown"), ScopeFilter("group", "123")],
+        )
+
+    assert found is not None
+    assert found.scope_key == "123"
+
+
+@pytest.mark.asyncio
+async def test_no_scopes_skips_the_query() -> None:
+    with patch.object(scoped_lookup, "list_items") as list_items:
+        assert (
+            await find_active_scoped_entry(MagicMock(), BlocklistEntry, {}, []) is None
+        )
+
+    list_items.assert_not_called()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    BlocklistEntry,
+    SubjectPolicyEntry,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.blocklist_index import (
+    reset_blocklist_index,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.services import blocklist_transfer
+from src.plugins.nonebot_plugin_lingchu_bot.services.blocklist_transfer import (
+    BlocklistTransferError,
+    read_blocklist,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+EXPIRES_AT = datetime(2030, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'transfer.db'}")
+    async with engine.begin() as connection:
+        for table in (BlocklistEntry.__table__, SubjectPolicyEntry.__table__):
+            await connection.execute(CreateTable(table))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(blocklist_transfer, "get_session", factory)
+    try:
+        yield factory
+    finally:
+        reset_blocklist_index()
+        await engine.dispose()
+
+
+def write_jsonl(path: Path, *records: dict[str, object]) -> Path:
+    path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records), encoding="utf-8"
+    )
+    return path
+
+
+def record(user_id: str, **values: object) -> dict[str, object]:
+    return {
+        "platform_id": "qq",
+        "adapter_id": "~onebot.v11",
+        "bot_id": "bot-1",
+        "user_id": user_id,
+        **values,
+    }
+
+
+def test_read_infers_scope_and_parses_expiry(tmp_path: Path) -> None:
+    path = tmp_path / "in.csv"
+    path.write_text(
+        "platform_id,adapter_id,bot_id,group_id,user_id,expires_at\n"
+        "qq,~onebot.v11,bot-1,123,1,2030-01-01T00:00:00+00:00\n"
+        "qq,~onebot.v11,bot-1,,2,\n",
+        encoding="utf-8",
+    )
+
+    requests = list(read_blocklist(path))
+
+    assert [(request.scope, request.group_id) for request in requests] == [
+        ("group", "123"),
+        ("global", None),
+    ]
+    assert requests[0].expires_at == EXPIRES_AT
+    assert requests[1].expires_at is None
+
+
+def test_overrides_replace_record_columns(tmp_path: Path) -> None:
+    path = write_jsonl(tmp_path / "in.jsonl", record("1", bot_id="other-bot"))
+
+    (request,) = read_blocklist(path, {"bot_id": "bot-1"})
+
+    assert request.bot_id == "bot-1"
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ('{"user_id": "1"}\n', "line 1: platform_id is required"),
+        ("\n[]\n", "line 2: expected a JSON object"),
+        ("{not json\n", "line 1: invalid JSON"),
+    ],
+)
+def test_invalid_records_name_their_line(
+    tmp_path: Path, content: str, message: str
+) -> None:
+    path = tmp_path / "in.jsonl"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(BlocklistTransferError, match=message):
+        list(read_blocklist(path))
+
+
+def test_invalid_scope_and_timestamp_are_rejected(tmp_path: Path) -> None:
+    scope = write_jsonl(tmp_path / "scope.jsonl", record("1", scope="room"))
+    group = write_jsonl(tmp_path / "group.jsonl", record("1", scope="group"))
+    expiry = write_jsonl(tmp_path / "expiry.jsonl", record("1", expires_at="soon"))
+
+    with pytest.raises(BlocklistTransferError, match="scope must be"):
+        list(read_blocklist(scope))
+    with pytest.raises(BlocklistTransferError, match="group_id is required"):
+        list(read_blocklist(group))
+    with pytest.raises(BlocklistTransferError, match="ISO 8601"):
+        list(read_blocklist(expiry))
+
+
+def test_unsupported_suffix_and_missing_header_are_rejected(tmp_path: Path) -> None:
+    headerless = tmp_path / "in.csv"
+    headerless.write_text("qq,~onebot.v11\n", encoding="utf-8")
+
+    with pytest.raises(BlocklistTransferError, match="unsupported"):
+        list(read_blocklist(tmp_path / "in.xlsx"))
+    with pytest.raises(BlocklistTransferError, match="no user_id column"):
+        list(read_blocklist(headerless))
+    with pytest.raises(BlocklistTransferError, match="cannot read"):
+        list(read_blocklist(tmp_path / "missing.csv"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("session_factory")
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+async def test_export_then_import_round_trips(tmp_path: Path, suffix: str) -> None:
+    source = write_jsonl(
+        tmp_path / "source.jsonl",
+        record("1", group_id="123", reason="spam", expires_at=EXPIRES_AT.isoformat()),
+        record("2"),
+        record("3", bot_id="bot-2"),
+    )
+    assert await blocklist_transfer.import_blocklist(source) == 3
+
+    exported = tmp_path / "out" / f"blocklist{suffix}"
+    assert await blocklist_transfer.export_blocklist(exported, bot_id="bot-1") == 2
+
+    requests = sorted(read_blocklist(exported), key=lambda request: request.user_id)
+    assert [request.user_id for request in requests] == ["1", "2"]
+    assert requests[0].reason == "spam"
+    assert requests[0].expires_at == EXPIRES_AT
+    assert requests[1].scope == "global"
+
+
+@pytest.mark.asyncio
+async def test_invalid_record_rolls_back_the_import(
+    tmp_path: Path,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    source = write_jsonl(tmp_path / "source.jsonl", record("1"), {"user_id": "2"})
+
+    with pytest.raises(BlocklistTransferError, match="line 2"):
+        await blocklist_transfer.import_blocklist(source)
+
+    async with session_factory() as session:
+        assert await blocklist_transfer.list_blocks(session) == []
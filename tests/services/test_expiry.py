@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    BlocklistEntry,
+    SubjectPolicyEntry,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.blocklist_index import (
+    IndexedBlock,
+    block_key,
+    probe_block,
+    replace_blocklist_index,
+    reset_blocklist_index,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories.expiry import note_expiry
+from src.plugins.nonebot_plugin_lingchu_bot.services import expiry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class FakeScheduler:
+    def __init__(self) -> None:
+        self.run_dates: list[datetime] = []
+        self.removed: list[str] = []
+
+    def add_job(self, _func: object, trigger: str, **kwargs: Any) -> None:
+        assert trigger == "date"
+        assert kwargs["id"] == expiry.EXPIRY_JOB_ID
+        self.run_dates.append(kwargs["run_date"])
+
+    def remove_job(self, job_id: str) -> None:
+        self.removed.append(job_id)
+
+
+@pytest.fixture
+def fake_scheduler(monkeypatch: pytest.MonkeyPatch) -> FakeScheduler:
+    fake = FakeScheduler()
+    monkeypatch.setattr(expiry, "scheduler", fake)
+    monkeypatch.setattr(expiry, "_state", expiry._ExpiryState())
+    return fake
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'expiry.db'}")
+    async with engine.begin() as connection:
+        for table in (BlocklistEntry.__table__, SubjectPolicyEntry.__table__):
+            await connection.execute(CreateTable(table))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(expiry, "get_session", factory)
+    try:
+        yield factory
+    finally:
+        reset_blocklist_index()
+        await engine.dispose()
+
+
+def block(user_id: int, expires_at: datetime | None) -> BlocklistEntry:
+    return BlocklistEntry(
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        protocol_id="unknown",
+        bot_id="bot-1",
+        scope="group",
+        scope_key="123",
+        group_id="123",
+        user_id=str(user_id),
+        expires_at=expires_at,
+    )
+
+
+def policy(user_id: int, expires_at: datetime | None) -> SubjectPolicyEntry:
+    return SubjectPolicyEntry(
+        policy_type="protected",
+        platform_id="qq",
+        adapter_id="~onebot.v11",
+        protocol_id="unknown",
+        bot_id="bot-1",
+        scope="global",
+        scope_key="*",
+        user_id=str(user_id),
+        expires_at=expires_at,
+    )
+
+
+async def remaining_users(
+    factory: async_sessionmaker[AsyncSession],
+    model: type[BlocklistEntry | SubjectPolicyEntry],
+) -> set[str]:
+    async with factory() as session:
+        return set(await session.scalars(select(model.user_id)))
+
+
+@pytest.mark.asyncio
+async def test_initialize_arms_the_earliest_future_deadline(
+    fake_scheduler: FakeScheduler,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(1, now + timedelta(hours=2)),
+            block(2, None),
+            block(3, now - timedelta(hours=1)),
+            policy(4, now + timedelta(hours=1)),
+        ])
+
+    await expiry.initialize_expiry_service()
+
+    assert len(expiry._state.deadlines) == 2
+    assert fake_scheduler.run_dates == [min(expiry._state.deadlines)]
+    assert fake_scheduler.run_dates[0] > now
+
+
+@pytest.mark.asyncio
+async def test_only_earlier_deadlines_rearm_the_job(
+    fake_scheduler: FakeScheduler,
+) -> None:
+    expiry._state.running = True
+
+    expiry.schedule_expiry(NOW + timedelta(minutes=10))
+    expiry.schedule_expiry(NOW + timedelta(minutes=20))
+    expiry.schedule_expiry(NOW + timedelta(minutes=5))
+
+    assert fake_scheduler.run_dates == [
+        NOW + timedelta(minutes=10),
+        NOW + timedelta(minutes=5),
+    ]
+
+
+def test_deadlines_are_ignored_until_the_service_runs(
+    fake_scheduler: FakeScheduler,
+) -> None:
+    expiry.schedule_expiry(NOW)
+
+    assert expiry._state.deadlines == []
+    assert fake_scheduler.run_dates == []
+
+
+@pytest.mark.asyncio
+async def test_committed_deadlines_are_scheduled_and_rolled_back_ones_dropped(
+    fake_scheduler: FakeScheduler,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    expiry._state.running = True
+
+    async with session_factory() as session:
+        await session.begin()
+        note_expiry(session, NOW + timedelta(minutes=1))
+        await session.rollback()
+    async with session_factory() as session, session.begin():
+        note_expiry(session, NOW + timedelta(minutes=2))
+        note_expiry(session, None)
+
+    assert fake_scheduler.run_dates == [NOW + timedelta(minutes=2)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fake_scheduler")
+async def test_reap_deletes_due_rows_and_publishes_their_keys(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(1, now - timedelta(seconds=1)),
+            block(2, now + timedelta(hours=1)),
+            block(3, None),
+            policy(4, now - timedelta(seconds=1)),
+            policy(5, now + timedelta(hours=1)),
+        ])
+    expired_key = block_key("qq", "~onebot.v11", "bot-1", "123", 1)
+    replace_blocklist_index([
+        (expired_key, IndexedBlock("unknown", now - timedelta(seconds=1)))
+    ])
+    events: list[expiry.ExpiryEvent] = []
+    expiry.add_expiry_listener(events.append)
+
+    reaped = await expiry.reap_expired(now)
+
+    assert reaped.blocks == (expired_key,)
+    assert reaped.subject_policies == 1
+    assert events == [reaped]
+    assert expiry._state.watermark == now
+    assert probe_block(expired_key) is None
+    assert await remaining_users(session_factory, BlocklistEntry) == {"2", "3"}
+    assert await remaining_users(session_factory, SubjectPolicyEntry) == {"5"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fake_scheduler")
+async def test_reap_only_scans_past_the_watermark(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    now = datetime.now(UTC)
+    await expiry.reap_expired(now)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(1, now - timedelta(seconds=1)),
+            block(2, now + timedelta(seconds=1)),
+        ])
+
+    reaped = await expiry.reap_expired(now + timedelta(seconds=2))
+
+    assert len(reaped.blocks) == 1
+    assert await remaining_users(session_factory, BlocklistEntry) == {"1"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fake_scheduler")
+async def test_reap_deletes_in_bounded_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session, session.begin():
+        session.add_all([
+            block(user_id, now - timedelta(seconds=user_id)) for user_id in range(5)
+        ])
+    reap_expired_entries = expiry.reap_expired_entries
+    chunks: list[int] = []
+
+    async def spy(*args: Any, **kwargs: Any) -> list[BlocklistEntry]:
+        chunk = await reap_expired_entries(*args, **kwargs)
+        chunks.append(len(chunk))
+        return chunk
+
+    monkeypatch.setattr(expiry, "_REAP_BATCH_SIZE", 2)
+    monkeypatch.setattr(expiry, "reap_expired_entries", spy)
+
+    reaped = await expiry.reap_expired(now)
+
+    assert len(reaped.blocks) == 5
+    assert chunks == [2, 2, 1, 0]
+    assert await remaining_users(session_factory, BlocklistEntry) == set()
+
+
+@pytest.mark.asyncio
+async def test_fire_pops_due_deadlines_and_arms_the_next(
+    fake_scheduler: FakeScheduler,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = datetime.now(UTC)
+    reap = AsyncMock()
+    monkeypatch.setattr(expiry, "reap_expired", reap)
+    expiry._state.running = True
+    expiry._state.deadlines = [now - timedelta(seconds=1), now + timedelta(hours=1)]
+
+    await expiry._fire()
+
+    reap.assert_awaited_once()
+    assert expiry._state.deadlines == [now + timedelta(hours=1)]
+    assert fake_scheduler.run_dates == [now + timedelta(hours=1)]
+
+
+@pytest.mark.asyncio
+async def test_fire_retries_after_a_database_error(
+    fake_scheduler: FakeScheduler,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        expiry, "reap_expired", AsyncMock(side_effect=expiry.DatabaseError("boom"))
+    )
+    expiry._state.running = True
+    expiry._state.deadlines = [datetime.now(UTC) - timedelta(seconds=1)]
+
+    await expiry._fire()
+
+    assert len(fake_scheduler.run_dates) == 1
+    assert fake_scheduler.run_dates[0] > datetime.now(UTC)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_disarms_the_job(fake_scheduler: FakeScheduler) -> None:
+    expiry._state.running = True
+    expiry.schedule_expiry(NOW)
+
+    await expiry.shutdown_expiry_service()
+    expiry.schedule_expiry(NOW)
+
+    assert fake_scheduler.removed == [expiry.EXPIRY_JOB_ID]
+    assert expiry._state.deadlines == []
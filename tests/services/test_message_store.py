@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import replace
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -10,6 +12,9 @@ from src.plugins.nonebot_plugin_lingchu_bot.database.orm_crud import DatabaseErr
 from src.plugins.nonebot_plugin_lingchu_bot.hooks import adapters
 from src.plugins.nonebot_plugin_lingchu_bot.hooks.adapters import MessageIdentity
 from src.plugins.nonebot_plugin_lingchu_bot.services import message_store
+from src.plugins.nonebot_plugin_lingchu_bot.services.retention import (
+    RetentionProgress,
+)
 
 
 class _FakeSessionContext:
@@ -59,6 +64,14 @@ def enabled_config() -> SimpleNamespace:
         message_store_summary_limit=10,
         message_store_record_api_calls=True,
         message_store_cleanup_enabled=True,
+        message_store_cleanup_batch_size=500,
+        message_store_cleanup_pause_ms=20,
+        message_store_cleanup_incremental_vacuum=False,
+        message_store_write_batch_size=2,
+        message_store_write_interval_ms=10,
+        message_store_write_queue_limit=3,
+        message_store_raw_payload_sample_percent=100,
+        message_store_partition_period="none",
     )
 
 
@@ -72,6 +85,14 @@ def patched_runtime_config(
     return enabled_config
 
 
+@pytest.fixture(autouse=True)
+def fresh_event_queue(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Give each test an empty write-behind queue."""
+    queue = message_store._EventWriteQueue()
+    monkeypatch.setattr(message_store, "_event_queue", queue)
+    return queue
+
+
 @pytest.fixture(autouse=True)
 def patched_session(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     """Patch ``get_session`` in ``message_store`` to yield a mock session."""
@@ -84,169 +105,367 @@ def patched_session(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     return session
 
 
-async def test_handle_event_received_records_event(
+async def test_enqueue_event_received_batches_events_into_one_flush(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    patched_session: MagicMock,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
+    record_events = AsyncMock(return_value=1)
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
     normalized = adapters.normalize_message_event(make_bot(), make_event())
     assert normalized is not None
 
-    await message_store.handle_event_received(normalized)
+    assert message_store.enqueue_event_received(normalized) is True
+    assert message_store.get_event_queue_stats().depth == 1
+    written = await message_store.flush_event_queue()
+
+    assert written == 1
+    record_events.assert_awaited_once()
+    assert record_events.await_args is not None
+    assert record_events.await_args.args[0] is patched_session
+    (write,) = record_events.await_args.args[1]
+    assert write.platform_id == "qq"
+    assert write.adapter_id == "~onebot.v11"
+    assert write.protocol_id == "default"
+    assert write.bot_id == "bot-1"
+    assert write.conversation_id == "group:group-1"
+    assert write.message_id == "msg-1"
+    assert write.event_type == "message.group"
+    assert write.event_category == "message"
+    patched_session.commit.assert_awaited_once()
+    stats = message_store.get_event_queue_stats()
+    assert stats.depth == 0
+    assert stats.written == 1
+    assert stats.flushes == 1
+
+
+async def test_flush_event_queue_serializes_deferred_raw_payloads(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+) -> None:
+    _ = patched_runtime_config
+    record_events = AsyncMock(side_effect=lambda _session, events: len(events))
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
+    loader = MagicMock(return_value=('"hello"', '{"id": 1}'))
+    failing = MagicMock(side_effect=TypeError("boom"))
+    for message_id, raw_payload_loader in (("msg-1", loader), ("msg-2", failing)):
+        normalized = adapters.normalize_message_event(
+            make_bot(), make_event(message_id=message_id), defer_raw_payloads=True
+        )
+        assert normalized is not None
+        assert normalized.raw_event is None
+        message_store.enqueue_event_received(
+            replace(normalized, raw_payload_loader=raw_payload_loader)
+        )
+    loader.assert_not_called()
+
+    await message_store.flush_event_queue()
+
+    loader.assert_called_once_with()
+    assert record_events.await_args is not None
+    written, unserialized = record_events.await_args.args[1]
+    assert written.raw_message == '"hello"'
+    assert written.raw_event == '{"id": 1}'
+    assert unserialized.raw_event is None
+
+
+async def test_flush_event_queue_chunks_by_batch_size(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+    patched_session: MagicMock,
+) -> None:
+    patched_runtime_config.message_store_write_queue_limit = 10
+    record_events = AsyncMock(side_effect=lambda _session, events: len(events))
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
+    for index in range(5):
+        normalized = adapters.normalize_message_event(
+            make_bot(), make_event(message_id=f"msg-{index}")
+        )
+        assert normalized is not None
+        message_store.enqueue_event_received(normalized)
+
+    written = await message_store.flush_event_queue()
 
-    record_event.assert_awaited_once()
-    assert record_event.await_args is not None
-    record_kwargs = record_event.await_args.kwargs
-    assert record_kwargs["platform_id"] == "qq"
-    assert record_kwargs["adapter_id"] == "~onebot.v11"
-    assert record_kwargs["protocol_id"] == "default"
-    assert record_kwargs["bot_id"] == "bot-1"
-    assert record_kwargs["conversation_id"] == "group:group-1"
-    assert record_kwargs["message_id"] == "msg-1"
-    assert record_kwargs["event_type"] == "message.group"
-    assert record_kwargs["event_category"] == "message"
+    assert written == 5
+    assert [len(call.args[1]) for call in record_events.await_args_list] == [2, 2, 1]
+    patched_session.commit.assert_awaited_once()
 
 
-async def test_handle_event_received_skips_when_disabled(
+async def test_flush_event_queue_returns_zero_when_empty(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
+    record_events = AsyncMock()
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
+
+    assert await message_store.flush_event_queue() == 0
+    record_events.assert_not_awaited()
+
+
+async def test_enqueue_event_received_skips_when_disabled(
+    patched_runtime_config: SimpleNamespace,
+) -> None:
     patched_runtime_config.message_store_enabled = False
-    record_event = AsyncMock()
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
     normalized = adapters.normalize_message_event(make_bot(), make_event())
     assert normalized is not None
 
-    await message_store.handle_event_received(normalized)
+    assert message_store.enqueue_event_received(normalized) is False
+    assert message_store.get_event_queue_stats().depth == 0
+
+
+async def test_enqueue_event_received_drops_when_queue_is_full(
+    patched_runtime_config: SimpleNamespace,
+    fresh_event_queue: Any,
+) -> None:
+    _ = patched_runtime_config
+    fresh_event_queue.closed = True
+    normalized = adapters.normalize_message_event(make_bot(), make_event())
+    assert normalized is not None
+
+    accepted = [message_store.enqueue_event_received(normalized) for _ in range(5)]
 
-    record_event.assert_not_awaited()
+    assert accepted == [True, True, True, False, False]
+    stats = message_store.get_event_queue_stats()
+    assert stats.depth == 3
+    assert stats.enqueued == 3
+    assert stats.dropped == 2
 
 
-async def test_handle_event_received_swallows_database_errors(
+async def test_flush_event_queue_counts_failed_batches(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_event = AsyncMock(side_effect=DatabaseError("boom"))
-    monkeypatch.setattr(message_store.repository, "record_event_received", record_event)
+    record_events = AsyncMock(side_effect=DatabaseError("boom"))
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", record_events
+    )
     normalized = adapters.normalize_message_event(make_bot(), make_event())
     assert normalized is not None
+    message_store.enqueue_event_received(normalized)
 
-    await message_store.handle_event_received(normalized)
+    assert await message_store.flush_event_queue() == 0
 
-    record_event.assert_awaited_once()
+    stats = message_store.get_event_queue_stats()
+    assert stats.failed_flushes == 1
+    assert stats.dropped == 1
+    assert stats.depth == 0
 
 
-async def test_handle_matcher_result_records_handled(
+async def test_event_writer_flushes_after_interval(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(return_value=True)
+    flushed = asyncio.Event()
+
+    async def _record(_session: Any, events: list[Any]) -> int:
+        flushed.set()
+        return len(events)
+
+    monkeypatch.setattr(message_store.repository, "record_events_received", _record)
+    normalized = adapters.normalize_message_event(make_bot(), make_event())
+    assert normalized is not None
+
+    message_store.enqueue_event_received(normalized)
+    await asyncio.wait_for(flushed.wait(), timeout=1)
+    await message_store.stop_event_writer()
+
+    stats = message_store.get_event_queue_stats()
+    assert stats.written == 1
+    assert stats.depth == 0
+
+
+async def test_stop_event_writer_drains_pending_events(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+) -> None:
+    patched_runtime_config.message_store_write_interval_ms = 60_000
+    record_events = AsyncMock(side_effect=lambda _session, events: len(events))
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
+        message_store.repository, "record_events_received", record_events
     )
-    identity = MessageIdentity(
+    normalized = adapters.normalize_message_event(make_bot(), make_event())
+    assert normalized is not None
+    message_store.enqueue_event_received(normalized)
+
+    await message_store.stop_event_writer()
+
+    record_events.assert_awaited_once()
+    assert message_store.get_event_queue_stats().depth == 0
+
+
+def make_identity(message_id: str | None = "msg-1") -> MessageIdentity:
+    return MessageIdentity(
         platform_id="qq",
         adapter_id="~onebot.v11",
         protocol_id="default",
         framework_id="nonebot",
         bot_id="bot-1",
         conversation_id="group-1",
-        message_id="msg-1",
+        message_id=message_id,
+    )
+
+
+async def test_handle_matcher_result_queues_batched_update(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+    patched_session: MagicMock,
+    fresh_event_queue: Any,
+) -> None:
+    _ = patched_runtime_config
+    fresh_event_queue.closed = True
+    record_results = AsyncMock(return_value=1)
+    monkeypatch.setattr(
+        message_store.repository, "record_matcher_results", record_results
     )
     matcher = MagicMock()
     matcher.block = False
 
-    result = await message_store.handle_matcher_result(identity, matcher, None)
+    result = message_store.handle_matcher_result(make_identity(), matcher, None)
+    flushed = await message_store.flush_event_queue()
 
     assert result is True
-    record_result.assert_awaited_once()
-    assert record_result.await_args is not None
-    record_kwargs = record_result.await_args.kwargs
-    assert record_kwargs["process_status"] == "handled"
-    assert record_kwargs["adapter_id"] == "~onebot.v11"
-
-
-async def test_handle_matcher_result_records_blocked_and_failed(
+    assert flushed == 1
+    record_results.assert_awaited_once()
+    assert record_results.await_args is not None
+    assert record_results.await_args.args[0] is patched_session
+    (write,) = record_results.await_args.args[1]
+    assert write.process_status == "handled"
+    assert write.adapter_id == "~onebot.v11"
+    assert write.protocol_id == "default"
+    assert write.exception_summary is None
+    patched_session.commit.assert_awaited_once()
+
+
+async def test_handle_matcher_result_merges_into_pending_insert(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    fresh_event_queue: Any,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(return_value=True)
+    fresh_event_queue.closed = True
+    record_events = AsyncMock(side_effect=lambda _session, events: len(events))
+    record_results = AsyncMock()
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
+        message_store.repository, "record_events_received", record_events
     )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
+    monkeypatch.setattr(
+        message_store.repository, "record_matcher_results", record_results
     )
+    normalized = adapters.normalize_message_event(make_bot(), make_event())
+    assert normalized is not None
+    message_store.enqueue_event_received(normalized)
     matcher = MagicMock()
-    matcher.block = True
+    matcher.block = False
 
-    await message_store.handle_matcher_result(identity, matcher, ValueError("oops"))
+    result = message_store.handle_matcher_result(normalized.identity, matcher, None)
+    await message_store.flush_event_queue()
 
-    assert record_result.await_args is not None
-    assert record_result.await_args.kwargs["process_status"] == "failed:blocked"
+    assert result is True
+    record_results.assert_not_awaited()
+    assert record_events.await_args is not None
+    (write,) = record_events.await_args.args[1]
+    assert write.process_status == "handled"
+    stats = message_store.get_event_queue_stats()
+    assert stats.coalesced == 1
+    assert stats.written == 1
 
 
-async def test_handle_matcher_result_skips_when_disabled(
+async def test_handle_matcher_result_keeps_last_status_per_identity(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    fresh_event_queue: Any,
 ) -> None:
     _ = patched_runtime_config
-    patched_runtime_config.message_store_enabled = False
-    record_result = AsyncMock()
+    fresh_event_queue.closed = True
+    record_results = AsyncMock(return_value=1)
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
+        message_store.repository, "record_matcher_results", record_results
     )
+    matcher = MagicMock()
+    matcher.block = False
+
+    message_store.handle_matcher_result(make_identity(), matcher, None)
+    message_store.handle_matcher_result(make_identity(), matcher, ValueError("x"))
+    message_store.handle_matcher_result(make_identity("msg-2"), matcher, None)
+    await message_store.flush_event_queue()
+
+    assert record_results.await_args is not None
+    writes = record_results.await_args.args[1]
+    assert [(w.message_id, w.process_status) for w in writes] == [
+        ("msg-1", "failed"),
+        ("msg-2", "handled"),
+    ]
+
+
+async def test_handle_matcher_result_records_blocked_and_failed(
+    patched_runtime_config: SimpleNamespace,
+    fresh_event_queue: Any,
+) -> None:
+    _ = patched_runtime_config
+    fresh_event_queue.closed = True
+    matcher = MagicMock()
+    matcher.block = True
+
+    message_store.handle_matcher_result(make_identity(), matcher, ValueError("oops"))
 
-    result = await message_store.handle_matcher_result(identity, MagicMock(), None)
+    (write,) = fresh_event_queue.status_updates.values()
+    assert write.process_status == "failed:blocked"
+    assert write.exception_summary == "oops"
+
+
+async def test_handle_matcher_result_skips_when_disabled(
+    patched_runtime_config: SimpleNamespace,
+) -> None:
+    patched_runtime_config.message_store_enabled = False
+
+    result = message_store.handle_matcher_result(make_identity(), MagicMock(), None)
+
+    assert result is False
+    assert message_store.get_event_queue_stats().depth == 0
+
+
+async def test_handle_matcher_result_skips_without_message_id(
+    patched_runtime_config: SimpleNamespace,
+) -> None:
+    _ = patched_runtime_config
+
+    result = message_store.handle_matcher_result(make_identity(None), MagicMock(), None)
 
     assert result is False
-    record_result.assert_not_awaited()
+    assert message_store.get_event_queue_stats().depth == 0
 
 
-async def test_handle_matcher_result_swallows_database_errors(
+async def test_flush_event_queue_counts_failed_status_updates(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    fresh_event_queue: Any,
 ) -> None:
     _ = patched_runtime_config
-    record_result = AsyncMock(side_effect=DatabaseError("boom"))
+    fresh_event_queue.closed = True
+    record_results = AsyncMock(side_effect=DatabaseError("boom"))
     monkeypatch.setattr(
-        message_store.repository, "record_matcher_result", record_result
-    )
-    identity = MessageIdentity(
-        platform_id="qq",
-        adapter_id="~onebot.v11",
-        protocol_id="default",
-        framework_id="nonebot",
-        bot_id="bot-1",
-        conversation_id="group-1",
-        message_id="msg-1",
+        message_store.repository, "record_matcher_results", record_results
     )
 
-    result = await message_store.handle_matcher_result(identity, MagicMock(), None)
+    message_store.handle_matcher_result(make_identity(), MagicMock(), None)
 
-    assert result is False
-    record_result.assert_awaited_once()
+    assert await message_store.flush_event_queue() == 0
+    record_results.assert_awaited_once()
+    stats = message_store.get_event_queue_stats()
+    assert stats.failed_flushes == 1
+    assert stats.dropped == 1
 
 
 async def test_handle_api_called_records_result(
@@ -450,12 +669,37 @@ async def test_initialize_message_store_logs_disabled_when_disabled(
     await message_store.initialize_message_store()
 
 
-async def test_initialize_message_store_logs_initialized_when_enabled(
+async def test_initialize_message_store_loads_time_buckets(
+    monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
+    patched_session: MagicMock,
 ) -> None:
-    _ = patched_runtime_config
+    patched_runtime_config.message_store_partition_period = "month"
+    configure = MagicMock()
+    load = AsyncMock(return_value=2)
+    monkeypatch.setattr(message_store, "configure_record_buckets", configure)
+    monkeypatch.setattr(message_store, "load_record_buckets", load)
+
+    await message_store.initialize_message_store()
+
+    configure.assert_called_once_with("month")
+    load.assert_awaited_once_with(patched_session)
+    patched_session.commit.assert_awaited_once()
+
+
+async def test_initialize_message_store_survives_bucket_load_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+    patched_session: MagicMock,
+) -> None:
+    _ = patched_runtime_config, patched_session
+    load = AsyncMock(side_effect=DatabaseError("boom"))
+    monkeypatch.setattr(message_store, "load_record_buckets", load)
+
     await message_store.initialize_message_store()
 
+    load.assert_awaited_once()
+
 
 async def test_shutdown_message_store_skips_when_disabled(
     monkeypatch: pytest.MonkeyPatch,
@@ -480,7 +724,35 @@ async def test_shutdown_message_store_runs_cleanup_when_enabled(
 
     await message_store.shutdown_message_store()
 
-    cleanup_mock.assert_awaited_once()
+    cleanup_mock.assert_awaited_once_with(max_chunks=1)
+
+
+async def test_shutdown_message_store_drains_queue_before_cleanup(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_runtime_config: SimpleNamespace,
+) -> None:
+    _ = patched_runtime_config
+    call_order: list[str] = []
+
+    async def _record_events(_session: Any, events: list[Any]) -> int:
+        call_order.append("flush")
+        return len(events)
+
+    async def _cleanup(**_kwargs: Any) -> tuple[int, bool]:
+        call_order.append("cleanup")
+        return (0, True)
+
+    monkeypatch.setattr(
+        message_store.repository, "record_events_received", _record_events
+    )
+    monkeypatch.setattr(message_store, "cleanup_expired_messages", _cleanup)
+    normalized = adapters.normalize_message_event(make_bot(), make_event())
+    assert normalized is not None
+    message_store.enqueue_event_received(normalized)
+
+    await message_store.shutdown_message_store()
+
+    assert call_order == ["flush", "cleanup"]
 
 
 async def test_cleanup_expired_messages_skips_when_store_disabled(
@@ -499,23 +771,28 @@ async def test_cleanup_expired_messages_skips_when_cleanup_disabled(
     assert result == (0, True)
 
 
-async def test_cleanup_expired_messages_returns_count_when_successful(
+async def test_cleanup_expired_messages_sums_sweep_progress(
     monkeypatch: pytest.MonkeyPatch,
     patched_runtime_config: SimpleNamespace,
-    patched_session: MagicMock,
 ) -> None:
     _ = patched_runtime_config
-    cleanup_mock = AsyncMock(return_value=(7, True))
-    monkeypatch.setattr(
-        message_store.repository, "cleanup_expired_messages", cleanup_mock
+    sweep_mock = AsyncMock(
+        return_value=[
+            RetentionProgress("a", deleted=5, chunks=1, known=True, finished=True),
+            RetentionProgress("b", deleted=2, chunks=1, known=False, finished=False),
+        ]
     )
+    monkeypatch.setattr(message_store, "sweep_expired_records", sweep_mock)
 
-    result = await message_store.cleanup_expired_messages()
+    result = await message_store.cleanup_expired_messages(max_chunks=3)
 
-    assert result == (7, True)
-    cleanup_mock.assert_awaited_once_with(
-        patched_session,
+    assert result == (7, False)
+    sweep_mock.assert_awaited_once_with(
         retention_days=30,
+        batch_size=500,
+        pause_seconds=0.02,
+        max_chunks=3,
+        vacuum=False,
     )
 
 
@@ -525,9 +802,7 @@ async def test_cleanup_expired_messages_swallows_database_errors(
 ) -> None:
     _ = patched_runtime_config
     cleanup_mock = AsyncMock(side_effect=DatabaseError("boom"))
-    monkeypatch.setattr(
-        message_store.repository, "cleanup_expired_messages", cleanup_mock
-    )
+    monkeypatch.setattr(message_store, "sweep_expired_records", cleanup_mock)
 
     result = await message_store.cleanup_expired_messages()
 
@@ -366,11 +366,17 @@ async def test_record_bot_connected_schedules_restart_feedback(
     async def _send_pending_restart_feedback(_bot: Any) -> bool:
         return True
 
-    def _fire_and_forget(
-        coro: Coroutine[Any, Any, Any], *, name: str = "fire_and_forget"
-    ) -> None:
+    def _submit_background(
+        lane: str,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        name: str,
+        key: str | None = None,
+    ) -> bool:
+        _ = (lane, key)
         scheduled.append((name, coro))
         coro.close()
+        return True
 
     monkeypatch.setattr(
         bot_connection_module, "record_bot_lifecycle", _record_bot_lifecycle
@@ -380,7 +386,7 @@ async def test_record_bot_connected_schedules_restart_feedback(
         "send_pending_restart_feedback",
         _send_pending_restart_feedback,
     )
-    monkeypatch.setattr(bot_connection_module, "fire_and_forget", _fire_and_forget)
+    monkeypatch.setattr(bot_connection_module, "submit_background", _submit_background)
 
     await bot_connection_module.on_bot_connect(MagicMock())
 
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import (
+    AuditRecord,
+    QQOneBotV11NoneBotAuditRecord,
+    RetentionWatermark,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.repositories import (
+    record_buckets,
+    retention as repository,
+)
+from src.plugins.nonebot_plugin_lingchu_bot.services import retention
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from pathlib import Path
+
+TABLE = str(AuditRecord.__tablename__)
+
+
+@pytest.fixture(autouse=True)
+def _reset_buckets() -> Iterator[None]:
+    yield
+    record_buckets.reset_record_buckets()
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retention.db'}")
+    async with engine.begin() as connection:
+        for model in (*repository.RETENTION_MODELS, RetentionWatermark):
+            await connection.execute(CreateTable(model.__table__))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(retention, "get_session", factory)
+    try:
+        yield factory
+    finally:
+        await engine.dispose()
+
+
+async def seed(
+    factory: async_sessionmaker[AsyncSession], *, expired: int, fresh: int = 0
+) -> None:
+    now = datetime.now(UTC)
+    ages = [timedelta(days=40)] * expired + [timedelta(0)] * fresh
+    async with factory() as session, session.begin():
+        session.add_all(
+            AuditRecord(
+                platform_id="qq",
+                adapter_id="~onebot.v11",
+                bot_id="bot-1",
+                audit_type="api",
+                event_type="send_msg",
+                created_at=now - age,
+            )
+            for age in ages
+        )
+
+
+async def remaining(factory: async_sessionmaker[AsyncSession]) -> int:
+    async with factory() as session:
+        return int(await session.scalar(select(func.count(AuditRecord.id))) or 0)
+
+
+async def watermark(factory: async_sessionmaker[AsyncSession]) -> int:
+    async with factory() as session:
+        return await repository.get_watermark(session, TABLE)
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_in_chunks_and_pauses_between_them(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await seed(session_factory, expired=5, fresh=1)
+    sleep = AsyncMock()
+    monkeypatch.setattr(retention.asyncio, "sleep", sleep)
+
+    progress = await retention.sweep_expired_records(
+        retention_days=30, batch_size=2, pause_seconds=0.05
+    )
+
+    audit = next(item for item in progress if item.table_name == TABLE)
+    assert audit == retention.RetentionProgress(
+        table_name=TABLE, deleted=5, chunks=3, known=True, finished=True
+    )
+    assert [item.deleted for item in progress if item is not audit] == [0, 0, 0]
+    assert sleep.await_count == 2
+    sleep.assert_awaited_with(0.05)
+    assert await remaining(session_factory) == 1
+    assert await watermark(session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_stopped_sweep_resumes_from_the_watermark(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await seed(session_factory, expired=5)
+
+    first = await retention.sweep_expired_rows(
+        AuditRecord,
+        datetime.now(UTC) - timedelta(days=30),
+        batch_size=2,
+        max_chunks=1,
+    )
+
+    assert (first.deleted, first.chunks, first.finished) == (2, 1, False)
+    assert await watermark(session_factory) == 2
+
+    scan = AsyncMock(wraps=repository.delete_expired_chunk)
+    monkeypatch.setattr(repository, "delete_expired_chunk", scan)
+    second = await retention.sweep_expired_rows(
+        AuditRecord,
+        datetime.now(UTC) - timedelta(days=30),
+        batch_size=2,
+    )
+
+    assert scan.await_args_list[0].kwargs["after_id"] == 2
+    assert (second.deleted, second.chunks, second.finished) == (3, 2, True)
+    assert await remaining(session_factory) == 0
+    assert await watermark(session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_stops_the_key_walk_at_the_last_expired_id(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await seed(session_factory, expired=2, fresh=3)
+    scan = AsyncMock(wraps=repository.delete_expired_chunk)
+    monkeypatch.setattr(repository, "delete_expired_chunk", scan)
+
+    progress = await retention.sweep_expired_rows(
+        AuditRecord, datetime.now(UTC) - timedelta(days=30), batch_size=2
+    )
+
+    assert (progress.deleted, progress.finished) == (2, True)
+    assert {call.kwargs["up_to_id"] for call in scan.await_args_list} == {2}
+    assert await remaining(session_factory) == 3
+
+
+@pytest.mark.asyncio
+async def test_zero_retention_keeps_every_row(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    await seed(session_factory, expired=1)
+
+    assert await retention.sweep_expired_records(retention_days=0, batch_size=10) == []
+    assert await remaining(session_factory) == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_runs_only_after_deletions(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    vacuum = AsyncMock(return_value=True)
+    monkeypatch.setattr(retention, "incremental_vacuum", vacuum)
+
+    await retention.sweep_expired_records(retention_days=30, batch_size=10, vacuum=True)
+    vacuum.assert_not_awaited()
+
+    await seed(session_factory, expired=1)
+    await retention.sweep_expired_records(retention_days=30, batch_size=10, vacuum=True)
+    vacuum.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_expired_buckets_are_dropped_and_the_straddling_one_swept(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    record_buckets.configure_record_buckets("week")
+    cutoff = datetime.now(UTC) - timedelta(days=30)
+    straddling_start, straddling_end = record_buckets.bucket_bounds(cutoff, "week")
+    async with session_factory() as session, session.begin():
+        for at in (
+            cutoff - timedelta(days=14),
+            straddling_start,
+            straddling_end - timedelta(seconds=1),
+            datetime.now(UTC),
+        ):
+            bucket = await record_buckets.bucket_for_write(
+                session, QQOneBotV11NoneBotAuditRecord, at
+            )
+            session.add(
+                bucket(
+                    platform_id="qq",
+                    adapter_id="~onebot.v11",
+                    bot_id="bot-1",
+                    audit_type="api",
+                    event_type="send_msg",
+                    created_at=at,
+                )
+            )
+    expired, straddling, fresh = sorted(
+        record_buckets.known_buckets(QQOneBotV11NoneBotAuditRecord),
+        key=lambda bucket: bucket.starts_at,
+    )
+    # Mirror a sweep of the dropped bucket that was interrupted earlier.
+    async with session_factory() as session, session.begin():
+        await repository.save_watermark(session, expired.table_name, 7)
+
+    progress = await retention.sweep_expired_records(retention_days=30, batch_size=10)
+
+    by_table = {item.table_name: item for item in progress}
+    assert by_table[expired.table_name].dropped is True
+    assert by_table[straddling.table_name].deleted == 1
+    assert fresh.table_name not in by_table
+    assert record_buckets.known_buckets(QQOneBotV11NoneBotAuditRecord) == [
+        fresh,
+        straddling,
+    ]
+    async with session_factory() as session:
+        assert await repository.get_watermark(session, expired.table_name) == 0
+        assert (await session.scalar(select(func.count(straddling.model.id)))) == 1
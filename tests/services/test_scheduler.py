@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 import logging
 from types import SimpleNamespace
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, MagicMock
 
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+)
 from apscheduler.jobstores.base import JobLookupError
 import pytest
 
 from src.plugins.nonebot_plugin_lingchu_bot.services import (
     scheduler as scheduler_service,
+    scheduler_history,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class _FakeSessionContext:
     """Async context manager that yields a fixed mock session."""
@@ -32,6 +43,13 @@ class FakeScheduler:
         self.removed: list[str] = []
         self.missing_jobs: set[str] = set()
         self.remove_errors: dict[str, Exception] = {}
+        self.listeners: list[tuple[Any, int]] = []
+
+    def add_listener(self, callback: Any, mask: int) -> None:
+        self.listeners.append((callback, mask))
+
+    def remove_listener(self, callback: Any) -> None:
+        self.listeners = [item for item in self.listeners if item[0] is not callback]
 
     def add_job(self, func: Any, trigger: str, **kwargs: Any) -> None:
         self.added.append({"func": func, "trigger": trigger, **kwargs})
@@ -44,6 +62,9 @@ class FakeScheduler:
         self.removed.append(job_id)
 
 
+UPDATED_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
 def make_job(**overrides: Any) -> SimpleNamespace:
     values: dict[str, Any] = {
         "job_id": "cleanup",
@@ -53,6 +74,7 @@ def make_job(**overrides: Any) -> SimpleNamespace:
         "coalesce": True,
         "max_instances": 1,
         "misfire_grace_time": None,
+        "updated_at": UPDATED_AT,
     }
     values.update(overrides)
     return SimpleNamespace(**values)
@@ -64,19 +86,33 @@ def clear_registry() -> None:
 
 
 @pytest.fixture(autouse=True)
-def clear_runtime_jobs() -> None:
+def clear_runtime_jobs() -> Iterator[None]:
+    scheduler_service._runtime_job_ids.clear()
+    scheduler_service.invalidate_job_spec()
+    scheduler_history.clear_job_runs()
+    yield
     scheduler_service._runtime_job_ids.clear()
+    scheduler_service.invalidate_job_spec()
+    scheduler_history.clear_job_runs()
+
+
+@pytest.fixture(autouse=True)
+def save_job_run(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Keep run history writes off the database."""
+    save = AsyncMock()
+    monkeypatch.setattr(scheduler_history.repository, "save_job_run", save)
+    monkeypatch.setattr(
+        scheduler_history.repository, "delete_job_runs_before", AsyncMock()
+    )
+    return save
 
 
 @pytest.fixture(autouse=True)
 def patched_session(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     """Patch ``get_session`` in ``scheduler_service`` to yield a mock session."""
     session = MagicMock(name="async_session")
-    monkeypatch.setattr(
-        scheduler_service,
-        "get_session",
-        lambda: _FakeSessionContext(session),
-    )
+    for module in (scheduler_service, scheduler_history):
+        monkeypatch.setattr(module, "get_session", lambda: _FakeSessionContext(session))
     monkeypatch.setattr(
         scheduler_service.repository,
         "get_job_spec",
@@ -256,21 +292,32 @@ async def test_initialize_scheduler_service_persists_builtin_blocklist_cleanup_j
     )
 
 
-async def test_builtin_blocklist_cleanup_handler_uses_session_first_repository(
+async def test_builtin_blocklist_cleanup_handler_reaps_since_watermark(
     monkeypatch: pytest.MonkeyPatch,
-    patched_session: MagicMock,
 ) -> None:
-    cleanup = AsyncMock(return_value=(4, True))
-    monkeypatch.setattr(
-        scheduler_service.blocklist_repository,
-        "cleanup_expired_blocks",
-        cleanup,
+    reap = AsyncMock(
+        return_value=SimpleNamespace(
+            blocks=(("qq",) * 5, ("qq",) * 5), subject_policies=2
+        )
     )
+    monkeypatch.setattr(scheduler_service, "reap_expired", reap)
 
     result = await scheduler_service._cleanup_expired_blocks_job()
 
     assert result == (4, True)
-    cleanup.assert_awaited_once_with(patched_session)
+    reap.assert_awaited_once_with()
+
+
+async def test_builtin_blocklist_cleanup_handler_reports_database_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        scheduler_service,
+        "reap_expired",
+        AsyncMock(side_effect=scheduler_service.DatabaseError("boom")),
+    )
+
+    assert await scheduler_service._cleanup_expired_blocks_job() == (0, False)
 
 
 async def test_initialize_scheduler_service_logs_and_returns_on_database_error(
@@ -497,3 +544,222 @@ async def test_shutdown_scheduler_service_removes_runtime_jobs_without_deleting_
     }
     assert scheduler_service._runtime_job_ids == set()
     assert scheduler_service._handlers == {}
+
+
+async def _initialize_with_cached_job(
+    monkeypatch: pytest.MonkeyPatch,
+    handler: Any,
+) -> MagicMock:
+    monkeypatch.setattr(scheduler_service, "scheduler", FakeScheduler())
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "list_enabled_job_specs",
+        AsyncMock(return_value=[make_job()]),
+    )
+    decode_job_payload = MagicMock(return_value=({"minutes": 5}, ["a"], {"b": 1}))
+    monkeypatch.setattr(
+        scheduler_service.repository, "decode_job_payload", decode_job_payload
+    )
+    scheduler_service.register_scheduler_handler("cleanup", handler)
+    await scheduler_service.initialize_scheduler_service()
+    decode_job_payload.reset_mock()
+    return decode_job_payload
+
+
+async def test_execute_persistent_job_uses_cached_spec_without_database(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    handler = AsyncMock()
+    decode_job_payload = await _initialize_with_cached_job(monkeypatch, handler)
+    get_job_spec = AsyncMock()
+    monkeypatch.setattr(scheduler_service.repository, "get_job_spec", get_job_spec)
+
+    await scheduler_service.execute_persistent_job("cleanup")
+    await scheduler_service.execute_persistent_job("cleanup")
+
+    assert handler.await_count == 2
+    handler.assert_awaited_with("a", b=1)
+    get_job_spec.assert_not_awaited()
+    decode_job_payload.assert_not_called()
+
+
+async def test_register_persistent_job_caches_and_remove_invalidates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(scheduler_service, "scheduler", FakeScheduler())
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "save_job_spec",
+        AsyncMock(return_value=make_job()),
+    )
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "delete_job_spec",
+        AsyncMock(return_value=(1, True)),
+    )
+    scheduler_service.register_scheduler_handler("cleanup", AsyncMock())
+
+    await scheduler_service.register_persistent_job(
+        job_id="cleanup",
+        handler_key="cleanup",
+        trigger_type="interval",
+        trigger_kwargs={"minutes": 5},
+        args=["a"],
+    )
+    assert scheduler_service._job_specs["cleanup"].args == ("a",)
+
+    await scheduler_service.remove_persistent_job("cleanup")
+    assert "cleanup" not in scheduler_service._job_specs
+
+
+async def test_register_persistent_job_caches_only_committed_copies(
+    monkeypatch: pytest.MonkeyPatch,
+    patched_session: MagicMock,
+) -> None:
+    monkeypatch.setattr(scheduler_service, "scheduler", FakeScheduler())
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "save_job_spec",
+        AsyncMock(return_value=make_job()),
+    )
+    scheduler_service.register_scheduler_handler("cleanup", AsyncMock())
+    kwargs: dict[str, Any] = {"targets": ["a"]}
+    transaction = patched_session.begin.return_value
+    transaction.__aexit__.side_effect = scheduler_service.DatabaseError("commit failed")
+
+    with pytest.raises(scheduler_service.DatabaseError):
+        await scheduler_service.register_persistent_job(
+            job_id="cleanup",
+            handler_key="cleanup",
+            trigger_type="interval",
+            trigger_kwargs={"minutes": 5},
+            kwargs=kwargs,
+        )
+    assert "cleanup" not in scheduler_service._job_specs
+
+    transaction.__aexit__.side_effect = None
+    transaction.__aexit__.return_value = None
+    await scheduler_service.register_persistent_job(
+        job_id="cleanup",
+        handler_key="cleanup",
+        trigger_type="interval",
+        trigger_kwargs={"minutes": 5},
+        kwargs=kwargs,
+    )
+    kwargs["targets"].append("b")
+
+    assert scheduler_service._job_specs["cleanup"].kwargs == {"targets": ["a"]}
+
+
+@pytest.mark.parametrize(
+    ("updated_at", "decodes"),
+    [(UPDATED_AT, 0), (UPDATED_AT + timedelta(seconds=1), 1)],
+)
+async def test_version_check_redecodes_only_out_of_band_edits(
+    monkeypatch: pytest.MonkeyPatch,
+    updated_at: datetime,
+    decodes: int,
+) -> None:
+    handler = AsyncMock()
+    decode_job_payload = await _initialize_with_cached_job(monkeypatch, handler)
+    monkeypatch.setattr(
+        scheduler_service,
+        "plugin_config",
+        SimpleNamespace(scheduler_verify_job_version=True),
+    )
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "get_job_spec",
+        AsyncMock(return_value=make_job(updated_at=updated_at.replace(tzinfo=None))),
+    )
+
+    await scheduler_service.execute_persistent_job("cleanup")
+
+    assert decode_job_payload.call_count == decodes
+    handler.assert_awaited_once_with("a", b=1)
+    assert scheduler_service._job_specs["cleanup"].version == updated_at
+
+
+async def test_version_check_drops_disabled_jobs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    handler = AsyncMock()
+    await _initialize_with_cached_job(monkeypatch, handler)
+    monkeypatch.setattr(
+        scheduler_service,
+        "plugin_config",
+        SimpleNamespace(scheduler_verify_job_version=True),
+    )
+    monkeypatch.setattr(
+        scheduler_service.repository,
+        "get_job_spec",
+        AsyncMock(return_value=make_job(enabled=False)),
+    )
+
+    await scheduler_service.execute_persistent_job("cleanup")
+
+    handler.assert_not_awaited()
+    assert "cleanup" not in scheduler_service._job_specs
+
+
+async def test_execute_persistent_job_records_result_and_duration(
+    monkeypatch: pytest.MonkeyPatch,
+    save_job_run: AsyncMock,
+) -> None:
+    await _initialize_with_cached_job(monkeypatch, AsyncMock(return_value=(3, True)))
+
+    await scheduler_service.execute_persistent_job("cleanup")
+
+    [run] = scheduler_history.recent_job_runs("cleanup")
+    assert run.result == (3, True)
+    assert run.exception is None
+    assert run.duration_ms is not None
+    assert run.duration_ms >= 0
+    assert run.finished_at >= run.started_at
+    assert save_job_run.await_args is not None
+    assert save_job_run.await_args.kwargs["result"] == (3, True)
+
+
+async def test_execute_persistent_job_records_and_reraises_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _initialize_with_cached_job(
+        monkeypatch, AsyncMock(side_effect=RuntimeError("boom"))
+    )
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await scheduler_service.execute_persistent_job("cleanup")
+
+    [run] = scheduler_history.recent_job_runs()
+    assert run.exception == "RuntimeError: boom"
+    assert scheduler_history.job_run_stats()[0].failures == 1
+
+
+async def test_missed_and_overlapping_runs_are_recorded(
+    monkeypatch: pytest.MonkeyPatch,
+    save_job_run: AsyncMock,
+) -> None:
+    await _initialize_with_cached_job(monkeypatch, AsyncMock())
+    fake_scheduler = scheduler_service.scheduler
+    assert isinstance(fake_scheduler, FakeScheduler)
+    [(listener, mask)] = fake_scheduler.listeners
+    assert mask == EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+    run_time = datetime(2026, 1, 1, 8, tzinfo=UTC)
+
+    listener(JobExecutionEvent(EVENT_JOB_MISSED, "cleanup", "default", run_time))
+    listener(
+        JobSubmissionEvent(EVENT_JOB_MAX_INSTANCES, "cleanup", "default", [run_time])
+    )
+    listener(JobExecutionEvent(EVENT_JOB_MISSED, "foreign", "default", run_time))
+    await scheduler_service.shutdown_scheduler_service()
+
+    runs = scheduler_history.recent_job_runs()
+    assert [(run.misfired, run.skipped) for run in runs] == [
+        (True, False),
+        (False, True),
+    ]
+    assert {run.handler_key for run in runs} == {"cleanup"}
+    assert save_job_run.await_count == len(runs)
+    assert fake_scheduler.listeners == []
+    [stats] = scheduler_history.job_run_stats()
+    assert (stats.runs, stats.misfires, stats.skips, stats.p50_ms) == (0, 1, 1, None)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from src.plugins.nonebot_plugin_lingchu_bot.database.models import ScheduledJobRun
+from src.plugins.nonebot_plugin_lingchu_bot.services import scheduler_history
+from src.plugins.nonebot_plugin_lingchu_bot.services.scheduler_history import (
+    JobRun,
+    percentile,
+    summarize_job_runs,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from pathlib import Path
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _clear_runs() -> Iterator[None]:
+    scheduler_history.clear_job_runs()
+    yield
+    scheduler_history.clear_job_runs()
+
+
+@pytest.fixture
+async def session_factory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'runs.db'}")
+    async with engine.begin() as connection:
+        await connection.execute(CreateTable(ScheduledJobRun.__table__))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(scheduler_history, "get_session", factory)
+    try:
+        yield factory
+    finally:
+        await engine.dispose()
+
+
+def run(
+    handler_key: str,
+    duration_ms: float | None,
+    *,
+    started_at: datetime = NOW,
+    misfired: bool = False,
+    skipped: bool = False,
+) -> JobRun:
+    return JobRun(
+        job_id=handler_key,
+        handler_key=handler_key,
+        started_at=started_at,
+        finished_at=started_at,
+        duration_ms=duration_ms,
+        misfired=misfired,
+        skipped=skipped,
+    )
+
+
+def test_percentile_uses_the_nearest_rank() -> None:
+    durations = [float(value) for value in range(1, 21)]
+
+    assert percentile(durations, 0.5) == 10.0
+    assert percentile(durations, 0.95) == 19.0
+    assert percentile([7.0], 0.95) == 7.0
+    assert percentile([], 0.5) is None
+
+
+def test_summary_groups_by_handler_and_counts_unstarted_runs() -> None:
+    later = NOW + timedelta(minutes=5)
+    stats = summarize_job_runs([
+        run("b", 30.0),
+        run("a", 10.0),
+        run("a", 20.0, started_at=later),
+        run("a", None, misfired=True),
+        run("a", None, skipped=True),
+    ])
+
+    assert [item.handler_key for item in stats] == ["a", "b"]
+    assert (stats[0].runs, stats[0].misfires, stats[0].skips) == (2, 1, 1)
+    assert (stats[0].p50_ms, stats[0].p95_ms) == (10.0, 20.0)
+    assert stats[0].last_started_at == later
+
+
+def test_ring_buffer_keeps_the_latest_runs() -> None:
+    for index in range(scheduler_history.RUN_HISTORY_SIZE + 3):
+        scheduler_history.remember_job_run(run("a", float(index)))
+
+    runs = scheduler_history.recent_job_runs("a")
+    assert len(runs) == scheduler_history.RUN_HISTORY_SIZE
+    assert runs[0].duration_ms == 3.0
+
+
+@pytest.mark.asyncio
+async def test_persisted_runs_round_trip_and_expire(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    stale = NOW - scheduler_history.RUN_RETENTION - timedelta(seconds=1)
+    await scheduler_history.persist_job_run(run("cleanup", 5.0, started_at=stale))
+    await scheduler_history.record_job_run(
+        JobRun(
+            job_id="cleanup",
+            handler_key="cleanup",
+            started_at=NOW,
+            finished_at=NOW,
+            duration_ms=12.5,
+            result=(4, True),
+        )
+    )
+
+    async with session_factory() as session:
+        rows = list(await session.scalars(select(ScheduledJobRun)))
+    assert [row.result for row in rows] == ["[4, true]"]
+    [stats] = await scheduler_history.load_job_run_stats()
+    assert (stats.handler_key, stats.runs, stats.p50_ms) == ("cleanup", 1, 12.5)
+    assert stats.last_started_at == NOW
+
+
+@pytest.mark.asyncio
+async def test_persist_failures_are_logged(
+    monkeypatch: pytest.MonkeyPatch,
+    session_factory: async_sessionmaker[AsyncSession],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    del session_factory
+    monkeypatch.setattr(
+        scheduler_history.repository,
+        "save_job_run",
+        AsyncMock(side_effect=scheduler_history.DatabaseError("boom")),
+    )
+
+    await scheduler_history.record_job_run(run("cleanup", 1.0))
+
+    assert "Failed to persist run of scheduled job cleanup" in caplog.text
+    assert len(scheduler_history.recent_job_runs()) == 1
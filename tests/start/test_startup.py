@@ -53,6 +53,10 @@ def _apply_default_startup_mocks(
     monkeypatch.setattr(
         startup_module, "validate_and_seed_permission_system", AsyncMock()
     )
+    load_permission_index = AsyncMock()
+    monkeypatch.setattr(startup_module, "load_permission_index", load_permission_index)
+    load_blocklist_index = AsyncMock()
+    monkeypatch.setattr(startup_module, "load_blocklist_index", load_blocklist_index)
     import_handle_mock = AsyncMock()
     monkeypatch.setattr(startup_module, "import_handle", import_handle_mock)
     monkeypatch.setattr(startup_module, "initialize_message_store", AsyncMock())
@@ -67,6 +71,10 @@ def _apply_default_startup_mocks(
         "initialize_scheduler_service",
         initialize_scheduler_service,
     )
+    initialize_expiry_service = AsyncMock()
+    monkeypatch.setattr(
+        startup_module, "initialize_expiry_service", initialize_expiry_service
+    )
 
     return {
         "log_error": log_error,
@@ -74,6 +82,9 @@ def _apply_default_startup_mocks(
         "import_handle": import_handle_mock,
         "register_scheduler_handler": register_scheduler_handler,
         "initialize_scheduler_service": initialize_scheduler_service,
+        "initialize_expiry_service": initialize_expiry_service,
+        "load_permission_index": load_permission_index,
+        "load_blocklist_index": load_blocklist_index,
     }
 
 
@@ -130,6 +141,12 @@ async def test_startup_imports_group_and_menu_handlers(
         initialize_scheduler_service,
     )
     monkeypatch.setattr(startup_module, "seed_registry_tables", AsyncMock())
+    monkeypatch.setattr(startup_module, "load_permission_index", AsyncMock())
+    monkeypatch.setattr(startup_module, "load_blocklist_index", AsyncMock())
+    initialize_expiry_service = AsyncMock()
+    monkeypatch.setattr(
+        startup_module, "initialize_expiry_service", initialize_expiry_service
+    )
 
     await startup_module.startup()
 
@@ -143,6 +160,7 @@ async def test_startup_imports_group_and_menu_handlers(
         startup_module.cleanup_expired_messages,
     )
     initialize_scheduler_service.assert_awaited_once()
+    initialize_expiry_service.assert_awaited_once()
     runtime_loader.assert_awaited_once()
     assert calls.index("load_runtime_configs") < calls.index("import_handle:menu")
 
@@ -174,6 +192,11 @@ async def test_startup_commits_registry_and_permission_seeds(
     transaction.__aexit__.assert_awaited_once()
     seed_registry.assert_awaited_once_with(session)
     seed_permissions.assert_awaited_once_with(session)
+    mocks["load_permission_index"].assert_awaited_once_with(session)
+    mocks["load_blocklist_index"].assert_awaited_once_with(
+        session,
+        ttl_seconds=startup_module.plugin_config.blocklist_index_ttl_seconds,
+    )
     mocks["initialize_scheduler_service"].assert_awaited_once()
 
 